@@ -285,6 +285,9 @@ class AgentCollaborationSystem:
         # Message handlers registered by agents
         self.message_handlers = {}  # agent_id -> {message_type -> handler_function}
         
+        # Observers notified of every sent message, e.g. to push it to clients
+        self.message_listeners = []  # handler_function(message)
+        
         # Load data
         self.load_data()
         
@@ -413,6 +416,15 @@ class AgentCollaborationSystem:
         else:
             self.message_handlers[agent_id]["__default__"] = handler
     
+    def add_message_listener(self, listener: Callable) -> None:
+        """
+        Register a function called with every message sent between agents.
+        
+        Args:
+            listener: Function taking the CollaborationMessage
+        """
+        self.message_listeners.append(listener)
+    
     def unregister_agent(self, agent_id: str) -> bool:
         """
         Unregister an agent from the collaboration system.
@@ -511,6 +523,12 @@ class AgentCollaborationSystem:
         # Try to deliver immediately if there's a registered handler
         self._try_deliver_message(message_id)
         
+        for listener in self.message_listeners:
+            try:
+                listener(message)
+            except Exception as e:
+                logger.error(f"Error in message listener: {str(e)}")
+        
         # Save data
         self.save_data()
         
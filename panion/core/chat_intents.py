@@ -0,0 +1,247 @@
+"""
+Chat Intent Matching
+Precompiled keyword and entity matching for chat messages.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+# Intents reported by detect_intent, in priority order
+INTENT_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("greeting", ["hello", "hi", "hey", "greetings"]),
+    ("help_request", ["help", "support", "assist"]),
+    ("goal_creation", ["goal", "task", "objective", "project"]),
+    ("agent_management", ["agent", "team", "group", "collaborate"]),
+    ("system_status", ["status", "stat", "performance", "health", "system"]),
+]
+
+# Topics the chat endpoint answers directly, in priority order
+TOPIC_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("greeting", ["hello", "hi"]),
+    ("help", ["help"]),
+    ("goal", ["goal", "task"]),
+    ("agent", ["agent", "team"]),
+    ("system", ["stat", "system"]),
+]
+
+# Phrases that switch on specific handling
+PHRASE_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("smoke_shop", ["smoke shop", "smokeshop"]),
+    ("web_research", [
+        "search online", "find online", "search the web", "look online",
+        "find on the internet", "current information", "latest news"
+    ]),
+]
+
+class KeywordScanner:
+    """Finds every flag whose keywords occur in a text in one regex pass.
+
+    Keywords match as substrings. All keywords are compiled into a single
+    trie-shaped regex inside a zero-width lookahead, so one ``findall``
+    reports the longest keyword starting at each position, overlapping
+    matches included, and shared prefixes are only tested once. Each
+    keyword also carries the flags of the keywords that are its prefixes,
+    since those match at the same position.
+    """
+
+    def __init__(self, flags: Dict[str, Iterable[str]]):
+        """Initialize the scanner.
+
+        Args:
+            flags: Flag name -> keywords that set it
+        """
+        keyword_flags: Dict[str, Set[str]] = {}
+        for flag, keywords in flags.items():
+            for keyword in keywords:
+                keyword_flags.setdefault(keyword.lower(), set()).add(flag)
+
+        self.keyword_flags: Dict[str, frozenset] = {}
+        for keyword in keyword_flags:
+            closure = set()
+            for other, other_flags in keyword_flags.items():
+                if keyword.startswith(other):
+                    closure |= other_flags
+            self.keyword_flags[keyword] = frozenset(closure)
+
+        trie: Dict[str, dict] = {}
+        for keyword in self.keyword_flags:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self.pattern: Pattern = re.compile(f"(?=({self._trie_pattern(trie)}))")
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, dict]) -> str:
+        """Render a trie as a regex; greedy optional suffixes prefer longer keywords."""
+        branches = [re.escape(char) + cls._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{group})?"
+        return group
+
+    def scan(self, text: str) -> Set[str]:
+        """Get the flags set by a lowercase text."""
+        found: Set[str] = set()
+        keyword_flags = self.keyword_flags
+        for keyword in set(self.pattern.findall(text)):
+            found |= keyword_flags[keyword]
+        return found
+
+# Entity patterns, compiled once
+BUSINESS_SEARCH_PATTERNS = [
+    # General pattern: find X in Y
+    re.compile(r"(?:find|search for|show me|get|locate|look up)\s+([a-zA-Z\s]+)\s+in\s+([a-zA-Z\s]+)"),
+    # Specific pattern: X in Y
+    re.compile(r"([a-zA-Z\s]+(?:shop|store|restaurant|cafe|business|company|hotel|bar)s?)\s+in\s+([a-zA-Z\s]+)"),
+]
+_IN_CLAUSE = re.compile(r"\sin\s")
+LOCATION_PATTERN = re.compile(r"in\s+([A-Za-z\s]+)(?:,|\.|$|\s)")
+SCRAPE_REQUEST_PATTERNS = [
+    re.compile(r"(scrape|find|get|collect|search).*(business|store|restaurant|shop|company)"),
+    re.compile(r"(business|store|restaurant|shop|company).*(info|data|details|phone|contact)"),
+]
+SCRAPE_BUSINESS_TYPE_PATTERN = re.compile(
+    r"(restaurant|cafe|coffee\s*shop|bar|grocery\s*store|clothing\s*store|electronic\s*store|"
+    r"hardware\s*store|bookstore|pharmacy|gym|salon|spa|hotel|bank|gas\s*station|theater|cinema)"
+)
+LIMIT_PATTERN = re.compile(r"(\d+)\s+(results|stores?|businesses|restaurants)")
+WITH_PROXY_PATTERN = re.compile(r"(using|with|via)\s+(proxy|proxies)")
+WITHOUT_PROXY_PATTERN = re.compile(r"(without|no)\s+(proxy|proxies)")
+PLAYWRIGHT_PATTERN = re.compile(r"(using|with|via)\s+(playwright|browser|headless|chrome|firefox)")
+SELENIUM_PATTERN = re.compile(r"(using|with|via)\s+(selenium|browser automation)")
+STRATEGIC_PATTERN = re.compile(r"(strategic|strategy|multiple approaches|compare|best approach|optimal|combine|multi-source)")
+ANALYSIS_REQUEST_PATTERN = re.compile(r"(analyze|chart|graph|visualization|trend|plot|dashboard).*(data|csv|json|file|result)")
+ANALYSIS_TYPE_PATTERN = re.compile(r"(bar\s*chart|pie\s*chart|line\s*graph|histogram|scatter\s*plot|correlation|summary|statistics)")
+
+@dataclass
+class ScrapeRequest:
+    """Parameters of a scraping request found in a chat message."""
+    business_type: str
+    location: str
+    limit: int
+    use_proxy: bool
+    use_playwright: bool
+    use_selenium: bool
+    use_strategic: bool
+
+@dataclass
+class ChatAnalysis:
+    """Intent and entities extracted from one chat message."""
+    content: str
+    lowered: str
+    flags: Set[str] = field(default_factory=set)
+    intent: str = "general_query"
+    business_type: Optional[str] = None
+    location: Optional[str] = None
+
+    def has(self, flag: str) -> bool:
+        """Check whether a keyword flag was found."""
+        return flag in self.flags
+
+    @property
+    def topic(self) -> Optional[str]:
+        """Highest-priority chat topic mentioned, if any."""
+        for topic, _ in TOPIC_KEYWORDS:
+            if f"topic:{topic}" in self.flags:
+                return topic
+        return None
+
+class ChatIntentMatcher:
+    """Extracts intent, business type and location from chat messages.
+
+    Everything is compiled once at construction; analysing a message
+    lowercases it once and runs a single keyword pass, and the entity
+    regexes only run when their cheaper prefilters pass.
+    """
+
+    def __init__(self):
+        flags: Dict[str, List[str]] = {}
+        for prefix, table in (("intent", INTENT_KEYWORDS), ("topic", TOPIC_KEYWORDS), (None, PHRASE_KEYWORDS)):
+            for name, keywords in table:
+                flags[f"{prefix}:{name}" if prefix else name] = keywords
+        self.scanner = KeywordScanner(flags)
+
+    def analyze(self, content: str) -> ChatAnalysis:
+        """Analyse a chat message.
+
+        Args:
+            content: Raw message text
+
+        Returns:
+            ChatAnalysis: Flags, intent and business search entities
+        """
+        lowered = content.lower()
+        analysis = ChatAnalysis(content=content, lowered=lowered, flags=self.scanner.scan(lowered))
+
+        for intent, _ in INTENT_KEYWORDS:
+            if f"intent:{intent}" in analysis.flags:
+                analysis.intent = intent
+                break
+
+        # Both business patterns need whitespace around "in"
+        if _IN_CLAUSE.search(lowered):
+            for pattern in BUSINESS_SEARCH_PATTERNS:
+                match = pattern.search(lowered)
+                if match:
+                    analysis.business_type = match.group(1).strip()
+                    analysis.location = match.group(2).strip()
+                    break
+        return analysis
+
+    def detect_intent(self, message: str) -> str:
+        """Detect the intent of a message."""
+        flags = self.scanner.scan(message.lower())
+        for intent, _ in INTENT_KEYWORDS:
+            if f"intent:{intent}" in flags:
+                return intent
+        return "general_query"
+
+    @staticmethod
+    def find_location(content: str) -> Optional[str]:
+        """Find an ``in <place>`` location in the original-case message."""
+        match = LOCATION_PATTERN.search(content)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def is_scrape_request(analysis: ChatAnalysis) -> bool:
+        """Check whether a message asks to collect business data."""
+        return any(pattern.search(analysis.lowered) for pattern in SCRAPE_REQUEST_PATTERNS)
+
+    def scrape_request(self, analysis: ChatAnalysis) -> ScrapeRequest:
+        """Extract the parameters of a scraping request."""
+        lowered = analysis.lowered
+        business_type_match = SCRAPE_BUSINESS_TYPE_PATTERN.search(lowered)
+        limit_match = LIMIT_PATTERN.search(analysis.content)
+
+        use_proxy = True  # Default to using proxy
+        if not WITH_PROXY_PATTERN.search(lowered) and WITHOUT_PROXY_PATTERN.search(lowered):
+            use_proxy = False
+
+        return ScrapeRequest(
+            business_type=business_type_match.group(1) if business_type_match else "business",
+            location=self.find_location(analysis.content) or "New York",
+            limit=min(int(limit_match.group(1)) if limit_match else 10, 100),  # Cap at 100
+            use_proxy=use_proxy,
+            use_playwright=bool(PLAYWRIGHT_PATTERN.search(lowered)),
+            use_selenium=bool(SELENIUM_PATTERN.search(lowered)),
+            use_strategic=bool(STRATEGIC_PATTERN.search(lowered))
+        )
+
+    @staticmethod
+    def is_analysis_request(analysis: ChatAnalysis) -> bool:
+        """Check whether a message asks for data analysis."""
+        return bool(ANALYSIS_REQUEST_PATTERN.search(analysis.lowered))
+
+    @staticmethod
+    def analysis_type(analysis: ChatAnalysis) -> str:
+        """Get the requested analysis type."""
+        match = ANALYSIS_TYPE_PATTERN.search(analysis.lowered)
+        return match.group(1) if match else "summary"
+
+# Shared matcher, built once at import
+chat_matcher = ChatIntentMatcher()
@@ -20,6 +20,7 @@ from .agent_collaboration import (
     request_task,
     share_knowledge
 )
+from .progress_stream import progress_stream
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +33,12 @@ logger = logging.getLogger(__name__)
 collaboration_system = AgentCollaborationSystem()
 team_coordinator = AgentTeamCoordinator(collaboration_system)
 
+def _publish_message(message):
+    """Push agent messages to event stream clients on topic agent:<receiver>"""
+    progress_stream.publish(f"agent:{message.receiver_id}", message.to_dict())
+
+collaboration_system.add_message_listener(_publish_message)
+
 class CollaborationAPIHandler:
     """Handler for collaboration API requests"""
     
@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from .validators import context_validator
+from core.utils.ids import id_allocator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -262,7 +263,7 @@ class ContextManager:
         self.validator.validate(data)
         
         # Create context entry
-        context_id = f"{agent_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        context_id = id_allocator.new_id(agent_id)
         entry = ContextEntry(
             id=context_id,
             type=context_type,
@@ -7,7 +7,7 @@ import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Callable, Union, Set, Tuple, Pattern
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 import uuid
@@ -24,6 +24,7 @@ from .panion_os import panion_os
 from core.panion_plugins import plugin_manager
 from core.ai_service import ai_service
 from core.capabilities import capability_manager, CapabilityCategory, Capability
+from core.utils.ids import id_allocator
 
 class MemoryCategory(Enum):
     """Predefined memory categories for organizing conversations."""
@@ -87,6 +88,7 @@ class Memory:
     conflicting_memories: List[str] = None
     verification_history: List[Dict[str, Any]] = None
     expiration_date: Optional[datetime] = None
+    id: str = field(default_factory=lambda: id_allocator.new_id("mem"))
 
     def __post_init__(self):
         if self.keywords is None:
@@ -100,6 +102,7 @@ class Memory:
 
     def to_dict(self) -> Dict[str, Any]:
         data = {
+            "id": self.id,
             "content": self.content,
             "category": self.category.value,
             "timestamp": self.timestamp.isoformat(),
@@ -131,6 +134,8 @@ class Memory:
             confidence=data.get("confidence", 1.0),
             importance_score=data.get("importance_score", 0.5)
         )
+        if "id" in data:
+            memory.id = data["id"]
         memory.keywords = data.get("keywords", [])
         memory.context = data.get("context", {})
         memory.validation_status = MemoryValidationStatus(data.get("validation_status", "unverified"))
@@ -452,6 +457,7 @@ class ConversationManager:
                     continue
                 if not await self.conversation_queue.empty():
                     conversation = await self.conversation_queue.get()
+                    conversation.setdefault("id", id_allocator.new_id("conv"))
                     conversation_coroutine = self._handle_conversation(conversation)
                     self.active_conversations[conversation["id"]] = asyncio.create_task(conversation_coroutine)
                 await asyncio.sleep(0.1)
@@ -520,6 +526,7 @@ class ConversationManager:
         """Handle a message."""
         try:
             # Process message
+            message.setdefault("id", id_allocator.new_id("msg"))
             self.current_conversation.append(message)
             self.messages_processed += 1
             
@@ -545,6 +552,7 @@ class ConversationManager:
         """Process a message and return a response."""
         try:
             # Add message to conversation history
+            message.setdefault("id", id_allocator.new_id("msg"))
             self.current_conversation.append(message)
             
             # Format messages for AI service
@@ -559,6 +567,7 @@ class ConversationManager:
             
             # Create response message
             response_message = {
+                "id": id_allocator.new_id("msg"),
                 "content": response,
                 "type": "system",
                 "timestamp": datetime.now().isoformat(),
@@ -3,9 +3,11 @@ Event System
 Handles event-based communication between components.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Callable, Optional
-from dataclasses import dataclass
+from collections import deque
+from typing import Dict, Any, List, Callable, Optional, Deque, Hashable, Awaitable, Union
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 
@@ -15,6 +17,8 @@ class EventType(Enum):
     """Types of events in the system."""
     PLUGIN_LOADED = auto()
     PLUGIN_UNLOADED = auto()
+    PLUGIN_UPDATED = auto()
+    PLUGIN_DELETED = auto()
     PLUGIN_TEST_STARTED = auto()
     PLUGIN_TEST_COMPLETED = auto()
     PLUGIN_SYNTHESIS_STARTED = auto()
@@ -22,49 +26,307 @@ class EventType(Enum):
     PLUGIN_CACHE_UPDATED = auto()
     PLUGIN_REFINEMENT_STARTED = auto()
     PLUGIN_REFINEMENT_COMPLETED = auto()
+    GOAL_CONTEXT_UPDATED = auto()  # data: {"goal_id": ...}, or no goal_id for all goals
 
 @dataclass
 class Event:
     """Event data structure."""
     type: EventType
     data: Dict[str, Any]
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
     source: str = ""
 
+class OverflowPolicy(Enum):
+    """What an async subscription does when its queue is full."""
+    DROP_NEWEST = "drop_newest"  # Discard the incoming event
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+    BLOCK = "block"              # Make publish_async wait for space
+    COALESCE = "coalesce"        # Replace a queued event with the same key
+
+EventCallback = Callable[[Event], Union[None, Awaitable[None]]]
+
+class AsyncSubscription:
+    """Bounded per-subscriber queue drained by its own asyncio task."""
+
+    def __init__(self,
+                 event_type: EventType,
+                 callback: EventCallback,
+                 loop: asyncio.AbstractEventLoop,
+                 max_queue_size: int = 100,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 coalesce_key: Optional[Callable[[Event], Hashable]] = None):
+        self.event_type = event_type
+        self.callback = callback
+        self.loop = loop
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key or (lambda event: (event.type, event.source))
+
+        self._keys: Deque[Hashable] = deque()
+        self._events: Dict[Hashable, Event] = {}
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._sequence = 0
+        self._task: Optional[asyncio.Task] = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start the delivery task."""
+        if self._task is None:
+            self._task = self.loop.create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the delivery task."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _enqueue(self, key: Hashable, event: Event) -> None:
+        self._keys.append(key)
+        self._events[key] = event
+        self._idle.clear()
+        self._ready.set()
+        if len(self._keys) >= self.max_queue_size:
+            self._space.clear()
+
+    def offer(self, event: Event) -> bool:
+        """Queue an event without waiting. Must run on the subscription's loop.
+
+        Returns:
+            bool: Whether the event was queued (or coalesced)
+        """
+        if self.overflow == OverflowPolicy.COALESCE:
+            key = self.coalesce_key(event)
+            if key in self._events:
+                self._events[key] = event
+                self.coalesced += 1
+                return True
+        else:
+            key = self._sequence
+            self._sequence += 1
+
+        if len(self._keys) >= self.max_queue_size:
+            if self.overflow in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.COALESCE):
+                oldest = self._keys.popleft()
+                self._events.pop(oldest, None)
+                self.dropped += 1
+            else:
+                # DROP_NEWEST, or BLOCK reached through the non-waiting path
+                self.dropped += 1
+                return False
+
+        self._enqueue(key, event)
+        return True
+
+    async def put(self, event: Event) -> None:
+        """Queue an event, waiting for space under the BLOCK policy."""
+        if self.overflow == OverflowPolicy.BLOCK:
+            while len(self._keys) >= self.max_queue_size:
+                await self._space.wait()
+        self.offer(event)
+
+    async def join(self) -> None:
+        """Wait until every queued event has been delivered."""
+        await self._idle.wait()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._keys:
+                self._ready.clear()
+                self._idle.set()
+                await self._ready.wait()
+                continue
+
+            key = self._keys.popleft()
+            event = self._events.pop(key)
+            if len(self._keys) < self.max_queue_size:
+                self._space.set()
+
+            try:
+                result = self.callback(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in async event handler: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery statistics."""
+        return {
+            "event_type": self.event_type.name,
+            "queued": len(self._keys),
+            "max_queue_size": self.max_queue_size,
+            "overflow": self.overflow.value,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors
+        }
+
 class EventBus:
-    """Event bus for handling system-wide events."""
-    
-    def __init__(self):
+    """Event bus for handling system-wide events.
+
+    Plain subscribers are called synchronously by ``publish``. Async
+    subscribers each get a bounded queue drained by their own task, so slow
+    handlers do not add latency to the publisher.
+    """
+
+    def __init__(self, history_size: int = 1000):
         self._subscribers: Dict[EventType, List[Callable[[Event], None]]] = {}
-        self._event_history: List[Event] = []
-        
+        self._async_subscribers: Dict[EventType, List[AsyncSubscription]] = {}
+        self.history_size = history_size
+        self._event_history: Deque[Event] = deque(maxlen=history_size)
+        self._history_by_type: Dict[EventType, Deque[Event]] = {}
+
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """Subscribe to an event type."""
         if event_type not in self._subscribers:
             self._subscribers[event_type] = []
         self._subscribers[event_type].append(callback)
-        
+
+    async def subscribe_async(self,
+                              event_type: EventType,
+                              callback: EventCallback,
+                              max_queue_size: int = 100,
+                              overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                              coalesce_key: Optional[Callable[[Event], Hashable]] = None
+                              ) -> AsyncSubscription:
+        """Subscribe with a bounded queue delivered on the running event loop.
+
+        Args:
+            event_type: Type of event to receive
+            callback: Handler; may be a coroutine function
+            max_queue_size: Maximum events queued for this subscriber
+            overflow: Policy applied when the queue is full
+            coalesce_key: Key under which COALESCE replaces queued events
+                (default event type and source)
+
+        Returns:
+            AsyncSubscription: Handle exposing stats and ``join()``
+        """
+        subscription = AsyncSubscription(
+            event_type,
+            callback,
+            asyncio.get_running_loop(),
+            max_queue_size=max_queue_size,
+            overflow=overflow,
+            coalesce_key=coalesce_key
+        )
+        subscription.start()
+        self._async_subscribers.setdefault(event_type, []).append(subscription)
+        return subscription
+
     def unsubscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """Unsubscribe from an event type."""
-        if event_type in self._subscribers:
+        if event_type in self._subscribers and callback in self._subscribers[event_type]:
             self._subscribers[event_type].remove(callback)
-            
-    def publish(self, event: Event) -> None:
-        """Publish an event to all subscribers."""
+
+        for subscription in list(self._async_subscribers.get(event_type, [])):
+            if subscription.callback == callback:
+                subscription.stop()
+                self._async_subscribers[event_type].remove(subscription)
+
+    def _record(self, event: Event) -> None:
         self._event_history.append(event)
-        
+        history = self._history_by_type.get(event.type)
+        if history is None:
+            history = self._history_by_type[event.type] = deque(maxlen=self.history_size)
+        history.append(event)
+
+    def _offer(self, subscription: AsyncSubscription, event: Event) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is subscription.loop:
+            subscription.offer(event)
+        elif not subscription.loop.is_closed():
+            subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+    def publish(self, event: Event) -> None:
+        """Publish an event to all subscribers.
+
+        Async subscribers are queued without waiting; a BLOCK subscriber
+        with a full queue drops the event here (use ``publish_async``).
+        """
+        self._record(event)
+
         if event.type in self._subscribers:
             for callback in self._subscribers[event.type]:
                 try:
                     callback(event)
                 except Exception as e:
                     logger.error(f"Error in event handler: {e}")
-                    
-    def get_event_history(self, event_type: Optional[EventType] = None) -> List[Event]:
-        """Get event history, optionally filtered by type."""
+
+        for subscription in self._async_subscribers.get(event.type, []):
+            self._offer(subscription, event)
+
+    async def publish_async(self, event: Event) -> None:
+        """Publish an event, waiting for queue space on BLOCK subscribers."""
+        self._record(event)
+
+        for callback in self._subscribers.get(event.type, []):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error in event handler: {e}")
+
+        for subscription in self._async_subscribers.get(event.type, []):
+            if subscription.loop is asyncio.get_running_loop():
+                await subscription.put(event)
+            else:
+                self._offer(subscription, event)
+
+    async def drain(self) -> None:
+        """Wait until every async subscriber has processed its queue."""
+        for subscriptions in self._async_subscribers.values():
+            for subscription in subscriptions:
+                await subscription.join()
+
+    async def close(self) -> None:
+        """Drain and stop all async subscribers."""
+        await self.drain()
+        for subscriptions in self._async_subscribers.values():
+            for subscription in subscriptions:
+                subscription.stop()
+        self._async_subscribers.clear()
+
+    def get_event_history(self,
+                          event_type: Optional[EventType] = None,
+                          limit: Optional[int] = None) -> List[Event]:
+        """Get recent event history, optionally filtered by type.
+
+        Args:
+            event_type: Only return events of this type
+            limit: Only return the most recent ``limit`` events
+        """
         if event_type:
-            return [e for e in self._event_history if e.type == event_type]
-        return self._event_history
+            history = self._history_by_type.get(event_type, ())
+        else:
+            history = self._event_history
+        events = list(history)
+        return events[-limit:] if limit else events
+
+    def get_subscription_stats(self) -> List[Dict[str, Any]]:
+        """Get queue statistics for every async subscriber."""
+        return [
+            subscription.get_stats()
+            for subscriptions in self._async_subscribers.values()
+            for subscription in subscriptions
+        ]
 
 # Create singleton instance
-event_bus = EventBus() 
\ No newline at end of file
+event_bus = EventBus()
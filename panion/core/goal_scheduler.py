@@ -17,16 +17,20 @@ from core.memory_router import MemoryRouter
 from core.task_manager import TaskManager
 import os
 import statistics
-import networkx as nx
 import psutil
 import pandas as pd
 import numpy as np
 import asyncio
 import threading
+import time
 from dataclasses import dataclass, field
 from collections import deque
 from core.plugin.base import BasePlugin
 from core.decorators import with_connection_pool, cache_result
+from core.ready_queue import ReadyQueue
+from core.resource_timeline import ResourceTimeline
+from core.schedule_graph import ScheduleDAG
+from core.schedule_plan import SchedulePlan
 
 @dataclass
 class Goal:
@@ -85,8 +89,15 @@ class GoalScheduler(BasePlugin):
         self._scheduler_thread = None
         self._scheduler_lock = threading.Lock()
         
+        # Event-driven dispatch: heap of ready goals keyed by (priority, deadline)
+        # plus reverse dependency edges so completions only touch dependents.
+        self._event_driven = self.config.get('event_driven', True)
+        self._ready_queue = ReadyQueue(self.goals)
+        self._wakeup = threading.Event()
+        
         self._schedule_file = Path('data/goal_schedules.json')
         self._schedules = {}
+        self._schedule_plans: Dict[str, SchedulePlan] = {}
         self._resource_pool = {}
         self.task_manager = TaskManager()
         self.memory_router = MemoryRouter()
@@ -101,6 +112,7 @@ class GoalScheduler(BasePlugin):
             self.logger.error(f"Error loading config: {e}")
             return {
                 'scheduling_interval': 60,  # 60 seconds
+                'event_driven': True,  # Dispatch on goal events instead of polling
                 'max_concurrent_goals': 5,
                 'resource_limits': {
                     'cpu': 80.0,  # 80% CPU
@@ -120,11 +132,16 @@ class GoalScheduler(BasePlugin):
     def stop_scheduling(self):
         """Stop goal scheduling."""
         self._scheduling = False
+        self._wakeup.set()
         if self._scheduler_thread:
             self._scheduler_thread.join()
             
     def _scheduler_loop(self):
         """Main scheduling loop."""
+        if self._event_driven:
+            self._event_scheduler_loop()
+            return
+            
         while self._scheduling:
             try:
                 with self._scheduler_lock:
@@ -144,6 +161,58 @@ class GoalScheduler(BasePlugin):
                 self.logger.error(f"Error in scheduler loop: {e}")
                 time.sleep(5)  # Wait before retrying
                 
+    def _event_scheduler_loop(self):
+        """Event-driven scheduling loop.
+        
+        Wakes as soon as a goal becomes ready or finishes. The scheduling
+        interval only bounds how long the loop sleeps without any event, so
+        resource changes and completion checks are still picked up.
+        """
+        while self._scheduling:
+            try:
+                self._wakeup.wait(timeout=self.config['scheduling_interval'])
+                self._wakeup.clear()
+                if not self._scheduling:
+                    break
+                    
+                with self._scheduler_lock:
+                    self._update_available_resources()
+                    self._dispatch_ready_goals()
+                    self._check_completed_goals()
+                    
+            except Exception as e:
+                self.logger.error(f"Error in event scheduler loop: {e}")
+                time.sleep(5)  # Wait before retrying
+                
+    def _signal_scheduler(self):
+        """Wake the scheduler loop so it dispatches without waiting for the interval."""
+        self._wakeup.set()
+        
+    def _dispatch_ready_goals(self):
+        """Start ready goals in (priority, deadline) order.
+        
+        Goals that cannot start yet because of resources or agents stay in
+        the queue and are retried on the next event.
+        """
+        max_concurrent = self.config.get('max_concurrent_goals')
+
+        def try_start(goal: Goal) -> bool:
+            if not self._check_goal_resources(goal):
+                return False
+            agent_id = self._assign_agent(goal)
+            if not agent_id:
+                return False
+            self._start_goal(goal.goal_id, agent_id)
+            return True
+
+        try:
+            self._ready_queue.dispatch(
+                try_start,
+                lambda: bool(max_concurrent) and len(self.running_goals) >= max_concurrent
+            )
+        except Exception as e:
+            self.logger.error(f"Error dispatching ready goals: {e}")
+            
     def _update_available_resources(self):
         """Update available system resources."""
         try:
@@ -186,7 +255,7 @@ class GoalScheduler(BasePlugin):
                     continue
                     
                 # Check resource availability
-                if not self._check_resource_availability(goal):
+                if not self._check_goal_resources(goal):
                     continue
                     
                 # Assign agent
@@ -225,7 +294,7 @@ class GoalScheduler(BasePlugin):
             self.logger.error(f"Error checking dependencies: {e}")
             return False
             
-    def _check_resource_availability(self, goal: Goal) -> bool:
+    def _check_goal_resources(self, goal: Goal) -> bool:
         """Check if required resources are available.
         
         Args:
@@ -420,10 +489,14 @@ class GoalScheduler(BasePlugin):
             self.running_goals.remove(goal_id)
             self.completed_goals.append(goal_id)
             
+            # Unblock only the goals that depend on this one
+            self._ready_queue.complete(goal_id)
+            
             # Save changes
             self._save_goals()
             
             self.logger.info(f"Completed goal {goal_id}")
+            self._signal_scheduler()
             
         except Exception as e:
             self.logger.error(f"Error completing goal: {e}")
@@ -459,8 +532,10 @@ class GoalScheduler(BasePlugin):
         try:
             self.goals[goal.goal_id] = goal
             self.scheduled_goals.append(goal.goal_id)
+            self._ready_queue.index(goal)
             self._save_goals()
             self.logger.info(f"Added goal {goal.goal_id}")
+            self._signal_scheduler()
             
         except Exception as e:
             self.logger.error(f"Error adding goal: {e}")
@@ -505,6 +580,7 @@ class GoalScheduler(BasePlugin):
             return {
                 'total_goals': len(self.goals),
                 'pending_goals': len(self.scheduled_goals),
+                'ready_goals': len(self._ready_queue),
                 'running_goals': len(self.running_goals),
                 'completed_goals': len(self.completed_goals),
                 'available_resources': self.available_resources,
@@ -531,8 +607,13 @@ class GoalScheduler(BasePlugin):
             if self.goals_file.exists():
                 with open(self.goals_file, 'r') as f:
                     state = json.load(f)
-                    self.goals = {goal_id: Goal(**goal_data) for goal_id, goal_data in state.items()}
+                    # Refill in place; the ready queue shares this mapping
+                    self.goals.clear()
+                    self.goals.update(
+                        (goal_id, Goal(**goal_data)) for goal_id, goal_data in state.items()
+                    )
                     self.scheduled_goals = list(self.goals.keys())
+                    self._ready_queue.rebuild()
         except Exception as e:
             self.logger.error(f"Error loading scheduler state: {e}")
             reflection_system.log_thought(
@@ -640,7 +721,9 @@ class GoalScheduler(BasePlugin):
             schedule['tasks'].append(task)
 
         # Create timeline
-        schedule['timeline'] = self._create_timeline(schedule['tasks'])
+        plan_state = self._new_schedule_plan(schedule['tasks'])
+        schedule['timeline'] = self._create_timeline(schedule['tasks'], plan_state)
+        self._schedule_plans[schedule['goal_id']] = plan_state
 
         return schedule
 
@@ -790,30 +873,114 @@ class GoalScheduler(BasePlugin):
             
         return factor
 
-    def _create_timeline(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _create_timeline(self,
+                         tasks: List[Dict[str, Any]],
+                         plan: Optional[SchedulePlan] = None) -> List[Dict[str, Any]]:
         """Create a timeline for tasks based on dependencies."""
+        if plan is None:
+            plan = self._new_schedule_plan(tasks)
+
         timeline = []
-        current_time = datetime.now()
+        for task_id in plan.graph.topological_order():
+            timeline.append(self._place_task(plan.graph.nodes[task_id], plan))
+
+        return timeline
 
-        # Sort tasks by dependencies
-        sorted_tasks = self._topological_sort(tasks)
+    def _new_schedule_plan(self, tasks: List[Dict[str, Any]]) -> SchedulePlan:
+        """Create planning state for a set of subtasks.
+        
+        Raises:
+            ValueError: If the subtasks have circular dependencies
+        """
+        return SchedulePlan(
+            graph=ScheduleDAG.from_items(tasks, key='subtask_id'),
+            resource_index=ResourceTimeline(self._get_resource_limits()),
+            anchor=datetime.now()
+        )
+
+    def _place_task(self, task: Dict[str, Any], plan: SchedulePlan) -> Dict[str, Any]:
+        """Place a task at its earliest feasible start and record its usage.
+        
+        Args:
+            task: Task dictionary
+            plan: Planning state of the task's schedule
+            
+        Returns:
+            Dict[str, Any]: Timeline entry for the task
+        """
+        task_id = task['subtask_id']
+        start_time = self._calculate_start_time(
+            task, [], plan.anchor, plan.resource_index, plan.end_times
+        )
+        end_time = start_time + timedelta(minutes=task['estimated_duration'])
+        plan.record(task_id, start_time, end_time, self._get_required_resources(task))
+
+        return {
+            'task_id': task_id,
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'duration': task['estimated_duration']
+        }
 
-        for task in sorted_tasks:
-            # Calculate start time based on dependencies
-            start_time = self._calculate_start_time(task, timeline, current_time)
+    def _get_schedule_plan(self, goal_id: str) -> SchedulePlan:
+        """Get the planning state of a schedule, rebuilding it if needed."""
+        plan = self._schedule_plans.get(goal_id)
+        if plan is not None:
+            return plan
+
+        schedule = self._schedules[goal_id]
+        tasks = {task['subtask_id']: task for task in schedule['tasks']}
+        plan = self._new_schedule_plan(schedule['tasks'])
+        starts = []
+        for entry in schedule.get('timeline', []):
+            task = tasks.get(entry['task_id'])
+            if task is None or not entry.get('start_time') or not entry.get('end_time'):
+                continue
+            start_time = datetime.fromisoformat(entry['start_time'])
+            end_time = datetime.fromisoformat(entry['end_time'])
+            plan.record(task['subtask_id'], start_time, end_time, self._get_required_resources(task))
+            starts.append(start_time)
+        if starts:
+            plan.anchor = min(starts)
+
+        self._schedule_plans[goal_id] = plan
+        return plan
+
+    def _replan_tasks(self,
+                      goal_id: str,
+                      task_updates: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Apply subtask changes and re-place only their downstream cone.
+        
+        Args:
+            goal_id: ID of the scheduled goal
+            task_updates: Changed fields per subtask ID, e.g.
+                ``{'sub_1': {'estimated_duration': 30}}``
             
-            # Calculate end time based on duration
-            end_time = start_time + timedelta(minutes=task['estimated_duration'])
+        Returns:
+            List[str]: IDs of re-placed subtasks in dependency order
             
-            timeline_entry = {
-                'task_id': task['subtask_id'],
-                'start_time': start_time.isoformat(),
-                'end_time': end_time.isoformat(),
-                'duration': task['estimated_duration']
-            }
-            timeline.append(timeline_entry)
+        Raises:
+            ValueError: If a subtask is unknown or a new dependency creates a cycle
+        """
+        schedule = self._schedules[goal_id]
+        plan = self._get_schedule_plan(goal_id)
+        tasks = {task['subtask_id']: task for task in schedule['tasks']}
+        return plan.replan(tasks, schedule['timeline'], task_updates, self._place_task)
 
-        return timeline
+    def _get_resource_limits(self) -> Dict[str, float]:
+        """Get limits for all known resource types in one pass."""
+        return {
+            resource_type: self._get_resource_limit(resource_type)
+            for resource_type in ('cpu', 'memory', 'disk', 'network')
+        }
+
+    def _build_resource_index(self, timeline: List[Dict[str, Any]]) -> ResourceTimeline:
+        """Build a resource index from an existing timeline."""
+        return ResourceTimeline.from_entries(
+            timeline,
+            self._get_required_resources,
+            self._get_resource_limits()
+        )
 
     def _topological_sort(self, goals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Perform topological sort on goals based on dependencies.
@@ -823,34 +990,12 @@ class GoalScheduler(BasePlugin):
             
         Returns:
             Sorted list of goals
-        """
-        # Create directed graph
-        graph = nx.DiGraph()
-        
-        # Add all goals to graph
-        for goal in goals:
-            graph.add_node(goal['id'], goal=goal)
             
-        # Add edges based on dependencies
-        for goal in goals:
-            if 'dependencies' in goal:
-                for dep_id in goal['dependencies']:
-                    if dep_id in graph:
-                        graph.add_edge(dep_id, goal['id'])
-                        
-        # Check for cycles
-        try:
-            cycle = nx.find_cycle(graph)
-            raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
-        except nx.NetworkXNoCycle:
-            pass
-            
-        # Get topological sort
-        try:
-            ordered_nodes = list(nx.topological_sort(graph))
-            return [graph.nodes[node]['goal'] for node in ordered_nodes]
-        except nx.NetworkXUnfeasible:
-            raise ValueError("Could not resolve goal dependencies")
+        Raises:
+            ValueError: If the goals have circular dependencies
+        """
+        graph = ScheduleDAG.from_items(goals, key='id')
+        return [graph.nodes[node] for node in graph.topological_order()]
             
     def _calculate_start_times(self, goals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Calculate start times for goals based on dependencies and constraints.
@@ -865,7 +1010,7 @@ class GoalScheduler(BasePlugin):
         sorted_goals = self._topological_sort(goals)
         
         # Track resource usage over time
-        resource_usage = {}
+        resource_index = ResourceTimeline(self._get_resource_limits())
         
         # Calculate start times
         for goal in sorted_goals:
@@ -881,76 +1026,58 @@ class GoalScheduler(BasePlugin):
                             earliest_start = dep_end
                             
             # Adjust for resource constraints
-            if 'constraints' in goal:
-                for constraint in goal['constraints']:
-                    if constraint['type'] == 'resource':
-                        resource_type = constraint['parameters'].get('resource_type')
-                        amount = constraint['parameters'].get('amount', 0)
-                        
-                        if not resource_type or amount <= 0:
-                            continue
-                            
-                        # Initialize resource tracking
-                        if resource_type not in resource_usage:
-                            resource_usage[resource_type] = []
-                            
-                        # Find earliest time when resource is available
-                        current_time = earliest_start
-                        while True:
-                            # Check if resource is available at current time
-                            available = True
-                            for usage in resource_usage[resource_type]:
-                                if (current_time >= usage['start'] and
-                                    current_time < usage['end']):
-                                    if usage['amount'] + amount > self._get_resource_limit(resource_type):
-                                        available = False
-                                        break
-                                        
-                            if available:
-                                break
-                                
-                            # Move to next time slot
-                            current_time += timedelta(minutes=1)
-                            
-                        if current_time > earliest_start:
-                            earliest_start = current_time
+            required_resources = self._get_constraint_resources(goal)
+            if required_resources:
+                earliest_start = resource_index.next_available(required_resources, earliest_start)
                             
             # Set start time
             goal['start_time'] = earliest_start.isoformat()
             
             # Calculate end time
             duration = self._estimate_duration(goal)
-            goal['end_time'] = (earliest_start + timedelta(seconds=duration)).isoformat()
+            end_time = earliest_start + timedelta(seconds=duration)
+            goal['end_time'] = end_time.isoformat()
             
             # Update resource usage
-            if 'constraints' in goal:
-                for constraint in goal['constraints']:
-                    if constraint['type'] == 'resource':
-                        resource_type = constraint['parameters'].get('resource_type')
-                        amount = constraint['parameters'].get('amount', 0)
-                        
-                        if not resource_type or amount <= 0:
-                            continue
-                            
-                        resource_usage[resource_type].append({
-                            'start': earliest_start,
-                            'end': datetime.fromisoformat(goal['end_time']),
-                            'amount': amount,
-                            'goal_id': goal['id']
-                        })
+            if required_resources:
+                resource_index.add(earliest_start, end_time, required_resources)
                         
         return sorted_goals
 
+    def _get_constraint_resources(self, goal: Dict[str, Any]) -> Dict[str, float]:
+        """Get resource amounts from a goal's resource constraints.
+        
+        Args:
+            goal: Goal dictionary
+            
+        Returns:
+            Dict[str, float]: Required amount per resource type
+        """
+        resources: Dict[str, float] = {}
+        for constraint in goal.get('constraints', []):
+            if constraint['type'] != 'resource':
+                continue
+            resource_type = constraint['parameters'].get('resource_type')
+            amount = constraint['parameters'].get('amount', 0)
+            if not resource_type or amount <= 0:
+                continue
+            resources[resource_type] = resources.get(resource_type, 0) + amount
+        return resources
+
     def _calculate_start_time(self,
                             task: Dict[str, Any],
                             timeline: List[Dict[str, Any]],
-                            current_time: datetime) -> datetime:
+                            current_time: datetime,
+                            resource_index: Optional[ResourceTimeline] = None,
+                            end_times: Optional[Dict[str, datetime]] = None) -> datetime:
         """Calculate the optimal start time for a task.
         
         Args:
             task: Task dictionary
             timeline: Current timeline of tasks
             current_time: Current system time
+            resource_index: Resource index of the timeline, built if not given
+            end_times: End time per task ID in the timeline, built if not given
             
         Returns:
             datetime: Calculated start time
@@ -960,15 +1087,19 @@ class GoalScheduler(BasePlugin):
         if not dependencies:
             return current_time
             
+        if end_times is None:
+            end_times = {
+                entry.get('task_id', entry.get('subtask_id')): datetime.fromisoformat(entry['end_time'])
+                for entry in timeline
+                if entry.get('end_time')
+            }
+            
         # Find latest end time of dependencies
         latest_end_time = current_time
         for dep_id in dependencies:
-            for timeline_task in timeline:
-                if timeline_task['subtask_id'] == dep_id:
-                    if timeline_task['end_time']:
-                        dep_end_time = datetime.fromisoformat(timeline_task['end_time'])
-                        latest_end_time = max(latest_end_time, dep_end_time)
-                    break
+            dep_end_time = end_times.get(dep_id)
+            if dep_end_time:
+                latest_end_time = max(latest_end_time, dep_end_time)
                     
         # Add buffer time between tasks
         buffer_time = timedelta(minutes=5)  # 5-minute buffer between tasks
@@ -978,7 +1109,8 @@ class GoalScheduler(BasePlugin):
         available_time = self._find_next_resource_availability(
             required_resources,
             latest_end_time + buffer_time,
-            timeline
+            timeline,
+            resource_index
         )
         
         return available_time
@@ -987,30 +1119,26 @@ class GoalScheduler(BasePlugin):
         self,
         required_resources: Dict[str, Any],
         start_time: datetime,
-        timeline: List[Dict[str, Any]]
+        timeline: List[Dict[str, Any]],
+        resource_index: Optional[ResourceTimeline] = None
     ) -> datetime:
         """Find the next time when all required resources are available.
         
+        Jumps between usage breakpoints of the resource index rather than
+        stepping through fixed intervals.
+        
         Args:
             required_resources: Dictionary of required resources
             start_time: Time to start looking from
             timeline: Current timeline of tasks
+            resource_index: Resource index of the timeline, built if not given
             
         Returns:
             datetime: Next available time slot
         """
-        current_time = start_time
-        while True:
-            # Check if resources are available at current time
-            if self._check_resource_availability_at_time(
-                required_resources,
-                current_time,
-                timeline
-            ):
-                return current_time
-                
-            # Move to next time slot (15-minute intervals)
-            current_time += timedelta(minutes=15)
+        if resource_index is None:
+            resource_index = self._build_resource_index(timeline)
+        return resource_index.next_available(required_resources, start_time)
             
     def _check_resource_availability_at_time(
         self,
@@ -1251,7 +1379,16 @@ class GoalScheduler(BasePlugin):
     async def update_schedule(self,
                             goal_id: str,
                             updates: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a goal schedule."""
+        """Update a goal schedule.
+        
+        Args:
+            goal_id: ID of the scheduled goal
+            updates: Schedule fields to update. A ``task_updates`` mapping of
+                subtask ID to changed fields re-plans only the affected subtasks.
+                
+        Returns:
+            Dict[str, Any]: Updated schedule
+        """
         try:
             reflection_system.log_thought(
                 "goal_scheduler",
@@ -1266,6 +1403,14 @@ class GoalScheduler(BasePlugin):
                 raise ValueError(f"Schedule for goal {goal_id} not found")
 
             schedule = self._schedules[goal_id]
+            updates = dict(updates)
+            task_updates = updates.pop('task_updates', None)
+
+            # Re-plan only the changed subtasks and their dependents; a rejected
+            # update leaves the schedule untouched
+            if task_updates:
+                schedule['replanned_tasks'] = self._replan_tasks(goal_id, task_updates)
+
             schedule.update(updates)
             schedule['updated_at'] = datetime.now().isoformat()
 
@@ -3,15 +3,25 @@ Learning System
 Handles pattern recognition, learning, and optimization.
 """
 
+import atexit
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import time
+import weakref
+from array import array
+from typing import Dict, Any, Hashable, List, Optional
 from datetime import datetime
 from pathlib import Path
 import json
 from dataclasses import dataclass, field
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Candidate lists at most this long are scored directly instead of with bincount
+_DIRECT_SCORING_LIMIT = 64
+
 @dataclass
 class Pattern:
     """A learned pattern."""
@@ -21,16 +31,123 @@ class Pattern:
     last_updated: datetime
     usage_count: int = 0
 
-@dataclass
+def _feature_key(key: str, value: Any) -> Hashable:
+    """Hashable posting key for a feature; equal values give equal keys."""
+    try:
+        hash(value)
+        return (key, value)
+    except TypeError:
+        # Unhashable values (lists, dicts) are keyed by their canonical JSON
+        return (key, "json", json.dumps(value, sort_keys=True, default=str))
+
+class FeatureIndex:
+    """Posting lists from features to the patterns of one type.
+
+    Pattern IDs are positions in the type's pattern list, so every posting
+    list is sorted and its first entry is the earliest matching pattern.
+    ``postings`` maps each (key, value) to the patterns having it and
+    ``key_postings`` each key to the patterns having that key at all.
+    """
+
+    def __init__(self):
+        self.postings: Dict[Hashable, array] = {}
+        self.key_postings: Dict[str, array] = {}
+        self.size = 0
+
+    def add(self, features: Dict[str, Any]) -> int:
+        """Index the features of the next pattern.
+
+        Returns:
+            int: The pattern's ID
+        """
+        pattern_id = self.size
+        self.size += 1
+        for key, value in (features or {}).items():
+            self.postings.setdefault(_feature_key(key, value), array('q')).append(pattern_id)
+            self.key_postings.setdefault(key, array('q')).append(pattern_id)
+        return pattern_id
+
+    def first_match(self, features: Dict[str, Any]) -> Optional[int]:
+        """ID of the earliest pattern sharing at least one feature value."""
+        firsts = [
+            postings[0]
+            for postings in (self.postings.get(_feature_key(key, value)) for key, value in features.items())
+            if postings
+        ]
+        return min(firsts) if firsts else None
+
+    def best_match(self, features: Dict[str, Any], patterns: List[Pattern]) -> Optional[int]:
+        """ID of the pattern with the highest feature agreement, earliest on ties.
+
+        A pattern's score is the fraction of the keys it shares with
+        ``features`` whose values are equal; patterns scoring 0 never match.
+        """
+        matched = [postings for postings in (self.postings.get(_feature_key(key, value))
+                                             for key, value in features.items()) if postings]
+        if not matched:
+            return None
+
+        if sum(len(postings) for postings in matched) <= _DIRECT_SCORING_LIMIT:
+            best_id, best_score = None, 0.0
+            for pattern_id in sorted(set().union(*matched)):
+                score = LearningSystem._compare_features(patterns[pattern_id].features, features)
+                if score > best_score:
+                    best_id, best_score = pattern_id, score
+            return best_id
+
+        ids = np.concatenate([np.frombuffer(postings, dtype=np.int64) for postings in matched])
+        matches = np.bincount(ids, minlength=self.size)
+        totals = np.zeros(self.size, dtype=np.int64)
+        for key in features:
+            key_postings = self.key_postings.get(key)
+            if key_postings:
+                totals += np.bincount(np.frombuffer(key_postings, dtype=np.int64), minlength=self.size)
+        scores = np.divide(matches, totals, out=np.zeros(self.size), where=totals > 0)
+        best_id = int(np.argmax(scores))
+        return best_id if scores[best_id] > 0 else None
+
+# Systems with patterns possibly unsaved; weak so that one atexit hook
+# serves all of them without keeping any alive
+_open_systems: "weakref.WeakSet[LearningSystem]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_open_systems() -> None:
+    for system in list(_open_systems):
+        system.flush()
+
+@dataclass(eq=False)  # Hashed by identity so instances can be tracked weakly
 class LearningSystem:
-    """Learning system for pattern recognition and optimization."""
+    """Learning system for pattern recognition and optimization.
+
+    Patterns of each type are indexed by feature so matching counts over
+    posting lists instead of comparing against every pattern. Learned
+    patterns are written to ``data_file`` at most once per
+    ``save_interval`` seconds and at exit, not on every call.
+    """
     patterns: Dict[str, List[Pattern]] = field(default_factory=dict)
     data_file: Path = Path("data/learning_data.json")
+    save_interval: float = 30.0
+    _indexes: Dict[str, FeatureIndex] = field(default_factory=dict, init=False, repr=False)
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _last_save: float = field(default=0.0, init=False, repr=False)
     
     def __post_init__(self):
         """Initialize learning system."""
         self.data_file.parent.mkdir(exist_ok=True)
+        self._last_save = time.monotonic()
         self._load_patterns()
+        _open_systems.add(self)
+    
+    def _index_for(self, pattern_type: str) -> FeatureIndex:
+        """Get the feature index of a pattern type, rebuilding it if the list changed outside it."""
+        patterns = self.patterns.get(pattern_type, [])
+        index = self._indexes.get(pattern_type)
+        if index is None or index.size != len(patterns):
+            index = FeatureIndex()
+            for pattern in patterns:
+                index.add(pattern.features)
+            self._indexes[pattern_type] = index
+        return index
     
     def _load_patterns(self) -> None:
         """Load patterns from file."""
@@ -53,8 +170,11 @@ class LearningSystem:
     
     def _save_patterns(self) -> None:
         """Save patterns to file."""
+        self._dirty = False
+        self._last_save = time.monotonic()
         try:
-            with open(self.data_file, "w") as f:
+            temp_file = self.data_file.with_name(self.data_file.name + ".tmp")
+            with open(temp_file, "w") as f:
                 json.dump(
                     {
                         pattern_type: [
@@ -66,12 +186,17 @@ class LearningSystem:
                         ]
                         for pattern_type, patterns in self.patterns.items()
                     },
-                    f,
-                    indent=2
+                    f
                 )
+            os.replace(temp_file, self.data_file)
         except Exception as e:
             logger.error(f"Error saving patterns: {e}")
     
+    def flush(self) -> None:
+        """Write pending pattern changes to file."""
+        if self._dirty:
+            self._save_patterns()
+    
     def learn_pattern(
         self,
         pattern_type: str,
@@ -87,13 +212,14 @@ class LearningSystem:
         """
         if pattern_type not in self.patterns:
             self.patterns[pattern_type] = []
+        index = self._index_for(pattern_type)
         
-        # Find similar pattern
+        # Find similar pattern: the earliest one sharing any feature value
         similar_pattern = None
-        for pattern in self.patterns[pattern_type]:
-            if self._compare_features(pattern.features, features):
-                similar_pattern = pattern
-                break
+        if features:
+            pattern_id = index.first_match(features)
+            if pattern_id is not None:
+                similar_pattern = self.patterns[pattern_type][pattern_id]
         
         if similar_pattern:
             # Update existing pattern
@@ -113,8 +239,11 @@ class LearningSystem:
                 usage_count=1
             )
             self.patterns[pattern_type].append(pattern)
+            index.add(features)
         
-        self._save_patterns()
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self._save_patterns()
     
     def get_best_pattern(
         self,
@@ -130,22 +259,14 @@ class LearningSystem:
         Returns:
             Optional[Pattern]: Best matching pattern if found
         """
-        if pattern_type not in self.patterns:
+        if pattern_type not in self.patterns or not features:
             return None
         
-        best_pattern = None
-        best_score = 0.0
-        
-        for pattern in self.patterns[pattern_type]:
-            score = self._compare_features(pattern.features, features)
-            if score > best_score:
-                best_score = score
-                best_pattern = pattern
-        
-        return best_pattern
+        pattern_id = self._index_for(pattern_type).best_match(features, self.patterns[pattern_type])
+        return None if pattern_id is None else self.patterns[pattern_type][pattern_id]
     
+    @staticmethod
     def _compare_features(
-        self,
         pattern_features: Dict[str, Any],
         input_features: Dict[str, Any]
     ) -> float:
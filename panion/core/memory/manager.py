@@ -9,53 +9,151 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import json
 import asyncio
+import atexit
+import bisect
+import heapq
+import weakref
 
 from .scoring import memory_scoring_system, MemoryScore
+from .storage import MemoryStorage, JsonFileStorage, SegmentLogStorage
+from .text_index import InvertedIndex
+from core.utils.ids import id_allocator, IdAllocator
+from core.events import event_bus, Event, EventType
 
 logger = logging.getLogger(__name__)
 
+# Managers not yet closed; weak so that one atexit hook serves all of them
+# without keeping any alive
+_open_managers: "weakref.WeakSet[MemoryManager]" = weakref.WeakSet()
+
+@atexit.register
+def _close_open_managers() -> None:
+    for manager in list(_open_managers):
+        manager.close()
+
 class MemoryManager:
     """Manages system memory with scoring and forgetting."""
     
-    def __init__(self, data_dir: str = "data/memories"):
+    def __init__(self,
+                 data_dir: str = "data/memories",
+                 text_weight: float = 0.5,
+                 storage: Optional[MemoryStorage] = None,
+                 flush_interval: float = 5.0):
         self.logger = logging.getLogger(__name__)
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Persistence backend; defaults to an append-only segment log
+        self.flush_interval = flush_interval
+        self.storage = storage or SegmentLogStorage(
+            self.data_dir / "log", flush_interval=flush_interval
+        )
+        _open_managers.add(self)
+        
         # Initialize memory storage
         self.memories: Dict[str, Dict[str, Any]] = {}
         self.memory_index: Dict[str, Set[str]] = {}  # tag -> memory_ids
+        self.memory_ids: List[str] = []  # sorted by ID, i.e. by creation time
+        self.text_index = InvertedIndex()  # token -> memory_ids
+        self.text_weight = text_weight  # Share of BM25 relevance in search ranking
+        
+        # Keep indexes in step with forgetting
+        memory_scoring_system.add_forget_listener(self._unindex_memory)
         
         # Load existing memories
         self._load_memories()
         
-        # Start decay task
+        # Start background tasks
         self._start_decay_task()
+        self._start_flush_task()
     
     def _load_memories(self) -> None:
-        """Load existing memories from disk."""
+        """Load existing memories from storage."""
         try:
-            for memory_file in self.data_dir.glob("*.json"):
-                with open(memory_file, 'r') as f:
-                    memory = json.load(f)
-                    memory_id = memory_file.stem
-                    self.memories[memory_id] = memory
-                    
-                    # Update index
-                    for tag in memory.get("tags", []):
-                        if tag not in self.memory_index:
-                            self.memory_index[tag] = set()
-                        self.memory_index[tag].add(memory_id)
-                    
-                    # Initialize score if not exists
-                    if memory_id not in memory_scoring_system.scores:
-                        memory_scoring_system.update_score(memory_id, memory)
+            memories = self.storage.load_all()
+            if not memories and not isinstance(self.storage, JsonFileStorage):
+                memories = self._migrate_json_files()
+            
+            for memory_id, memory in memories.items():
+                self.memories[memory_id] = memory
+                
+                # Update index
+                self._index_memory(memory_id, memory)
+                
+                # Initialize score if not exists
+                if memory_id not in memory_scoring_system.scores:
+                    memory_scoring_system.update_score(memory_id, memory)
             
+            self.memory_ids = sorted(self.memories)
             self.logger.info(f"Loaded {len(self.memories)} memories")
             
         except Exception as e:
             self.logger.error(f"Error loading memories: {e}")
     
+    def _migrate_json_files(self) -> Dict[str, Dict[str, Any]]:
+        """Import memories stored as one JSON file each into the storage backend."""
+        memories = JsonFileStorage(self.data_dir).load_all()
+        if memories:
+            for memory_id, memory in memories.items():
+                self.storage.put(memory_id, memory)
+            self.storage.flush()
+            self.logger.info(f"Migrated {len(memories)} memory files to {type(self.storage).__name__}")
+        return memories
+    
+    def _index_memory(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        """Add a memory to the tag and text indexes.
+        
+        Args:
+            memory_id: ID of the memory
+            memory: Memory data
+        """
+        for tag in memory.get("tags", []):
+            if tag not in self.memory_index:
+                self.memory_index[tag] = set()
+            self.memory_index[tag].add(memory_id)
+        
+        self.text_index.add(memory_id, self._memory_text(memory))
+    
+    def _unindex_memory(self, memory_id: str) -> None:
+        """Remove a memory from the tag and text indexes.
+        
+        Args:
+            memory_id: ID of the memory
+        """
+        memory = self.memories.get(memory_id, {})
+        for tag in memory.get("tags", []):
+            memory_ids = self.memory_index.get(tag)
+            if memory_ids is not None:
+                memory_ids.discard(memory_id)
+                if not memory_ids:
+                    del self.memory_index[tag]
+        
+        self.text_index.remove(memory_id)
+        if memory:
+            self._goal_context_updated(memory)
+    
+    def _goal_context_updated(self, memory: Dict[str, Any]) -> None:
+        """Tell context consumers that a goal-tagged memory changed."""
+        content = memory.get("content")
+        goal_id = content.get("goal_id") if isinstance(content, dict) else None
+        if goal_id:
+            event_bus.publish(Event(
+                type=EventType.GOAL_CONTEXT_UPDATED,
+                data={"goal_id": goal_id},
+                source="MemoryManager"
+            ))
+    
+    def _memory_text(self, memory: Dict[str, Any]) -> List[str]:
+        """Get the searchable text fields of a memory."""
+        texts = []
+        content = memory.get("content", {})
+        if isinstance(content, dict):
+            texts.extend(value for value in content.values() if isinstance(value, str))
+        elif isinstance(content, str):
+            texts.append(content)
+        texts.extend(tag for tag in memory.get("tags", []) if isinstance(tag, str))
+        return texts
+    
     def _start_decay_task(self) -> None:
         """Start background task for memory decay."""
         async def decay_task():
@@ -71,8 +169,48 @@ class MemoryManager:
                     self.logger.error(f"Error in decay task: {e}")
                     await asyncio.sleep(60)  # Wait before retry
         
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop yet (e.g. created at import time); skip scheduling decay
+            self.logger.debug("No running event loop; memory decay task not started")
+            return
+        
         asyncio.create_task(decay_task())
     
+    def _start_flush_task(self) -> None:
+        """Start background task that flushes buffered storage writes."""
+        async def flush_task():
+            while True:
+                try:
+                    await asyncio.sleep(self.flush_interval)
+                    self.storage.maybe_flush()
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in flush task: {e}")
+                    await asyncio.sleep(60)  # Wait before retry
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Buffered writes still flush on batch size, access and close()
+            return
+        
+        asyncio.create_task(flush_task())
+    
+    def flush(self) -> None:
+        """Persist buffered memory writes."""
+        self.storage.flush()
+    
+    def close(self) -> None:
+        """Flush buffered writes and release storage."""
+        _open_managers.discard(self)
+        memory_scoring_system.remove_forget_listener(self._unindex_memory)
+        try:
+            self.storage.close()
+        except Exception as e:
+            self.logger.error(f"Error closing memory storage: {e}")
+    
     def add_memory(self, content: Dict[str, Any], tags: Optional[List[str]] = None) -> str:
         """Add a new memory.
         
@@ -85,7 +223,7 @@ class MemoryManager:
         """
         try:
             # Generate memory ID
-            memory_id = f"mem_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            memory_id = id_allocator.new_id("mem")
             
             # Create memory entry
             memory = {
@@ -103,21 +241,21 @@ class MemoryManager:
             
             # Store memory
             self.memories[memory_id] = memory
+            if self.memory_ids and memory_id < self.memory_ids[-1]:
+                bisect.insort(self.memory_ids, memory_id)
+            else:
+                self.memory_ids.append(memory_id)
             
             # Update index
-            for tag in memory["tags"]:
-                if tag not in self.memory_index:
-                    self.memory_index[tag] = set()
-                self.memory_index[tag].add(memory_id)
+            self._index_memory(memory_id, memory)
             
-            # Save to disk
-            memory_file = self.data_dir / f"{memory_id}.json"
-            with open(memory_file, 'w') as f:
-                json.dump(memory, f, indent=2)
+            # Persist (buffered by the storage backend)
+            self.storage.put(memory_id, memory)
             
             # Update score
             memory_scoring_system.update_score(memory_id, memory)
             
+            self._goal_context_updated(memory)
             self.logger.info(f"Added memory {memory_id}")
             
             return memory_id
@@ -144,16 +282,20 @@ class MemoryManager:
             # Update score
             memory_scoring_system.update_score(memory_id, memory)
             
-            # Save changes
-            memory_file = self.data_dir / f"{memory_id}.json"
-            with open(memory_file, 'w') as f:
-                json.dump(memory, f, indent=2)
+            # Buffer the access update instead of rewriting the memory
+            self.storage.touch(memory_id, {
+                "access_count": memory["access_count"],
+                "last_accessed": memory["last_accessed"]
+            })
         
         return memory
     
     def search_memories(self, query: str, tags: Optional[List[str]] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Search memories by query and tags.
         
+        Memories must contain every query token. Results are ranked by a blend
+        of BM25 text relevance and the memory's importance score.
+        
         Args:
             query: Search query
             tags: Optional list of tags to filter by
@@ -163,64 +305,57 @@ class MemoryManager:
             List of matching memories
         """
         # Get candidate memory IDs
-        candidate_ids = set()
-        
+        candidate_ids: Optional[Set[str]] = None
         if tags:
-            # Filter by tags
+            candidate_ids = set()
             for tag in tags:
                 if tag in self.memory_index:
                     candidate_ids.update(self.memory_index[tag])
+        
+        # Match query terms through the inverted index
+        if query.strip():
+            text_scores = self.text_index.search(query, candidates=candidate_ids)
         else:
-            # Use all memories
-            candidate_ids = set(self.memories.keys())
+            ids = candidate_ids if candidate_ids is not None else self.memories.keys()
+            text_scores = {memory_id: 0.0 for memory_id in ids}
         
-        # Search memories
-        results = []
-        for memory_id in candidate_ids:
-            memory = self.memories[memory_id]
-            
-            # Check if memory matches query
-            if self._matches_query(memory, query):
-                # Get score
-                score = memory_scoring_system.scores.get(memory_id)
-                if score:
-                    results.append({
-                        "memory": memory,
-                        "score": score.current_score
-                    })
+        max_text_score = max(text_scores.values(), default=0.0) or 1.0
+        
+        importance = memory_scoring_system.get_scores(text_scores)
+        
+        def ranked():
+            for memory_id, score in importance.items():
+                if memory_id in self.memories:
+                    combined = (
+                        self.text_weight * text_scores[memory_id] / max_text_score +
+                        (1 - self.text_weight) * score
+                    )
+                    yield combined, memory_id
         
-        # Sort by score and limit results
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return [r["memory"] for r in results[:limit]]
+        # Select top results without sorting every match
+        top = heapq.nlargest(limit, ranked())
+        return [self.memories[memory_id] for _, memory_id in top]
     
-    def _matches_query(self, memory: Dict[str, Any], query: str) -> bool:
-        """Check if memory matches search query.
+    def get_memories_in_range(self, start: datetime, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get memories created in ``[start, end)``, oldest first.
+        
+        Uses the time-sortable memory IDs instead of parsing ``created_at``.
         
         Args:
-            memory: Memory to check
-            query: Search query
+            start: Inclusive start time
+            end: Exclusive end time (default now)
             
         Returns:
-            bool: Whether memory matches query
+            List of memories in creation order
         """
-        # Convert query to lowercase
-        query = query.lower()
-        
-        # Check content
-        content = memory.get("content", {})
-        if isinstance(content, dict):
-            for value in content.values():
-                if isinstance(value, str) and query in value.lower():
-                    return True
-        elif isinstance(content, str) and query in content.lower():
-            return True
-        
-        # Check tags
-        for tag in memory.get("tags", []):
-            if query in tag.lower():
-                return True
-        
-        return False
+        lower, upper = IdAllocator.id_bounds("mem", start, end or datetime.now())
+        lo = bisect.bisect_left(self.memory_ids, lower)
+        hi = bisect.bisect_left(self.memory_ids, upper)
+        return [
+            self.memories[memory_id]
+            for memory_id in self.memory_ids[lo:hi]
+            if memory_id in self.memories
+        ]
     
     def get_important_memories(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most important memories.
@@ -258,7 +393,8 @@ class MemoryManager:
                 tag: len(memory_ids)
                 for tag, memory_ids in self.memory_index.items()
             },
-            "scoring_stats": scoring_stats
+            "scoring_stats": scoring_stats,
+            "storage_stats": self.storage.stats()
         }
         
         return stats
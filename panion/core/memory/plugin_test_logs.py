@@ -0,0 +1,134 @@
+"""
+Plugin Test Log Cache
+Parsed, mtime-aware view of the JSON plugin test logs with a goal index.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ParsedLogFile:
+    """One test log file as parsed at a given modification time."""
+    mtime_ns: int
+    size: int
+    logs: List[Dict[str, Any]]
+    timestamps: List[Optional[datetime]]
+    by_test_id: Dict[str, List[int]]
+    by_goal: Dict[str, List[int]] = field(default_factory=dict)
+
+    def positions_for_goal(self, goal_id: str) -> List[int]:
+        """Positions of the logs whose test ID mentions the goal, in file order."""
+        positions = self.by_goal.get(goal_id)
+        if positions is None:
+            positions = sorted(
+                position
+                for test_id, test_positions in self.by_test_id.items()
+                if goal_id in test_id
+                for position in test_positions
+            )
+            self.by_goal[goal_id] = positions
+        return positions
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    # Compare everything as naive local time
+    return timestamp.astimezone().replace(tzinfo=None) if timestamp.tzinfo else timestamp
+
+class PluginTestLogCache:
+    """Keeps test log files parsed between lookups.
+
+    A file is re-read only when its modification time or size changes, and
+    deleted files are dropped. Logs are indexed by test ID; the logs of a
+    goal (test IDs containing the goal ID) are resolved once per file
+    version and then served from the goal index.
+    """
+
+    def __init__(self, directory: Path, pattern: str = "*.json"):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the JSON test logs
+            pattern: Glob pattern of log files
+        """
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self._files: Dict[Path, ParsedLogFile] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def _parse(self, path: Path, stat: os.stat_result) -> ParsedLogFile:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.parses += 1
+
+        # Only files holding a list of log entries contribute logs
+        logs = [log for log in data if isinstance(log, dict)] if isinstance(data, list) else []
+        by_test_id: Dict[str, List[int]] = {}
+        for position, log in enumerate(logs):
+            by_test_id.setdefault(str(log.get("test_id", "")), []).append(position)
+        return ParsedLogFile(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            logs=logs,
+            timestamps=[_parse_timestamp(log.get("timestamp", "")) for log in logs],
+            by_test_id=by_test_id
+        )
+
+    def refresh(self) -> List[Tuple[Path, ParsedLogFile]]:
+        """Re-read changed files and forget deleted ones.
+
+        Returns:
+            List[Tuple[Path, ParsedLogFile]]: Current files in name order
+        """
+        with self._lock:
+            paths = sorted(self.directory.glob(self.pattern)) if self.directory.is_dir() else []
+            current: Dict[Path, ParsedLogFile] = {}
+            for path in paths:
+                cached = self._files.get(path)
+                try:
+                    stat = path.stat()
+                    if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                        current[path] = cached
+                        continue
+                    current[path] = self._parse(path, stat)
+                except Exception as e:
+                    logger.warning(f"Error reading test log file {path}: {e}")
+            self._files = current
+            return list(current.items())
+
+    def logs_for_goal(self, goal_id: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get the logs of a goal, optionally only those at or after ``since``.
+
+        Args:
+            goal_id: Goal whose logs to return
+            since: Earliest log timestamp; logs without a valid timestamp are skipped
+
+        Returns:
+            List[Dict[str, Any]]: Matching logs, by file name then file order
+        """
+        matches = []
+        for _, parsed in self.refresh():
+            with self._lock:
+                positions = parsed.positions_for_goal(goal_id)
+            for position in positions:
+                timestamp = parsed.timestamps[position]
+                if timestamp is None or (since is not None and timestamp < since):
+                    continue
+                matches.append(parsed.logs[position])
+        return matches
+
+    def clear(self) -> None:
+        """Drop every parsed file."""
+        with self._lock:
+            self._files.clear()
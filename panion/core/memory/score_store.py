@@ -0,0 +1,127 @@
+"""
+Memory Score Store
+Columnar storage of memory scoring features for batch operations.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Set, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ScoreStore:
+    """Dense NumPy columns holding one row per scored memory.
+
+    Rows are kept contiguous: removing a memory moves the last row into its
+    slot, so every batch operation runs over ``[:size]`` without masks.
+    """
+
+    # Float columns: scoring features of the memory and score state
+    FLOAT_COLUMNS = (
+        "memory_accessed",    # memory's last_accessed/created_at (drives recency)
+        "access_count",       # memory's access_count (drives frequency)
+        "tag_score",          # share of important tags
+        "relevance",          # metadata relevance
+        "importance",         # metadata importance
+        "connected_goals",    # number of connected goals
+        "base_score",
+        "current_score",
+        "score_accessed",     # when the score was last updated by an access
+        "score_access_count",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.capacity = capacity
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=np.float64) for name in self.FLOAT_COLUMNS
+        }
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.tags: List[Set[str]] = []
+        self.metadata: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a writable view of the used part of a column."""
+        return self.columns[name][:self.size]
+
+    def _grow(self, minimum: int) -> None:
+        capacity = max(self.capacity * 2, minimum)
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def add(self, memory_id: str, values: Dict[str, float],
+            tags: Iterable[str] = (), metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Add a row and return its index."""
+        if self.size >= self.capacity:
+            self._grow(self.size + 1)
+        row = self.size
+        for name, column in self.columns.items():
+            column[row] = values.get(name, 0.0)
+        self.ids.append(memory_id)
+        self.tags.append(set(tags))
+        self.metadata.append(metadata or {})
+        self.rows[memory_id] = row
+        self.size += 1
+        return row
+
+    def add_many(self, memory_ids: List[str], values: Dict[str, np.ndarray]) -> None:
+        """Append many rows at once from column arrays."""
+        count = len(memory_ids)
+        if self.size + count > self.capacity:
+            self._grow(self.size + count)
+        start = self.size
+        for name, column in self.columns.items():
+            if name in values:
+                column[start:start + count] = values[name]
+            else:
+                column[start:start + count] = 0.0
+        for offset, memory_id in enumerate(memory_ids):
+            self.rows[memory_id] = start + offset
+        self.ids.extend(memory_ids)
+        self.tags.extend(set() for _ in range(count))
+        self.metadata.extend({} for _ in range(count))
+        self.size += count
+
+    def remove(self, memory_id: str) -> None:
+        """Remove a row by moving the last row into its slot."""
+        row = self.rows.pop(memory_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved_id = self.ids[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.ids[row] = moved_id
+            self.tags[row] = self.tags[last]
+            self.metadata[row] = self.metadata[last]
+            self.rows[moved_id] = row
+        self.ids.pop()
+        self.tags.pop()
+        self.metadata.pop()
+        self.size -= 1
+
+    def row(self, memory_id: str) -> Optional[int]:
+        """Get the row index of a memory."""
+        return self.rows.get(memory_id)
+
+    def rows_for(self, memory_ids: Iterable[str]) -> np.ndarray:
+        """Get row indexes for the given IDs, skipping unknown ones."""
+        rows = self.rows
+        return np.fromiter(
+            (rows[memory_id] for memory_id in memory_ids if memory_id in rows),
+            dtype=np.int64
+        )
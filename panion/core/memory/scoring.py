@@ -4,13 +4,17 @@ Manages memory importance scoring, decay, and forgetting mechanisms.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Callable, Iterable, Iterator
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-import math
 import json
 from pathlib import Path
 
+import numpy as np
+
+from .score_store import ScoreStore
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -26,12 +30,51 @@ class MemoryScore:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
 
+class ScoreView(Mapping):
+    """Read-only mapping of memory ID to a ``MemoryScore`` snapshot."""
+    
+    def __init__(self, store: ScoreStore):
+        self._store = store
+    
+    def __getitem__(self, memory_id: str) -> MemoryScore:
+        row = self._store.row(memory_id)
+        if row is None:
+            raise KeyError(memory_id)
+        columns = self._store.columns
+        return MemoryScore(
+            memory_id=memory_id,
+            base_score=float(columns["base_score"][row]),
+            current_score=float(columns["current_score"][row]),
+            last_accessed=datetime.fromtimestamp(columns["score_accessed"][row]),
+            access_count=int(columns["score_access_count"][row]),
+            tags=set(self._store.tags[row]),
+            metadata=self._store.metadata[row],
+            created_at=datetime.fromtimestamp(columns["created_at"][row]),
+            updated_at=datetime.fromtimestamp(columns["updated_at"][row])
+        )
+    
+    def __contains__(self, memory_id: object) -> bool:
+        return memory_id in self._store
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._store.ids))
+    
+    def __len__(self) -> int:
+        return len(self._store)
+
 class MemoryScoringSystem:
-    """Manages memory importance scoring and forgetting."""
+    """Manages memory importance scoring and forgetting.
+    
+    Scores live in a columnar ``ScoreStore`` so decay, re-scoring, forgetting
+    selection and top-k queries run as NumPy batch operations.
+    """
+    
+    IMPORTANT_TAGS = {"critical", "important", "key", "core"}
     
     def __init__(self, config_path: str = "config/episodic_memory_config.yaml"):
         self.logger = logging.getLogger(__name__)
-        self.scores: Dict[str, MemoryScore] = {}
+        self.store = ScoreStore()
+        self._forget_listeners: List[Callable[[str], None]] = []
         self.archive_dir = Path("data/memory_archives")
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         
@@ -51,6 +94,11 @@ class MemoryScoringSystem:
         self.min_score = 0.1   # Minimum score before forgetting
         self.max_age_days = self.config.get("memory_retention_days", 30)
     
+    @property
+    def scores(self) -> ScoreView:
+        """Mapping of memory ID to score snapshot."""
+        return ScoreView(self.store)
+    
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load scoring configuration."""
         try:
@@ -60,79 +108,89 @@ class MemoryScoringSystem:
             self.logger.error(f"Error loading config: {e}")
             return {}
     
-    def calculate_score(self, memory: Dict[str, Any]) -> float:
-        """Calculate importance score for a memory.
-        
-        Args:
-            memory: Memory data to score
-            
-        Returns:
-            float: Calculated importance score
-        """
-        # Get base components
-        recency = self._calculate_recency_score(memory)
-        frequency = self._calculate_frequency_score(memory)
-        relevance = self._calculate_relevance_score(memory)
-        impact = self._calculate_impact_score(memory)
-        
-        # Calculate weighted score
-        score = (
-            self.weights["recency"] * recency +
-            self.weights["frequency"] * frequency +
-            self.weights["relevance"] * relevance +
-            self.weights["impact"] * impact
-        )
-        
-        return min(max(score, 0.0), 1.0)
-    
-    def _calculate_recency_score(self, memory: Dict[str, Any]) -> float:
-        """Calculate recency component of score."""
+    def _features(self, memory: Dict[str, Any]) -> Dict[str, float]:
+        """Extract the scoring features of a memory."""
         last_accessed = memory.get("last_accessed", memory.get("created_at"))
         if isinstance(last_accessed, str):
             last_accessed = datetime.fromisoformat(last_accessed)
+        if last_accessed is None:
+            last_accessed = datetime.now()
         
-        age_days = (datetime.now() - last_accessed).days
-        return math.exp(-self.decay_rate * age_days)
-    
-    def _calculate_frequency_score(self, memory: Dict[str, Any]) -> float:
-        """Calculate frequency component of score."""
-        access_count = memory.get("access_count", 0)
-        return min(access_count / 10.0, 1.0)  # Cap at 10 accesses
-    
-    def _calculate_relevance_score(self, memory: Dict[str, Any]) -> float:
-        """Calculate relevance component of score."""
-        tags = memory.get("tags", [])
         metadata = memory.get("metadata", {})
-        
-        # Check for important tags
-        important_tags = {"critical", "important", "key", "core"}
-        tag_score = len(set(tags) & important_tags) / len(important_tags)
-        
-        # Check metadata relevance
-        relevance_score = metadata.get("relevance", 0.5)
-        
-        return (tag_score + relevance_score) / 2
+        tags = set(memory.get("tags", []))
+        return {
+            "memory_accessed": last_accessed.timestamp(),
+            "access_count": memory.get("access_count", 0),
+            "tag_score": len(tags & self.IMPORTANT_TAGS) / len(self.IMPORTANT_TAGS),
+            "relevance": metadata.get("relevance", 0.5),
+            "importance": metadata.get("importance", 0.5),
+            "connected_goals": len(metadata.get("connected_goals", []))
+        }
     
-    def _calculate_impact_score(self, memory: Dict[str, Any]) -> float:
-        """Calculate impact component of score."""
-        metadata = memory.get("metadata", {})
+    def _score_features(self,
+                        memory_accessed: Any,
+                        access_count: Any,
+                        tag_score: Any,
+                        relevance: Any,
+                        importance: Any,
+                        connected_goals: Any,
+                        now: float) -> Any:
+        """Compute importance scores from feature scalars or arrays."""
+        # Whole days since last access, as timedelta.days would give
+        age_days = np.floor((now - memory_accessed) / 86400.0)
+        recency = np.exp(-self.decay_rate * age_days)
+        frequency = np.minimum(access_count / 10.0, 1.0)  # Cap at 10 accesses
+        relevance_score = (tag_score + relevance) / 2
         
-        # Get impact factors
-        connected_goals = len(metadata.get("connected_goals", []))
-        memory_importance = metadata.get("importance", 0.5)
-        time_recency = self._calculate_recency_score(memory)
-        
-        # Calculate weighted impact
         impact_weights = self.config.get("impact_score_weights", {
             "connected_goals": 0.4,
             "memory_importance": 0.3,
             "time_recency": 0.3
         })
+        impact = (
+            impact_weights["connected_goals"] * np.minimum(connected_goals / 5.0, 1.0) +
+            impact_weights["memory_importance"] * importance +
+            impact_weights["time_recency"] * recency
+        )
         
-        return (
-            impact_weights["connected_goals"] * min(connected_goals / 5.0, 1.0) +
-            impact_weights["memory_importance"] * memory_importance +
-            impact_weights["time_recency"] * time_recency
+        score = (
+            self.weights["recency"] * recency +
+            self.weights["frequency"] * frequency +
+            self.weights["relevance"] * relevance_score +
+            self.weights["impact"] * impact
+        )
+        return np.clip(score, 0.0, 1.0)
+    
+    def calculate_score(self, memory: Dict[str, Any]) -> float:
+        """Calculate importance score for a memory.
+        
+        Args:
+            memory: Memory data to score
+            
+        Returns:
+            float: Calculated importance score
+        """
+        return float(self._score_features(now=datetime.now().timestamp(), **self._features(memory)))
+    
+    def calculate_scores(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate importance scores for stored memories in one batch.
+        
+        Args:
+            rows: Row indexes to score (default all)
+            
+        Returns:
+            np.ndarray: Scores aligned with ``rows``
+        """
+        store = self.store
+        select = slice(None) if rows is None else rows
+        return self._score_features(
+            store.column("memory_accessed")[select],
+            store.column("access_count")[select],
+            store.column("tag_score")[select],
+            store.column("relevance")[select],
+            store.column("importance")[select],
+            store.column("connected_goals")[select],
+            now=datetime.now().timestamp()
         )
     
     def update_score(self, memory_id: str, memory: Dict[str, Any]) -> None:
@@ -142,43 +200,107 @@ class MemoryScoringSystem:
             memory_id: ID of the memory
             memory: Memory data
         """
-        # Calculate new score
-        new_score = self.calculate_score(memory)
+        features = self._features(memory)
+        now = datetime.now().timestamp()
+        new_score = float(self._score_features(now=now, **features))
         
-        # Update or create score entry
-        if memory_id in self.scores:
-            self.scores[memory_id].current_score = new_score
-            self.scores[memory_id].last_accessed = datetime.now()
-            self.scores[memory_id].access_count += 1
-            self.scores[memory_id].updated_at = datetime.now()
+        row = self.store.row(memory_id)
+        if row is not None:
+            columns = self.store.columns
+            for name, value in features.items():
+                columns[name][row] = value
+            columns["current_score"][row] = new_score
+            columns["score_accessed"][row] = now
+            columns["score_access_count"][row] += 1
+            columns["updated_at"][row] = now
         else:
-            self.scores[memory_id] = MemoryScore(
-                memory_id=memory_id,
-                base_score=new_score,
-                current_score=new_score,
-                last_accessed=datetime.now(),
-                access_count=1,
-                tags=set(memory.get("tags", [])),
+            self.store.add(
+                memory_id,
+                dict(
+                    features,
+                    base_score=new_score,
+                    current_score=new_score,
+                    score_accessed=now,
+                    score_access_count=1,
+                    created_at=now,
+                    updated_at=now
+                ),
+                tags=memory.get("tags", []),
                 metadata=memory.get("metadata", {})
             )
     
+    def rescore_all(self) -> None:
+        """Recompute every current score from the stored features."""
+        if len(self.store):
+            self.store.column("current_score")[:] = self.calculate_scores()
+    
+    def get_scores(self, memory_ids: Iterable[str]) -> Dict[str, float]:
+        """Get current scores for a set of memories in one lookup.
+        
+        Args:
+            memory_ids: IDs to look up; unknown IDs are omitted
+            
+        Returns:
+            Dict[str, float]: Current score per known memory
+        """
+        rows = self.store.rows
+        current = self.store.columns["current_score"]
+        return {
+            memory_id: float(current[rows[memory_id]])
+            for memory_id in memory_ids
+            if memory_id in rows
+        }
+    
     def apply_decay(self) -> None:
         """Apply time-based decay to all memory scores."""
-        now = datetime.now()
+        if not len(self.store):
+            return
         
-        for memory_id, score in self.scores.items():
-            # Calculate days since last update
-            days = (now - score.updated_at).days
+        now = datetime.now().timestamp()
+        updated_at = self.store.column("updated_at")
+        current = self.store.column("current_score")
+        base = self.store.column("base_score")
+        
+        # Whole days since last update
+        days = np.floor((now - updated_at) / 86400.0)
+        decaying = days > 0
+        current[decaying] = base[decaying] * np.exp(-self.decay_rate * days[decaying])
+        updated_at[decaying] = now
+        
+        # Forget memories that fell below the threshold
+        for memory_id in self.get_forgetting_candidates(mask=decaying):
+            self._forget_memory(memory_id)
+    
+    def get_forgetting_candidates(self,
+                                  threshold: Optional[float] = None,
+                                  mask: Optional[np.ndarray] = None) -> List[str]:
+        """Select memories whose current score is below the forgetting threshold.
+        
+        Args:
+            threshold: Score threshold (default ``min_score``)
+            mask: Optional boolean row mask restricting the selection
             
-            if days > 0:
-                # Apply decay
-                decay_factor = math.exp(-self.decay_rate * days)
-                score.current_score = score.base_score * decay_factor
-                score.updated_at = now
-                
-                # Check if memory should be forgotten
-                if score.current_score < self.min_score:
-                    self._forget_memory(memory_id)
+        Returns:
+            List[str]: IDs of memories to forget
+        """
+        below = self.store.column("current_score") < (self.min_score if threshold is None else threshold)
+        if mask is not None:
+            below &= mask
+        ids = self.store.ids
+        return [ids[row] for row in np.flatnonzero(below)]
+    
+    def add_forget_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with the ID of each forgotten memory.
+        
+        Args:
+            callback: Function taking the forgotten memory ID
+        """
+        self._forget_listeners.append(callback)
+    
+    def remove_forget_listener(self, callback: Callable[[str], None]) -> None:
+        """Unregister a callback added with ``add_forget_listener``, if present."""
+        if callback in self._forget_listeners:
+            self._forget_listeners.remove(callback)
     
     def _forget_memory(self, memory_id: str) -> None:
         """Archive a memory that has fallen below importance threshold.
@@ -186,7 +308,7 @@ class MemoryScoringSystem:
         Args:
             memory_id: ID of the memory to forget
         """
-        if memory_id not in self.scores:
+        if memory_id not in self.store:
             return
         
         try:
@@ -211,7 +333,10 @@ class MemoryScoringSystem:
                 json.dump(archive_entry, f, indent=2)
             
             # Remove from active scores
-            del self.scores[memory_id]
+            self.store.remove(memory_id)
+            
+            for callback in self._forget_listeners:
+                callback(memory_id)
             
             self.logger.info(f"Archived memory {memory_id} with final score {score.current_score}")
             
@@ -227,22 +352,28 @@ class MemoryScoringSystem:
         Returns:
             List of important memories with their scores
         """
-        # Sort memories by score
-        sorted_memories = sorted(
-            self.scores.items(),
-            key=lambda x: x[1].current_score,
-            reverse=True
-        )
+        size = len(self.store)
+        if not size or limit <= 0:
+            return []
         
+        # Select the top-k rows without sorting the whole column
+        current = self.store.column("current_score")
+        if limit < size:
+            top = np.argpartition(-current, limit - 1)[:limit]
+        else:
+            top = np.arange(size)
+        top = top[np.argsort(-current[top], kind="stable")]
+        
+        columns = self.store.columns
         return [
             {
-                "memory_id": memory_id,
-                "score": score.current_score,
-                "access_count": score.access_count,
-                "tags": list(score.tags),
-                "last_accessed": score.last_accessed.isoformat()
+                "memory_id": self.store.ids[row],
+                "score": float(columns["current_score"][row]),
+                "access_count": int(columns["score_access_count"][row]),
+                "tags": list(self.store.tags[row]),
+                "last_accessed": datetime.fromtimestamp(columns["score_accessed"][row]).isoformat()
             }
-            for memory_id, score in sorted_memories[:limit]
+            for row in top
         ]
     
     def get_memory_stats(self) -> Dict[str, Any]:
@@ -251,16 +382,17 @@ class MemoryScoringSystem:
         Returns:
             Dictionary containing memory statistics
         """
+        current = self.store.column("current_score")
         return {
-            "total_memories": len(self.scores),
-            "average_score": sum(s.current_score for s in self.scores.values()) / len(self.scores) if self.scores else 0,
+            "total_memories": len(self.store),
+            "average_score": float(current.mean()) if len(current) else 0,
             "score_distribution": {
-                "high": len([s for s in self.scores.values() if s.current_score > 0.7]),
-                "medium": len([s for s in self.scores.values() if 0.3 <= s.current_score <= 0.7]),
-                "low": len([s for s in self.scores.values() if s.current_score < 0.3])
+                "high": int(np.count_nonzero(current > 0.7)),
+                "medium": int(np.count_nonzero((current >= 0.3) & (current <= 0.7))),
+                "low": int(np.count_nonzero(current < 0.3))
             },
             "archived_count": len(list(self.archive_dir.glob("*.json")))
         }
 
 # Create global instance
-memory_scoring_system = MemoryScoringSystem() 
\ No newline at end of file
+memory_scoring_system = MemoryScoringSystem()
@@ -0,0 +1,350 @@
+"""
+Memory Storage
+Pluggable persistence backends for the memory manager.
+"""
+
+import logging
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class MemoryStorage(ABC):
+    """Interface for memory persistence backends."""
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Load every stored memory keyed by ID."""
+
+    @abstractmethod
+    def put(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        """Store a full memory record."""
+
+    @abstractmethod
+    def touch(self, memory_id: str, fields: Dict[str, Any]) -> None:
+        """Record updated access fields (e.g. ``access_count``) for a memory."""
+
+    @abstractmethod
+    def delete(self, memory_id: str) -> None:
+        """Delete a memory."""
+
+    def flush(self) -> None:
+        """Persist any buffered writes."""
+
+    def maybe_flush(self) -> None:
+        """Flush if the backend's batching policy says it is due."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {}
+
+class JsonFileStorage(MemoryStorage):
+    """One pretty-printed JSON file per memory."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._memories: Dict[str, Dict[str, Any]] = {}
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        for memory_file in self.data_dir.glob("*.json"):
+            with open(memory_file, 'r') as f:
+                self._memories[memory_file.stem] = json.load(f)
+        return dict(self._memories)
+
+    def put(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        self._memories[memory_id] = memory
+        with open(self.data_dir / f"{memory_id}.json", 'w') as f:
+            json.dump(memory, f, indent=2)
+
+    def touch(self, memory_id: str, fields: Dict[str, Any]) -> None:
+        memory = self._memories.get(memory_id)
+        if memory is not None:
+            memory.update(fields)
+            self.put(memory_id, memory)
+
+    def delete(self, memory_id: str) -> None:
+        self._memories.pop(memory_id, None)
+        memory_file = self.data_dir / f"{memory_id}.json"
+        if memory_file.exists():
+            memory_file.unlink()
+
+class SegmentLogStorage(MemoryStorage):
+    """Append-only JSON-lines log split into segments.
+
+    Writes are buffered and appended in batches with one fsync per batch.
+    Access-field updates are coalesced per memory until the next flush.
+    An in-memory offset index points at the latest record of each memory,
+    and compaction rewrites only live records once most of the log is
+    superseded.
+    """
+
+    SEGMENT_PATTERN = "segment_*.log"
+
+    def __init__(self,
+                 log_dir: Path,
+                 batch_size: int = 100,
+                 flush_interval: float = 5.0,
+                 segment_size: int = 64 * 1024 * 1024,
+                 compact_ratio: float = 0.5,
+                 min_compact_bytes: int = 1024 * 1024,
+                 fsync: bool = True):
+        """Initialize the log.
+
+        Args:
+            log_dir: Directory holding the segments
+            batch_size: Buffered records that trigger a flush
+            flush_interval: Seconds after which buffered records are flushed
+            segment_size: Bytes after which a new segment is started
+            compact_ratio: Live/total byte ratio below which the log is compacted
+            min_compact_bytes: Log size below which compaction is skipped
+            fsync: Whether to fsync each flushed batch
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_size = segment_size
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._pending_puts: Dict[str, Dict[str, Any]] = {}
+        self._pending_touches: Dict[str, Dict[str, Any]] = {}
+        self._pending_deletes: set = set()
+        self._last_flush = time.monotonic()
+
+        # memory_id -> (segment number, offset, length) of the latest put
+        self._offsets: Dict[str, Tuple[int, int, int]] = {}
+        # Access fields written after the latest put, merged on compaction
+        self._touched: Dict[str, Dict[str, Any]] = {}
+        self._live_bytes = 0
+        self._total_bytes = 0
+        self._active_segment = 0
+
+    def _segment_path(self, number: int) -> Path:
+        return self.log_dir / f"segment_{number:06d}.log"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(p.stem.split("_")[1]) for p in self.log_dir.glob(self.SEGMENT_PATTERN))
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Replay the log and rebuild the offset index."""
+        memories: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            self._offsets.clear()
+            self._touched.clear()
+            self._live_bytes = 0
+            self._total_bytes = 0
+            segments = self._segments()
+            for number in segments:
+                with open(self._segment_path(number), 'rb') as f:
+                    offset = 0
+                    for line in f:
+                        length = len(line)
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Torn write at the tail of a crashed flush
+                            logger.warning(f"Skipping corrupt record in segment {number} at {offset}")
+                            offset += length
+                            self._total_bytes += length
+                            continue
+                        self._apply(memories, record, (number, offset, length))
+                        offset += length
+                        self._total_bytes += length
+            self._active_segment = segments[-1] if segments else 1
+        return memories
+
+    def _apply(self, memories: Dict[str, Dict[str, Any]],
+               record: Dict[str, Any], location: Tuple[int, int, int]) -> None:
+        memory_id = record["id"]
+        op = record["op"]
+        if op == "put":
+            previous = self._offsets.get(memory_id)
+            if previous:
+                self._live_bytes -= previous[2]
+            memories[memory_id] = record["data"]
+            self._offsets[memory_id] = location
+            self._touched.pop(memory_id, None)
+            self._live_bytes += location[2]
+        elif op == "touch":
+            if memory_id in memories:
+                memories[memory_id].update(record["data"])
+                self._touched.setdefault(memory_id, {}).update(record["data"])
+        elif op == "delete":
+            memories.pop(memory_id, None)
+            previous = self._offsets.pop(memory_id, None)
+            if previous:
+                self._live_bytes -= previous[2]
+            self._touched.pop(memory_id, None)
+
+    def put(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending_deletes.discard(memory_id)
+            self._pending_touches.pop(memory_id, None)
+            self._pending_puts[memory_id] = memory
+            self.maybe_flush()
+
+    def touch(self, memory_id: str, fields: Dict[str, Any]) -> None:
+        with self._lock:
+            if memory_id in self._pending_puts:
+                self._pending_puts[memory_id].update(fields)
+            else:
+                self._pending_touches.setdefault(memory_id, {}).update(fields)
+            self.maybe_flush()
+
+    def delete(self, memory_id: str) -> None:
+        with self._lock:
+            self._pending_puts.pop(memory_id, None)
+            self._pending_touches.pop(memory_id, None)
+            self._pending_deletes.add(memory_id)
+            self.maybe_flush()
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Read a single memory through the offset index."""
+        with self._lock:
+            if memory_id in self._pending_puts:
+                return dict(self._pending_puts[memory_id])
+            if memory_id in self._pending_deletes:
+                return None
+            location = self._offsets.get(memory_id)
+            if location is None:
+                return None
+            memory = self._read(location)
+            memory.update(self._touched.get(memory_id, {}))
+            memory.update(self._pending_touches.get(memory_id, {}))
+            return memory
+
+    def _read(self, location: Tuple[int, int, int]) -> Dict[str, Any]:
+        number, offset, length = location
+        with open(self._segment_path(number), 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["data"]
+
+    def _pending_count(self) -> int:
+        return len(self._pending_puts) + len(self._pending_touches) + len(self._pending_deletes)
+
+    def maybe_flush(self) -> None:
+        with self._lock:
+            pending = self._pending_count()
+            if not pending:
+                return
+            if (pending >= self.batch_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self, compact: bool = True) -> None:
+        """Append all buffered records with a single fsync.
+
+        Args:
+            compact: Whether to compact afterwards if the log is mostly dead
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending_count():
+                return
+
+            records = (
+                [{"op": "put", "id": k, "data": v} for k, v in self._pending_puts.items()] +
+                [{"op": "touch", "id": k, "data": v} for k, v in self._pending_touches.items()] +
+                [{"op": "delete", "id": k} for k in self._pending_deletes]
+            )
+            self._pending_puts = {}
+            self._pending_touches = {}
+            self._pending_deletes = set()
+
+            if not self._active_segment:
+                segments = self._segments()
+                self._active_segment = segments[-1] if segments else 1
+            path = self._segment_path(self._active_segment)
+            if path.exists() and path.stat().st_size >= self.segment_size:
+                self._active_segment += 1
+                path = self._segment_path(self._active_segment)
+
+            scratch: Dict[str, Dict[str, Any]] = {}
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                for record in records:
+                    line = (json.dumps(record, separators=(',', ':')) + "\n").encode('utf-8')
+                    f.write(line)
+                    if record["op"] == "touch":
+                        # Only the fields matter for replay bookkeeping
+                        scratch[record["id"]] = {}
+                    self._apply(scratch, record, (self._active_segment, offset, len(line)))
+                    offset += len(line)
+                    self._total_bytes += len(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+            if compact:
+                self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if self._total_bytes < self.min_compact_bytes:
+            return
+        if self._live_bytes / self._total_bytes >= self.compact_ratio:
+            return
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrite live records into a fresh segment and drop the old ones."""
+        with self._lock:
+            self.flush(compact=False)
+            old_segments = self._segments()
+            if not old_segments:
+                return
+
+            live = {}
+            for memory_id, location in self._offsets.items():
+                memory = self._read(location)
+                memory.update(self._touched.get(memory_id, {}))
+                live[memory_id] = memory
+
+            new_number = old_segments[-1] + 1
+            tmp_path = self.log_dir / f"segment_{new_number:06d}.tmp"
+            offsets: Dict[str, Tuple[int, int, int]] = {}
+            with open(tmp_path, 'wb') as f:
+                offset = 0
+                for memory_id, memory in live.items():
+                    line = (json.dumps({"op": "put", "id": memory_id, "data": memory},
+                                       separators=(',', ':')) + "\n").encode('utf-8')
+                    f.write(line)
+                    offsets[memory_id] = (new_number, offset, len(line))
+                    offset += len(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self._segment_path(new_number))
+
+            for number in old_segments:
+                self._segment_path(number).unlink()
+
+            self._offsets = offsets
+            self._touched = {}
+            self._live_bytes = offset
+            self._total_bytes = offset
+            self._active_segment = new_number
+            logger.info(f"Compacted memory log to {len(live)} records ({offset} bytes)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get log size and buffering statistics."""
+        with self._lock:
+            return {
+                "records": len(self._offsets),
+                "segments": len(self._segments()),
+                "live_bytes": self._live_bytes,
+                "total_bytes": self._total_bytes,
+                "pending": self._pending_count()
+            }
@@ -0,0 +1,133 @@
+"""
+Memory Text Index
+Token-level inverted index with BM25 ranking for memory search.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+class InvertedIndex:
+    """Incrementally maintained inverted index over memory text.
+
+    Postings map each term to the documents containing it with their term
+    frequency, so a query only touches the postings of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize the index.
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id: str, texts: Iterable[str]) -> None:
+        """Index a document, replacing any previous version.
+
+        Args:
+            doc_id: Document ID
+            texts: Text fields of the document
+        """
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+
+        terms = Counter()
+        for text in texts:
+            terms.update(tokenize(text))
+
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        length = sum(terms.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = list(terms)
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document from the index."""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+
+        for term in self.doc_terms.pop(doc_id, []):
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+
+    def search(self,
+               query: str,
+               candidates: Optional[Set[str]] = None,
+               match_all: bool = True) -> Dict[str, float]:
+        """Score documents against a query with BM25.
+
+        Args:
+            query: Search query
+            candidates: Restrict scoring to these document IDs
+            match_all: Only return documents containing every query term
+
+        Returns:
+            Dict[str, float]: BM25 score per matching document
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.doc_lengths:
+            return {}
+
+        postings = [self.postings.get(term, {}) for term in terms]
+        if match_all and any(not docs for docs in postings):
+            return {}
+
+        # Walk the rarest posting list first to keep the candidate set small
+        order = sorted(range(len(terms)), key=lambda i: len(postings[i]))
+        if match_all:
+            matched = set(postings[order[0]])
+            for i in order[1:]:
+                matched.intersection_update(postings[i])
+                if not matched:
+                    return {}
+        else:
+            matched = set()
+            for docs in postings:
+                matched.update(docs)
+        if candidates is not None:
+            matched &= candidates
+
+        doc_count = len(self.doc_lengths)
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        scores: Dict[str, float] = {}
+        for docs in postings:
+            if not docs:
+                continue
+            idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id in matched:
+                tf = docs.get(doc_id)
+                if not tf:
+                    continue
+                norm = 1 - self.b + self.b * (self.doc_lengths[doc_id] / avg_length if avg_length else 0)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
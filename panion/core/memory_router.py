@@ -3,26 +3,106 @@ Memory Router
 Aggregates and routes context from various memory systems to agents.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-import json
-from core.reflection import reflection_system
-from core.memory import memory_system
+from core.memory.plugin_test_logs import PluginTestLogCache
+from core.events import event_bus, Event, EventType
 from core.logging_config import get_logger, LogTimer
 
 class MemoryRouter:
-    """Routes and aggregates context from various memory systems."""
+    """Routes and aggregates context from various memory systems.
     
-    def __init__(self):
+    Assembled contexts are memoized per goal. An entry is dropped when a
+    GOAL_CONTEXT_UPDATED event names its goal (or no goal), which the
+    reflection logger and memory manager publish for reflections and
+    memories carrying a ``goal_id``; when any plugin test completes; or
+    after ``context_ttl`` seconds, which bounds staleness from writers
+    that publish no events.
+    """
+    
+    def __init__(self,
+                 context_ttl: float = 60.0,
+                 max_cached_contexts: int = 256,
+                 reflection_source: Optional[Any] = None,
+                 memory_source: Optional[Any] = None):
+        """Initialize the router.
+        
+        Args:
+            context_ttl: Seconds an assembled context may be served from the memo
+            max_cached_contexts: Goals whose contexts are kept, least recently used evicted first
+            reflection_source: Provider of ``get_reflections`` (default the reflection system)
+            memory_source: Provider of ``get_entries`` (default the memory system)
+        """
         self.logger = get_logger(__name__)
+        self._reflection_source = reflection_source
+        self._memory_source = memory_source
         self.test_logs_dir = Path("data/plugin_test_logs")
+        self.test_log_cache = PluginTestLogCache(self.test_logs_dir)
         self.context_window = timedelta(days=7)  # Default context window
+        self.context_ttl = context_ttl
+        self.max_cached_contexts = max_cached_contexts
+        self._clock = time.monotonic
+        self._contexts: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._building: Dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so a build that raced with it is not memoized
+        self._generation = 0
+        self.context_hits = 0
+        self.context_misses = 0
+        
+        event_bus.subscribe(EventType.GOAL_CONTEXT_UPDATED, self._handle_context_event)
+        event_bus.subscribe(EventType.PLUGIN_TEST_COMPLETED, self._handle_context_event)
+    
+    @property
+    def reflection_source(self) -> Any:
+        """Reflection provider, resolved on first use."""
+        if self._reflection_source is None:
+            from core.reflection import reflection_system
+            self._reflection_source = reflection_system
+        return self._reflection_source
+    
+    @property
+    def memory_source(self) -> Any:
+        """Memory provider, resolved on first use."""
+        if self._memory_source is None:
+            from core.memory import memory_system
+            self._memory_source = memory_system
+        return self._memory_source
+    
+    def close(self) -> None:
+        """Stop listening for invalidation events and drop memoized contexts."""
+        event_bus.unsubscribe(EventType.GOAL_CONTEXT_UPDATED, self._handle_context_event)
+        event_bus.unsubscribe(EventType.PLUGIN_TEST_COMPLETED, self._handle_context_event)
+        self.invalidate_context()
+    
+    def _handle_context_event(self, event: Event) -> None:
+        """Invalidate memoized contexts affected by an event."""
+        goal_id = event.data.get("goal_id") if event.type == EventType.GOAL_CONTEXT_UPDATED else None
+        self.invalidate_context(goal_id)
+    
+    def invalidate_context(self, goal_id: Optional[str] = None) -> None:
+        """Drop the memoized context of a goal, or of every goal.
         
+        Args:
+            goal_id: Goal to invalidate; None invalidates all goals
+        """
+        self._generation += 1
+        if goal_id is None:
+            self._contexts.clear()
+        else:
+            self._contexts.pop(goal_id, None)
+    
     async def get_agent_context(self, goal_id: str) -> Dict[str, Any]:
         """Get aggregated context for an agent based on goal_id.
         
+        Repeated calls for a goal return the memoized context until it is
+        invalidated; concurrent calls share one build. The returned dict
+        is shared with the memo and must not be mutated.
+        
         Args:
             goal_id: The ID of the goal to get context for
             
@@ -33,16 +113,49 @@ class MemoryRouter:
             - test_logs: List of relevant test logs
             - metadata: Context metadata (timestamps, counts, etc.)
         """
+        cached = self._contexts.get(goal_id)
+        if cached and self._clock() - cached[0] < self.context_ttl:
+            self._contexts.move_to_end(goal_id)
+            self.context_hits += 1
+            return cached[1]
+        
+        building = self._building.get(goal_id)
+        if building is not None:
+            return await asyncio.shield(building)
+        
+        self.context_misses += 1
+        building = asyncio.get_running_loop().create_future()
+        self._building[goal_id] = building
+        generation = self._generation
+        try:
+            context = await self._build_agent_context(goal_id)
+            if "error" not in context and generation == self._generation:
+                self._contexts[goal_id] = (self._clock(), context)
+                self._contexts.move_to_end(goal_id)
+                while len(self._contexts) > self.max_cached_contexts:
+                    self._contexts.popitem(last=False)
+            building.set_result(context)
+            return context
+        except asyncio.CancelledError:
+            building.cancel()
+            raise
+        except Exception as e:
+            building.set_exception(e)
+            # Mark the exception retrieved when nobody else is waiting
+            building.exception()
+            raise
+        finally:
+            del self._building[goal_id]
+    
+    async def _build_agent_context(self, goal_id: str) -> Dict[str, Any]:
+        """Fetch every context source concurrently and assemble the context."""
         with LogTimer(self.logger, 'get_agent_context', goal_id=goal_id):
             try:
-                # Get reflections
-                reflections = await self._get_reflections(goal_id)
-                
-                # Get memory entries
-                memory_entries = await self._get_memory_entries(goal_id)
-                
-                # Get test logs
-                test_logs = await self._get_test_logs(goal_id)
+                reflections, memory_entries, test_logs = await asyncio.gather(
+                    self._get_reflections(goal_id),
+                    self._get_memory_entries(goal_id),
+                    self._get_test_logs(goal_id)
+                )
                 
                 # Aggregate context
                 context = {
@@ -94,7 +207,7 @@ class MemoryRouter:
         """Get reflections related to the goal."""
         try:
             # Get reflections from reflection system
-            reflections = await reflection_system.get_reflections(
+            reflections = await self.reflection_source.get_reflections(
                 goal_id=goal_id,
                 start_time=datetime.now() - self.context_window
             )
@@ -120,7 +233,7 @@ class MemoryRouter:
         """Get memory entries related to the goal."""
         try:
             # Get memory entries from memory system
-            entries = await memory_system.get_entries(
+            entries = await self.memory_source.get_entries(
                 goal_id=goal_id,
                 start_time=datetime.now() - self.context_window
             )
@@ -146,28 +259,12 @@ class MemoryRouter:
     async def _get_test_logs(self, goal_id: str) -> List[Dict[str, Any]]:
         """Get test logs related to the goal."""
         try:
-            test_logs = []
-            
-            # Get all test log files
-            for log_file in self.test_logs_dir.glob("*.json"):
-                try:
-                    with open(log_file, 'r') as f:
-                        logs = json.load(f)
-                        
-                        # Filter logs by goal_id and time window
-                        relevant_logs = [
-                            log for log in logs
-                            if self._is_log_relevant(log, goal_id)
-                        ]
-                        
-                        if relevant_logs:
-                            test_logs.extend(relevant_logs)
-                            
-                except Exception as e:
-                    self.logger.warning(
-                        f"Error reading test log file {log_file}: {e}"
-                    )
-                    continue
+            # Parsing runs in a thread; unchanged files come from the cache
+            test_logs = await asyncio.to_thread(
+                self.test_log_cache.logs_for_goal,
+                goal_id,
+                datetime.now() - self.context_window
+            )
             
             # Format test logs
             formatted_logs = []
@@ -188,24 +285,10 @@ class MemoryRouter:
             self.logger.error(f"Error getting test logs: {e}")
             return []
     
-    def _is_log_relevant(self, log: Dict[str, Any], goal_id: str) -> bool:
-        """Check if a test log is relevant to the goal."""
-        try:
-            # Check timestamp
-            log_time = datetime.fromisoformat(log.get("timestamp", ""))
-            if log_time < datetime.now() - self.context_window:
-                return False
-            
-            # Check if log is related to goal
-            test_id = log.get("test_id", "")
-            return goal_id in test_id
-            
-        except Exception:
-            return False
-    
     def set_context_window(self, days: int) -> None:
         """Set the context window in days."""
         self.context_window = timedelta(days=days)
+        self.invalidate_context()
 
 # Create singleton instance
 memory_router = MemoryRouter() 
\ No newline at end of file
@@ -8,10 +8,12 @@ import functools
 import asyncio
 from typing import Any, Callable, Dict, Optional, TypeVar, cast
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import datetime
 import threading
 from contextlib import contextmanager
 
+from core.utils.cache import cache_registry, cache_result as _cache_result
+
 # Type variables for generic functions
 T = TypeVar('T')
 R = TypeVar('R')
@@ -27,10 +29,6 @@ _connection_lock = threading.Lock()
 _circuit_breakers: Dict[str, Dict[str, Any]] = {}
 _circuit_breaker_lock = threading.Lock()
 
-# Cache for expensive operations
-_result_cache: Dict[str, Dict[str, Any]] = {}
-_cache_lock = threading.Lock()
-
 def with_connection_pool(pool_name: str):
     """
     Decorator for managing database connection pooling.
@@ -72,49 +70,24 @@ def with_connection_pool(pool_name: str):
         return cast(Callable[..., R], wrapper)
     return decorator
 
-def cache_result(ttl_seconds: int = 300, max_size: int = 1000):
+def cache_result(ttl_seconds: int = 300, max_size: int = 1000, namespace: Optional[str] = None):
     """
     Decorator for caching expensive function results.
     
+    Backed by an LRU/TTL cache per function with single-flight loading:
+    concurrent misses for the same arguments share one call, and the
+    cache lock is never held while the function runs.
+    
     Args:
         ttl_seconds: Time-to-live for cache entries in seconds
         max_size: Maximum number of cache entries
+        namespace: Cache namespace (defaults to the function's qualified name)
     """
-    def decorator(func: Callable[..., R]) -> Callable[..., R]:
-        @functools.wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> R:
-            # Generate cache key
-            key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            
-            with _cache_lock:
-                # Check cache
-                if key in _result_cache:
-                    entry = _result_cache[key]
-                    if datetime.now() - entry['timestamp'] < timedelta(seconds=ttl_seconds):
-                        return entry['result']
-                    del _result_cache[key]
-                
-                # Execute function
-                result = await func(*args, **kwargs)
-                
-                # Cache result
-                if len(_result_cache) >= max_size:
-                    # Remove oldest entry
-                    oldest_key = min(
-                        _result_cache.keys(),
-                        key=lambda k: _result_cache[k]['timestamp']
-                    )
-                    del _result_cache[oldest_key]
-                
-                _result_cache[key] = {
-                    'result': result,
-                    'timestamp': datetime.now()
-                }
-                
-                return result
-        
-        return cast(Callable[..., R], wrapper)
-    return decorator
+    return _cache_result(ttl_seconds=ttl_seconds, max_size=max_size, namespace=namespace)
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get hit/miss/eviction statistics for every cache namespace."""
+    return cache_registry.stats()
 
 def asyncify(func: Callable[..., R]) -> Callable[..., R]:
     """
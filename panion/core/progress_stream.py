@@ -0,0 +1,122 @@
+"""
+Progress Stream
+Sequence-numbered progress deltas that clients follow instead of polling.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+@dataclass
+class ProgressEvent:
+    """A change to one tracked item, e.g. topic ``task:<id>``."""
+    seq: int
+    topic: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def merge(self, newer: "ProgressEvent") -> "ProgressEvent":
+        """Combine with a later event for the same topic.
+
+        Later fields win, except ``messages``, which accumulate.
+        """
+        data = dict(self.data)
+        messages = data.get("messages", []) + newer.data.get("messages", [])
+        data.update(newer.data)
+        if messages:
+            data["messages"] = messages
+        return ProgressEvent(seq=newer.seq, topic=self.topic, data=data)
+
+class ProgressStream:
+    """Thread-safe ring buffer of progress events.
+
+    Producers call ``publish`` with only the fields that changed; each
+    event gets the next sequence number. Readers keep the last sequence
+    number they saw and call ``read`` with it, which blocks until newer
+    events exist, so a reconnecting client resumes exactly where it left
+    off. Events for the same topic within one read are coalesced into a
+    single delta, so a reader that falls behind a burst of updates gets
+    one event per item rather than every intermediate step. Only the last
+    ``history_size`` events are kept; a reader that asks for older ones, or
+    for a sequence number this stream never reached (e.g. one from before a
+    restart), is told it missed events and should refetch full state.
+    """
+
+    def __init__(self, history_size: int = 1000):
+        self.history_size = history_size
+        self._events: deque = deque(maxlen=history_size)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 before the first)."""
+        with self._cond:
+            return self._seq
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> int:
+        """Record a delta for a topic and wake waiting readers.
+
+        Returns:
+            int: The event's sequence number
+        """
+        with self._cond:
+            self._seq += 1
+            self._events.append(ProgressEvent(seq=self._seq, topic=topic, data=data))
+            self._cond.notify_all()
+            return self._seq
+
+    def read(self,
+             since: int,
+             topic_prefix: Optional[str] = None,
+             timeout: Optional[float] = None) -> Tuple[List[ProgressEvent], int, bool]:
+        """Get events newer than ``since``, waiting up to ``timeout`` for some.
+
+        Args:
+            since: Last sequence number the reader has seen
+            topic_prefix: Only return events whose topic starts with this
+            timeout: Seconds to wait if there is nothing new (None waits forever)
+
+        Returns:
+            Tuple[List[ProgressEvent], int, bool]: Coalesced events in
+            sequence order, the sequence number to pass next time, and
+            whether events after ``since`` had already been discarded or
+            ``since`` is ahead of the stream
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            oldest = self._seq - len(self._events) + 1
+            # A cursor ahead of the stream comes from before a restart
+            missed = since < oldest - 1 or since > self._seq
+            cursor = oldest - 1 if missed else since
+            while True:
+                start = cursor - (self._seq - len(self._events))
+                pending = list(itertools.islice(self._events, start, None))
+                cursor = self._seq
+                if topic_prefix:
+                    pending = [event for event in pending if event.topic.startswith(topic_prefix)]
+                if pending:
+                    return self.coalesce(pending), cursor, missed
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return [], cursor, missed
+                self._cond.wait(remaining)
+                # Events may have been evicted while waiting
+                oldest = self._seq - len(self._events) + 1
+                if cursor < oldest - 1:
+                    missed = True
+                    cursor = oldest - 1
+
+    @staticmethod
+    def coalesce(events: List[ProgressEvent]) -> List[ProgressEvent]:
+        """Merge events per topic, ordered by each topic's latest event."""
+        merged: Dict[str, ProgressEvent] = {}
+        for event in events:
+            previous = merged.pop(event.topic, None)
+            merged[event.topic] = previous.merge(event) if previous else event
+        return list(merged.values())
+
+# Shared stream for task and strategic operation progress
+progress_stream = ProgressStream()
@@ -0,0 +1,217 @@
+"""
+Pub/Sub Hub
+Topic subscriptions and non-blocking fan-out for push connections.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to consumers that cannot keep up ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+class HubConnection:
+    """One subscriber: a bounded queue of outgoing messages and a writer task.
+
+    Publishing only ever appends to the queue without waiting; the writer
+    task sends queued messages one at a time, so a slow socket delays
+    nobody but its own connection.
+    """
+
+    def __init__(self,
+                 hub: "PubSubHub",
+                 client_id: str,
+                 send: Callable[[str], Awaitable[Any]],
+                 close: Callable[[int, str], Awaitable[Any]],
+                 max_queue_size: int):
+        self.hub = hub
+        self.client_id = client_id
+        self.topics: Set[str] = set()
+        self.pending: deque = deque()
+        self.max_queue_size = max_queue_size
+        self.sent = 0
+        self.closed = False
+        self.sending_since: Optional[float] = None
+        self._send = send
+        self._close = close
+        self._loop = asyncio.get_running_loop()
+        self._wakeup: Optional[asyncio.Future] = None
+        self._writer = self._loop.create_task(self._write_loop())
+
+    def enqueue(self, message: str) -> bool:
+        """Queue a serialized message, dropping the connection if the queue is full.
+
+        Returns:
+            bool: Whether the message was queued
+        """
+        if self.closed:
+            return False
+        if len(self.pending) >= self.max_queue_size:
+            self.hub.drop(self, "Consumer too slow")
+            return False
+        self.pending.append(message)
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+        return True
+
+    async def _write_loop(self) -> None:
+        pending = self.pending
+        try:
+            while True:
+                while pending:
+                    self.sending_since = self._loop.time()
+                    await self._send(pending.popleft())
+                    self.sending_since = None
+                    self.sent += 1
+                self._wakeup = self._loop.create_future()
+                await self._wakeup
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Writer for {self.client_id} stopped: {e}")
+            self.hub.unregister(self)
+
+class PubSubHub:
+    """Routes published messages to the connections subscribed to a topic.
+
+    Subscriptions are exact topics (``task:abc``), prefix patterns ending
+    in ``*`` (``task:*``), or ``*`` for everything. ``publish`` serializes
+    a message once and queues it on every matching connection without
+    awaiting any socket, so fan-out cost is independent of how fast
+    clients read. A connection whose queue is full, or whose send takes
+    longer than ``send_timeout``, is dropped and closed with code 1013 so
+    the client reconnects rather than holding up memory. Send times are
+    checked by one watchdog task rather than a timer per send.
+    """
+
+    def __init__(self, max_queue_size: int = 256, send_timeout: float = 10.0):
+        """Initialize the hub.
+
+        Args:
+            max_queue_size: Messages buffered per connection before it is dropped
+            send_timeout: Seconds a single send may take before the connection is dropped
+        """
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.connections: Set[HubConnection] = set()
+        self._exact: Dict[str, Set[HubConnection]] = {}
+        self._prefixes: Dict[str, Set[HubConnection]] = {}
+        self.stats = {"published": 0, "delivered": 0, "dropped_connections": 0}
+        self._watchdog: Optional[asyncio.Task] = None
+
+    def register(self,
+                 client_id: str,
+                 send: Callable[[str], Awaitable[Any]],
+                 close: Callable[[int, str], Awaitable[Any]]) -> HubConnection:
+        """Add a connection. Must be called from the event loop."""
+        connection = HubConnection(self, client_id, send, close, self.max_queue_size)
+        self.connections.add(connection)
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.get_running_loop().create_task(self._watch_sends())
+        return connection
+
+    async def _watch_sends(self) -> None:
+        """Drop connections stuck in one send for longer than ``send_timeout``."""
+        loop = asyncio.get_running_loop()
+        while self.connections:
+            await asyncio.sleep(min(1.0, self.send_timeout / 2))
+            deadline = loop.time() - self.send_timeout
+            for connection in list(self.connections):
+                started = connection.sending_since
+                if started is not None and started < deadline:
+                    self.drop(connection, "Send timed out")
+
+    def unregister(self, connection: HubConnection) -> None:
+        """Remove a connection and its subscriptions."""
+        if connection.closed:
+            return
+        connection.closed = True
+        self.connections.discard(connection)
+        self.unsubscribe(connection, list(connection.topics))
+        connection._writer.cancel()
+
+    def drop(self, connection: HubConnection, reason: str) -> None:
+        """Disconnect a connection that cannot keep up."""
+        if connection.closed:
+            return
+        logger.warning(f"Dropping {connection.client_id}: {reason}")
+        self.stats["dropped_connections"] += 1
+        self.unregister(connection)
+        asyncio.get_running_loop().create_task(self._close_quietly(connection, reason))
+
+    @staticmethod
+    async def _close_quietly(connection: HubConnection, reason: str) -> None:
+        try:
+            await connection._close(SLOW_CONSUMER_CLOSE_CODE, reason)
+        except Exception:
+            pass
+
+    def subscribe(self, connection: HubConnection, topics: Iterable[str]) -> List[str]:
+        """Subscribe a connection to topics or ``prefix*`` patterns.
+
+        Returns:
+            List[str]: The connection's subscriptions afterwards
+        """
+        for topic in topics:
+            if topic.endswith("*"):
+                self._prefixes.setdefault(topic[:-1], set()).add(connection)
+            else:
+                self._exact.setdefault(topic, set()).add(connection)
+            connection.topics.add(topic)
+        return sorted(connection.topics)
+
+    def unsubscribe(self, connection: HubConnection, topics: Iterable[str]) -> List[str]:
+        """Remove subscriptions from a connection."""
+        for topic in topics:
+            index, key = (self._prefixes, topic[:-1]) if topic.endswith("*") else (self._exact, topic)
+            subscribers = index.get(key)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del index[key]
+            connection.topics.discard(topic)
+        return sorted(connection.topics)
+
+    def subscribers(self, topic: str) -> Set[HubConnection]:
+        """Get the connections a message on a topic goes to."""
+        matched = set(self._exact.get(topic, ()))
+        for prefix, subscribers in self._prefixes.items():
+            if topic.startswith(prefix):
+                matched |= subscribers
+        return matched
+
+    def publish(self, topic: str, data: Any, message_type: str = "event") -> int:
+        """Queue a message for every subscriber of a topic.
+
+        Returns:
+            int: Number of connections the message was queued for
+        """
+        message = json.dumps({
+            "type": message_type,
+            "topic": topic,
+            "data": data,
+            "timestamp": time.time()
+        }, default=str)
+        delivered = sum(1 for connection in self.subscribers(topic) if connection.enqueue(message))
+        self.stats["published"] += 1
+        self.stats["delivered"] += delivered
+        return delivered
+
+    def broadcast(self, payload: Dict[str, Any]) -> int:
+        """Queue a message for every connection, subscribed or not."""
+        message = json.dumps(payload, default=str)
+        return sum(1 for connection in list(self.connections) if connection.enqueue(message))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hub counters and current sizes."""
+        return {
+            **self.stats,
+            "connections": len(self.connections),
+            "topics": len(self._exact) + len(self._prefixes),
+            "queued": sum(len(connection.pending) for connection in self.connections)
+        }
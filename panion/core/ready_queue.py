@@ -0,0 +1,145 @@
+"""
+Ready Queue
+Dependency-aware priority queue of goals that are ready to start.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+def deadline_key(deadline: Any) -> float:
+    """Get a sortable timestamp for a deadline, ``inf`` when there is none."""
+    if isinstance(deadline, str):
+        try:
+            deadline = datetime.fromisoformat(deadline)
+        except ValueError:
+            return float('inf')
+    if isinstance(deadline, datetime):
+        return deadline.timestamp()
+    return float('inf')
+
+class ReadyQueue:
+    """Heap of ready goals keyed by (priority, deadline) plus reverse dependency edges.
+
+    Goals are read from a shared mapping of goal ID to goal; each goal needs
+    ``goal_id``, ``priority``, ``deadline``, ``dependencies`` and ``status``.
+    Completing a goal only visits the goals that depend on it, and only
+    those whose last unmet dependency it was are queued.
+    """
+
+    def __init__(self, goals: Mapping[str, Any]):
+        """Initialize the queue.
+
+        Args:
+            goals: Goal ID to goal, shared with and kept up to date by the owner
+        """
+        self.goals = goals
+        self.heap: List[Tuple[float, float, int, str]] = []
+        self.ready: Set[str] = set()
+        self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        self.unmet_dependencies: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.ready)
+
+    def __contains__(self, goal_id: str) -> bool:
+        return goal_id in self.ready
+
+    def push(self, goal_id: str) -> None:
+        """Queue a goal whose dependencies are all satisfied."""
+        goal = self.goals[goal_id]
+        with self._lock:
+            if goal_id in self.ready:
+                return
+            self.ready.add(goal_id)
+            heapq.heappush(self.heap, (
+                -goal.priority,  # Higher priority first
+                deadline_key(goal.deadline),  # Earlier deadline first
+                next(self._sequence),
+                goal_id
+            ))
+
+    def index(self, goal: Any) -> None:
+        """Register a goal's dependency edges and queue it if it is ready."""
+        with self._lock:
+            unmet = 0
+            for dep_id in set(goal.dependencies):
+                self.dependents[dep_id].add(goal.goal_id)
+                dep_goal = self.goals.get(dep_id)
+                if dep_goal is None or dep_goal.status != 'completed':
+                    unmet += 1
+            self.unmet_dependencies[goal.goal_id] = unmet
+
+            if unmet == 0 and goal.status == 'pending':
+                self.push(goal.goal_id)
+
+    def rebuild(self) -> None:
+        """Rebuild the heap and dependency index from the goal mapping."""
+        with self._lock:
+            self.heap = []
+            self.ready.clear()
+            self.dependents.clear()
+            self.unmet_dependencies.clear()
+            for goal in self.goals.values():
+                self.index(goal)
+
+    def complete(self, goal_id: str) -> List[str]:
+        """Unblock the dependents of a completed goal.
+
+        Returns:
+            List[str]: IDs of dependents that became ready
+        """
+        promoted = []
+        with self._lock:
+            for dependent_id in self.dependents.get(goal_id, ()):
+                remaining = self.unmet_dependencies.get(dependent_id, 0) - 1
+                self.unmet_dependencies[dependent_id] = max(remaining, 0)
+                dependent = self.goals.get(dependent_id)
+                if remaining <= 0 and dependent is not None and dependent.status == 'pending':
+                    self.push(dependent_id)
+                    promoted.append(dependent_id)
+        return promoted
+
+    def dispatch(self, try_start: Callable[[Any], bool], at_capacity: Callable[[], bool]) -> List[str]:
+        """Start ready goals in (priority, deadline) order.
+
+        Goals ``try_start`` declines stay queued for the next call, also
+        when it raises part way through.
+
+        Args:
+            try_start: Starts a goal and returns True, or returns False if it cannot start yet
+            at_capacity: Returns True once no more goals may start
+
+        Returns:
+            List[str]: IDs of started goals
+        """
+        started = []
+        deferred = []
+        with self._lock:
+            try:
+                while self.heap and not at_capacity():
+                    entry = heapq.heappop(self.heap)
+                    goal_id = entry[-1]
+                    goal = self.goals.get(goal_id)
+                    if goal is None or goal.status != 'pending':
+                        # Stale entry for a goal that was removed or started
+                        self.ready.discard(goal_id)
+                        continue
+
+                    deferred.append(entry)
+                    if try_start(goal):
+                        deferred.pop()
+                        self.ready.discard(goal_id)
+                        started.append(goal_id)
+            finally:
+                for entry in deferred:
+                    heapq.heappush(self.heap, entry)
+        return started
@@ -3,14 +3,29 @@ Reflection System
 Handles logging and analysis of system reflections.
 """
 
+import atexit
+import bisect
 import json
 import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 
+from core.events import event_bus, Event, EventType
+
+# Writer queue markers; logged reflections are queued as dicts
+_FLUSH = object()
+_TRUNCATE = object()
+_STOP = object()
+
 class ReflectionCategory(Enum):
     """Categories for reflections."""
     GOAL = "goal"
@@ -38,82 +53,163 @@ class Reflection:
             "timestamp": self.timestamp.isoformat()
         }
 
+# Loggers not yet closed; weak so that one atexit hook serves all of them
+# without keeping any alive
+_open_loggers: "weakref.WeakSet[ReflectionLogger]" = weakref.WeakSet()
+
+@atexit.register
+def _close_open_loggers() -> None:
+    for reflection_logger in list(_open_loggers):
+        reflection_logger.close()
+
 class ReflectionLogger:
-    """Handles reflection logging and analysis."""
+    """Handles reflection logging and analysis.
+    
+    Reflections are appended to ``reflections.jsonl`` by a background
+    writer that batches lines for up to ``flush_interval`` seconds, so
+    ``log`` never touches the disk. The summary is kept as running counters
+    and rewritten after each batch, and ``get_reflections`` narrows by time
+    and category with sorted indexes before applying the other filters.
+    """
     
-    def __init__(self, log_dir: Path):
+    def __init__(self, log_dir: Path, flush_interval: float = 0.5, batch_size: int = 500):
         """Initialize reflection logger.
         
         Args:
             log_dir: Directory to store reflection logs
+            flush_interval: Longest a reflection waits before it is written
+            batch_size: Most reflections written in one batch
         """
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.reflections: List[Reflection] = []
+        self.journal_file = self.log_dir / "reflections.jsonl"
+        self.summary_file = self.log_dir / "reflections_summary.json"
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._reset()
         self._load_reflections()
+        _open_loggers.add(self)
+    
+    def _reset(self) -> None:
+        """Empty the in-memory reflections, indexes and counters."""
+        self.reflections: List[Reflection] = []
+        self._timestamps: List[datetime] = []
+        self._by_category: Dict[ReflectionCategory, List[int]] = defaultdict(list)
+        self._category_timestamps: Dict[ReflectionCategory, List[datetime]] = defaultdict(list)
+        self._category_counts: Counter = Counter()
+        self._severity_counts: Counter = Counter()
+        self._tag_counts: Counter = Counter()
+    
+    def _index(self, reflection: Reflection) -> None:
+        """Add a reflection to the list, indexes and counters."""
+        if self._timestamps and reflection.timestamp < self._timestamps[-1]:
+            # Clock stepped back: keep the list sorted and rebuild the indexes
+            position = bisect.bisect_right(self._timestamps, reflection.timestamp)
+            reflections = self.reflections[:position] + [reflection] + self.reflections[position:]
+            self._reset()
+            for existing in reflections:
+                self._index(existing)
+            return
+        position = len(self.reflections)
+        self.reflections.append(reflection)
+        self._timestamps.append(reflection.timestamp)
+        self._by_category[reflection.category].append(position)
+        self._category_timestamps[reflection.category].append(reflection.timestamp)
+        self._category_counts[reflection.category.value] += 1
+        self._severity_counts[reflection.severity] += 1
+        self._tag_counts.update(set(reflection.tags or []))
+    
+    @staticmethod
+    def _from_dict(entry: Dict[str, Any]) -> Reflection:
+        return Reflection(
+            category=ReflectionCategory(entry["category"]),
+            timestamp=datetime.fromisoformat(entry["timestamp"]),
+            **{k: v for k, v in entry.items() 
+               if k not in ["category", "timestamp"]}
+        )
     
     def _load_reflections(self) -> None:
-        """Load existing reflections from file."""
-        reflections_file = self.log_dir / "reflections.json"
-        if reflections_file.exists():
-            with open(reflections_file) as f:
-                data = json.load(f)
-                self.reflections = [
-                    Reflection(
-                        category=ReflectionCategory(entry["category"]),
-                        timestamp=datetime.fromisoformat(entry["timestamp"]),
-                        **{k: v for k, v in entry.items() 
-                           if k not in ["category", "timestamp"]}
-                    )
-                    for entry in data
-                ]
-    
-    def _save_reflections(self) -> None:
-        """Save reflections to file."""
-        reflections_file = self.log_dir / "reflections.json"
-        with open(reflections_file, "w") as f:
-            json.dump(
-                [reflection.to_dict() for reflection in self.reflections],
-                f,
-                indent=2
-            )
-    
-    def _update_summary(self) -> None:
-        """Update reflection summary."""
-        summary = {
-            "total_reflections": len(self.reflections),
-            "categories": {
-                category.value: len([
-                    r for r in self.reflections
-                    if r.category == category
-                ])
-                for category in ReflectionCategory
-            },
-            "severities": {
-                severity: len([
-                    r for r in self.reflections
-                    if r.severity == severity
-                ])
-                for severity in {"info", "warning", "error", "critical"}
-            },
-            "tags": {
-                tag: len([
-                    r for r in self.reflections
-                    if r.tags and tag in r.tags
-                ])
-                for reflection in self.reflections
-                if reflection.tags
-                for tag in reflection.tags
-            },
-            "latest_reflection": max(
-                (r.timestamp for r in self.reflections),
-                default=datetime.now()
-            ).isoformat()
-        }
+        """Load existing reflections from the journal."""
+        entries = []
+        legacy_file = self.log_dir / "reflections.json"
+        if self.journal_file.exists():
+            with open(self.journal_file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash mid-write
+                        logging.warning(f"Skipping unreadable reflection in {self.journal_file}")
+        elif legacy_file.exists():
+            # Move reflections kept in the old whole-file format into the journal
+            with open(legacy_file) as f:
+                entries = json.load(f)
+            with open(self.journal_file, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            legacy_file.rename(legacy_file.with_name("reflections.json.migrated"))
         
-        summary_file = self.log_dir / "reflections_summary.json"
-        with open(summary_file, "w") as f:
-            json.dump(summary, f, indent=2)
+        for entry in sorted(entries, key=lambda entry: entry["timestamp"]):
+            self._index(self._from_dict(entry))
+    
+    def _ensure_writer(self) -> None:
+        """Start the writer thread if it is not running (called with the lock held)."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="reflection-writer", daemon=True)
+            self._writer.start()
+    
+    def _write_loop(self) -> None:
+        """Write queued reflections in batches until told to stop."""
+        while True:
+            item = self._queue.get()
+            batch, control = [], item
+            deadline = time.monotonic() + self.flush_interval
+            while isinstance(control, dict):
+                batch.append(control)
+                control = None
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    control = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            
+            try:
+                if batch:
+                    with open(self.journal_file, "a", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(entry) + "\n" for entry in batch))
+                if control is _TRUNCATE:
+                    open(self.journal_file, "w").close()
+                self._write_summary()
+            except Exception as e:
+                logging.error(f"Error writing reflections: {str(e)}")
+            finally:
+                for _ in range(len(batch) + (control is not None)):
+                    self._queue.task_done()
+            if control is _STOP:
+                return
+    
+    def _write_summary(self) -> None:
+        """Save the current summary next to the journal."""
+        temp_file = self.summary_file.with_suffix(".tmp")
+        with open(temp_file, "w") as f:
+            json.dump(self.get_summary(), f, indent=2)
+        os.replace(temp_file, self.summary_file)
+    
+    def flush(self) -> None:
+        """Block until every logged reflection has been written."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Write pending reflections and stop the writer."""
+        _open_loggers.discard(self)
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
     
     def log(
         self,
@@ -141,9 +237,20 @@ class ReflectionLogger:
             tags=tags or []
         )
         
-        self.reflections.append(reflection)
-        self._save_reflections()
-        self._update_summary()
+        with self._lock:
+            self._index(reflection)
+            # Queued under the lock so the journal keeps the order of the indexes
+            self._queue.put(reflection.to_dict())
+            self._ensure_writer()
+        
+        # Memoized agent contexts of the goal are now stale
+        goal_id = reflection.metadata.get("goal_id")
+        if goal_id:
+            event_bus.publish(Event(
+                type=EventType.GOAL_CONTEXT_UPDATED,
+                data={"goal_id": goal_id},
+                source="ReflectionLogger"
+            ))
         
         # Also log to standard logging
         log_message = f"[{category.value}] {message}"
@@ -206,10 +313,20 @@ class ReflectionLogger:
         Returns:
             List[Reflection]: Filtered reflections
         """
-        filtered = self.reflections
+        with self._lock:
+            if category:
+                timestamps = self._category_timestamps.get(category, [])
+                positions = self._by_category.get(category, [])
+            else:
+                timestamps = self._timestamps
+                positions = None
+            low = bisect.bisect_left(timestamps, start_time) if start_time else 0
+            high = bisect.bisect_right(timestamps, end_time) if end_time else len(timestamps)
+            if positions is None:
+                filtered = self.reflections[low:high]
+            else:
+                filtered = [self.reflections[position] for position in positions[low:high]]
         
-        if category:
-            filtered = [r for r in filtered if r.category == category]
         if severity:
             filtered = [r for r in filtered if r.severity == severity]
         if tags:
@@ -217,10 +334,6 @@ class ReflectionLogger:
                 r for r in filtered
                 if r.tags and all(tag in r.tags for tag in tags)
             ]
-        if start_time:
-            filtered = [r for r in filtered if r.timestamp >= start_time]
-        if end_time:
-            filtered = [r for r in filtered if r.timestamp <= end_time]
         
         return filtered
     
@@ -230,17 +343,29 @@ class ReflectionLogger:
         Returns:
             Dict[str, Any]: Summary statistics
         """
-        summary_file = self.log_dir / "reflections_summary.json"
-        if summary_file.exists():
-            with open(summary_file) as f:
-                return json.load(f)
-        return {}
+        with self._lock:
+            return {
+                "total_reflections": len(self.reflections),
+                "categories": {
+                    category.value: self._category_counts[category.value]
+                    for category in ReflectionCategory
+                },
+                "severities": {
+                    **{severity: 0 for severity in ("info", "warning", "error", "critical")},
+                    **self._severity_counts
+                },
+                "tags": dict(self._tag_counts),
+                "latest_reflection": (
+                    self._timestamps[-1] if self._timestamps else datetime.now()
+                ).isoformat()
+            }
     
     def clear(self) -> None:
         """Clear all reflections."""
-        self.reflections = []
-        self._save_reflections()
-        self._update_summary()
+        with self._lock:
+            self._reset()
+            self._queue.put(_TRUNCATE)
+            self._ensure_writer()
 
 # Create global reflection system instance
-reflection_system = ReflectionLogger(Path("logs/reflections")) 
\ No newline at end of file
+reflection_system = ReflectionLogger(Path("logs/reflections"))
@@ -4,15 +4,20 @@ Provides advanced reflection analysis and summarization capabilities.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Set
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import json
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 import re
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import DBSCAN
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -29,13 +34,169 @@ class ReflectionPattern:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
 
+class IncrementalClusterer:
+    """Online clustering of sparse, L2-normalized vectors by cosine similarity.
+    
+    Vectors arrive in batches. Each row joins the cluster whose centroid is
+    most similar if that similarity is at least ``1 - eps``; the remaining
+    rows of the batch are grouped with each other (single linkage at the
+    same threshold) into new clusters. Rows stay sparse, and a batch costs
+    one sparse-dense product against the centroids, so memory is bounded
+    by ``clusters x features`` rather than ``reflections x features``.
+    When there are more than ``max_clusters`` clusters, clusters that never
+    grew past one member are dropped as noise.
+    """
+    
+    def __init__(self, dimensions: int, eps: float = 0.3, batch_size: int = 1024, max_clusters: int = 5000):
+        """Initialize the clusterer.
+        
+        Args:
+            dimensions: Number of features per vector
+            eps: Cosine distance within which a vector joins a cluster
+            batch_size: Rows compared against the centroids at once
+            max_clusters: Cluster count above which single-member clusters are dropped
+        """
+        self.dimensions = dimensions
+        self.eps = eps
+        self.batch_size = batch_size
+        self.max_clusters = max_clusters
+        self.size = 0  # Live clusters
+        self.ids = np.zeros(0, dtype=np.int64)  # Stable id of each cluster slot
+        self.counts = np.zeros(0, dtype=np.int64)
+        self._sums = np.zeros((0, dimensions), dtype=np.float32)
+        self.centroids = np.zeros((0, dimensions), dtype=np.float32)
+        self._next_id = 0
+        self.pruned: Set[int] = set()  # Ids dropped by the last partial_fit
+    
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        if needed <= len(self.counts):
+            return
+        capacity = max(needed, 2 * len(self.counts), 64)
+        for name in ("ids", "counts"):
+            grown = np.zeros(capacity, dtype=np.int64)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+        for name in ("_sums", "centroids"):
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+    
+    def _add_to(self, slots: np.ndarray, rows: csr_matrix) -> None:
+        """Add rows to the clusters in ``slots`` and refresh those centroids."""
+        touched, inverse = np.unique(slots, return_inverse=True)
+        membership = csr_matrix((np.ones(len(slots), dtype=np.float32), (inverse, np.arange(len(slots)))),
+                                shape=(len(touched), len(slots)))
+        self._sums[touched] += (membership @ rows).toarray()
+        self.counts[touched] += np.bincount(inverse, minlength=len(touched))
+        norms = np.linalg.norm(self._sums[touched], axis=1, keepdims=True)
+        self.centroids[touched] = self._sums[touched] / np.maximum(norms, 1e-12)
+    
+    def _prune(self) -> None:
+        """Drop single-member clusters, keeping slots contiguous."""
+        keep = self.counts[:self.size] > 1
+        self.pruned.update(self.ids[:self.size][~keep].tolist())
+        kept = int(keep.sum())
+        for name in ("ids", "counts", "_sums", "centroids"):
+            array = getattr(self, name)
+            array[:kept] = array[:self.size][keep]
+            array[kept:self.size] = 0
+        self.size = kept
+    
+    def partial_fit(self, vectors: csr_matrix) -> np.ndarray:
+        """Assign new vectors to clusters.
+        
+        Args:
+            vectors: L2-normalized rows, e.g. TF-IDF vectors
+            
+        Returns:
+            np.ndarray: Stable cluster id of each row
+        """
+        vectors = csr_matrix(vectors, dtype=np.float32)
+        labels = np.empty(vectors.shape[0], dtype=np.int64)
+        self.pruned = set()
+        threshold = 1.0 - self.eps
+        
+        for start in range(0, vectors.shape[0], self.batch_size):
+            batch = vectors[start:start + self.batch_size]
+            slots = np.full(batch.shape[0], -1, dtype=np.int64)
+            if self.size:
+                similarities = batch @ self.centroids[:self.size].T
+                best = similarities.argmax(axis=1)
+                matched = similarities[np.arange(len(best)), best] >= threshold
+                slots[matched] = best[matched]
+            
+            unmatched = np.flatnonzero(slots < 0)
+            if len(unmatched):
+                rows = batch[unmatched]
+                linked = (rows @ rows.T) >= threshold
+                count, components = connected_components(linked, directed=False)
+                self._reserve(count)
+                new_slots = np.arange(self.size, self.size + count)
+                self.ids[new_slots] = np.arange(self._next_id, self._next_id + count)
+                self._next_id += count
+                self.size += count
+                slots[unmatched] = new_slots[components]
+            
+            self._add_to(slots, batch)
+            labels[start:start + batch.shape[0]] = self.ids[slots]
+            if self.size > self.max_clusters:
+                self._prune()
+        
+        if self.pruned:
+            labels[np.isin(labels, list(self.pruned))] = -1
+        return labels
+    
+    def slot_of(self, cluster_id: int) -> Optional[int]:
+        """Current slot of a cluster, or None if it was dropped."""
+        slot = np.searchsorted(self.ids[:self.size], cluster_id)
+        if slot < self.size and self.ids[slot] == cluster_id:
+            return int(slot)
+        return None
+
 class ReflectionAnalyzer:
-    """Analyzes reflections to extract patterns and insights."""
+    """Analyzes reflections to extract patterns and insights.
     
-    def __init__(self, data_dir: str = "data/reflections"):
+    The TF-IDF vocabulary is fitted once enough reflections have been seen
+    and saved to ``vectorizer.json``, so later analyses (and restarts)
+    transform text into the same space instead of refitting. It is refitted
+    when most terms of a batch are unknown to it. ``add_reflections`` feeds new reflections to a
+    long-lived ``IncrementalClusterer`` and only re-derives the patterns of
+    the clusters they joined.
+    """
+    
+    def __init__(self,
+                 data_dir: str = "data/reflections",
+                 eps: float = 0.3,
+                 min_samples: int = 2,
+                 min_fit_documents: int = 50,
+                 max_unknown_share: float = 0.5,
+                 max_occurrences: int = 50,
+                 save_interval: float = 30.0):
+        """Initialize the analyzer.
+        
+        Args:
+            data_dir: Directory for patterns and the fitted vocabulary
+            eps: Cosine distance within which reflections are clustered together
+            min_samples: Smallest cluster reported as a pattern
+            min_fit_documents: Reflections needed before the vocabulary is fitted
+                and saved; smaller analyses before that fit a vocabulary of their own
+            max_unknown_share: Share of a batch's words missing from the vocabulary
+                above which the vocabulary is refitted
+            max_occurrences: Most recent reflections kept with each pattern
+            save_interval: Minimum seconds between pattern saves from ``add_reflections``
+        """
         self.logger = logging.getLogger(__name__)
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.eps = eps
+        self.min_samples = min_samples
+        self.min_fit_documents = min_fit_documents
+        self.max_unknown_share = max_unknown_share
+        self.max_occurrences = max_occurrences
+        self.save_interval = save_interval
+        self._patterns_dirty = False
+        self._last_save = time.monotonic()
         
         # Initialize storage
         self.patterns: Dict[str, ReflectionPattern] = {}
@@ -50,6 +211,15 @@ class ReflectionAnalyzer:
             stop_words='english',
             ngram_range=(1, 2)
         )
+        self._vectorizer_fitted = False
+        self._feature_names = None
+        self._load_vocabulary()
+        
+        # Incremental state
+        self.clusterer: Optional[IncrementalClusterer] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._cluster_members: Dict[int, deque] = {}
+        self._cluster_times: Dict[int, Tuple[datetime, datetime]] = {}
     
     def _load_patterns(self) -> None:
         """Load existing patterns from disk."""
@@ -76,6 +246,81 @@ class ReflectionAnalyzer:
         except Exception as e:
             self.logger.error(f"Error loading patterns: {e}")
     
+    def _load_vocabulary(self) -> None:
+        """Restore the fitted vocabulary and IDF weights, if saved."""
+        try:
+            vocabulary_file = self.data_dir / "vectorizer.json"
+            if vocabulary_file.exists():
+                with open(vocabulary_file, 'r') as f:
+                    data = json.load(f)
+                self.vectorizer.set_params(vocabulary=data["vocabulary"])
+                self.vectorizer.idf_ = np.asarray(data["idf"])
+                self._vectorizer_fitted = True
+                self.logger.info(f"Loaded vocabulary of {len(data['vocabulary'])} terms")
+        except Exception as e:
+            self.logger.error(f"Error loading vocabulary: {e}")
+    
+    def _save_vocabulary(self, documents: int) -> None:
+        """Save the fitted vocabulary and IDF weights."""
+        try:
+            vocabulary_file = self.data_dir / "vectorizer.json"
+            temp_file = vocabulary_file.with_suffix(".tmp")
+            with open(temp_file, 'w') as f:
+                json.dump({
+                    "vocabulary": {term: int(index) for term, index in self.vectorizer.vocabulary_.items()},
+                    "idf": self.vectorizer.idf_.tolist(),
+                    "documents": documents,
+                    "fitted_at": datetime.now().isoformat()
+                }, f)
+            os.replace(temp_file, vocabulary_file)
+        except Exception as e:
+            self.logger.error(f"Error saving vocabulary: {e}")
+    
+    def _unknown_share(self, texts: List[str]) -> float:
+        """Share of the words in texts that the fitted vocabulary does not know."""
+        vocabulary = getattr(self.vectorizer, "vocabulary_", None) or self.vectorizer.vocabulary
+        words = [term for text in texts for term in self.vectorizer.build_analyzer()(text) if " " not in term]
+        if not words:
+            return 0.0
+        return sum(word not in vocabulary for word in words) / len(words)
+    
+    def _vectorize(self, texts: List[str], transient: bool = False):
+        """TF-IDF vectors of texts in the saved vocabulary.
+        
+        The vocabulary is fitted (and saved) when there is none yet, or when
+        most words of the batch are unknown to it, provided the batch has at
+        least ``min_fit_documents`` texts. A smaller ``transient`` batch gets
+        a vocabulary of its own for this call instead.
+        """
+        if self._vectorizer_fitted and self._unknown_share(texts) <= self.max_unknown_share:
+            return self.vectorizer.transform(texts)
+        if transient and len(texts) < self.min_fit_documents:
+            return clone(self.vectorizer).set_params(vocabulary=None).fit_transform(texts)
+        if self._vectorizer_fitted:
+            self.logger.info("Most terms are new; refitting the reflection vocabulary")
+            self._reset_clusters()
+        self.vectorizer.set_params(vocabulary=None)
+        vectors = self.vectorizer.fit_transform(texts)
+        self._vectorizer_fitted = True
+        self._feature_names = None
+        self._save_vocabulary(len(texts))
+        return vectors
+    
+    def _reset_clusters(self) -> None:
+        """Drop incremental clusters, which live in the old vector space."""
+        self.clusterer = None
+        self._cluster_members.clear()
+        self._cluster_times.clear()
+    
+    def refit_vocabulary(self, texts: List[str]) -> None:
+        """Refit the vocabulary, e.g. after the topics of reflections have drifted.
+        
+        Incremental clusters live in the old vector space, so they are reset.
+        """
+        self._vectorizer_fitted = False
+        self._vectorize(texts)
+        self._reset_clusters()
+    
     def analyze_reflections(self, reflections: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze a set of reflections to extract patterns and insights.
         
@@ -90,7 +335,7 @@ class ReflectionAnalyzer:
             texts = [r.get("thought", "") for r in reflections]
             
             # Convert to TF-IDF vectors
-            vectors = self.vectorizer.fit_transform(texts)
+            vectors = self._vectorize(texts, transient=True)
             
             # Cluster similar reflections
             clusters = self._cluster_reflections(vectors)
@@ -120,31 +365,141 @@ class ReflectionAnalyzer:
             }
     
     def _cluster_reflections(self, vectors) -> List[List[int]]:
-        """Cluster similar reflections using DBSCAN.
+        """Cluster similar reflections without densifying their vectors.
         
         Args:
-            vectors: TF-IDF vectors of reflections
+            vectors: TF-IDF vectors of reflections (sparse)
             
         Returns:
             List of clusters, each containing indices of similar reflections
         """
-        # Convert to dense matrix
-        dense_vectors = vectors.toarray()
+        clusterer = IncrementalClusterer(vectors.shape[1], eps=self.eps)
+        labels = clusterer.partial_fit(vectors)
+        
+        # Group indices by cluster, in order of first member
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        boundaries = np.flatnonzero(np.diff(sorted_labels)) + 1
+        clusters = [
+            group.tolist() for group, label in zip(np.split(order, boundaries), sorted_labels[np.r_[0, boundaries]])
+            if label != -1 and len(group) >= self.min_samples  # Skip noise points
+        ] if len(labels) else []
+        return sorted(clusters, key=lambda group: group[0])
+    
+    def add_reflections(self, reflections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fold new reflections into the running clusters.
         
-        # Cluster using DBSCAN
-        clustering = DBSCAN(
-            eps=0.3,
-            min_samples=2,
-            metric='cosine'
-        ).fit(dense_vectors)
+        Only the patterns of clusters the new reflections joined are
+        rebuilt; their ids (``cluster_<n>``) stay the same as they grow.
+        Until ``min_fit_documents`` reflections have arrived they are
+        buffered, so the vocabulary is not fitted on a handful of texts; the
+        same holds for batches mostly made of words the vocabulary lacks,
+        which are clustered once enough have arrived to refit it.
         
-        # Group indices by cluster
-        clusters = defaultdict(list)
-        for idx, label in enumerate(clustering.labels_):
-            if label != -1:  # Skip noise points
-                clusters[label].append(idx)
+        Args:
+            reflections: New reflections
+            
+        Returns:
+            Dictionary with the updated patterns and insights
+        """
+        try:
+            drifted = (self._vectorizer_fitted and
+                       self._unknown_share([r.get("thought", "") for r in reflections]) > self.max_unknown_share)
+            if not self._vectorizer_fitted or self.clusterer is None or drifted:
+                self._pending.extend(reflections)
+                if (not self._vectorizer_fitted or drifted) and len(self._pending) < self.min_fit_documents:
+                    return {"patterns": [], "insights": [], "buffered": len(self._pending), "pattern_count": 0}
+                reflections, self._pending = self._pending, []
+            
+            vectors = self._vectorize([r.get("thought", "") for r in reflections])
+            if self.clusterer is None:
+                self.clusterer = IncrementalClusterer(vectors.shape[1], eps=self.eps)
+            labels = self.clusterer.partial_fit(vectors)
+            
+            for cluster_id in self.clusterer.pruned:
+                self._cluster_members.pop(cluster_id, None)
+                self._cluster_times.pop(cluster_id, None)
+                self.patterns.pop(f"cluster_{cluster_id}", None)
+            
+            touched = set()
+            for reflection, label in zip(reflections, labels.tolist()):
+                if label == -1:
+                    continue
+                members = self._cluster_members.setdefault(label, deque(maxlen=self.max_occurrences))
+                members.append(reflection)
+                timestamp = self._timestamp_of(reflection)
+                if timestamp:
+                    first, last = self._cluster_times.get(label, (timestamp, timestamp))
+                    self._cluster_times[label] = (min(first, timestamp), max(last, timestamp))
+                touched.add(label)
+            
+            patterns = []
+            for cluster_id in sorted(touched):
+                slot = self.clusterer.slot_of(cluster_id)
+                if slot is None or self.clusterer.counts[slot] < self.min_samples:
+                    continue
+                patterns.append(self._cluster_pattern(cluster_id, slot))
+            
+            insights = self._generate_insights(patterns)
+            self._update_patterns(patterns, save=False)
+            
+            return {
+                "patterns": [p.__dict__ for p in patterns],
+                "insights": insights,
+                "cluster_count": int(np.sum(self.clusterer.counts[:self.clusterer.size] >= self.min_samples)),
+                "pattern_count": len(patterns)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error adding reflections: {e}")
+            return {
+                "error": str(e),
+                "patterns": [],
+                "insights": []
+            }
+    
+    def _cluster_pattern(self, cluster_id: int, slot: int) -> ReflectionPattern:
+        """Build the pattern of an incremental cluster from its running state."""
+        occurrences = list(self._cluster_members[cluster_id])
+        size = int(self.clusterer.counts[slot])
+        themes = self._merge_overlapping_terms(self._top_terms(self.clusterer.centroids[slot]))
+        times = self._cluster_times.get(cluster_id)
+        existing = self.patterns.get(f"cluster_{cluster_id}")
+        return ReflectionPattern(
+            pattern_id=f"cluster_{cluster_id}",
+            pattern_type="theme",
+            confidence=min(size / 5.0, 1.0),  # Cap at 5 occurrences
+            occurrences=occurrences,
+            summary=self._generate_pattern_summary(occurrences, themes, size),
+            metadata={
+                "themes": themes,
+                "cluster_size": size,
+                "time_span": self._describe_span(times[1] - times[0]) if times else "unknown"
+            },
+            created_at=existing.created_at if existing else datetime.utcnow()
+        )
+    
+    def _top_terms(self, weights: np.ndarray, count: int = 10) -> List[str]:
+        """Highest-weighted vocabulary terms of a TF-IDF (centroid) vector."""
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        top_indices = np.argpartition(weights, -count)[-count:] if len(weights) > count else np.arange(len(weights))
+        top_indices = top_indices[np.argsort(weights[top_indices])[::-1]]
+        return [self._feature_names[i] for i in top_indices if weights[i] > 0]
+    
+    @staticmethod
+    def _merge_overlapping_terms(terms: List[str]) -> List[str]:
+        """Themes from ranked terms, dropping terms whose words a longer theme already has.
         
-        return list(clusters.values())
+        A cheap stand-in for ``_group_similar_phrases`` on n-grams of one vocabulary.
+        """
+        themes, covered = [], set()
+        for term in sorted(terms, key=lambda term: -len(term.split())):
+            words = set(term.split())
+            if not words <= covered:
+                themes.append(term)
+                covered |= words
+        return themes
     
     def _extract_patterns(self, reflections: List[Dict[str, Any]], clusters: List[List[int]]) -> List[ReflectionPattern]:
         """Extract patterns from reflection clusters.
@@ -173,7 +528,7 @@ class ReflectionAnalyzer:
                 pattern_id=f"pattern_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{cluster_idx}",
                 pattern_type="theme",
                 confidence=confidence,
-                occurrences=cluster_reflections,
+                occurrences=cluster_reflections[-self.max_occurrences:],
                 summary=self._generate_pattern_summary(cluster_reflections, themes),
                 metadata={
                     "themes": themes,
@@ -215,11 +570,12 @@ class ReflectionAnalyzer:
         Returns:
             List of key phrases
         """
-        # Convert to TF-IDF
-        vectors = self.vectorizer.fit_transform([text])
+        # Convert to TF-IDF (with its own vectorizer, keeping the fitted vocabulary intact)
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        vectors = vectorizer.fit_transform([text])
         
         # Get feature names
-        feature_names = self.vectorizer.get_feature_names_out()
+        feature_names = vectorizer.get_feature_names_out()
         
         # Get top phrases
         scores = vectors.toarray()[0]
@@ -236,8 +592,11 @@ class ReflectionAnalyzer:
         Returns:
             List of grouped themes
         """
+        if not phrases:
+            return []
+        
         # Convert to vectors
-        vectors = self.vectorizer.fit_transform(phrases)
+        vectors = TfidfVectorizer(ngram_range=(1, 2)).fit_transform(phrases)
         
         # Cluster similar phrases
         clustering = DBSCAN(
@@ -259,12 +618,14 @@ class ReflectionAnalyzer:
         
         return themes
     
-    def _generate_pattern_summary(self, reflections: List[Dict[str, Any]], themes: List[str]) -> str:
+    def _generate_pattern_summary(self, reflections: List[Dict[str, Any]], themes: List[str],
+                                  occurrence_count: Optional[int] = None) -> str:
         """Generate summary for a pattern.
         
         Args:
             reflections: List of reflections in pattern
             themes: Identified themes
+            occurrence_count: Size of the pattern, if more than the reflections given
             
         Returns:
             Pattern summary
@@ -274,7 +635,7 @@ class ReflectionAnalyzer:
         
         # Generate summary
         summary_parts = [
-            f"Pattern identified with {len(reflections)} occurrences",
+            f"Pattern identified with {occurrence_count or len(reflections)} occurrences",
             f"Themes: {', '.join(themes)}"
         ]
         
@@ -316,21 +677,22 @@ class ReflectionAnalyzer:
         Returns:
             Time span description
         """
-        timestamps = []
-        for reflection in reflections:
-            timestamp = reflection.get("timestamp")
-            if timestamp:
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp)
-                timestamps.append(timestamp)
+        timestamps = [t for t in map(self._timestamp_of, reflections) if t]
         
         if not timestamps:
             return "unknown"
         
-        min_time = min(timestamps)
-        max_time = max(timestamps)
-        span = max_time - min_time
-        
+        return self._describe_span(max(timestamps) - min(timestamps))
+    
+    @staticmethod
+    def _timestamp_of(reflection: Dict[str, Any]) -> Optional[datetime]:
+        timestamp = reflection.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return timestamp or None
+    
+    @staticmethod
+    def _describe_span(span: timedelta) -> str:
         if span.days > 0:
             return f"{span.days} days"
         elif span.seconds > 3600:
@@ -356,7 +718,7 @@ class ReflectionAnalyzer:
                     "summary": pattern.summary,
                     "confidence": pattern.confidence,
                     "themes": pattern.metadata.get("themes", []),
-                    "occurrence_count": len(pattern.occurrences),
+                    "occurrence_count": pattern.metadata.get("cluster_size", len(pattern.occurrences)),
                     "time_span": pattern.metadata.get("time_span"),
                     "created_at": datetime.now().isoformat()
                 }
@@ -364,17 +726,25 @@ class ReflectionAnalyzer:
         
         return insights
     
-    def _update_patterns(self, new_patterns: List[ReflectionPattern]) -> None:
+    def _update_patterns(self, new_patterns: List[ReflectionPattern], save: bool = True) -> None:
         """Update stored patterns with new ones.
         
         Args:
             new_patterns: List of new patterns
+            save: Write the patterns file now rather than leaving it to ``save_patterns``
         """
         # Add new patterns
         for pattern in new_patterns:
             self.patterns[pattern.pattern_id] = pattern
+        self._patterns_dirty = True
         
-        # Save to disk
+        if save or time.monotonic() - self._last_save >= self.save_interval:
+            self.save_patterns()
+    
+    def save_patterns(self) -> None:
+        """Write all stored patterns to disk."""
+        self._patterns_dirty = False
+        self._last_save = time.monotonic()
         try:
             patterns_file = self.data_dir / "patterns.json"
             with open(patterns_file, 'w') as f:
@@ -0,0 +1,205 @@
+"""
+Resource Timeline
+Sweep-line index of scheduled resource usage for fast time-slot search.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+class UsageProfile:
+    """Piecewise-constant usage of a single resource over time.
+
+    ``times`` holds sorted breakpoints (POSIX timestamps) and ``levels[i]`` is
+    the usage on ``[times[i], times[i + 1])``. Usage before the first
+    breakpoint and after the last one is zero.
+    """
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.levels: List[float] = []
+
+    def _split(self, t: float) -> int:
+        """Ensure ``t`` is a breakpoint and return its index."""
+        i = bisect_left(self.times, t)
+        if i < len(self.times) and self.times[i] == t:
+            return i
+        level = self.levels[i - 1] if i > 0 else 0.0
+        self.times.insert(i, t)
+        self.levels.insert(i, level)
+        return i
+
+    def add(self, start: float, end: float, amount: float) -> None:
+        """Add ``amount`` of usage over ``[start, end)``."""
+        if end <= start or not amount:
+            return
+        i = self._split(start)
+        j = self._split(end)
+        levels = self.levels
+        for k in range(i, j):
+            levels[k] += amount
+
+    def usage_at(self, t: float) -> float:
+        """Get usage at time ``t``."""
+        i = bisect_right(self.times, t) - 1
+        return self.levels[i] if i >= 0 else 0.0
+
+    def next_fit(self, t: float, amount: float, limit: float,
+                 duration: float = 0.0) -> Optional[float]:
+        """Find the earliest time >= ``t`` where ``amount`` more usage fits.
+
+        Args:
+            t: Time to start looking from
+            amount: Additional usage required
+            limit: Capacity of the resource
+            duration: How long the usage must fit for (0 checks only the instant)
+
+        Returns:
+            Optional[float]: Earliest fitting time, or None if it never fits
+        """
+        if amount > limit:
+            return None
+
+        times, levels = self.times, self.levels
+        n = len(times)
+        candidate = t
+        i = bisect_right(times, t) - 1
+
+        while True:
+            # Skip segments that are already too full at the candidate time
+            while i >= 0 and i < n and levels[i] + amount > limit:
+                i += 1
+                if i < n:
+                    candidate = times[i]
+            if i >= n:
+                return candidate
+
+            if duration <= 0:
+                return candidate
+
+            # Verify the whole window [candidate, candidate + duration) fits
+            window_end = candidate + duration
+            k = i + 1
+            while k < n and times[k] < window_end:
+                if levels[k] + amount > limit:
+                    break
+                k += 1
+            else:
+                return candidate
+
+            i = k
+            candidate = times[k]
+
+class ResourceTimeline:
+    """Per-resource usage index for a schedule timeline.
+
+    Entries are parsed once when added, so availability queries never
+    re-read the timeline and jump directly to the next breakpoint where
+    capacity frees up instead of stepping through fixed intervals.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None):
+        """Initialize the timeline.
+
+        Args:
+            limits: Capacity per resource type
+        """
+        self.limits: Dict[str, float] = dict(limits or {})
+        self.profiles: Dict[str, UsageProfile] = {}
+
+    @staticmethod
+    def _to_timestamp(value: Any) -> float:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).timestamp()
+        return float(value)
+
+    def add(self, start: Any, end: Any, resources: Dict[str, float]) -> None:
+        """Record resource usage over ``[start, end)``.
+
+        Args:
+            start: Start time (datetime, ISO string or timestamp)
+            end: End time (datetime, ISO string or timestamp)
+            resources: Amount used per resource type
+        """
+        start_ts = self._to_timestamp(start)
+        end_ts = self._to_timestamp(end)
+        for resource_type, amount in resources.items():
+            profile = self.profiles.get(resource_type)
+            if profile is None:
+                profile = self.profiles[resource_type] = UsageProfile()
+            profile.add(start_ts, end_ts, amount)
+
+    def usage_at(self, time: Any) -> Dict[str, float]:
+        """Get usage of every resource type at a point in time."""
+        ts = self._to_timestamp(time)
+        return {
+            resource_type: profile.usage_at(ts)
+            for resource_type, profile in self.profiles.items()
+        }
+
+    def next_available(self,
+                       required_resources: Dict[str, float],
+                       start_time: datetime,
+                       duration: float = 0.0) -> datetime:
+        """Find the earliest time at which all required resources fit.
+
+        Args:
+            required_resources: Amount needed per resource type
+            start_time: Time to start looking from
+            duration: Seconds the resources must stay available (0 checks only the instant)
+
+        Returns:
+            datetime: Earliest time all resources fit. If a requirement exceeds
+            its limit outright, the time after all scheduled usage ends.
+        """
+        candidate = self._to_timestamp(start_time)
+
+        while True:
+            latest = candidate
+            for resource_type, amount in required_resources.items():
+                profile = self.profiles.get(resource_type)
+                limit = self.limits.get(resource_type, float('inf'))
+                if profile is None:
+                    if amount > limit:
+                        logger.warning(f"Requirement for {resource_type} exceeds limit {limit}")
+                    continue
+
+                fit = profile.next_fit(candidate, amount, limit, duration)
+                if fit is None:
+                    logger.warning(f"Requirement for {resource_type} exceeds limit {limit}")
+                    fit = max(candidate, self.end_time())
+                latest = max(latest, fit)
+
+            if latest == candidate:
+                return datetime.fromtimestamp(candidate)
+            candidate = latest
+
+    def end_time(self) -> float:
+        """Get the timestamp after which no usage is scheduled."""
+        return max((p.times[-1] for p in self.profiles.values() if p.times), default=0.0)
+
+    @classmethod
+    def from_entries(cls,
+                     entries: Iterable[Dict[str, Any]],
+                     resources_for: Any,
+                     limits: Optional[Dict[str, float]] = None) -> 'ResourceTimeline':
+        """Build an index from timeline entries with ``start_time``/``end_time``.
+
+        Args:
+            entries: Timeline entries
+            resources_for: Callable returning the resources used by an entry
+            limits: Capacity per resource type
+
+        Returns:
+            ResourceTimeline: Populated index
+        """
+        index = cls(limits)
+        for entry in entries:
+            if entry.get('start_time') and entry.get('end_time'):
+                index.add(entry['start_time'], entry['end_time'], resources_for(entry))
+        return index
@@ -0,0 +1,161 @@
+"""
+Schedule Graph
+Persistent task dependency DAG with incremental cycle detection.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Set, Iterable, Hashable
+
+logger = logging.getLogger(__name__)
+
+class ScheduleDAG:
+    """Dependency DAG that keeps a topological order up to date.
+
+    Edges point from a dependency to its dependent. Every insertion checks
+    for cycles and repairs the order locally (Pearce-Kelly), so the graph
+    never has to be rebuilt or fully re-sorted when a schedule changes.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[Hashable, Any] = {}
+        self.successors: Dict[Hashable, Set[Hashable]] = {}
+        self.predecessors: Dict[Hashable, Set[Hashable]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_index = 0
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def add_node(self, node: Hashable, data: Any = None) -> None:
+        """Add a node or replace its data."""
+        if node not in self.nodes:
+            self.successors[node] = set()
+            self.predecessors[node] = set()
+            self._order[node] = self._next_index
+            self._next_index += 1
+        self.nodes[node] = data
+
+    def add_edge(self, dependency: Hashable, dependent: Hashable) -> None:
+        """Add an edge, rejecting it if it would close a cycle.
+
+        Args:
+            dependency: Node that must come first
+            dependent: Node that depends on it
+
+        Raises:
+            ValueError: If the edge would create a circular dependency
+        """
+        for node in (dependency, dependent):
+            if node not in self.nodes:
+                self.add_node(node)
+        if dependent in self.successors[dependency]:
+            return
+        if dependency == dependent:
+            raise ValueError(f"Circular dependency detected: {dependency} -> {dependent}")
+
+        lower = self._order[dependent]
+        upper = self._order[dependency]
+        if lower < upper:
+            # Order is violated; only nodes ranked between the two can be affected
+            forward = self._reach(dependent, self.successors, upper, above=False,
+                                  target=dependency)
+            backward = self._reach(dependency, self.predecessors, lower, above=True)
+            self._reorder(backward, forward)
+
+        self.successors[dependency].add(dependent)
+        self.predecessors[dependent].add(dependency)
+
+    def remove_edge(self, dependency: Hashable, dependent: Hashable) -> None:
+        """Remove an edge if present."""
+        self.successors.get(dependency, set()).discard(dependent)
+        self.predecessors.get(dependent, set()).discard(dependency)
+
+    def set_dependencies(self, node: Hashable, dependencies: Iterable[Hashable]) -> None:
+        """Replace the incoming edges of a node.
+
+        The graph is left unchanged if any new edge would create a cycle.
+        """
+        new = set(dependencies)
+        old = set(self.predecessors.get(node, set()))
+        for dep in old - new:
+            self.remove_edge(dep, node)
+        added = []
+        try:
+            for dep in new - old:
+                self.add_edge(dep, node)
+                added.append(dep)
+        except ValueError:
+            for dep in added:
+                self.remove_edge(dep, node)
+            for dep in old - new:
+                self.add_edge(dep, node)
+            raise
+
+    def _reach(self, start: Hashable, edges: Dict[Hashable, Set[Hashable]],
+               bound: int, above: bool, target: Optional[Hashable] = None) -> List[Hashable]:
+        """Collect nodes reachable from ``start`` within the order bound."""
+        seen = {start}
+        stack = [start]
+        visited = []
+        while stack:
+            node = stack.pop()
+            visited.append(node)
+            for nxt in edges[node]:
+                if nxt == target:
+                    raise ValueError(
+                        f"Circular dependency detected: {target} -> {start} -> ... -> {target}"
+                    )
+                rank = self._order[nxt]
+                in_range = rank > bound if above else rank < bound
+                if nxt not in seen and in_range:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return visited
+
+    def _reorder(self, backward: List[Hashable], forward: List[Hashable]) -> None:
+        """Reassign the affected ranks so ``backward`` precedes ``forward``."""
+        backward.sort(key=self._order.__getitem__)
+        forward.sort(key=self._order.__getitem__)
+        ranks = sorted(self._order[n] for n in backward + forward)
+        for node, rank in zip(backward + forward, ranks):
+            self._order[node] = rank
+
+    def topological_order(self, nodes: Optional[Iterable[Hashable]] = None) -> List[Hashable]:
+        """Get nodes in dependency order.
+
+        Args:
+            nodes: Restrict the result to these nodes (default all)
+        """
+        selected = self.nodes.keys() if nodes is None else nodes
+        return sorted(selected, key=self._order.__getitem__)
+
+    def descendants(self, sources: Iterable[Hashable]) -> Set[Hashable]:
+        """Get the downstream cone of ``sources``, including the sources."""
+        cone = set()
+        stack = [s for s in sources if s in self.nodes]
+        while stack:
+            node = stack.pop()
+            if node in cone:
+                continue
+            cone.add(node)
+            stack.extend(self.successors[node])
+        return cone
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]], key: str) -> 'ScheduleDAG':
+        """Build a graph from dicts with an ID field and ``dependencies``.
+
+        Dependencies on IDs outside ``items`` are ignored.
+        """
+        graph = cls()
+        items = list(items)
+        for item in items:
+            graph.add_node(item[key], item)
+        for item in items:
+            for dep_id in item.get('dependencies', []) or []:
+                if dep_id in graph.nodes:
+                    graph.add_edge(dep_id, item[key])
+        return graph
@@ -0,0 +1,108 @@
+"""
+Schedule Plan
+Persistent planning state of a goal schedule and incremental re-planning.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.resource_timeline import ResourceTimeline
+from core.schedule_graph import ScheduleDAG
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SchedulePlan:
+    """Persistent planning state kept per goal schedule.
+
+    Attributes:
+        graph: Subtask dependency DAG
+        resource_index: Resource usage of the placed subtasks
+        anchor: Earliest start time of the schedule
+        end_times: Planned end time per subtask
+        usage: Placed (start, end, resources) per subtask
+    """
+    graph: ScheduleDAG
+    resource_index: ResourceTimeline
+    anchor: datetime
+    end_times: Dict[str, datetime] = field(default_factory=dict)
+    usage: Dict[str, Tuple[datetime, datetime, Dict[str, float]]] = field(default_factory=dict)
+
+    def record(self, task_id: str, start_time: datetime, end_time: datetime,
+               resources: Dict[str, float]) -> None:
+        """Record a subtask's placement and its resource usage."""
+        self.resource_index.add(start_time, end_time, resources)
+        self.end_times[task_id] = end_time
+        self.usage[task_id] = (start_time, end_time, resources)
+
+    def release(self, task_id: str) -> None:
+        """Remove a subtask's placement and give back its resources."""
+        placed = self.usage.pop(task_id, None)
+        self.end_times.pop(task_id, None)
+        if placed:
+            start_time, end_time, resources = placed
+            self.resource_index.add(start_time, end_time, {k: -v for k, v in resources.items()})
+
+    def replan(self,
+               tasks: Dict[str, Dict[str, Any]],
+               timeline: List[Dict[str, Any]],
+               task_updates: Dict[str, Dict[str, Any]],
+               place: Callable[[Dict[str, Any], 'SchedulePlan'], Dict[str, Any]]) -> List[str]:
+        """Apply subtask changes and re-place only their downstream cone.
+
+        Either every update is applied or none is: unknown subtasks are
+        rejected before anything changes, and dependency changes already
+        made to the graph are undone if a later one would create a cycle.
+
+        Args:
+            tasks: Subtask ID to subtask of the schedule
+            timeline: Timeline entries of the schedule, updated in place
+            task_updates: Changed fields per subtask ID, e.g.
+                ``{'sub_1': {'estimated_duration': 30}}``
+            place: Places a subtask in this plan and returns its timeline entry
+
+        Returns:
+            List[str]: IDs of re-placed subtasks in dependency order
+
+        Raises:
+            ValueError: If a subtask is unknown or a new dependency creates a cycle
+        """
+        unknown = [task_id for task_id in task_updates if task_id not in tasks]
+        if unknown:
+            raise ValueError(f"Subtasks not found in schedule: {', '.join(unknown)}")
+
+        replaced = []
+        try:
+            for task_id, changes in task_updates.items():
+                if 'dependencies' in changes:
+                    previous = set(self.graph.predecessors[task_id])
+                    self.graph.set_dependencies(
+                        task_id, [dep for dep in changes['dependencies'] if dep in self.graph]
+                    )
+                    replaced.append((task_id, previous))
+        except ValueError:
+            # Restoring in reverse only ever returns to an earlier acyclic graph
+            for task_id, previous in reversed(replaced):
+                self.graph.set_dependencies(task_id, previous)
+            raise
+
+        for task_id, changes in task_updates.items():
+            tasks[task_id].update(changes)
+
+        affected = self.graph.topological_order(self.graph.descendants(task_updates))
+
+        # Release the affected tasks before re-placing them
+        for task_id in affected:
+            self.release(task_id)
+
+        entries = {entry['task_id']: entry for entry in timeline}
+        for task_id in affected:
+            entry = place(tasks[task_id], self)
+            if task_id in entries:
+                entries[task_id].update(entry)
+            else:
+                timeline.append(entry)
+
+        return affected
@@ -0,0 +1,257 @@
+"""
+LLM Client
+Pooled chat-completion client and content-addressed response cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from core.utils.cache import cache_registry
+
+logger = logging.getLogger(__name__)
+
+class ChatCompletionClient:
+    """Chat-completion client sharing one connection-pooled session.
+
+    Requests are retried with exponential backoff and jitter; rate-limit
+    responses honour the server's ``Retry-After`` header.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str],
+                 api_base: str = "https://api.openai.com/v1",
+                 timeout: float = 30,
+                 retry_attempts: int = 3,
+                 retry_delay: float = 1,
+                 max_connections: int = 20):
+        """Initialize the client.
+
+        Args:
+            api_key: Bearer token for the API
+            api_base: Base URL of the API
+            timeout: Total request timeout in seconds
+            retry_attempts: Attempts per request
+            retry_delay: Base delay for exponential backoff in seconds
+            max_connections: Size of the connection pool
+        """
+        self.api_key = api_key
+        self.api_base = api_base.rstrip('/')
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"Content-Type": "application/json"},
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            )
+        return self._session
+
+    def _backoff(self, attempt: int) -> float:
+        return self.retry_delay * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def complete(self, request_data: Dict[str, Any]) -> str:
+        """Send a chat-completion request.
+
+        Args:
+            request_data: Request payload
+
+        Returns:
+            str: Content of the first choice
+
+        Raises:
+            Exception: If the API returns an error or all attempts fail
+        """
+        url = f"{self.api_base}/chat/completions"
+        for attempt in range(self.retry_attempts):
+            last_attempt = attempt == self.retry_attempts - 1
+            try:
+                async with self.session.post(
+                    url,
+                    json=request_data,
+                    headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else None,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        return result['choices'][0]['message']['content']
+
+                    try:
+                        error_data = await response.json()
+                        error_msg = error_data.get('error', {}).get('message', 'Unknown error')
+                    except (aiohttp.ContentTypeError, ValueError):
+                        error_msg = await response.text()
+                    logger.error(f"API error (attempt {attempt + 1}): {error_msg}")
+
+                    if response.status == 429 or response.status >= 500:
+                        if last_attempt:
+                            raise Exception(f"API error: {error_msg}")
+                        retry_after = response.headers.get('Retry-After')
+                        try:
+                            delay = float(retry_after) if retry_after else self._backoff(attempt)
+                        except ValueError:
+                            delay = self._backoff(attempt)
+                        await asyncio.sleep(delay)
+                        continue
+
+                    raise Exception(f"API error: {error_msg}")
+
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                logger.error(f"Request failed (attempt {attempt + 1}): {e!r}")
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+        raise Exception("Failed to generate text after all retry attempts")
+
+    async def close(self) -> None:
+        """Close the shared session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+class LLMResponseCache:
+    """Content-addressed cache of LLM responses.
+
+    Entries are keyed by a hash of the full request (model, messages and
+    sampling parameters). A bounded in-memory tier sits in front of an
+    optional on-disk tier of one JSON file per response, and concurrent
+    misses for the same request share a single generation.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[Path] = None,
+                 ttl_seconds: float = 86400,
+                 max_memory_entries: int = 1000,
+                 namespace: str = "llm.responses"):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory of the on-disk tier (None for memory only)
+            ttl_seconds: Seconds a response stays valid in either tier
+            max_memory_entries: Size of the in-memory tier
+            namespace: Cache namespace of the in-memory tier
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.memory = cache_registry.namespace(namespace, max_memory_entries, ttl_seconds)
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    @staticmethod
+    def key_for(request_data: Dict[str, Any]) -> str:
+        """Get the content address of a request."""
+        payload = json.dumps(request_data, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {path}: {e}")
+            return None
+        if time.time() - entry.get('created_at', 0) >= self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, request_data: Dict[str, Any], response: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'created_at': time.time(),
+                'model': request_data.get('model'),
+                'response': response
+            }, f)
+        os.replace(tmp_path, path)
+
+    async def get_or_generate(self, request_data: Dict[str, Any],
+                              generate: Callable[[], Awaitable[str]]) -> str:
+        """Get the cached response for a request, generating it on a miss.
+
+        Args:
+            request_data: Request payload the response is keyed by
+            generate: Produces the response on a miss
+
+        Returns:
+            str: Cached or freshly generated response
+        """
+        key = self.key_for(request_data)
+
+        async def load() -> str:
+            if self.cache_dir:
+                entry = await asyncio.to_thread(self._read_disk, key)
+                if entry is not None:
+                    self.disk_hits += 1
+                    return entry['response']
+
+            response = await generate()
+            if self.cache_dir:
+                try:
+                    await asyncio.to_thread(self._write_disk, key, request_data, response)
+                    self.disk_writes += 1
+                except OSError as e:
+                    logger.warning(f"Failed to write LLM cache entry: {e}")
+            return response
+
+        return await self.memory.get_or_compute_async(key, load)
+
+    def invalidate(self, request_data: Dict[str, Any]) -> None:
+        """Drop a request's response from both tiers."""
+        key = self.key_for(request_data)
+        self.memory.delete(key)
+        if self.cache_dir:
+            self._path(key).unlink(missing_ok=True)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the on-disk tier.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        if not self.cache_dir:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics for both tiers."""
+        stats = self.memory.stats()
+        stats.update({
+            'disk_hits': self.disk_hits,
+            'disk_writes': self.disk_writes
+        })
+        return stats
@@ -5,16 +5,15 @@ Provides text generation capabilities using language models.
 
 import logging
 import os
-import json
-import asyncio
+import time
 from typing import Dict, Any, Optional
 from pathlib import Path
 import yaml
-import aiohttp
 from datetime import datetime
 
 from core.service_locator import service_locator
 from core.reflection import reflection_system
+from core.services.llm_client import ChatCompletionClient, LLMResponseCache
 
 class LLMService:
     def __init__(self):
@@ -26,14 +25,22 @@ class LLMService:
         self.timeout = self.config.get('timeout', 30)
         self.retry_attempts = self.config.get('retry_attempts', 3)
         self.retry_delay = self.config.get('retry_delay', 1)
+        self.cache_enabled = self.config.get('cache_enabled', True)
         
         # Load API key from environment
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             self.logger.warning("OPENAI_API_KEY not found in environment variables")
             
-        # Initialize session
-        self.session = None
+        # Responses are keyed by the full request and kept in memory and on disk
+        self.response_cache = LLMResponseCache(
+            cache_dir=Path(self.config.get('cache_dir', 'data/llm_cache')),
+            ttl_seconds=self.config.get('cache_ttl', 86400),
+            max_memory_entries=self.config.get('cache_max_size', 1000)
+        )
+        
+        # Initialize client
+        self.client: Optional[ChatCompletionClient] = None
         
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -62,12 +69,7 @@ class LLMService:
             if not self.api_key:
                 raise ValueError("OpenAI API key not configured")
                 
-            self.session = aiohttp.ClientSession(
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
+            self.client = self._create_client()
             
             self.logger.info(f"Initialized LLM service with model {self.model}")
             
@@ -88,7 +90,7 @@ class LLMService:
             ValueError: If service is not initialized
             Exception: For other errors
         """
-        if not self.session:
+        if not self.client:
             raise ValueError("LLM service not initialized")
             
         # Get model-specific settings
@@ -122,57 +124,42 @@ class LLMService:
             }
         )
         
-        # Retry loop
-        for attempt in range(self.retry_attempts):
-            try:
-                async with self.session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    json=request_data,
-                    timeout=self.timeout
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        generated_text = result['choices'][0]['message']['content']
-                        
-                        # Log success
-                        reflection_system.log_thought(
-                            "llm_service",
-                            "Successfully generated text",
-                            {
-                                "model": self.model,
-                                "response_length": len(generated_text),
-                                "attempt": attempt + 1
-                            }
-                        )
-                        
-                        return generated_text
-                        
-                    else:
-                        error_data = await response.json()
-                        error_msg = error_data.get('error', {}).get('message', 'Unknown error')
-                        self.logger.error(f"API error (attempt {attempt + 1}): {error_msg}")
-                        
-                        if response.status == 429:  # Rate limit
-                            await asyncio.sleep(self.retry_delay * (attempt + 1))
-                            continue
-                            
-                        raise Exception(f"API error: {error_msg}")
-                        
-            except asyncio.TimeoutError:
-                self.logger.error(f"Timeout (attempt {attempt + 1})")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                raise
-                
-            except Exception as e:
-                self.logger.error(f"Error generating text (attempt {attempt + 1}): {e}")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                raise
-                
-        raise Exception("Failed to generate text after all retry attempts")
+        start_time = time.monotonic()
+        if self.cache_enabled:
+            generated_text = await self.response_cache.get_or_generate(
+                request_data,
+                lambda: self.client.complete(request_data)
+            )
+        else:
+            generated_text = await self.client.complete(request_data)
+            
+        # Log success
+        reflection_system.log_thought(
+            "llm_service",
+            "Successfully generated text",
+            {
+                "model": self.model,
+                "response_length": len(generated_text),
+                "duration": time.monotonic() - start_time
+            }
+        )
+        
+        return generated_text
+        
+    def _create_client(self) -> ChatCompletionClient:
+        """Create the pooled API client from the current settings."""
+        return ChatCompletionClient(
+            api_key=self.api_key,
+            api_base=self.config.get('api_base', 'https://api.openai.com/v1'),
+            timeout=self.timeout,
+            retry_attempts=self.retry_attempts,
+            retry_delay=self.retry_delay,
+            max_connections=self.config.get('max_connections', 20)
+        )
+        
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics."""
+        return self.response_cache.stats()
         
     def configure(self, config: Dict[str, Any]) -> None:
         """Configure the LLM service.
@@ -192,6 +179,18 @@ class LLMService:
             if 'api_key' in config:
                 self.api_key = config['api_key']
                 
+            if 'api_base' in config:
+                self.config['api_base'] = config['api_base']
+            self.cache_enabled = config.get('cache_enabled', self.cache_enabled)
+                
+            # The client reads its settings per request, so the pooled session is kept
+            if self.client:
+                self.client.api_key = self.api_key
+                self.client.api_base = self.config.get('api_base', self.client.api_base).rstrip('/')
+                self.client.timeout = self.timeout
+                self.client.retry_attempts = self.retry_attempts
+                self.client.retry_delay = self.retry_delay
+                
             self.logger.info(f"Updated LLM service configuration: {config}")
             
         except Exception as e:
@@ -200,9 +199,9 @@ class LLMService:
             
     async def cleanup(self) -> None:
         """Clean up resources."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        if self.client:
+            await self.client.close()
+            self.client = None
 
 # Create and register service instance
 llm_service = LLMService()
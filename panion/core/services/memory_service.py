@@ -4,13 +4,19 @@ Centralizes memory management and operations.
 """
 
 import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, Callable, Tuple
 import json
 import asyncio
-from difflib import SequenceMatcher
 from pathlib import Path
 from ..plugin.types import PluginError, PluginErrorType
+from ..memory.near_duplicates import (
+    NearDuplicateIndex, compute_signatures, memory_similarity, verify_pairs
+)
 
 from ..core.base import BaseComponent, ComponentState
 from ..core.memory import (
@@ -18,6 +24,34 @@ from ..core.memory import (
     MemoryQuery, ReflectionType
 )
 
+MEMORY_WORKERS = int(os.environ.get("PANION_MEMORY_WORKERS", 0)) or None
+# Work items per process pool task, large enough to amortize pickling
+SIGNATURE_BATCH = 500
+VERIFY_BATCH = 2000
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the worker processes that sign and compare memories off the event loop."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=MEMORY_WORKERS)
+        return _process_pool
+
+def _reset_process_pool() -> None:
+    """Drop a broken pool so the next call starts fresh workers."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def _similarity_record(memory: MemoryEntry) -> Tuple[Any, Optional[Dict[str, Any]], Optional[List[str]]]:
+    """The picklable parts of a memory that similarity looks at."""
+    return (memory.content, memory.metadata, list(memory.tags) if memory.tags else None)
+
 class MemoryService(BaseComponent):
     """Service for centralized memory management."""
     
@@ -38,6 +72,9 @@ class MemoryService(BaseComponent):
         self._last_cleanup: Optional[datetime] = None
         self.data_dir = Path(data_dir)
         self.memory: Dict[str, Dict[str, Any]] = {}
+        # MinHash/LSH index of memory content, updated as memories appear and go;
+        # its banding is derived from the compression threshold
+        self._duplicate_index = NearDuplicateIndex.for_threshold(self._compression_threshold)
         self._ensure_data_dir()
     
     def _ensure_data_dir(self) -> None:
@@ -132,6 +169,7 @@ class MemoryService(BaseComponent):
             # Remove memories
             for memory in memories:
                 await self._memory_manager.forget(memory.id)
+            self._unindex_memories([memory.id for memory in memories])
             
             self.logger.info(f"Removed {len(memories)} oldest memories")
             
@@ -156,6 +194,12 @@ class MemoryService(BaseComponent):
                 )
             )
             
+            # Forget index entries of memories removed elsewhere
+            current_ids = {memory.id for memory in memories}
+            self._unindex_memories([
+                key for key in self._duplicate_index.keys() if key not in current_ids
+            ])
+            
             # Group memories by category
             memories_by_category: Dict[MemoryCategory, List[MemoryEntry]] = {}
             for memory in memories:
@@ -182,38 +226,97 @@ class MemoryService(BaseComponent):
         except Exception as e:
             self.logger.error(f"Error compressing similar memories: {e}")
     
+    async def _run_cpu(self, func: Callable, *args):
+        """Run CPU-bound work in the process pool without blocking the event loop.
+
+        Falls back to a thread when worker processes are unavailable.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(get_process_pool(), func, *args)
+        except (BrokenProcessPool, OSError) as e:
+            self.logger.warning(f"Memory worker processes unavailable, using a thread: {e}")
+            _reset_process_pool()
+            return await asyncio.to_thread(func, *args)
+
+    async def _index_memories(self, memories: List[MemoryEntry]) -> None:
+        """Sign memories that are new or changed since they were last indexed."""
+        index = self._duplicate_index
+        pending = [m for m in memories if not index.is_current(m.id, str(m.content), m.category)]
+        if not pending:
+            return
+        batches = [pending[start:start + SIGNATURE_BATCH]
+                   for start in range(0, len(pending), SIGNATURE_BATCH)]
+        results = await asyncio.gather(*(
+            self._run_cpu(compute_signatures, [str(m.content) for m in batch],
+                          index.num_perm, index.seed, index.shingle_size)
+            for batch in batches
+        ))
+        for batch, signatures in zip(batches, results):
+            for memory, signature in zip(batch, signatures):
+                index.add(memory.id, str(memory.content), signature, group=memory.category)
+        self.logger.debug(f"Indexed {len(pending)} memories for near-duplicate detection")
+
+    def _unindex_memories(self, memory_ids: List[str]) -> None:
+        """Drop memories from the near-duplicate index."""
+        for memory_id in memory_ids:
+            self._duplicate_index.remove(memory_id)
+
     async def _find_similar_memories(
         self,
         memories: List[MemoryEntry]
     ) -> List[List[MemoryEntry]]:
-        """Find groups of similar memories."""
+        """Find groups of similar memories.
+
+        Only pairs that share an LSH band are compared; the comparisons run
+        in worker processes. Each group is the earliest unprocessed memory
+        and every later one similar to it, as with a full pairwise scan.
+        """
         try:
+            await self._index_memories(memories)
+            by_id = {memory.id: memory for memory in memories}
+            candidates = set()
+            for category in {memory.category for memory in memories}:
+                candidates.update(
+                    pair for pair in self._duplicate_index.candidate_pairs(category)
+                    if pair[0] in by_id and pair[1] in by_id
+                )
+            if not candidates:
+                return []
+
+            pairs = sorted(candidates)
+            records = {key: _similarity_record(by_id[key]) for pair in pairs for key in pair}
+            results = await asyncio.gather(*(
+                self._run_cpu(verify_pairs, pairs[start:start + VERIFY_BATCH], records,
+                              self._compression_threshold)
+                for start in range(0, len(pairs), VERIFY_BATCH)
+            ))
+
+            neighbours: Dict[str, Set[str]] = {}
+            for matches in results:
+                for first, second, _ in matches:
+                    neighbours.setdefault(first, set()).add(second)
+                    neighbours.setdefault(second, set()).add(first)
+            self.logger.debug(
+                f"Verified {len(pairs)} candidate pairs of {len(memories)} memories, "
+                f"{sum(len(m) for m in results)} similar"
+            )
+
             similar_groups: List[List[MemoryEntry]] = []
             processed = set()
-            
-            for i, memory1 in enumerate(memories):
-                if memory1.id in processed:
+            position = {memory.id: i for i, memory in enumerate(memories)}
+            for memory1 in memories:
+                if memory1.id in processed or memory1.id not in neighbours:
                     continue
-                
-                current_group = [memory1]
                 processed.add(memory1.id)
-                
-                for memory2 in memories[i+1:]:
-                    if memory2.id in processed:
-                        continue
-                    
-                    # Calculate similarity
-                    similarity = await self._calculate_similarity(
-                        memory1, memory2
-                    )
-                    
-                    if similarity >= self._compression_threshold:
-                        current_group.append(memory2)
-                        processed.add(memory2.id)
-                
+                current_group = [memory1]
+                for other in sorted(neighbours[memory1.id], key=position.__getitem__):
+                    if other not in processed and position[other] > position[memory1.id]:
+                        current_group.append(by_id[other])
+                        processed.add(other)
                 if len(current_group) > 1:
                     similar_groups.append(current_group)
-            
+
             return similar_groups
             
         except Exception as e:
@@ -227,40 +330,7 @@ class MemoryService(BaseComponent):
     ) -> float:
         """Calculate similarity between two memories."""
         try:
-            # Compare content
-            content_similarity = SequenceMatcher(
-                None,
-                memory1.content,
-                memory2.content
-            ).ratio()
-            
-            # Compare metadata
-            metadata_similarity = 0.0
-            if memory1.metadata and memory2.metadata:
-                common_keys = set(memory1.metadata.keys()) & set(memory2.metadata.keys())
-                if common_keys:
-                    metadata_similarity = sum(
-                        1 for key in common_keys
-                        if memory1.metadata[key] == memory2.metadata[key]
-                    ) / len(common_keys)
-            
-            # Compare tags
-            tag_similarity = 0.0
-            if memory1.tags and memory2.tags:
-                common_tags = set(memory1.tags) & set(memory2.tags)
-                if common_tags:
-                    tag_similarity = len(common_tags) / max(
-                        len(memory1.tags),
-                        len(memory2.tags)
-                    )
-            
-            # Calculate weighted average
-            return (
-                content_similarity * 0.6 +
-                metadata_similarity * 0.2 +
-                tag_similarity * 0.2
-            )
-            
+            return memory_similarity(_similarity_record(memory1), _similarity_record(memory2))
         except Exception as e:
             self.logger.error(f"Error calculating memory similarity: {e}")
             return 0.0
@@ -293,6 +363,7 @@ class MemoryService(BaseComponent):
             # Remove original memories
             for memory in group:
                 await self._memory_manager.forget(memory.id)
+            self._unindex_memories([memory.id for memory in group])
             
             self.logger.info(
                 f"Compressed {len(group)} memories into one"
@@ -338,6 +409,9 @@ class MemoryService(BaseComponent):
             if not 0 <= threshold <= 1:
                 raise ValueError("Threshold must be between 0 and 1")
             
+            if threshold != self._compression_threshold:
+                # Banding depends on the threshold; memories are re-signed at the next cleanup
+                self._duplicate_index = NearDuplicateIndex.for_threshold(threshold)
             self._compression_threshold = threshold
             self.logger.info(f"Compression threshold set to {threshold}")
             
@@ -0,0 +1,131 @@
+"""
+Task Store
+SQLite persistence for background tasks, with time-based retention.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.utils.sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a task never changes again
+TERMINAL_STATUSES = frozenset({"completed", "error", "cancelled", "interrupted"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    finished_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_finished ON tasks (finished_at);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, finished_at);
+"""
+
+class TaskStore(SQLiteStore):
+    """Stores task records in SQLite.
+
+    Each task is one row keyed by id, with the full record as JSON and the
+    status and finish time as indexed columns, so lookups and paginated
+    listings never load more than a page. Finished tasks are deleted once
+    they are older than the retention period; the purge runs at most once
+    per ``purge_interval`` as a side effect of saving.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 retention_seconds: Optional[float] = 7 * 24 * 3600,
+                 purge_interval: float = 300,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the store.
+
+        Args:
+            db_path: SQLite database file, or ":memory:"
+            retention_seconds: Seconds finished tasks are kept (None keeps them forever)
+            purge_interval: Minimum seconds between automatic purges
+            clock: Wall clock in epoch seconds
+        """
+        super().__init__(db_path, _SCHEMA, purge_interval, clock)
+        self.retention_seconds = retention_seconds
+
+    def save(self, task: Dict[str, Any]) -> None:
+        """Insert or replace a task record.
+
+        Args:
+            task: Task record with at least ``id``, ``status`` and ``created_at``
+        """
+        finished_at = self._clock() if task["status"] in TERMINAL_STATUSES else None
+        data = json.dumps(task, default=str)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tasks (id, status, created_at, finished_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (task["id"], task["status"], task["created_at"], finished_at, data)
+                )
+            if finished_at is not None:
+                self._purge_if_due(conn, finished_at)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task record by id, or None if it is unknown or was purged."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT data FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(self,
+             status: Optional[str] = None,
+             limit: int = 50,
+             offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """List finished tasks, most recently finished first.
+
+        Args:
+            status: Only include tasks with this status
+            limit: Maximum number of tasks to return
+            offset: Number of tasks to skip
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The page of tasks and the total count
+        """
+        where = "finished_at IS NOT NULL"
+        params: List[Any] = []
+        if status:
+            where += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT data FROM tasks WHERE {where} ORDER BY finished_at DESC, id LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Get tasks that were saved but never finished, oldest first."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT data FROM tasks WHERE finished_at IS NULL ORDER BY created_at, id"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _delete_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """Delete finished tasks older than the retention period."""
+        if self.retention_seconds is None:
+            return 0
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.retention_seconds,)
+            )
+        if cursor.rowcount:
+            logger.info(f"Purged {cursor.rowcount} expired tasks")
+        return cursor.rowcount
@@ -7,10 +7,11 @@ import logging
 import functools
 import asyncio
 from typing import Any, Callable, Dict, Optional, TypeVar, List
-from datetime import datetime, timedelta
 import json
 from pathlib import Path
 
+from .cache import cache_result as _cache_result
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -43,45 +44,17 @@ def with_connection_pool(pool_name: str):
         return wrapper
     return decorator
 
-def cache_result(ttl_seconds: int = 300):
+def cache_result(ttl_seconds: int = 300, max_size: int = 1000):
     """Decorator for caching function results.
     
     Args:
         ttl_seconds: Time to live in seconds for cached results
+        max_size: Maximum number of cached results
         
     Returns:
         Callable: The wrapped function
     """
-    cache: Dict[str, Dict[str, Any]] = {}
-    
-    def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs) -> Any:
-            # Create cache key from function name and arguments
-            key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            
-            # Check if result is cached and not expired
-            if key in cache:
-                entry = cache[key]
-                if datetime.now() < entry['expires']:
-                    return entry['result']
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            cache[key] = {
-                'result': result,
-                'expires': datetime.now() + timedelta(seconds=ttl_seconds)
-            }
-            
-            # Cleanup expired entries
-            for k in list(cache.keys()):
-                if datetime.now() >= cache[k]['expires']:
-                    del cache[k]
-            
-            return result
-            
-        return wrapper
-    return decorator
+    return _cache_result(ttl_seconds=ttl_seconds, max_size=max_size)
 
 def with_retry(max_retries: int = 3, delay: float = 1.0):
     """Decorator for retrying failed operations.
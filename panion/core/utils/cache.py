@@ -0,0 +1,316 @@
+"""
+Result Cache
+LRU/TTL caches with single-flight loading, shared by decorators and services.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_MISSING = object()
+
+def make_key(*args: Any, **kwargs: Any) -> str:
+    """Build a stable, fixed-length cache key from call arguments.
+
+    Arguments are serialized as sorted JSON (falling back to ``repr`` for
+    objects JSON cannot encode) and hashed, so equal dicts give equal keys
+    regardless of insertion order and large prompts do not bloat the cache.
+    Arguments JSON cannot key, such as dicts with tuple or mixed-type keys,
+    fall back to their ``repr``.
+    """
+    try:
+        payload = json.dumps([args, kwargs], sort_keys=True, default=repr, separators=(',', ':'))
+    except (TypeError, ValueError):
+        payload = repr((args, sorted(kwargs.items())))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class _Flight:
+    """A synchronous computation that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL.
+
+    Lookups, inserts and evictions are O(1): entries live in an
+    ``OrderedDict`` in recency order, so the least recently used entry is
+    always first. The lock only guards the dict; it is never held while a
+    value is being computed.
+    """
+
+    def __init__(self,
+                 max_size: int = 1000,
+                 ttl_seconds: Optional[float] = 300,
+                 name: str = "",
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl_seconds: Seconds an entry stays valid (None for no expiry)
+            name: Namespace name used in stats
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.joins = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, record=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, record: bool = True) -> Any:
+        """Get a cached value, refreshing its recency.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is missing or expired
+            record: Whether to count the lookup in hit/miss stats
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    if record:
+                        self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            if record:
+                self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Override of the cache's TTL for this entry
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self._clock() + ttl if ttl is not None else float('inf')
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            now = self._clock()
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def get_or_compute(self, key: Hashable, factory: Callable[[], T],
+                       ttl_seconds: Optional[float] = None) -> T:
+        """Get a value, computing it once for all concurrent callers on a miss.
+
+        Args:
+            key: Cache key
+            factory: Computes the value on a miss
+            ttl_seconds: Override of the cache's TTL for this entry
+
+        Returns:
+            The cached or freshly computed value. Errors are not cached and
+            are raised to every caller waiting on the computation.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.joins += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = factory()
+            self.set(key, flight.result, ttl_seconds)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def get_or_compute_async(self, key: Hashable, factory: Callable[[], Awaitable[T]],
+                                   ttl_seconds: Optional[float] = None) -> T:
+        """Async variant of ``get_or_compute``; concurrent misses share one await."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        loop = asyncio.get_running_loop()
+        future = self._async_flights.get(key)
+        if future is not None and future.get_loop() is loop:
+            self.joins += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled; compute it ourselves
+                    return await self.get_or_compute_async(key, factory, ttl_seconds)
+                raise
+
+        future = loop.create_future()
+        self._async_flights[key] = future
+        try:
+            result = await factory()
+            self.set(key, result, ttl_seconds)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure is not logged
+            future.exception()
+            raise
+        finally:
+            if self._async_flights.get(key) is future:
+                del self._async_flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "joins": self.joins
+            }
+
+class CacheRegistry:
+    """Named cache namespaces, so each cached function gets its own bounds and stats."""
+
+    def __init__(self):
+        self._caches: Dict[str, TTLCache] = {}
+        self._lock = threading.Lock()
+
+    def namespace(self, name: str, max_size: int = 1000,
+                  ttl_seconds: Optional[float] = 300) -> TTLCache:
+        """Get or create the cache for a namespace."""
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = self._caches[name] = TTLCache(max_size, ttl_seconds, name=name)
+            return cache
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """Clear one namespace, or all of them."""
+        with self._lock:
+            if name is None:
+                caches = list(self._caches.values())
+            else:
+                caches = [self._caches[name]] if name in self._caches else []
+        for cache in caches:
+            cache.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every namespace."""
+        with self._lock:
+            caches = list(self._caches.values())
+        return {cache.name: cache.stats() for cache in caches}
+
+# Shared registry for all cached functions in this process
+cache_registry = CacheRegistry()
+
+def cache_result(ttl_seconds: Optional[float] = 300, max_size: int = 1000,
+                 namespace: Optional[str] = None):
+    """Decorator for caching results of sync or async functions.
+
+    Args:
+        ttl_seconds: Time-to-live for cache entries in seconds
+        max_size: Maximum number of cache entries
+        namespace: Cache namespace (defaults to the function's qualified name)
+
+    The wrapper exposes its cache as ``wrapper.cache``.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        cache = cache_registry.namespace(
+            namespace or f"{func.__module__}.{func.__qualname__}", max_size, ttl_seconds
+        )
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+                key = make_key(*args, **kwargs)
+                return await cache.get_or_compute_async(key, lambda: func(*args, **kwargs))
+            async_wrapper.cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = make_key(*args, **kwargs)
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+        wrapper.cache = cache
+        return wrapper
+    return decorator
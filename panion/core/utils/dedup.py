@@ -0,0 +1,341 @@
+"""
+Record Deduplication
+Entity resolution for business records gathered from several sources.
+"""
+
+import itertools
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_NAME_NOISE = {"the", "and", "inc", "llc", "ltd", "co", "corp", "company"}
+_ADDRESS_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "boulevard": "blvd",
+    "drive": "dr", "lane": "ln", "court": "ct", "place": "pl",
+    "highway": "hwy", "parkway": "pkwy", "suite": "ste",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
+_ZIP = re.compile(r'\b(\d{5})(?:-\d{4})?\s*$')
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Digits of a phone number without the US country code ("" if too short)."""
+    digits = re.sub(r'\D', '', phone or "")
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) >= 7 else ""
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase business name without punctuation or legal suffixes."""
+    text = (name or "").lower().replace("&", " and ").replace("'", "")
+    return " ".join(token for token in re.findall(r'[a-z0-9]+', text) if token not in _NAME_NOISE)
+
+def normalize_address(address: Optional[str]) -> str:
+    """Lowercase address with the usual street abbreviations applied."""
+    tokens = re.findall(r'[a-z0-9]+', (address or "").lower())
+    return " ".join(_ADDRESS_ABBREVIATIONS.get(token, token) for token in tokens)
+
+def geohash(latitude: float, longitude: float, precision: int = 6) -> str:
+    """Encode a coordinate as a geohash (6 characters is roughly a 1 km cell)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if value > middle:
+            bits = bits * 2 + 1
+            bounds[0] = middle
+        else:
+            bits *= 2
+            bounds[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = bit = 0
+    return "".join(chars)
+
+def _coordinates(record: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    location = record.get("location") if isinstance(record.get("location"), dict) else record
+    latitude = location.get("lat", location.get("latitude"))
+    longitude = location.get("lng", location.get("lon", location.get("longitude")))
+    try:
+        return float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+
+def merge_records(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge duplicates into the first record, filling its empty fields from the others."""
+    merged = dict(records[0])
+    for other in records[1:]:
+        for key, value in other.items():
+            if value not in (None, "", [], {}) and not merged.get(key):
+                merged[key] = value
+    return merged
+
+class UnionFind:
+    """Disjoint sets over ``0..size-1`` whose roots are their smallest member."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]  # Path halving
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest record as the root so clusters keep input order
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def groups(self) -> List[List[int]]:
+        """Members of every set, ordered by their first member."""
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+@dataclass
+class _Features:
+    """Normalized, array-encoded fields of a batch of records."""
+    phones: np.ndarray        # Phone id per record, -1 when missing
+    numbers: np.ndarray       # Street number per record, -1 when missing
+    name_indptr: np.ndarray   # CSR offsets into name_grams
+    name_grams: np.ndarray    # Ids of each record's name q-grams
+    address_indptr: np.ndarray
+    address_tokens: np.ndarray
+    blocks: Dict[Hashable, List[int]]
+
+def _csr(sets: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(len(sets) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(items) for items in sets])
+    data = np.fromiter(itertools.chain.from_iterable(sets), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, data
+
+def _gather(indptr: np.ndarray, data: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate the CSR rows ``rows`` without a Python loop."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    begins = np.cumsum(lengths) - lengths
+    offsets = np.repeat(starts - begins, lengths) + np.arange(int(lengths.sum()))
+    return data[offsets], lengths
+
+def _set_jaccard(indptr: np.ndarray, data: np.ndarray,
+                 left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact Jaccard similarity of the sets in rows ``left[k]`` and ``right[k]``.
+
+    Both sides of every pair are tagged with the pair number and sorted
+    together; since a set holds each id once, equal neighbours are exactly
+    the intersection.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Similarities, and whether both sets were non-empty
+    """
+    pairs = np.arange(len(left), dtype=np.int64)
+    width = int(data.max()) + 1 if len(data) else 1
+    left_items, left_lengths = _gather(indptr, data, left)
+    right_items, right_lengths = _gather(indptr, data, right)
+    keys = np.concatenate([np.repeat(pairs, left_lengths) * width + left_items,
+                           np.repeat(pairs, right_lengths) * width + right_items])
+    keys.sort()
+    shared = keys[1:][keys[1:] == keys[:-1]] // width
+    intersection = np.bincount(shared, minlength=len(left))
+    union = left_lengths + right_lengths - intersection
+    present = (left_lengths > 0) & (right_lengths > 0)
+    return np.where(present, intersection / np.maximum(union, 1), 0.0), present
+
+class RecordDeduplicator:
+    """Finds records that describe the same business.
+
+    Records are only compared within blocks that share a blocking key
+    (normalized phone, normalized name within a zip code, geohash cell or
+    city, or street number within one of those), so the work grows with the
+    number of plausible pairs rather than quadratically. Candidate pairs
+    are scored in bulk with numpy: q-gram Jaccard of the names, token
+    Jaccard of the addresses and phone equality, weighted over the fields
+    both records have; records at different street numbers never match.
+    Pairs scoring at least ``threshold`` are joined with union-find, so
+    duplicates chain across sources.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.7,
+                 name_weight: float = 0.45,
+                 address_weight: float = 0.25,
+                 phone_weight: float = 0.3,
+                 min_evidence: float = 0.5,
+                 q: int = 3,
+                 max_block_size: int = 200,
+                 geohash_precision: int = 6):
+        """Initialize the deduplicator.
+
+        Args:
+            threshold: Minimum weighted similarity for two records to match
+            name_weight: Weight of name similarity
+            address_weight: Weight of address similarity
+            phone_weight: Weight of phone equality
+            min_evidence: Minimum total weight of the fields both records have,
+                so two records are never merged on a name alone
+            q: Length of the name q-grams
+            max_block_size: Blocks larger than this (e.g. a chain's name across a
+                city) are skipped rather than compared pairwise
+            geohash_precision: Geohash length used to block records with coordinates
+        """
+        self.threshold = threshold
+        self.name_weight = name_weight
+        self.address_weight = address_weight
+        self.phone_weight = phone_weight
+        self.min_evidence = min_evidence
+        self.q = q
+        self.max_block_size = max_block_size
+        self.geohash_precision = geohash_precision
+        self.last_stats: Dict[str, int] = {}
+
+    def _name_grams(self, name: str) -> List[str]:
+        padded = f" {name} "
+        if len(padded) <= self.q:
+            return [padded]
+        return [padded[k:k + self.q] for k in range(len(padded) - self.q + 1)]
+
+    def features(self, records: Sequence[Dict[str, Any]]) -> _Features:
+        """Normalize records and assign them to blocks."""
+        phone_ids: Dict[str, int] = {}
+        gram_ids: Dict[str, int] = {}
+        name_grams: Dict[str, List[int]] = {}  # Chains and re-listings repeat names
+        token_ids: Dict[str, int] = {}
+        phones = np.full(len(records), -1, dtype=np.int64)
+        numbers = np.full(len(records), -1, dtype=np.int64)
+        name_sets: List[List[int]] = []
+        address_sets: List[List[int]] = []
+        blocks: Dict[Hashable, List[int]] = {}
+
+        for index, record in enumerate(records):
+            phone = normalize_phone(record.get("phone"))
+            name = normalize_name(record.get("name"))
+            raw_address = record.get("address") or ""
+            address = normalize_address(raw_address)
+
+            if phone:
+                phones[index] = phone_ids.setdefault(phone, len(phone_ids))
+                blocks.setdefault(("phone", phone), []).append(index)
+            grams = name_grams.get(name)
+            if grams is None:
+                grams = name_grams[name] = sorted({gram_ids.setdefault(gram, len(gram_ids))
+                                                   for gram in self._name_grams(name)}) if name else []
+            name_sets.append(grams)
+            address_sets.append(sorted({token_ids.setdefault(token, len(token_ids))
+                                        for token in address.split()}))
+
+            localities = []
+            zip_code = record.get("zip") or record.get("zip_code") or record.get("postal_code")
+            match = _ZIP.search(raw_address)
+            if zip_code or match:
+                localities.append(f"zip:{str(zip_code or match.group(1))[:5]}")
+            coordinates = _coordinates(record)
+            if coordinates:
+                localities.append(f"geo:{geohash(*coordinates, self.geohash_precision)}")
+            if record.get("city"):
+                localities.append(f"city:{normalize_name(record['city'])}")
+
+            number = re.match(r'(\d{1,9})\b', address)
+            if number:
+                numbers[index] = int(number.group(1))
+                for locality in localities:
+                    blocks.setdefault(("number", number.group(1), locality), []).append(index)
+            if name:
+                # Records without any locality can only meet on the name itself
+                for locality in localities or [""]:
+                    blocks.setdefault(("name", name, locality), []).append(index)
+
+        name_indptr, name_grams = _csr(name_sets)
+        address_indptr, address_tokens = _csr(address_sets)
+        return _Features(phones, numbers, name_indptr, name_grams, address_indptr, address_tokens, blocks)
+
+    def candidate_pairs(self, features: _Features) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct pairs ``(left, right)``, ``left < right``, sharing a block."""
+        count = len(features.phones)
+        pairs: List[int] = []  # Most blocks are pairs; skip numpy overhead for them
+        chunks = []
+        skipped = 0
+        for members in features.blocks.values():
+            size = len(members)
+            if size < 2:
+                continue
+            if size == 2:
+                pairs.append(members[0] * count + members[1])
+            elif size <= self.max_block_size:
+                upper = np.triu_indices(size, 1)
+                members = np.asarray(members, dtype=np.int64)
+                chunks.append(members[upper[0]] * count + members[upper[1]])
+            else:
+                skipped += 1
+        self.last_stats["oversized_blocks"] = skipped
+        chunks.append(np.asarray(pairs, dtype=np.int64))
+        codes = np.unique(np.concatenate(chunks))
+        return codes // count, codes % count
+
+    def score_pairs(self, features: _Features, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Weighted similarity of each candidate pair.
+
+        Pairs without enough evidence, or at different street numbers, score 0.
+        """
+        names, has_names = _set_jaccard(features.name_indptr, features.name_grams, left, right)
+        addresses, has_addresses = _set_jaccard(features.address_indptr, features.address_tokens, left, right)
+        left_phones, right_phones = features.phones[left], features.phones[right]
+        has_phones = (left_phones >= 0) & (right_phones >= 0)
+        same_phone = has_phones & (left_phones == right_phones)
+        left_numbers, right_numbers = features.numbers[left], features.numbers[right]
+        # Branches of a chain share everything but the street number
+        other_number = (left_numbers >= 0) & (right_numbers >= 0) & (left_numbers != right_numbers)
+
+        evidence = (self.name_weight * has_names + self.address_weight * has_addresses
+                    + self.phone_weight * has_phones)
+        total = (self.name_weight * names + self.address_weight * addresses
+                 + self.phone_weight * same_phone)
+        enough = (evidence >= self.min_evidence) & ~other_number
+        return np.where(enough, total / np.maximum(evidence, 1e-9), 0.0)
+
+    def cluster(self, records: Sequence[Dict[str, Any]]) -> List[List[int]]:
+        """Group record indices by the business they describe, in input order."""
+        features = self.features(records)
+        left, right = self.candidate_pairs(features)
+        matched = self.score_pairs(features, left, right) >= self.threshold if len(left) else np.zeros(0, bool)
+
+        clusters = UnionFind(len(records))
+        for a, b in zip(left[matched].tolist(), right[matched].tolist()):
+            clusters.union(a, b)
+        groups = clusters.groups()
+        logger.debug(f"Resolved {len(records)} records into {len(groups)} businesses "
+                     f"({len(left)} candidate pairs, {int(matched.sum())} matches)")
+        self.last_stats.update(records=len(records), candidates=len(left),
+                               matches=int(matched.sum()), clusters=len(groups))
+        return groups
+
+    def deduplicate(self,
+                    records: Sequence[Dict[str, Any]],
+                    merge: Callable[[Sequence[Dict[str, Any]]], Dict[str, Any]] = merge_records
+                    ) -> List[Dict[str, Any]]:
+        """Collapse duplicate records, keeping the order of first appearance.
+
+        Args:
+            records: Business records with any of name, phone, address, zip,
+                city and coordinates
+            merge: Builds one record from a cluster of duplicates (first seen first)
+        """
+        if not records:
+            return []
+        return [merge([records[index] for index in group]) for group in self.cluster(records)]
+
+def deduplicate_records(records: Sequence[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+    """Deduplicate records with a default ``RecordDeduplicator``."""
+    merge = kwargs.pop("merge", merge_records)
+    return RecordDeduplicator(**kwargs).deduplicate(records, merge)
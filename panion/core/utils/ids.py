@@ -0,0 +1,97 @@
+"""
+ID Allocation
+Collision-free, time-sortable identifiers.
+"""
+
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+_STAMP_FORMAT = "%Y%m%d_%H%M%S_%f"
+_STAMP_LENGTH = len("20250101_120000_000000")
+
+class IdAllocator:
+    """Allocates monotonic IDs of the form ``<prefix>_<timestamp>_<seq><node>``.
+
+    The timestamp has microsecond resolution and a fixed width, so IDs with
+    the same prefix sort lexicographically in creation order. A per-process
+    sequence keeps IDs unique within the same microsecond (and when the
+    clock steps backwards), and a node suffix keeps separate processes
+    from colliding.
+    """
+
+    def __init__(self, node: Optional[str] = None):
+        """Initialize the allocator.
+
+        Args:
+            node: Four hex characters identifying this process (random by default)
+        """
+        self.node = node or f"{(os.getpid() ^ random.getrandbits(16)) & 0xffff:04x}"
+        self._lock = threading.Lock()
+        self._last: Optional[datetime] = None
+        self._sequence = 0
+
+    def _next_stamp(self) -> Tuple[datetime, int]:
+        with self._lock:
+            now = datetime.now()
+            if self._last is None or now > self._last:
+                self._last = now
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence > 0xffff:
+                    # Sequence exhausted; borrow the next microsecond
+                    self._last += timedelta(microseconds=1)
+                    self._sequence = 0
+            return self._last, self._sequence
+
+    def new_id(self, prefix: str) -> str:
+        """Allocate a new ID.
+
+        Args:
+            prefix: ID prefix, e.g. ``mem`` or an agent ID
+
+        Returns:
+            str: Unique, time-sortable ID
+        """
+        stamp, sequence = self._next_stamp()
+        return f"{prefix}_{stamp.strftime(_STAMP_FORMAT)}_{sequence:04x}{self.node}"
+
+    @staticmethod
+    def id_bounds(prefix: str, start: datetime, end: datetime) -> Tuple[str, str]:
+        """Get the ID range covering ``[start, end)`` for a prefix.
+
+        Args:
+            prefix: ID prefix
+            start: Inclusive start time
+            end: Exclusive end time
+
+        Returns:
+            Tuple[str, str]: Inclusive lower and exclusive upper ID bounds
+        """
+        return (
+            f"{prefix}_{start.strftime(_STAMP_FORMAT)}",
+            f"{prefix}_{end.strftime(_STAMP_FORMAT)}"
+        )
+
+    @staticmethod
+    def timestamp_of(identifier: str, prefix: str) -> Optional[datetime]:
+        """Get the creation time encoded in an ID.
+
+        Also understands the older second-resolution ``<prefix>_%Y%m%d_%H%M%S`` IDs.
+
+        Returns:
+            Optional[datetime]: Creation time, or None if the ID has no timestamp
+        """
+        stamp = identifier[len(prefix) + 1:]
+        for fmt, length in ((_STAMP_FORMAT, _STAMP_LENGTH), ("%Y%m%d_%H%M%S", 15)):
+            try:
+                return datetime.strptime(stamp[:length], fmt)
+            except ValueError:
+                continue
+        return None
+
+# Shared allocator for all managers in this process
+id_allocator = IdAllocator()
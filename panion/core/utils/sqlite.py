@@ -0,0 +1,85 @@
+"""
+SQLite Store
+Shared connection handling and periodic purging for SQLite-backed stores.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class SQLiteStore:
+    """Base class for stores kept in one SQLite database.
+
+    A single connection is shared by all threads behind ``_lock`` and
+    opened on first use, in WAL mode with the store's schema applied.
+    Stores whose rows expire override ``_delete_expired``; writers call
+    ``_purge_if_due`` so the purge runs at most once per
+    ``purge_interval`` as a side effect of writing.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 schema: str,
+                 purge_interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the store.
+
+        Args:
+            db_path: SQLite database file, or ":memory:"
+            schema: SQL script creating the tables if they do not exist
+            purge_interval: Minimum seconds between automatic purges (None never purges on write)
+            clock: Wall clock in epoch seconds
+        """
+        self.db_path = db_path
+        self.purge_interval = purge_interval
+        self._schema = schema
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_purge = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Must be called with the lock held."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._schema)
+            self._conn = conn
+        return self._conn
+
+    def _delete_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """Delete expired rows and return how many were deleted."""
+        return 0
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> int:
+        self._last_purge = now
+        return self._delete_expired(conn, now)
+
+    def _purge_if_due(self, conn: sqlite3.Connection, now: float) -> None:
+        """Purge if ``purge_interval`` has passed since the last purge. Must be called with the lock held."""
+        if self.purge_interval is not None and now - self._last_purge >= self.purge_interval:
+            self._purge(conn, now)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows.
+
+        Returns:
+            int: Number of rows deleted
+        """
+        with self._lock:
+            return self._purge(self._connection(), self._clock())
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -18,6 +18,7 @@ from bs4 import BeautifulSoup
 import pandas as pd
 
 from panion.core.plugin.plugin_base import BasePlugin, PluginResult
+from panion.core.utils.dedup import RecordDeduplicator, merge_records
 
 class DaddyDataAgent(BasePlugin):
     """
@@ -51,6 +52,7 @@ class DaddyDataAgent(BasePlugin):
         self.active_tasks = {}
         self.data_cache = {}
         self.verification_results = {}
+        self.deduplicator = RecordDeduplicator()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -479,79 +481,25 @@ class DaddyDataAgent(BasePlugin):
     
     def _deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Deduplicate results based on phone number and name.
+        Deduplicate results that describe the same business, matching on
+        phone, name and address similarity across sources.
         """
-        deduplicated = {}
-        
-        # First pass: organize by phone
-        for item in results:
-            if "phone" in item and item["phone"]:
-                # Normalize phone number for comparison
-                clean_phone = re.sub(r'\D', '', item["phone"])
-                
-                if clean_phone in deduplicated:
-                    # Merge sources
-                    sources = set([deduplicated[clean_phone].get("source", "unknown")])
-                    sources.add(item.get("source", "unknown"))
-                    deduplicated[clean_phone]["sources"] = list(sources)
-                    
-                    # Use the most complete record
-                    for key, value in item.items():
-                        if key != "source" and key != "sources":
-                            if key not in deduplicated[clean_phone] or not deduplicated[clean_phone][key]:
-                                deduplicated[clean_phone][key] = value
-                else:
-                    # New entry
-                    deduplicated[clean_phone] = item.copy()
-                    deduplicated[clean_phone]["sources"] = [item.get("source", "unknown")]
-                    if "source" in deduplicated[clean_phone]:
-                        del deduplicated[clean_phone]["source"]
-            
-        # Second pass: check for similar names without matching phones
-        name_matches = {}
-        for phone, item in list(deduplicated.items()):
-            if "name" in item and item["name"]:
-                # Normalize name for comparison
-                clean_name = item["name"].lower().strip()
-                
-                if clean_name in name_matches and name_matches[clean_name] != phone:
-                    # Potential match with different phone - compare addresses
-                    other_item = deduplicated[name_matches[clean_name]]
-                    if self._similar_addresses(item.get("address", ""), other_item.get("address", "")):
-                        # Merge the items
-                        for key, value in item.items():
-                            if key != "sources":
-                                if key not in other_item or not other_item[key]:
-                                    other_item[key] = value
-                        
-                        # Merge sources
-                        sources = set(other_item.get("sources", []))
-                        sources.update(item.get("sources", []))
-                        other_item["sources"] = list(sources)
-                        
-                        # Remove the duplicate
-                        del deduplicated[phone]
-                    else:
-                        name_matches[clean_name + "_" + phone] = phone
-                else:
-                    name_matches[clean_name] = phone
-        
-        return list(deduplicated.values())
+        return self.deduplicator.deduplicate(results, merge=self._merge_duplicates)
     
-    def _similar_addresses(self, addr1: str, addr2: str) -> bool:
+    def _merge_duplicates(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Check if two addresses are similar.
+        Merge records of one business, filling gaps from later sources and
+        listing every source the business was found in.
         """
-        if not addr1 or not addr2:
-            return False
-            
-        # Normalize addresses for comparison
-        clean1 = re.sub(r'\W+', ' ', addr1.lower()).strip()
-        clean2 = re.sub(r'\W+', ' ', addr2.lower()).strip()
-        
-        # Simple similarity check
-        # In a real implementation, this would use more sophisticated address matching
-        return clean1 == clean2 or (len(clean1) > 5 and clean1 in clean2) or (len(clean2) > 5 and clean2 in clean1)
+        merged = merge_records(items)
+        merged.pop("source", None)
+        sources = []
+        for item in items:
+            for source in item.get("sources") or [item.get("source", "unknown")]:
+                if source not in sources:
+                    sources.append(source)
+        merged["sources"] = sources
+        return merged
     
     async def _verify_field(self, item: Dict[str, Any], field: str) -> Tuple[Any, float]:
         """
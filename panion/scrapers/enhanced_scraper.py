@@ -6,6 +6,11 @@ A versatile web scraping utility that can extract information from various sourc
 import os
 import json
 import time
+import asyncio
+import copy
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import requests
 import re
@@ -15,6 +20,13 @@ from typing import List, Dict, Any, Optional, Union, Tuple
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+from core.progress_stream import progress_stream
+from core.utils.cache import cache_registry, make_key
+from core.utils.dedup import RecordDeduplicator
+from scrapers.fetch_engine import FetchEngine
+from scrapers.profile_cache import ProfileCache, profile_key
+from scrapers.response_cache import ResponseCache, get_response_cache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,6 +69,59 @@ USER_AGENTS = [
     'Mozilla/5.0 (Linux; Android 13; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36'
 ]
 
+# Seconds between requests to the directory sites we scrape most
+HOST_INTERVALS = {
+    "www.yelp.com": 2.0,
+    "www.yellowpages.com": 1.0
+}
+
+# LinkedIn lookups in flight at once, shared by all scrapers
+ENRICHMENT_WORKERS = int(os.environ.get("PANION_ENRICHMENT_WORKERS", 8))
+PROFILE_CACHE_PATH = "./data/scraped/linkedin_profiles.db"
+
+_fetch_engine = None
+_fetch_engine_lock = threading.Lock()
+_enrichment_pool = None
+_profile_cache = None
+
+def get_fetch_engine() -> FetchEngine:
+    """Get the fetch engine shared by all scrapers.
+    
+    Sharing one engine keeps connections alive between scrapes and makes
+    the per-host politeness limits apply across scraper instances.
+    """
+    global _fetch_engine
+    with _fetch_engine_lock:
+        if _fetch_engine is None:
+            # Import proxy manager (only when needed to avoid circular imports)
+            try:
+                from scrapers.proxy_manager import proxy_manager
+            except ImportError:
+                proxy_manager = None
+                logger.warning("Proxy manager not available, proceeding without proxies")
+            _fetch_engine = FetchEngine(host_intervals=HOST_INTERVALS,
+                                        user_agents=USER_AGENTS,
+                                        proxies=proxy_manager,
+                                        cache=get_response_cache())
+        return _fetch_engine
+
+def get_enrichment_pool() -> ThreadPoolExecutor:
+    """Get the worker pool that bounds concurrent LinkedIn lookups."""
+    global _enrichment_pool
+    with _fetch_engine_lock:
+        if _enrichment_pool is None:
+            _enrichment_pool = ThreadPoolExecutor(max_workers=ENRICHMENT_WORKERS,
+                                                  thread_name_prefix="linkedin-enrichment")
+        return _enrichment_pool
+
+def get_profile_cache() -> ProfileCache:
+    """Get the persistent LinkedIn profile cache shared by all scrapers."""
+    global _profile_cache
+    with _fetch_engine_lock:
+        if _profile_cache is None:
+            _profile_cache = ProfileCache(PROFILE_CACHE_PATH)
+        return _profile_cache
+
 class ScrapingStrategy:
     """Base class for different scraping strategies."""
     
@@ -71,6 +136,15 @@ class ScrapingStrategy:
         """Execute this strategy to get data. Must be implemented by subclasses."""
         raise NotImplementedError("Strategy must implement execute method")
     
+    async def execute_async(self, scraper, business_type, location, limit):
+        """Execute this strategy on the fetch engine's event loop.
+        
+        Strategies that fetch through the engine override this; the default
+        runs the blocking ``execute`` in a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute, scraper, business_type, location, limit)
+    
     def record_success(self):
         """Record a successful execution of this strategy."""
         self.consecutive_failures = 0
@@ -97,282 +171,304 @@ class ScrapingStrategy:
         return self.priority * self.success_rate * cooling_factor
 
 
-class DirectYelpStrategy(ScrapingStrategy):
+def listing_key(business: Dict[str, Any]) -> Tuple[str, str]:
+    """Identify a listing across pages and sources by its name and street number."""
+    name = re.sub(r'\W+', '', (business.get("name") or "").lower())
+    number = re.match(r'\s*(\d+)', business.get("address") or "")
+    return name, number.group(1) if number else ""
+
+def merge_listings(result_lists: List[List[Dict[str, Any]]], limit: int = None) -> List[Dict[str, Any]]:
+    """Concatenate listings in order, dropping repeats of the same business."""
+    merged = []
+    seen = set()
+    for results in result_lists:
+        for business in results:
+            key = listing_key(business)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(business)
+            if limit is not None and len(merged) >= limit:
+                return merged
+    return merged
+
+
+class DirectoryStrategy(ScrapingStrategy):
+    """Base for strategies that page through a directory's search results.
+    
+    The result pages needed to reach ``limit`` are fetched concurrently
+    through the scraper's fetch engine, which paces requests per host, and
+    each page is parsed by ``parse_page``.
+    """
+    
+    search_url = None
+    results_per_page = 10
+    max_pages = 5
+    
+    def page_urls(self, business_type, location, limit):
+        """Get the search result URLs to fetch for a query."""
+        raise NotImplementedError("Directory strategy must implement page_urls")
+    
+    def parse_page(self, html_content):
+        """Parse one search result page into business records."""
+        raise NotImplementedError("Directory strategy must implement parse_page")
+    
+    def request_headers(self, scraper):
+        """Extra headers sent with every page request."""
+        return None
+    
+    def page_count(self, limit):
+        """Number of result pages needed to collect ``limit`` listings."""
+        return max(1, min(self.max_pages, -(-limit // self.results_per_page)))
+    
+    async def fetch_listings(self, scraper, business_type, location, limit):
+        """Fetch and parse the result pages for a query."""
+        urls = self.page_urls(business_type, location, limit)
+        pages = await scraper.fetch_engine.fetch_all(urls, headers=scraper._build_headers(self.request_headers(scraper)))
+        parsed = []
+        for html_content in pages:
+            if html_content:
+                try:
+                    parsed.append(self.parse_page(html_content))
+                except Exception as e:
+                    logger.error(f"Error parsing {self.name} results page: {str(e)}")
+        return merge_listings(parsed, limit)
+    
+    def execute(self, scraper, business_type, location, limit):
+        """Execute this strategy from synchronous code."""
+        return scraper.fetch_engine.run(self.execute_async(scraper, business_type, location, limit))
+    
+    async def execute_async(self, scraper, business_type, location, limit):
+        """Fetch the result pages concurrently and record the outcome."""
+        logger.info(f"Trying {type(self).__name__} for {business_type} in {location}")
+        try:
+            businesses = await self.fetch_listings(scraper, business_type, location, limit)
+        except Exception as e:
+            logger.error(f"Error in {type(self).__name__}: {str(e)}")
+            businesses = []
+        
+        # Record success if we got any businesses
+        if businesses:
+            self.record_success()
+        else:
+            self.record_failure()
+        return businesses
+
+
+class DirectYelpStrategy(DirectoryStrategy):
     """Direct scraping of Yelp with enhanced browser emulation."""
     
+    search_url = "https://www.yelp.com/search"
+    results_per_page = 10
+    
     def __init__(self):
         super().__init__("direct_yelp", priority=10)
     
-    def execute(self, scraper, business_type, location, limit):
-        """Execute direct Yelp scraping strategy."""
-        logger.info(f"Trying DirectYelpStrategy for {business_type} in {location}")
-        
-        # Format the search URL
+    def page_urls(self, business_type, location, limit):
+        """Yelp pages its results with a ``start`` offset."""
         search_term = business_type.replace(" ", "+")
         formatted_location = location.replace(" ", "+")
-        base_url = f"https://www.yelp.com/search?find_desc={search_term}&find_loc={formatted_location}"
+        base_url = f"{self.search_url}?find_desc={search_term}&find_loc={formatted_location}"
+        return [base_url if page == 0 else f"{base_url}&start={page * self.results_per_page}"
+                for page in range(self.page_count(limit))]
+    
+    def request_headers(self, scraper):
+        """Enhanced headers to appear more like a real browser."""
+        return {
+            'User-Agent': scraper._get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Cache-Control': 'max-age=0',
+            'TE': 'Trailers',
+            'Referer': 'https://www.google.com/',
+            'Sec-Fetch-Site': 'cross-site'
+        }
+    
+    def parse_page(self, html_content):
+        """Parse a Yelp search result page."""
+        soup = BeautifulSoup(html_content, 'lxml')
         
-        try:
-            # Enhanced headers to appear more like a real browser
-            enhanced_headers = {
-                'User-Agent': scraper._get_random_user_agent(),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0',
-                'TE': 'Trailers',
-                'Referer': 'https://www.google.com/',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'cross-site',
-                'Sec-Fetch-User': '?1',
-                'Pragma': 'no-cache'
-            }
-            
-            # First attempt - direct web scraping
-            html_content = scraper._make_request(base_url, headers=enhanced_headers, timeout=15)
-            
-            if not html_content:
-                self.record_failure()
-                return []
-                
-            # Parse the HTML
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Find business listings (try multiple selectors for resilience)
-            business_elements = soup.find_all("div", class_="container__09f24__mpR8_")
+        # Find business listings (try multiple selectors for resilience)
+        business_elements = soup.find_all("div", class_="container__09f24__mpR8_")
+        
+        # If we can't find businesses with the expected class, try alternative selectors
+        if not business_elements:
+            business_elements = soup.select("div.businessName__09f24__CGSAT")
             
-            # If we can't find businesses with the expected class, try alternative selectors
-            if not business_elements:
-                business_elements = soup.select("div.businessName__09f24__CGSAT")
-                
-            # If we still can't find businesses, try a broader approach
-            if not business_elements:
-                business_elements = soup.select("div[data-testid='serp-biz-attribute']")
+        # If we still can't find businesses, try a broader approach
+        if not business_elements:
+            business_elements = soup.select("div[data-testid='serp-biz-attribute']")
+        
+        # Last resort - try to find any <h3> elements that might be business names
+        if not business_elements:
+            business_elements = soup.select("h3 a")
             
-            # Last resort - try to find any <h3> elements that might be business names
-            if not business_elements:
-                business_elements = soup.select("h3 a")
-                
-            if not business_elements:
-                logger.warning("No business elements found with any selector pattern")
-                self.record_failure()
-                return []
-                
-            businesses = []
-            count = 0
+        if not business_elements:
+            logger.warning("No business elements found with any selector pattern")
+            return []
             
-            for element in business_elements:
-                if count >= limit:
-                    break
-                    
-                try:
-                    # Extract name (try multiple possible selectors)
-                    name_element = element.find("a", class_="css-19v1rkv")
-                    if not name_element:
-                        name_element = element.find("a", class_="businessName__09f24__CGSAT")
-                    if not name_element:
-                        name_element = element.select_one("h3 a")
-                    if not name_element and element.name == 'a':
-                        name_element = element
-                        
-                    if not name_element:
-                        continue
-                        
-                    name = name_element.text.strip()
-                    if not name:
-                        continue
-                    
-                    # Extract business URL
-                    business_url = name_element.get('href')
-                    if business_url and not business_url.startswith('http'):
-                        business_url = f"https://www.yelp.com{business_url}"
-                    
-                    # Extract address (try multiple possible selectors)
-                    address_element = element.find("span", class_="css-1e4fdj9")
-                    if not address_element:
-                        address_element = element.select_one("address p")
-                    if not address_element:
-                        address_element = element.select_one("[data-testid='address']")
-                        
-                    address = address_element.text.strip() if address_element else "Address not found"
-                    
-                    # Skip detailed page scraping to avoid too many requests
-                    phone = "Phone not available"
-                    categories = []
-                    hours = []
-                    rating = None
-                    
-                    # Add to results
-                    businesses.append({
-                        "name": name,
-                        "address": address,
-                        "phone": phone,
-                        "categories": categories,
-                        "rating": rating,
-                        "hours": hours,
-                        "source": "yelp",
-                        "url": business_url,
-                        "scraped_at": datetime.now().isoformat()
-                    })
+        businesses = []
+        for element in business_elements:
+            try:
+                # Extract name (try multiple possible selectors)
+                name_element = element.find("a", class_="css-19v1rkv")
+                if not name_element:
+                    name_element = element.find("a", class_="businessName__09f24__CGSAT")
+                if not name_element:
+                    name_element = element.select_one("h3 a")
+                if not name_element and element.name == 'a':
+                    name_element = element
                     
-                    count += 1
-                    logger.info(f"Scraped business: {name}")
+                if not name_element:
+                    continue
                     
-                    # Be nice to the server - use longer random delays
-                    time.sleep(random.uniform(2.0, 5.0))
+                name = name_element.text.strip()
+                if not name:
+                    continue
+                
+                # Extract business URL
+                business_url = name_element.get('href')
+                if business_url and not business_url.startswith('http'):
+                    business_url = f"https://www.yelp.com{business_url}"
+                
+                # Extract address (try multiple possible selectors)
+                address_element = element.find("span", class_="css-1e4fdj9")
+                if not address_element:
+                    address_element = element.select_one("address p")
+                if not address_element:
+                    address_element = element.select_one("[data-testid='address']")
                     
-                except Exception as e:
-                    logger.error(f"Error parsing business listing: {str(e)}")
-            
-            # Record success if we got any businesses
-            if businesses:
-                self.record_success()
-                return businesses
-            else:
-                self.record_failure()
-                return []
+                address = address_element.text.strip() if address_element else "Address not found"
                 
-        except Exception as e:
-            logger.error(f"Error in DirectYelpStrategy: {str(e)}")
-            self.record_failure()
-            return []
+                # Skip detailed page scraping to avoid too many requests
+                businesses.append({
+                    "name": name,
+                    "address": address,
+                    "phone": "Phone not available",
+                    "categories": [],
+                    "rating": None,
+                    "hours": [],
+                    "source": "yelp",
+                    "url": business_url,
+                    "scraped_at": datetime.now().isoformat()
+                })
+                logger.info(f"Scraped business: {name}")
+                
+            except Exception as e:
+                logger.error(f"Error parsing business listing: {str(e)}")
+        
+        return businesses
 
 
-class YellowPagesStrategy(ScrapingStrategy):
+class YellowPagesStrategy(DirectoryStrategy):
     """Scrape business data from Yellow Pages as an alternative source."""
     
+    search_url = "https://www.yellowpages.com/search"
+    results_per_page = 30
+    
     def __init__(self):
         super().__init__("yellowpages", priority=5)
     
-    def execute(self, scraper, business_type, location, limit):
-        """Execute YellowPages scraping strategy."""
-        logger.info(f"Trying YellowPagesStrategy for {business_type} in {location}")
-        
-        # Format the search URL
+    def page_urls(self, business_type, location, limit):
+        """Yellow Pages numbers its result pages from 1."""
         search_term = business_type.replace(" ", "+")
         formatted_location = location.replace(" ", "+")
-        base_url = f"https://www.yellowpages.com/search?search_terms={search_term}&geo_location_terms={formatted_location}"
+        base_url = f"{self.search_url}?search_terms={search_term}&geo_location_terms={formatted_location}"
+        return [base_url if page == 1 else f"{base_url}&page={page}"
+                for page in range(1, self.page_count(limit) + 1)]
+    
+    def parse_page(self, html_content):
+        """Parse a Yellow Pages search result page."""
+        soup = BeautifulSoup(html_content, 'lxml')
         
-        try:
-            # Make the request
-            html_content = scraper._make_request(base_url)
-            if not html_content:
-                self.record_failure()
-                return []
-            
-            # Parse the HTML
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Find business listings
-            business_elements = soup.find_all("div", class_="result")
+        # Find business listings
+        business_elements = soup.find_all("div", class_="result")
+        
+        if not business_elements:
+            # Try alternative selectors if standard ones fail
+            business_elements = soup.select(".info")
             
-            if not business_elements:
-                # Try alternative selectors if standard ones fail
-                business_elements = soup.select(".info")
-                
-            if not business_elements:
-                # Last resort
-                business_elements = soup.select(".business-card")
-                
-            if not business_elements:
-                logger.warning("No business elements found in Yellow Pages results")
-                self.record_failure()
-                return []
+        if not business_elements:
+            # Last resort
+            business_elements = soup.select(".business-card")
             
-            businesses = []
-            count = 0
-            for element in business_elements:
-                if count >= limit:
-                    break
-                    
-                try:
-                    # Extract name
-                    name_element = element.find("a", class_="business-name")
-                    if not name_element:
-                        name_element = element.select_one(".business-name")
-                    if not name_element:
-                        name_element = element.find("h2")
-                        
-                    if not name_element:
-                        continue
-                        
-                    name = name_element.text.strip()
-                    
-                    # Extract business URL
-                    business_url = name_element.get('href')
-                    if business_url and not business_url.startswith('http'):
-                        business_url = f"https://www.yellowpages.com{business_url}"
-                    
-                    # Extract address
-                    address_element = element.find("div", class_="street-address")
-                    address_locality = element.find("div", class_="locality")
-                    
-                    address = ""
-                    if address_element:
-                        address = address_element.text.strip()
-                    if address_locality:
-                        if address:
-                            address += ", "
-                        address += address_locality.text.strip()
-                    
-                    if not address:
-                        address = "Address not found"
-                    
-                    # Extract phone
-                    phone_element = element.find("div", class_="phones")
-                    phone = phone_element.text.strip() if phone_element else "Phone not available"
-                    
-                    # Extract categories
-                    categories_element = element.find("div", class_="categories")
-                    categories = []
-                    if categories_element:
-                        category_links = categories_element.find_all("a")
-                        categories = [link.text.strip() for link in category_links]
-                    
-                    # Add to results
-                    businesses.append({
-                        "name": name,
-                        "address": address,
-                        "phone": phone,
-                        "categories": categories,
-                        "source": "yellowpages",
-                        "url": business_url,
-                        "scraped_at": datetime.now().isoformat()
-                    })
-                    
-                    count += 1
-                    logger.info(f"Scraped business from Yellow Pages: {name}")
+        if not business_elements:
+            logger.warning("No business elements found in Yellow Pages results")
+            return []
+        
+        businesses = []
+        for element in business_elements:
+            try:
+                # Extract name
+                name_element = element.find("a", class_="business-name")
+                if not name_element:
+                    name_element = element.select_one(".business-name")
+                if not name_element:
+                    name_element = element.find("h2")
                     
-                    # Be nice to the server
-                    time.sleep(random.uniform(1.0, 3.0))
+                if not name_element:
+                    continue
                     
-                except Exception as e:
-                    logger.error(f"Error parsing Yellow Pages listing: {str(e)}")
-            
-            # Record success if we got any businesses
-            if businesses:
-                self.record_success()
-                return businesses
-            else:
-                self.record_failure()
-                return []
+                name = name_element.text.strip()
                 
-        except Exception as e:
-            logger.error(f"Error in YellowPagesStrategy: {str(e)}")
-            self.record_failure()
-            return []
+                # Extract business URL
+                business_url = name_element.get('href')
+                if business_url and not business_url.startswith('http'):
+                    business_url = f"https://www.yellowpages.com{business_url}"
+                
+                # Extract address
+                address_element = element.find("div", class_="street-address")
+                address_locality = element.find("div", class_="locality")
+                
+                address = ""
+                if address_element:
+                    address = address_element.text.strip()
+                if address_locality:
+                    if address:
+                        address += ", "
+                    address += address_locality.text.strip()
+                
+                if not address:
+                    address = "Address not found"
+                
+                # Extract phone
+                phone_element = element.find("div", class_="phones")
+                phone = phone_element.text.strip() if phone_element else "Phone not available"
+                
+                # Extract categories
+                categories_element = element.find("div", class_="categories")
+                categories = []
+                if categories_element:
+                    category_links = categories_element.find_all("a")
+                    categories = [link.text.strip() for link in category_links]
+                
+                # Add to results
+                businesses.append({
+                    "name": name,
+                    "address": address,
+                    "phone": phone,
+                    "categories": categories,
+                    "source": "yellowpages",
+                    "url": business_url,
+                    "scraped_at": datetime.now().isoformat()
+                })
+                logger.info(f"Scraped business from Yellow Pages: {name}")
+                
+            except Exception as e:
+                logger.error(f"Error parsing Yellow Pages listing: {str(e)}")
+        
+        return businesses
 
 
 class GoogleMapsAPIStrategy(ScrapingStrategy):
     """Use Google Maps API if available."""
     
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
         super().__init__("google_maps_api", priority=8)
         self.api_key = os.environ.get('GOOGLE_MAPS_API_KEY')
+        self.response_cache = response_cache or get_response_cache()
+        # Place lookups are billed per call and rarely change within a day
+        self.place_cache = cache_registry.namespace("scraper.google_places", max_size=5000, ttl_seconds=86400)
         
     def execute(self, scraper, business_type, location, limit):
         """Try to use Google Maps API if available."""
@@ -400,14 +496,11 @@ class GoogleMapsAPIStrategy(ScrapingStrategy):
             }
             
             # Make the request with SSL verification disabled for Replit
-            response = requests.get(base_url, params=params, timeout=10, verify=False)
-            response.raise_for_status()
-            
-            # Parse results
-            data = response.json()
+            data = json.loads(self.response_cache.fetch(requests, base_url, params=params, timeout=10, verify=False))
             
             # Check if the request was successful
             if data.get('status') != 'OK':
+                self.response_cache.invalidate(base_url, params)
                 logger.error(f"Google Maps API error: {data.get('status')}: {data.get('error_message', 'No error message')}")
                 self.record_failure()
                 return []
@@ -496,39 +589,47 @@ class GoogleMapsAPIStrategy(ScrapingStrategy):
             self.record_failure()
             return []
             
-    def get_place_details(self, place_id):
-        """Get additional details for a place by its ID.
+    def _fetch_place(self, place_id, fields):
+        """Fetch place details from the API, sharing results through the place cache.
         
-        This is implemented as a separate method to allow for selective usage
-        to avoid hitting API rate limits unnecessarily.
+        Errors are raised rather than cached, so a failed lookup is retried
+        on the next call.
         """
-        if not self.api_key or not place_id:
-            return {}
-            
-        try:
+        def fetch():
             # Build the API request URL
             base_url = "https://maps.googleapis.com/maps/api/place/details/json"
             params = {
                 'place_id': place_id,
                 'key': self.api_key,
-                # Request all available fields for maximum data
-                'fields': 'name,formatted_address,formatted_phone_number,website,opening_hours,url,address_components,business_status,reviews,price_level,rating,user_ratings_total'
+                'fields': fields
             }
             
             # Make the request with SSL verification disabled for Replit
-            response = requests.get(base_url, params=params, timeout=10, verify=False)
-            response.raise_for_status()
-            
-            # Parse results
-            data = response.json()
+            data = json.loads(self.response_cache.fetch(requests, base_url, params=params, timeout=10, verify=False))
             
             # Check if the request was successful
             if data.get('status') != 'OK':
-                logger.error(f"Google Maps Details API error: {data.get('status')}")
-                return {}
-                
-            # Return the result
+                self.response_cache.invalidate(base_url, params)
+                raise ValueError(f"Google Maps Details API error: {data.get('status')}")
             return data.get('result', {})
+        
+        return self.place_cache.get_or_compute(make_key(place_id, fields), fetch)
+    
+    def get_place_details(self, place_id):
+        """Get additional details for a place by its ID.
+        
+        This is implemented as a separate method to allow for selective usage
+        to avoid hitting API rate limits unnecessarily.
+        """
+        if not self.api_key or not place_id:
+            return {}
+            
+        try:
+            # Request all available fields for maximum data
+            return self._fetch_place(
+                place_id,
+                'name,formatted_address,formatted_phone_number,website,opening_hours,url,address_components,business_status,reviews,price_level,rating,user_ratings_total'
+            )
         except Exception as e:
             logger.error(f"Error getting place details: {str(e)}")
             return {}
@@ -539,28 +640,8 @@ class GoogleMapsAPIStrategy(ScrapingStrategy):
             return {}
             
         try:
-            # Build the API request URL - use the details endpoint but only request reviews
-            base_url = "https://maps.googleapis.com/maps/api/place/details/json"
-            params = {
-                'place_id': place_id,
-                'key': self.api_key,
-                'fields': 'reviews'
-            }
-            
-            # Make the request with SSL verification disabled for Replit
-            response = requests.get(base_url, params=params, timeout=10, verify=False)
-            response.raise_for_status()
-            
-            # Parse results
-            data = response.json()
-            
-            # Check if the request was successful
-            if data.get('status') != 'OK':
-                logger.error(f"Google Maps Reviews API error: {data.get('status')}")
-                return {}
-                
-            # Return the reviews
-            return data.get('result', {}).get('reviews', [])
+            # Use the details endpoint but only request reviews
+            return self._fetch_place(place_id, 'reviews').get('reviews', [])
             
         except Exception as e:
             logger.error(f"Error getting place reviews: {str(e)}")
@@ -1225,8 +1306,21 @@ class CachedDataStrategy(ScrapingStrategy):
 class EnhancedScraper:
     """Advanced web scraping utility that can extract data from various sources."""
     
-    def __init__(self):
+    def __init__(self,
+                 fetch_engine: Optional[FetchEngine] = None,
+                 profile_cache: Optional[ProfileCache] = None,
+                 stream=None,
+                 response_cache: Optional[ResponseCache] = None,
+                 deduplicator: Optional[RecordDeduplicator] = None):
         self.session = requests.Session()
+        self.fetch_engine = fetch_engine or get_fetch_engine()
+        self.response_cache = response_cache or self.fetch_engine.cache or get_response_cache()
+        self.profile_cache = profile_cache or get_profile_cache()
+        self.stream = stream or progress_stream
+        # Joins concurrent lookups of the same business in front of the persistent cache
+        self.profile_memo = cache_registry.namespace("scraper.linkedin_profiles", max_size=5000, ttl_seconds=3600)
+        self.last_enrichment_topic = None
+        self.deduplicator = deduplicator or RecordDeduplicator()
         self.data_dir = "./data/scraped"
         os.makedirs(self.data_dir, exist_ok=True)
         
@@ -1235,7 +1329,7 @@ class EnhancedScraper:
             "cached_data": CachedDataStrategy(),
             "direct_yelp": DirectYelpStrategy(),
             "yellowpages": YellowPagesStrategy(),
-            "google_maps_api": GoogleMapsAPIStrategy()
+            "google_maps_api": GoogleMapsAPIStrategy(self.response_cache)
         }
         
         # Track strategy success/failure patterns
@@ -1251,39 +1345,27 @@ class EnhancedScraper:
         """Get a random user agent string to avoid detection."""
         return random.choice(USER_AGENTS)
     
-    def _make_request(self, url: str, method: str = "GET", 
-                      params: Dict[str, Any] = None, 
-                      headers: Dict[str, str] = None,
-                      timeout: int = 15,
-                      verify: bool = False,  # Set to False to bypass SSL verification in Replit
-                      use_proxy: bool = True) -> Optional[str]:
-        """Make an HTTP request with error handling and retries."""
-        # Import proxy manager (only when needed to avoid circular imports)
-        try:
-            from scrapers.proxy_manager import proxy_manager
-        except ImportError:
-            proxy_manager = None
-            logger.warning("Proxy manager not available, proceeding without proxies")
-            use_proxy = False
-            
+    def _build_headers(self, headers: Dict[str, str] = None) -> Dict[str, str]:
+        """Build browser-like request headers, overridden by any given headers."""
         # Generate a realistic browser-like user agent
         chrome_version = f"{random.randint(90, 120)}.0.{random.randint(1000, 9999)}.{random.randint(10, 999)}"
         default_user_agent = f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{chrome_version} Safari/537.36"
         
+        # Accept-Encoding is left to aiohttp, which only offers what it can decode
         default_headers = {
             'User-Agent': headers.get('User-Agent', default_user_agent) if headers else self._get_random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
             'DNT': '1',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
             'Sec-Fetch-Mode': 'navigate',
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
             'Pragma': 'no-cache',
-            'Cache-Control': 'no-cache'
+            'Cache-Control': 'no-cache',
+            # Fresh visitor cookie per request to appear like a regular browser session
+            'Cookie': f"visitor=v{random.randint(1, 9999999)}"
         }
         
         # Merge default headers with any custom headers
@@ -1301,116 +1383,23 @@ class EnhancedScraper:
             ]
             default_headers['Referer'] = random.choice(referers)
         
-        # Init session for each request to avoid cookie tracking
-        local_session = requests.Session()
-        
-        # Configure session
-        local_session.headers.update(default_headers)
-        
-        # Add cookies to appear like a regular browser session
-        local_session.cookies.set('visitor', f"v{random.randint(1, 9999999)}", domain=url.split('/')[2] if '://' in url else url)
-        
-        # Setup retry strategy with exponential backoff
-        retries = 5
-        backoff_factor = 1.5
-        
-        # Setup proxy if requested and available
-        current_proxy = None
-        if use_proxy and proxy_manager:
-            proxy_dict = proxy_manager.get_proxy_dict()
-            if proxy_dict:
-                logger.info(f"Using proxy: {proxy_dict}")
-                local_session.proxies.update(proxy_dict)
-                current_proxy = proxy_dict.get('http', '')
-        
-        # Keep track of current attempt
-        attempt = 0
-        
-        while attempt < retries:
-            try:
-                # Calculate wait time for exponential backoff (but randomize it a bit)
-                wait_time = (backoff_factor ** attempt) * (0.5 + random.random())
-                
-                # On later attempts, try different approaches
-                if attempt > 0:
-                    # Rotate user agent on retry
-                    local_session.headers['User-Agent'] = self._get_random_user_agent()
-                    
-                    # Rotate proxy on retry
-                    if use_proxy and proxy_manager and attempt > 1:
-                        # Mark current proxy as failed
-                        if current_proxy:
-                            proxy_manager.mark_proxy_failed(current_proxy)
-                            
-                        # Get a new proxy
-                        proxy_dict = proxy_manager.get_proxy_dict()
-                        if proxy_dict:
-                            logger.info(f"Switching to new proxy: {proxy_dict}")
-                            local_session.proxies.update(proxy_dict)
-                            current_proxy = proxy_dict.get('http', '')
-                    
-                    # Add some jitter to the request timing to appear more human-like
-                    time.sleep(random.uniform(0.5, 1.5))
-                
-                # Execute the request with the appropriate method
-                if method.upper() == "GET":
-                    response = local_session.get(
-                        url, 
-                        params=params,
-                        timeout=timeout,
-                        verify=verify
-                    )
-                elif method.upper() == "POST":
-                    response = local_session.post(
-                        url, 
-                        data=params,
-                        timeout=timeout,
-                        verify=verify
-                    )
-                else:
-                    logger.error(f"Unsupported HTTP method: {method}")
-                    return None
-                
-                # Check for rate limiting or blocking
-                if response.status_code == 403:
-                    logger.warning(f"Received 403 Forbidden - we may be blocked. Attempt {attempt+1}/{retries}")
-                    
-                    # Mark proxy as failed if we're using one
-                    if current_proxy and proxy_manager:
-                        proxy_manager.mark_proxy_failed(current_proxy)
-                        current_proxy = None
-                    
-                    # Wait longer between retries if we're being rate limited
-                    time.sleep(wait_time * 2)
-                    attempt += 1
-                    continue
-                    
-                # Proceed if successful
-                response.raise_for_status()
-                
-                # Mark proxy as successful if we're using one
-                if current_proxy and proxy_manager:
-                    proxy_manager.mark_proxy_success(current_proxy)
-                
-                # Return response with encoding properly set
-                if response.encoding is None:
-                    response.encoding = 'utf-8'
-                    
-                return response.text
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching {url} (attempt {attempt+1}/{retries}): {str(e)}")
-                
-                # Mark proxy as failed if we're using one
-                if current_proxy and proxy_manager:
-                    proxy_manager.mark_proxy_failed(current_proxy)
-                    current_proxy = None
-                
-                attempt += 1
-                time.sleep(wait_time)  # Wait before retrying with exponential backoff
-        
-        logger.error(f"Failed to fetch {url} after {retries} attempts")
-        return None
+        return default_headers
+    
+    def _make_request(self, url: str, method: str = "GET", 
+                      params: Dict[str, Any] = None, 
+                      headers: Dict[str, str] = None,
+                      timeout: int = 15,
+                      verify: bool = False,  # TLS verification is configured on the fetch engine
+                      use_proxy: bool = True) -> Optional[str]:
+        """Make an HTTP request through the pooled fetch engine, with retries."""
+        return self.fetch_engine.run(self.fetch_engine.fetch(
+            url,
+            method=method,
+            params=params,
+            headers=self._build_headers(headers),
+            timeout=timeout,
+            use_proxy=use_proxy
+        ))
     
     def _unblock_strategy(self, strategy_name: str) -> None:
         """Unblock a strategy if its block period has expired."""
@@ -1485,11 +1474,92 @@ class EnhancedScraper:
         except Exception as e:
             logger.error(f"Error saving data to cache: {str(e)}")
             
+    def _is_cooling_off(self, strategy: ScrapingStrategy) -> bool:
+        """Skip strategies in a cooling-off period after many failures."""
+        if strategy.consecutive_failures > 5 and time.time() - strategy.last_used < 3600:
+            logger.info(f"Skipping strategy {strategy.name} in cooling-off period after {strategy.consecutive_failures} failures")
+            return True
+        return False
+    
+    def _record_strategy_result(self, strategy_name: str, result: List[Dict[str, Any]]) -> bool:
+        """Note a strategy's results, blocking it if it keeps coming back empty."""
+        if result and len(result) > 0:
+            logger.info(f"Strategy {strategy_name} succeeded with {len(result)} results")
+            return True
+        logger.warning(f"Strategy {strategy_name} returned no results")
+        
+        # If strategy fails consistently, block it temporarily
+        if self.strategies[strategy_name].consecutive_failures >= 3:
+            self._block_strategy(strategy_name)
+        return False
+    
+    def _record_strategy_error(self, strategy_name: str) -> None:
+        """Note a strategy that raised, blocking it if it keeps raising."""
+        strategy = self.strategies[strategy_name]
+        strategy.record_failure()
+        
+        # Block the strategy if it had an exception
+        if strategy.consecutive_failures >= 2:
+            self._block_strategy(strategy_name)
+    
+    def _fan_out_strategies(self, strategy_names: List[str], business_type: str,
+                            location: str, limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Run strategies concurrently on the fetch engine.
+        
+        Returns:
+            The strategies that found businesses with their results, in rank order
+        """
+        logger.info(f"Fanning out across strategies: {', '.join(strategy_names)}")
+        
+        async def run_all():
+            return await asyncio.gather(*(
+                self.strategies[name].execute_async(self, business_type, location, limit)
+                for name in strategy_names
+            ), return_exceptions=True)
+        
+        succeeded = []
+        for strategy_name, outcome in zip(strategy_names, self.fetch_engine.run(run_all())):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error executing strategy {strategy_name}: {str(outcome)}")
+                self._record_strategy_error(strategy_name)
+            elif self._record_strategy_result(strategy_name, outcome):
+                succeeded.append((strategy_name, outcome))
+        return succeeded
+    
+    def _finish_scrape(self, business_type: str, location: str, strategy_name: str,
+                       result: List[Dict[str, Any]], from_cache: bool = False,
+                       defer_enrichment: bool = False) -> List[Dict[str, Any]]:
+        """Cache a successful scrape and enhance it with LinkedIn information."""
+        # Record as last successful strategy
+        self.last_successful_strategy = strategy_name
+        
+        # Save to cache (if not already from cache)
+        if not from_cache:
+            self._save_to_cache(business_type, location, result)
+        
+        if defer_enrichment:
+            self.last_enrichment_topic = self.enhance_business_data_in_background(result)
+            logger.info(f"Enhancing {len(result)} business records in the background ({self.last_enrichment_topic})")
+            return result
+        
+        # Enhance data with LinkedIn information
+        try:
+            logger.info(f"Enhancing {len(result)} business records with LinkedIn information")
+            enhanced_data = self.enhance_business_data_with_linkedin(result)
+            logger.info(f"LinkedIn enhancement completed successfully")
+            return enhanced_data
+        except Exception as e:
+            logger.error(f"Error enhancing with LinkedIn data: {str(e)}")
+            # Continue with original data if LinkedIn enhancement fails
+            return result
+            
     def scrape_business_directory(self, 
                                  business_type: str, 
                                  location: str, 
                                  limit: int = 20,
-                                 source: str = "adaptive") -> List[Dict[str, Any]]:
+                                 source: str = "adaptive",
+                                 fan_out: bool = False,
+                                 defer_enrichment: bool = False) -> List[Dict[str, Any]]:
         """
         Scrape business information from a directory using adaptive strategy selection.
         
@@ -1499,6 +1569,11 @@ class EnhancedScraper:
             limit: Maximum number of businesses to return
             source: Preferred source to scrape from ("adaptive", "yelp", "google", "yellowpages",
                    "cached_data", "playwright")
+            fan_out: Run all available strategies at once and merge their results
+                     instead of trying them one after another
+            defer_enrichment: Return the results without LinkedIn data and enhance
+                              them in the background; progress is published on
+                              ``self.last_enrichment_topic``
             
         Returns:
             List of business records
@@ -1550,54 +1625,35 @@ class EnhancedScraper:
             
         logger.info(f"Attempting to scrape with strategies (in order): {', '.join(ranked_strategies)}")
         
-        # Try strategies in order until we get data
-        for strategy_name in ranked_strategies:
-            strategy = self.strategies[strategy_name]
-            
-            # Skip if the strategy is in cooling-off period after many failures
-            if strategy.consecutive_failures > 5 and time.time() - strategy.last_used < 3600:
-                logger.info(f"Skipping strategy {strategy_name} in cooling-off period after {strategy.consecutive_failures} failures")
-                continue
-                
-            logger.info(f"Trying strategy: {strategy_name} (priority: {strategy.get_effective_priority():.2f})")
-            try:
-                # Execute strategy
-                result = strategy.execute(self, business_type, location, limit)
-                
-                # If successful, save to cache and return
-                if result and len(result) > 0:
-                    logger.info(f"Strategy {strategy_name} succeeded with {len(result)} results")
-                    
-                    # Record as last successful strategy
-                    self.last_successful_strategy = strategy_name
-                    
-                    # Save to cache (if not already from cache)
-                    if strategy_name != "cached_data":
-                        self._save_to_cache(business_type, location, result)
-                    
-                    # Enhance data with LinkedIn information
-                    try:
-                        logger.info(f"Enhancing {len(result)} business records with LinkedIn information")
-                        enhanced_data = self.enhance_business_data_with_linkedin(result)
-                        logger.info(f"LinkedIn enhancement completed successfully")
-                        return enhanced_data
-                    except Exception as e:
-                        logger.error(f"Error enhancing with LinkedIn data: {str(e)}")
-                        # Continue with original data if LinkedIn enhancement fails
-                        return result
-                else:
-                    logger.warning(f"Strategy {strategy_name} returned no results")
-                    
-                    # If strategy fails consistently, block it temporarily
-                    if strategy.consecutive_failures >= 3:
-                        self._block_strategy(strategy_name)
-            except Exception as e:
-                logger.error(f"Error executing strategy {strategy_name}: {str(e)}")
-                strategy.record_failure()
-                
-                # Block the strategy if it had an exception
-                if strategy.consecutive_failures >= 2:
-                    self._block_strategy(strategy_name)
+        ranked_strategies = [name for name in ranked_strategies
+                             if not self._is_cooling_off(self.strategies[name])]
+        
+        if fan_out:
+            succeeded = self._fan_out_strategies(ranked_strategies, business_type, location, limit)
+            if succeeded:
+                # Sources overlap with slightly different names and addresses, so
+                # exact listing keys are not enough to line their results up
+                merged = self.deduplicator.deduplicate(
+                    [business for _, result in succeeded for business in result])[:limit]
+                logger.info(f"Merged {len(merged)} results from {', '.join(name for name, _ in succeeded)}")
+                return self._finish_scrape(business_type, location, succeeded[0][0], merged,
+                                           from_cache=all(name == "cached_data" for name, _ in succeeded),
+                                           defer_enrichment=defer_enrichment)
+        else:
+            # Try strategies in order until we get data
+            for strategy_name in ranked_strategies:
+                strategy = self.strategies[strategy_name]
+                logger.info(f"Trying strategy: {strategy_name} (priority: {strategy.get_effective_priority():.2f})")
+                try:
+                    result = strategy.execute(self, business_type, location, limit)
+                except Exception as e:
+                    logger.error(f"Error executing strategy {strategy_name}: {str(e)}")
+                    self._record_strategy_error(strategy_name)
+                    continue
+                if self._record_strategy_result(strategy_name, result):
+                    return self._finish_scrape(business_type, location, strategy_name, result,
+                                               from_cache=strategy_name == "cached_data",
+                                               defer_enrichment=defer_enrichment)
                     
         # Use YellowPages as a fallback instead of Playwright for now
         logger.info("All standard scraping strategies failed, falling back to YellowPages directly")
@@ -1618,6 +1674,9 @@ class EnhancedScraper:
                     if cached_data:
                         logger.warning(f"Falling back to potentially stale cached data ({len(cached_data)} records)")
                         # Enhance with LinkedIn even for cached data
+                        if defer_enrichment:
+                            self.last_enrichment_topic = self.enhance_business_data_in_background(cached_data[:limit])
+                            return cached_data[:limit]
                         try:
                             enhanced_data = self.enhance_business_data_with_linkedin(cached_data[:limit])
                             logger.info(f"Enhanced fallback cached data with LinkedIn information")
@@ -1696,142 +1755,22 @@ class EnhancedScraper:
             except (json.JSONDecodeError, KeyError, ValueError) as e:
                 logger.error(f"Error reading cached data: {str(e)}")
         
-        # Format the search URL
-        search_term = business_type.replace(" ", "+")
-        formatted_location = location.replace(" ", "+")
-        base_url = f"https://www.yelp.com/search?find_desc={search_term}&find_loc={formatted_location}"
-        
         logger.info(f"Scraping Yelp for {business_type} in {location}")
         
-        # Enhanced headers to appear more like a real browser
-        enhanced_headers = {
-            'User-Agent': self._get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0',
-            'TE': 'Trailers',
-            'Referer': 'https://www.google.com/',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'cross-site',
-            'Sec-Fetch-User': '?1',
-            'Pragma': 'no-cache'
-        }
-        
-        # If Yelp scraping fails, try an alternative approach or fallback to existing data
         try:
-            # First attempt - direct web scraping
-            html_content = self._make_request(base_url, headers=enhanced_headers, timeout=15)
-            
-            if not html_content:
-                # If direct scraping fails, try to use existing data if available
-                if os.path.exists(cache_file):
-                    try:
-                        with open(cache_file, 'r') as f:
-                            logger.info(f"Using cached data as fallback for {business_type} in {location}")
-                            return json.load(f)[:limit]
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.error(f"Error reading fallback data: {str(e)}")
-                
-                # If we still don't have data, fall back to Yellow Pages
-                logger.info("Falling back to Yellow Pages as Yelp scraping failed")
-                return self._scrape_yellowpages(business_type, location, limit)
-            
-            # Parse the HTML
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Find business listings (this may need updates as Yelp changes their HTML structure)
-            business_elements = soup.find_all("div", class_="container__09f24__mpR8_")
-            
-            # If we can't find businesses with the expected class, try alternative selectors
-            if not business_elements:
-                business_elements = soup.select("div.businessName__09f24__CGSAT")
-                
-            # If we still can't find businesses, try a broader approach
-            if not business_elements:
-                business_elements = soup.select("div[data-testid='serp-biz-attribute']")
-            
-            # Last resort - try to find any <h3> elements that might be business names
-            if not business_elements:
-                business_elements = soup.select("h3 a")
-            
-            count = 0
-            for element in business_elements:
-                if count >= limit:
-                    break
-                    
-                try:
-                    # Extract name (try multiple possible selectors)
-                    name_element = element.find("a", class_="css-19v1rkv")
-                    if not name_element:
-                        name_element = element.find("a", class_="businessName__09f24__CGSAT")
-                    if not name_element:
-                        name_element = element.select_one("h3 a")
-                    if not name_element and element.name == 'a':
-                        name_element = element
-                        
-                    if not name_element:
-                        continue
-                        
-                    name = name_element.text.strip()
-                    if not name:
-                        continue
-                    
-                    # Extract business URL
-                    business_url = name_element.get('href')
-                    if business_url and not business_url.startswith('http'):
-                        business_url = f"https://www.yelp.com{business_url}"
-                    
-                    # Extract address (try multiple possible selectors)
-                    address_element = element.find("span", class_="css-1e4fdj9")
-                    if not address_element:
-                        address_element = element.select_one("address p")
-                    if not address_element:
-                        address_element = element.select_one("[data-testid='address']")
-                        
-                    address = address_element.text.strip() if address_element else "Address not found"
-                    
-                    # Extract phone and additional details (requires visiting the business page)
-                    phone = "Phone not available"
-                    categories = []
-                    hours = []
-                    rating = None
-                    
-                    # Skip detailed page scraping to avoid too many requests
-                    # This reduces the chance of getting blocked
-                    
-                    # Add to results
-                    businesses.append({
-                        "name": name,
-                        "address": address,
-                        "phone": phone,
-                        "categories": categories,
-                        "rating": rating,
-                        "hours": hours,
-                        "source": "yelp",
-                        "url": business_url,
-                        "scraped_at": datetime.now().isoformat()
-                    })
-                    
-                    count += 1
-                    logger.info(f"Scraped business: {name}")
-                    
-                    # Be nice to the server - use longer random delays
-                    time.sleep(random.uniform(2.0, 5.0))
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing business listing: {str(e)}")
-                    
+            businesses = self.fetch_engine.run(
+                self.strategies["direct_yelp"].fetch_listings(self, business_type, location, limit))
         except Exception as e:
             logger.error(f"Error during Yelp scraping: {str(e)}")
-            # If we have a catastrophic error, try to fall back to Yellow Pages
-            if not businesses:
-                logger.info("Falling back to Yellow Pages due to Yelp scraping error")
-                return self._scrape_yellowpages(business_type, location, limit)
+        
+        # If direct scraping fails, try to use existing data if available
+        if not businesses and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    logger.info(f"Using cached data as fallback for {business_type} in {location}")
+                    return json.load(f)[:limit]
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.error(f"Error reading fallback data: {str(e)}")
         
         # If we got some data from Yelp, save it to the cache
         if businesses:
@@ -1851,91 +1790,17 @@ class EnhancedScraper:
     
     def _scrape_yellowpages(self, business_type: str, location: str, limit: int) -> List[Dict[str, Any]]:
         """Scrape business data from Yellow Pages."""
-        businesses = []
-        
-        # Format the search URL
-        search_term = business_type.replace(" ", "+")
-        formatted_location = location.replace(" ", "+")
-        base_url = f"https://www.yellowpages.com/search?search_terms={search_term}&geo_location_terms={formatted_location}"
-        
         logger.info(f"Scraping Yellow Pages for {business_type} in {location}")
         
-        # Make the request
-        html_content = self._make_request(base_url)
-        if not html_content:
-            logger.error("Failed to fetch Yellow Pages search results")
-            return businesses
-        
-        # Parse the HTML
-        soup = BeautifulSoup(html_content, 'lxml')
-        
-        # Find business listings
-        business_elements = soup.find_all("div", class_="result")
-        
-        count = 0
-        for element in business_elements:
-            if count >= limit:
-                break
-                
-            try:
-                # Extract name
-                name_element = element.find("a", class_="business-name")
-                if not name_element:
-                    continue
-                    
-                name = name_element.text.strip()
-                
-                # Extract business URL
-                business_url = name_element.get('href')
-                if business_url and not business_url.startswith('http'):
-                    business_url = f"https://www.yellowpages.com{business_url}"
-                
-                # Extract address
-                address_element = element.find("div", class_="street-address")
-                address_locality = element.find("div", class_="locality")
-                
-                address = ""
-                if address_element:
-                    address = address_element.text.strip()
-                if address_locality:
-                    if address:
-                        address += ", "
-                    address += address_locality.text.strip()
-                
-                if not address:
-                    address = "Address not found"
-                
-                # Extract phone
-                phone_element = element.find("div", class_="phones")
-                phone = phone_element.text.strip() if phone_element else "Phone not available"
-                
-                # Extract categories
-                categories_element = element.find("div", class_="categories")
-                categories = []
-                if categories_element:
-                    category_links = categories_element.find_all("a")
-                    categories = [link.text.strip() for link in category_links]
-                
-                # Add to results
-                businesses.append({
-                    "name": name,
-                    "address": address,
-                    "phone": phone,
-                    "categories": categories,
-                    "source": "yellowpages",
-                    "url": business_url,
-                    "scraped_at": datetime.now().isoformat()
-                })
-                
-                count += 1
-                logger.info(f"Scraped business: {name}")
-                
-                # Be nice to the server
-                time.sleep(random.uniform(1.0, 3.0))
-                
-            except Exception as e:
-                logger.error(f"Error parsing business listing: {str(e)}")
+        try:
+            businesses = self.fetch_engine.run(
+                self.strategies["yellowpages"].fetch_listings(self, business_type, location, limit))
+        except Exception as e:
+            logger.error(f"Error during Yellow Pages scraping: {str(e)}")
+            return []
         
+        if not businesses:
+            logger.error("Failed to fetch Yellow Pages search results")
         return businesses
     
     def _simulate_google_data(self, business_type: str, location: str, limit: int) -> List[Dict[str, Any]]:
@@ -2052,10 +1917,98 @@ class EnhancedScraper:
             
         return profiles
 
+    def _lookup_linkedin_profiles(self, business_name: str, city: str = None) -> List[Dict[str, Any]]:
+        """Find profiles for a business, consulting the persistent cache first."""
+        def load():
+            profiles = self.profile_cache.get(business_name, city)
+            if profiles is None:
+                profiles = self.find_linkedin_profiles(business_name, city)
+                self.profile_cache.set(business_name, city, profiles)
+            return profiles
+        return self.profile_memo.get_or_compute(profile_key(business_name, city), load)
+    
+    def _linkedin_targets(self, business_data: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any], str, str]]:
+        """Get the (index, record, name, city) of each business that needs a lookup."""
+        targets = []
+        for index, business in enumerate(business_data):
+            business_name = business.get('name', '')
+            business_location = business.get('city', '') or business.get('location', {}).get('city', '')
+            
+            if not business_name:
+                continue
+            
+            # Skip if we already have good owner info
+            if business.get('owner_info', {}).get('owner_name') and (
+               business.get('owner_info', {}).get('owner_phone') or 
+               business.get('owner_info', {}).get('owner_email')):
+                continue
+            
+            targets.append((index, business, business_name, business_location))
+        return targets
+    
+    def _apply_linkedin_profiles(self, business: Dict[str, Any], profiles: List[Dict[str, Any]]) -> None:
+        """Merge looked-up LinkedIn profiles into a business record's owner_info."""
+        if not profiles:
+            return
+            
+        if 'owner_info' not in business:
+            business['owner_info'] = {}
+            
+        # Add LinkedIn data to owner_info
+        for profile in profiles:
+            # Look for owner/manager titles in job titles
+            is_key_person = False
+            job_title = profile.get('job_title', '').lower()
+            
+            if job_title:
+                if any(title in job_title for title in ['owner', 'founder', 'president', 'ceo', 'partner']):
+                    business['owner_info']['owner_name'] = profile.get('name')
+                    business['owner_info']['owner_linkedin'] = profile.get('url')
+                    business['owner_info']['owner_title'] = profile.get('job_title')
+                    business['owner_info']['owner_name_confidence'] = profile.get('confidence', 'medium')
+                    business['owner_info']['owner_name_source'] = "linkedin_profile"
+                    is_key_person = True
+                    break
+                elif any(title in job_title for title in ['manager', 'director', 'supervisor']):
+                    business['owner_info']['manager_name'] = profile.get('name')
+                    business['owner_info']['manager_linkedin'] = profile.get('url')
+                    business['owner_info']['manager_title'] = profile.get('job_title')
+                    business['owner_info']['manager_name_confidence'] = profile.get('confidence', 'medium')
+                    business['owner_info']['manager_name_source'] = "linkedin_profile"
+                    is_key_person = True
+                    # Don't break here as we might still find an owner
+            
+        # If no key person found but we have LinkedIn profiles, use the first one
+        if not is_key_person and profiles and not business['owner_info'].get('owner_name') and not business['owner_info'].get('manager_name'):
+            profile = profiles[0]
+            # Assume this might be an employee or owner
+            business['owner_info']['linkedin_contact'] = profile.get('name')
+            business['owner_info']['linkedin_url'] = profile.get('url')
+            business['owner_info']['linkedin_confidence'] = profile.get('confidence', 'low')
+            
+        # Add company LinkedIn if available
+        company_profiles = [p for p in profiles if p.get('source') == 'linkedin_company']
+        if company_profiles:
+            business['owner_info']['company_linkedin'] = company_profiles[0].get('url')
+            
+        # Update quality score based on LinkedIn data
+        if 'data_quality' in business['owner_info']:
+            current_quality = business['owner_info']['data_quality']
+            
+            # Upgrade quality if we found owner/manager on LinkedIn
+            if business['owner_info'].get('owner_linkedin') or business['owner_info'].get('manager_linkedin'):
+                if current_quality == 'basic':
+                    business['owner_info']['data_quality'] = 'enhanced'
+                elif current_quality == 'enhanced':
+                    business['owner_info']['data_quality'] = 'premium'
+
     def enhance_business_data_with_linkedin(self, business_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Enhance business data by adding LinkedIn profiles of potential owners/managers.
         
+        Lookups run concurrently on the shared enrichment pool and are served
+        from the profile cache when the business was looked up recently.
+        
         Args:
             business_data: List of business records to enhance
             
@@ -2064,81 +2017,65 @@ class EnhancedScraper:
         """
         if not business_data:
             return business_data
-            
-        for business in business_data:
+        
+        pool = get_enrichment_pool()
+        lookups = [(business, pool.submit(self._lookup_linkedin_profiles, name, city))
+                   for _, business, name, city in self._linkedin_targets(business_data)]
+        for business, lookup in lookups:
             try:
-                business_name = business.get('name', '')
-                business_location = business.get('city', '') or business.get('location', {}).get('city', '')
-                
-                if not business_name:
-                    continue
-                
-                # Skip if we already have good owner info
-                if business.get('owner_info', {}).get('owner_name') and (
-                   business.get('owner_info', {}).get('owner_phone') or 
-                   business.get('owner_info', {}).get('owner_email')):
-                    continue
-                    
-                # Look up LinkedIn profiles for this business
-                profiles = self.find_linkedin_profiles(business_name, business_location)
-                
-                if profiles:
-                    if 'owner_info' not in business:
-                        business['owner_info'] = {}
-                        
-                    # Add LinkedIn data to owner_info
-                    for profile in profiles:
-                        # Look for owner/manager titles in job titles
-                        is_key_person = False
-                        job_title = profile.get('job_title', '').lower()
-                        
-                        if job_title:
-                            if any(title in job_title for title in ['owner', 'founder', 'president', 'ceo', 'partner']):
-                                business['owner_info']['owner_name'] = profile.get('name')
-                                business['owner_info']['owner_linkedin'] = profile.get('url')
-                                business['owner_info']['owner_title'] = profile.get('job_title')
-                                business['owner_info']['owner_name_confidence'] = profile.get('confidence', 'medium')
-                                business['owner_info']['owner_name_source'] = "linkedin_profile"
-                                is_key_person = True
-                                break
-                            elif any(title in job_title for title in ['manager', 'director', 'supervisor']):
-                                business['owner_info']['manager_name'] = profile.get('name')
-                                business['owner_info']['manager_linkedin'] = profile.get('url')
-                                business['owner_info']['manager_title'] = profile.get('job_title')
-                                business['owner_info']['manager_name_confidence'] = profile.get('confidence', 'medium')
-                                business['owner_info']['manager_name_source'] = "linkedin_profile"
-                                is_key_person = True
-                                # Don't break here as we might still find an owner
-                        
-                    # If no key person found but we have LinkedIn profiles, use the first one
-                    if not is_key_person and profiles and not business['owner_info'].get('owner_name') and not business['owner_info'].get('manager_name'):
-                        profile = profiles[0]
-                        # Assume this might be an employee or owner
-                        business['owner_info']['linkedin_contact'] = profile.get('name')
-                        business['owner_info']['linkedin_url'] = profile.get('url')
-                        business['owner_info']['linkedin_confidence'] = profile.get('confidence', 'low')
-                        
-                    # Add company LinkedIn if available
-                    company_profiles = [p for p in profiles if p.get('source') == 'linkedin_company']
-                    if company_profiles:
-                        business['owner_info']['company_linkedin'] = company_profiles[0].get('url')
-                        
-                    # Update quality score based on LinkedIn data
-                    if 'data_quality' in business['owner_info']:
-                        current_quality = business['owner_info']['data_quality']
-                        
-                        # Upgrade quality if we found owner/manager on LinkedIn
-                        if business['owner_info'].get('owner_linkedin') or business['owner_info'].get('manager_linkedin'):
-                            if current_quality == 'basic':
-                                business['owner_info']['data_quality'] = 'enhanced'
-                            elif current_quality == 'enhanced':
-                                business['owner_info']['data_quality'] = 'premium'
-            
+                self._apply_linkedin_profiles(business, lookup.result())
             except Exception as e:
                 logger.error(f"Error enhancing business with LinkedIn: {str(e)}")
                 
         return business_data
     
+    def enhance_business_data_in_background(self, business_data: List[Dict[str, Any]]) -> str:
+        """
+        Enhance copies of business records with LinkedIn data without waiting.
+        
+        Each enhanced record is published to the progress stream on topic
+        ``enrichment:<id>:<index>`` as soon as its lookup finishes, and the
+        job's progress on ``enrichment:<id>``, so clients can follow
+        ``/events?topic=enrichment:<id>`` while using the base results.
+        
+        Args:
+            business_data: List of business records to enhance; not modified
+            
+        Returns:
+            The job's topic, ``enrichment:<id>``
+        """
+        topic = f"enrichment:{uuid.uuid4().hex[:12]}"
+        records = copy.deepcopy(business_data)
+        targets = self._linkedin_targets(records)
+        total = len(targets)
+        completed = [0]
+        lock = threading.Lock()
+        self.stream.publish(topic, {"status": "running" if total else "completed", "completed": 0, "total": total})
+        
+        def finished(index, business, lookup):
+            try:
+                self._apply_linkedin_profiles(business, lookup.result())
+                self.stream.publish(f"{topic}:{index}", {
+                    "index": index,
+                    "name": business.get("name"),
+                    "owner_info": business.get("owner_info", {})
+                })
+            except Exception as e:
+                logger.error(f"Error enhancing business with LinkedIn: {str(e)}")
+            with lock:
+                completed[0] += 1
+                self.stream.publish(topic, {
+                    "status": "completed" if completed[0] == total else "running",
+                    "completed": completed[0],
+                    "total": total
+                })
+        
+        pool = get_enrichment_pool()
+        for index, business, name, city in targets:
+            lookup = pool.submit(self._lookup_linkedin_profiles, name, city)
+            lookup.add_done_callback(lambda future, index=index, business=business: finished(index, business, future))
+        return topic
+    
     def scrape_news(self, topic: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Scrape news articles related to a specific topic.
@@ -2214,9 +2151,6 @@ class EnhancedScraper:
                 count += 1
                 logger.info(f"Scraped article: {title}")
                 
-                # Be nice to the server
-                time.sleep(random.uniform(0.5, 1.5))
-                
             except Exception as e:
                 logger.error(f"Error parsing article: {str(e)}")
         
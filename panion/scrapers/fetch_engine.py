@@ -0,0 +1,281 @@
+"""
+Fetch Engine
+Pooled asynchronous HTTP fetching with per-host politeness limits.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+from typing import Any, Coroutine, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; 403 additionally means the proxy or client is blocked
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+class HostLimiter:
+    """Spaces out the start of requests to one host.
+
+    Each caller is given the next free slot and sleeps until it, so
+    concurrent fetches to the same host start at least ``min_interval``
+    (plus up to ``jitter``) seconds apart while fetches to other hosts
+    proceed independently. Slots are handed out without a lock because
+    the limiter is only used from one event loop.
+    """
+
+    def __init__(self, min_interval: float, jitter: float = 0.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Wait for this caller's turn to start a request."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_slot)
+        self._next_slot = start + self.min_interval + random.uniform(0, self.jitter)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+class FetchEngine:
+    """Fetches pages over one pooled aiohttp session.
+
+    Connections are kept alive and reused per host (up to
+    ``max_per_host`` at a time), requests to a host are paced by a
+    ``HostLimiter`` instead of fixed sleeps, and failed requests are
+    retried with jittered exponential backoff that only delays the
+    request being retried. Proxies come from a proxy manager exposing
+    ``get_proxy_dict``, ``mark_proxy_failed`` and ``mark_proxy_success``,
+    which are told the target host and, on success, the request latency.
+
+    The async methods may be awaited from any single event loop. Sync
+    callers use ``run``, which executes a coroutine on a background loop
+    owned by the engine so the pool survives between calls.
+    """
+
+    def __init__(self,
+                 max_connections: int = 32,
+                 max_per_host: int = 4,
+                 min_interval: float = 1.0,
+                 jitter: float = 0.5,
+                 host_intervals: Optional[Dict[str, float]] = None,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 backoff_factor: float = 1.5,
+                 timeout: float = 15.0,
+                 verify_ssl: bool = False,
+                 user_agents: Optional[List[str]] = None,
+                 proxies: Any = None,
+                 cache: Any = None):
+        """Initialize the engine.
+
+        Args:
+            max_connections: Open connections across all hosts
+            max_per_host: Open connections to any one host
+            min_interval: Default seconds between request starts to a host
+            jitter: Random extra seconds added to each interval
+            host_intervals: Per-host overrides of ``min_interval``
+            retries: Attempts per request, including the first
+            backoff: Seconds before the first retry, on average
+            backoff_factor: Growth of the retry delay per attempt
+            timeout: Default total seconds allowed per attempt
+            verify_ssl: Whether to verify TLS certificates
+            user_agents: User agents to rotate through on retries
+            proxies: Proxy manager to draw proxies from, or None
+            cache: ResponseCache for GET responses, or None
+        """
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.host_intervals = dict(host_intervals or {})
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.user_agents = user_agents or []
+        self.proxies = proxies
+        self.cache = cache
+        self.limiters: Dict[str, HostLimiter] = {}
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "blocked": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> HostLimiter:
+        """Get the politeness limiter for a host."""
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            interval = self.host_intervals.get(host, self.min_interval)
+            limiter = self.limiters[host] = HostLimiter(interval, self.jitter)
+        return limiter
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ssl=None if self.verify_ssl else False
+            )
+            # No cookie jar: pages should not be linked to each other by cookies
+            self._session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+            self._session_loop = loop
+        elif self._session_loop is not loop:
+            raise RuntimeError("FetchEngine is already bound to another event loop")
+        return self._session
+
+    async def _next_proxy(self, use_proxy: bool, host: str) -> Optional[str]:
+        if not use_proxy or self.proxies is None:
+            return None
+        # The proxy manager may refresh its list over the network
+        proxy_dict = await asyncio.to_thread(self.proxies.get_proxy_dict, host)
+        # aiohttp tunnels HTTPS through the proxy's HTTP endpoint
+        return proxy_dict.get('http') if proxy_dict else None
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff * (self.backoff_factor ** attempt) * (0.5 + random.random())
+
+    async def fetch(self,
+                    url: str,
+                    method: str = "GET",
+                    params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None,
+                    timeout: Optional[float] = None,
+                    use_proxy: bool = True,
+                    use_cache: bool = True) -> Optional[str]:
+        """Fetch a page, retrying transient failures.
+
+        With a response cache, fresh cached GETs are returned without a
+        request and stale ones are revalidated, so an unchanged page costs
+        a 304 rather than a download.
+
+        Args:
+            url: Page to fetch
+            method: "GET" or "POST" (params are sent as form data for POST)
+            params: Query parameters or form fields
+            headers: Request headers
+            timeout: Total seconds allowed per attempt
+            use_proxy: Whether to route through the proxy manager
+            use_cache: Whether to consult and fill the response cache
+
+        Returns:
+            Optional[str]: The response body, or None if every attempt failed
+        """
+        method = method.upper()
+        if method not in ("GET", "POST"):
+            logger.error(f"Unsupported HTTP method: {method}")
+            return None
+
+        session = self._get_session()
+        host = urlsplit(url).netloc
+        limiter = self.limiter(host)
+        headers = dict(headers or {})
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        cache = self.cache if use_cache and method == "GET" else None
+        cached = None
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.lookup, url, params)
+            if cached is not None:
+                if cached.fresh:
+                    return cached.body
+                headers.update(cached.conditional_headers())
+
+        proxy = await self._next_proxy(use_proxy, host)
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(self.retries):
+            if attempt > 0:
+                self.stats["retries"] += 1
+                if self.user_agents:
+                    headers['User-Agent'] = random.choice(self.user_agents)
+            await limiter.wait()
+            self.stats["requests"] += 1
+            delay = self._backoff(attempt)
+            started = loop.time()
+            try:
+                async with session.request(
+                    method, url,
+                    params=params if method == "GET" else None,
+                    data=params if method == "POST" else None,
+                    headers=headers,
+                    proxy=proxy,
+                    timeout=client_timeout
+                ) as response:
+                    if response.status == 304 and cached is not None:
+                        await asyncio.to_thread(cache.revalidated, url, response.headers, params)
+                        return cached.body
+                    if response.status < 400:
+                        body = await response.text(errors='replace')
+                        if proxy:
+                            self.proxies.mark_proxy_success(proxy, latency=loop.time() - started, host=host)
+                        if cache is not None:
+                            await asyncio.to_thread(cache.store, url, body, response.headers, params)
+                        return body
+                    if response.status not in RETRY_STATUSES:
+                        logger.error(f"Error fetching {url}: HTTP {response.status}")
+                        break
+                    logger.warning(f"HTTP {response.status} from {url} (attempt {attempt + 1}/{self.retries})")
+                    if response.status == 403:
+                        # Probably blocked: wait longer and come back from a different proxy
+                        self.stats["blocked"] += 1
+                        delay *= 2
+                        if proxy:
+                            self.proxies.mark_proxy_failed(proxy, host=host, banned=True)
+                            proxy = await self._next_proxy(use_proxy, host)
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        delay = max(delay, min(float(retry_after), 60.0))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error fetching {url} (attempt {attempt + 1}/{self.retries}): {str(e) or type(e).__name__}")
+                if proxy:
+                    self.proxies.mark_proxy_failed(proxy, host=host)
+                    proxy = await self._next_proxy(use_proxy, host)
+            if attempt + 1 < self.retries:
+                await asyncio.sleep(delay)
+
+        self.stats["failures"] += 1
+        logger.error(f"Failed to fetch {url}")
+        return None
+
+    async def fetch_all(self, urls: Iterable[str], **kwargs) -> List[Optional[str]]:
+        """Fetch several pages concurrently.
+
+        Returns:
+            List[Optional[str]]: Bodies in the order of ``urls`` (None for failures)
+        """
+        return list(await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls)))
+
+    def run(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the engine's background loop and wait for its result."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="fetch-engine", daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def close(self) -> None:
+        """Close pooled connections and stop the background loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
@@ -0,0 +1,85 @@
+"""
+Profile Cache
+SQLite persistence for LinkedIn profile lookups, keyed by business name and city.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.utils.sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_expires ON profiles (expires_at);
+"""
+
+def profile_key(business_name: str, city: Optional[str] = None) -> str:
+    """Normalize a (name, city) pair so spelling variants share an entry."""
+    def normalize(text: Optional[str]) -> str:
+        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', (text or '').lower())).strip()
+    return f"{normalize(business_name)}|{normalize(city)}"
+
+class ProfileCache(SQLiteStore):
+    """Stores profile lookup results in SQLite so they survive restarts.
+
+    Each (name, city) pair is one row holding the profiles as JSON and an
+    expiry time; expired rows read as misses and are deleted at most once
+    per ``purge_interval`` as a side effect of writing. Empty results are
+    cached too, so businesses without profiles are not looked up again
+    until they expire.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 ttl_seconds: float = 7 * 24 * 3600,
+                 purge_interval: float = 3600,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite database file, or ":memory:"
+            ttl_seconds: Seconds a lookup result stays valid
+            purge_interval: Minimum seconds between automatic purges
+            clock: Wall clock in epoch seconds
+        """
+        super().__init__(db_path, _SCHEMA, purge_interval, clock)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, business_name: str, city: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get cached profiles, or None if the pair was never looked up or has expired."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT data FROM profiles WHERE key = ? AND expires_at > ?",
+                (profile_key(business_name, city), self._clock())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, business_name: str, city: Optional[str], profiles: List[Dict[str, Any]]) -> None:
+        """Store the profiles found for a (name, city) pair."""
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO profiles (key, expires_at, data) VALUES (?, ?, ?)",
+                    (profile_key(business_name, city), now + self.ttl_seconds, json.dumps(profiles, default=str))
+                )
+            self._purge_if_due(conn, now)
+
+    def _delete_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """Delete expired entries."""
+        with conn:
+            cursor = conn.execute("DELETE FROM profiles WHERE expires_at <= ?", (now,))
+        if cursor.rowcount:
+            logger.info(f"Purged {cursor.rowcount} expired profile lookups")
+        return cursor.rowcount
@@ -4,11 +4,16 @@ Provides rotating proxy functionality for web scraping operations.
 """
 
 import os
+import atexit
+import heapq
 import logging
+import threading
 import time
 import random
 import json
-from typing import Dict, List, Optional, Union
+import weakref
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 try:
@@ -23,183 +28,461 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Latency assumed for a proxy before it has been measured
+DEFAULT_LATENCY = 1.0
+
+def _clean(proxy: str) -> str:
+    """Identify a proxy by host:port, whatever scheme it was given with."""
+    return proxy.replace('http://', '').replace('https://', '')
+
+class WeightedSampler:
+    """Fenwick tree over slot weights.
+
+    Setting a weight and drawing a slot with probability proportional to
+    its weight both take O(log n), so selection stays cheap however many
+    proxies are pooled and however often their scores change. A slot with
+    weight 0 is never drawn.
+    """
+
+    def __init__(self):
+        self._tree: List[float] = [0.0]  # 1-indexed partial sums
+        self._weights: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def _prefix(self, count: int) -> float:
+        total = 0.0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def append(self, weight: float) -> int:
+        """Add a slot and return its index."""
+        index = len(self._weights) + 1
+        low = index - (index & -index)
+        self._tree.append(weight + self._prefix(index - 1) - self._prefix(low))
+        self._weights.append(weight)
+        return index - 1
+
+    def update(self, slot: int, weight: float) -> None:
+        """Set a slot's weight."""
+        delta = weight - self._weights[slot]
+        self._weights[slot] = weight
+        index = slot + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def weight(self, slot: int) -> float:
+        return self._weights[slot]
+
+    def total(self) -> float:
+        return self._prefix(len(self._weights))
+
+    def sample(self, rng: random.Random) -> Optional[int]:
+        """Draw a slot in proportion to its weight, or None if all weights are 0."""
+        total = self.total()
+        if total <= 0:
+            return None
+        target = rng.random() * total
+        position = 0
+        step = 1 << len(self._weights).bit_length()
+        while step:
+            candidate = position + step
+            if candidate < len(self._tree) and self._tree[candidate] <= target:
+                position = candidate
+                target -= self._tree[candidate]
+            step >>= 1
+        # Guard against float drift landing past the last live slot
+        while position > 0 and (position >= len(self._weights) or self._weights[position] <= 0):
+            position -= 1
+        return position if self._weights[position] > 0 else None
+
+@dataclass
+class ProxyStats:
+    """Running health of one proxy, overall or against one target host."""
+    latency: float = DEFAULT_LATENCY  # EWMA seconds to response headers
+    success: float = 1.0              # EWMA of successes (1) and failures (0)
+    failures: int = 0                 # Consecutive failures
+    strikes: int = 0                  # Quarantines/bans without an intervening success
+    blocked_until: float = 0.0        # Quarantined (or banned from a host) until then
+
+    def score(self) -> float:
+        """Sampling weight: reliable, fast proxies are drawn more often."""
+        return max(self.success, 0.05) ** 2 / max(self.latency, 0.05)
+
+# Managers with state possibly unsaved; weak so that one atexit hook serves
+# all of them without keeping any alive
+_open_managers: "weakref.WeakSet[ProxyManager]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_open_managers() -> None:
+    for manager in list(_open_managers):
+        manager.flush()
+
 class ProxyManager:
-    """Manager for proxy rotation and health checking."""
-    
-    def __init__(self, proxy_file_path: str = "data/proxies.json", max_fail_count: int = 3, check_interval: int = 3600):
+    """Manager for proxy rotation and health checking.
+
+    Every proxy keeps an EWMA of its latency and success rate, overall and
+    per target host, and is drawn with probability proportional to its
+    score from a ``WeightedSampler``. A proxy that fails ``max_fail_count``
+    times in a row is quarantined (weight 0) for an exponentially growing
+    period and comes back on probation afterwards; one quarantined more
+    than ``max_strikes`` times in a row is dropped. A 403 from a host bans
+    the proxy from that host only, with the same backoff. State is written
+    to ``proxy_file_path`` at most once per ``save_interval`` seconds and
+    at exit, not on every mark.
+    """
+
+    def __init__(self,
+                 proxy_file_path: str = "data/proxies.json",
+                 max_fail_count: int = 3,
+                 check_interval: int = 3600,
+                 save_interval: float = 30.0,
+                 quarantine_base: float = 60.0,
+                 max_quarantine: float = 3600.0,
+                 max_strikes: int = 5,
+                 smoothing: float = 0.3,
+                 clock: Callable[[], float] = time.time,
+                 rng: Optional[random.Random] = None):
         """Initialize the proxy manager.
-        
+
         Args:
             proxy_file_path: Path to store cached proxies
-            max_fail_count: Maximum failures before removing a proxy
+            max_fail_count: Consecutive failures before a proxy is quarantined
             check_interval: How often to refresh proxy list in seconds
+            save_interval: Minimum seconds between writes of the proxy file
+            quarantine_base: Seconds of the first quarantine or host ban
+            max_quarantine: Longest quarantine or host ban in seconds
+            max_strikes: Quarantines in a row before a proxy is dropped
+            smoothing: Weight of the newest sample in the EWMAs
+            clock: Wall clock in epoch seconds
+            rng: Random source for sampling
         """
         self.proxy_file_path = proxy_file_path
         self.max_fail_count = max_fail_count
         self.check_interval = check_interval
-        
-        # Proxy storage
-        self.proxies = []
-        self.failed_proxies = {}
+        self.save_interval = save_interval
+        self.quarantine_base = quarantine_base
+        self.max_quarantine = max_quarantine
+        self.max_strikes = max_strikes
+        self.smoothing = smoothing
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.RLock()
+
+        # Proxy storage: stats by proxy, sampler slot by proxy, proxy by slot
+        self.stats: Dict[str, ProxyStats] = {}
+        self.host_stats: Dict[Tuple[str, str], ProxyStats] = {}
+        self._sampler = WeightedSampler()
+        self._slots: Dict[str, int] = {}
+        self._slot_proxies: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._quarantine: List[Tuple[float, str]] = []
         self.last_updated = None
-        
+        self._last_refresh_attempt = 0.0
+        self._dirty = False
+        self._last_save = self._clock()
+
         # Ensure directory exists
-        os.makedirs(os.path.dirname(self.proxy_file_path), exist_ok=True)
-        
+        os.makedirs(os.path.dirname(self.proxy_file_path) or ".", exist_ok=True)
+
         # Load proxies if they exist
         self._load_proxies()
-        
+        _open_managers.add(self)
+
+    @property
+    def proxies(self) -> List[str]:
+        """Proxies currently in the pool, including quarantined ones."""
+        with self._lock:
+            return list(self.stats)
+
     def _load_proxies(self) -> None:
-        """Load proxies from file if it exists."""
+        """Load proxies and their health from file if it exists."""
         try:
             if os.path.exists(self.proxy_file_path):
                 with open(self.proxy_file_path, 'r') as f:
                     data = json.load(f)
-                    self.proxies = data.get('proxies', [])
-                    self.failed_proxies = data.get('failed_proxies', {})
-                    last_updated_str = data.get('last_updated')
-                    
-                    if last_updated_str:
-                        self.last_updated = datetime.fromisoformat(last_updated_str)
-                    
-                    logger.info(f"Loaded {len(self.proxies)} proxies from cache")
+                saved_stats = data.get('stats', {})
+                for proxy in data.get('proxies', []):
+                    stats = saved_stats.get(_clean(proxy))
+                    self.add_proxy(proxy, ProxyStats(**stats) if stats else None)
+                for key, stats in data.get('host_stats', {}).items():
+                    proxy, _, host = key.partition('|')
+                    if proxy in self.stats:
+                        self.host_stats[(proxy, host)] = ProxyStats(**stats)
+
+                last_updated_str = data.get('last_updated')
+                if last_updated_str:
+                    self.last_updated = datetime.fromisoformat(last_updated_str)
+
+                self._dirty = False
+                logger.info(f"Loaded {len(self.stats)} proxies from cache")
         except Exception as e:
             logger.error(f"Error loading proxies: {str(e)}")
-            self.proxies = []
-            self.failed_proxies = {}
-    
+
     def _save_proxies(self) -> None:
-        """Save proxies to file."""
-        try:
+        """Save proxies and their health to file."""
+        with self._lock:
             data = {
-                'proxies': self.proxies,
-                'failed_proxies': self.failed_proxies,
-                'last_updated': datetime.now().isoformat()
+                'proxies': list(self.stats),
+                'stats': {proxy: asdict(stats) for proxy, stats in self.stats.items()},
+                'host_stats': {f"{proxy}|{host}": asdict(stats)
+                               for (proxy, host), stats in self.host_stats.items()},
+                'last_updated': (self.last_updated or datetime.now()).isoformat()
             }
-            
-            with open(self.proxy_file_path, 'w') as f:
+            self._dirty = False
+            self._last_save = self._clock()
+        try:
+            temp_path = f"{self.proxy_file_path}.tmp"
+            with open(temp_path, 'w') as f:
                 json.dump(data, f)
-                
-            logger.info(f"Saved {len(self.proxies)} proxies to cache")
+            os.replace(temp_path, self.proxy_file_path)
+            logger.debug(f"Saved {len(data['proxies'])} proxies to cache")
         except Exception as e:
             logger.error(f"Error saving proxies: {str(e)}")
-    
+
+    def _changed(self) -> None:
+        """Note a state change, saving if the last save is old enough."""
+        self._dirty = True
+        if self._clock() - self._last_save >= self.save_interval:
+            self._save_proxies()
+
+    def flush(self) -> None:
+        """Write pending state changes to the proxy file."""
+        if self._dirty:
+            self._save_proxies()
+
+    def add_proxy(self, proxy: str, stats: Optional[ProxyStats] = None) -> bool:
+        """Add a proxy to the pool.
+
+        Returns:
+            bool: False if the proxy was already pooled
+        """
+        proxy = _clean(proxy)
+        with self._lock:
+            if proxy in self.stats:
+                return False
+            stats = stats or ProxyStats()
+            self.stats[proxy] = stats
+            weight = 0.0 if stats.blocked_until > self._clock() else stats.score()
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._sampler.update(slot, weight)
+                self._slot_proxies[slot] = proxy
+            else:
+                slot = self._sampler.append(weight)
+                self._slot_proxies.append(proxy)
+            self._slots[proxy] = slot
+            if weight == 0.0:
+                heapq.heappush(self._quarantine, (stats.blocked_until, proxy))
+            self._dirty = True
+            return True
+
+    def remove_proxy(self, proxy: str) -> None:
+        """Drop a proxy from the pool."""
+        proxy = _clean(proxy)
+        with self._lock:
+            if proxy not in self.stats:
+                return
+            logger.info(f"Removing failed proxy: {proxy}")
+            del self.stats[proxy]
+            slot = self._slots.pop(proxy)
+            self._sampler.update(slot, 0.0)
+            self._slot_proxies[slot] = None
+            self._free_slots.append(slot)
+            for key in [key for key in self.host_stats if key[0] == proxy]:
+                del self.host_stats[key]
+            self._changed()
+
     def _needs_refresh(self) -> bool:
         """Check if proxy list needs to be refreshed."""
+        # Don't hammer the proxy source when it has nothing to offer
+        if self._clock() - self._last_refresh_attempt < 60:
+            return False
         if not self.last_updated:
             return True
-            
+
         time_diff = datetime.now() - self.last_updated
-        return time_diff.total_seconds() > self.check_interval or len(self.proxies) < 5
-    
+        return time_diff.total_seconds() > self.check_interval or len(self.stats) < 5
+
     def _fetch_new_proxies(self, count: int = 10) -> List[str]:
         """Fetch new proxies using FreeProxy."""
         if not FreeProxy:
             logger.warning("FreeProxy not available, cannot fetch new proxies")
             return []
-            
+
         new_proxies = []
         countries = ['US', 'CA', 'GB', 'DE', 'FR']  # Countries with generally good proxies
-        
+
         for _ in range(count):
             try:
                 # Try to get a proxy from one of the specified countries
                 country = random.choice(countries)
                 proxy = FreeProxy(country_id=country, timeout=1).get()
-                
-                if proxy and proxy not in new_proxies and proxy not in self.proxies:
+
+                if proxy and proxy not in new_proxies and _clean(proxy) not in self.stats:
                     new_proxies.append(proxy)
             except Exception as e:
                 logger.error(f"Error fetching proxy: {str(e)}")
-                
+
             # Small delay to avoid hammering the proxy service
             time.sleep(0.5)
-                
+
         return new_proxies
-    
-    def get_proxy(self) -> Optional[str]:
-        """Get a random working proxy."""
+
+    def _release_quarantined(self, now: float) -> None:
+        """Put proxies whose quarantine has ended back in the draw, on probation."""
+        while self._quarantine and self._quarantine[0][0] <= now:
+            until, proxy = heapq.heappop(self._quarantine)
+            stats = self.stats.get(proxy)
+            if stats is None or stats.blocked_until != until:
+                continue  # Removed, or quarantined again since
+            stats.failures = self.max_fail_count - 1  # One more failure sends it back
+            self._sampler.update(self._slots[proxy], stats.score())
+
+    def get_proxy(self, host: Optional[str] = None) -> Optional[str]:
+        """Draw a healthy proxy, favouring fast and reliable ones.
+
+        Args:
+            host: Target host, so proxies banned by or failing against it are avoided
+        """
         # Check if we need to refresh the proxy list
         if self._needs_refresh():
             logger.info("Refreshing proxy list")
-            
+            self._last_refresh_attempt = self._clock()
+
             # Fetch new proxies
             new_proxies = self._fetch_new_proxies(10)
-            
+
             if new_proxies:
-                # Add new proxies to our list
+                # Add new proxies to our pool
                 for proxy in new_proxies:
-                    if proxy not in self.proxies:
-                        self.proxies.append(proxy)
-                
+                    self.add_proxy(proxy)
+
                 # Update last updated time
                 self.last_updated = datetime.now()
-                
-                # Save updated proxy list
-                self._save_proxies()
-        
-        # Return a random proxy if we have any
-        if self.proxies:
-            return random.choice(self.proxies)
-        
-        return None
-    
-    def get_proxy_dict(self) -> Optional[Dict[str, str]]:
+                self._changed()
+
+        with self._lock:
+            now = self._clock()
+            self._release_quarantined(now)
+            # Rejection sampling folds in per-host health without a sampler per host
+            for _ in range(8):
+                slot = self._sampler.sample(self._rng)
+                if slot is None:
+                    return None
+                proxy = self._slot_proxies[slot]
+                host_stats = self.host_stats.get((proxy, host)) if host else None
+                if host_stats is None:
+                    return proxy
+                if host_stats.blocked_until <= now and self._rng.random() < max(host_stats.success, 0.05):
+                    return proxy
+            # Everything drawn was banned by the host; take the best proxy that is not
+            candidates = [
+                (stats.score(), proxy) for proxy, stats in self.stats.items()
+                if stats.blocked_until <= now
+                and self.host_stats.get((proxy, host), ProxyStats()).blocked_until <= now
+            ]
+            return max(candidates)[1] if candidates else None
+
+    def get_proxy_dict(self, host: Optional[str] = None) -> Optional[Dict[str, str]]:
         """Get a proxy in dictionary format for requests."""
-        proxy = self.get_proxy()
-        
+        proxy = self.get_proxy(host)
+
         if not proxy:
             return None
-            
-        if proxy.startswith('http'):
-            # Already formatted properly
-            return {
-                'http': proxy,
-                'https': proxy
-            }
-        else:
-            # Format as needed
+
+        return {
+            'http': f'http://{proxy}',
+            'https': f'http://{proxy}'
+        }
+
+    def _record(self, stats: ProxyStats, succeeded: bool, latency: Optional[float]) -> None:
+        alpha = self.smoothing
+        stats.success = (1 - alpha) * stats.success + alpha * (1.0 if succeeded else 0.0)
+        if latency is not None:
+            stats.latency = (1 - alpha) * stats.latency + alpha * latency
+
+    def _backoff(self, strikes: int) -> float:
+        return min(self.quarantine_base * 2 ** (strikes - 1), self.max_quarantine)
+
+    def mark_proxy_failed(self, proxy: str, host: Optional[str] = None, banned: bool = False) -> None:
+        """Mark a proxy as failed.
+
+        Args:
+            proxy: The proxy, with or without scheme
+            host: Target host the request failed against
+            banned: Whether the host refused the proxy (e.g. a 403)
+        """
+        proxy = _clean(proxy)
+        with self._lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+            now = self._clock()
+            self._record(stats, False, None)
+            stats.failures += 1
+
+            if host:
+                host_stats = self.host_stats.setdefault((proxy, host), ProxyStats())
+                self._record(host_stats, False, None)
+                if banned:
+                    host_stats.strikes += 1
+                    host_stats.blocked_until = now + self._backoff(host_stats.strikes)
+                    logger.info(f"Proxy {proxy} banned from {host} for {host_stats.blocked_until - now:.0f}s")
+
+            if stats.failures >= self.max_fail_count:
+                stats.strikes += 1
+                stats.failures = 0
+                if stats.strikes > self.max_strikes:
+                    self.remove_proxy(proxy)
+                    return
+                stats.blocked_until = now + self._backoff(stats.strikes)
+                heapq.heappush(self._quarantine, (stats.blocked_until, proxy))
+                self._sampler.update(self._slots[proxy], 0.0)
+                logger.info(f"Quarantined proxy {proxy} for {stats.blocked_until - now:.0f}s")
+            elif stats.blocked_until <= now:
+                self._sampler.update(self._slots[proxy], stats.score())
+            self._changed()
+
+    def mark_proxy_success(self, proxy: str, latency: Optional[float] = None, host: Optional[str] = None) -> None:
+        """Mark a proxy as successful.
+
+        Args:
+            proxy: The proxy, with or without scheme
+            latency: Seconds the request took, if measured
+            host: Target host the request succeeded against
+        """
+        proxy = _clean(proxy)
+        with self._lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+            self._record(stats, True, latency)
+            stats.failures = 0
+            stats.strikes = 0
+            if host:
+                host_stats = self.host_stats.setdefault((proxy, host), ProxyStats())
+                self._record(host_stats, True, latency)
+                host_stats.failures = 0
+                host_stats.strikes = 0
+            if stats.blocked_until <= self._clock():
+                self._sampler.update(self._slots[proxy], stats.score())
+            self._changed()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and the health of each proxy."""
+        with self._lock:
+            now = self._clock()
             return {
-                'http': f'http://{proxy}',
-                'https': f'https://{proxy}'
+                "proxies": len(self.stats),
+                "quarantined": sum(1 for stats in self.stats.values() if stats.blocked_until > now),
+                "host_bans": sum(1 for stats in self.host_stats.values() if stats.blocked_until > now),
+                "by_proxy": {proxy: asdict(stats) for proxy, stats in self.stats.items()}
             }
-    
-    def mark_proxy_failed(self, proxy: str) -> None:
-        """Mark a proxy as failed."""
-        # Remove http:// or https:// if present
-        clean_proxy = proxy.replace('http://', '').replace('https://', '')
-        
-        # Increment fail count
-        self.failed_proxies[clean_proxy] = self.failed_proxies.get(clean_proxy, 0) + 1
-        
-        # Remove if too many failures
-        if self.failed_proxies[clean_proxy] >= self.max_fail_count:
-            logger.info(f"Removing failed proxy: {proxy}")
-            
-            if proxy in self.proxies:
-                self.proxies.remove(proxy)
-                
-            # Also check without protocol
-            if clean_proxy in self.proxies:
-                self.proxies.remove(clean_proxy)
-                
-            # Remove from failed dict to clean up
-            del self.failed_proxies[clean_proxy]
-            
-            # Save updated proxy list
-            self._save_proxies()
-    
-    def mark_proxy_success(self, proxy: str) -> None:
-        """Mark a proxy as successful (reset fail count)."""
-        # Remove http:// or https:// if present
-        clean_proxy = proxy.replace('http://', '').replace('https://', '')
-        
-        # Reset fail count if it was tracked
-        if clean_proxy in self.failed_proxies:
-            del self.failed_proxies[clean_proxy]
-            
-            # Save updated proxy list if we made changes
-            self._save_proxies()
 
 # Create a singleton proxy manager instance
-proxy_manager = ProxyManager()
\ No newline at end of file
+proxy_manager = ProxyManager()
@@ -0,0 +1,345 @@
+"""
+Response Cache
+Shared on-disk HTTP response cache for the scrapers, with conditional revalidation.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.utils.sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = "./data/http_cache"
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("PANION_HTTP_CACHE_MB", 256)) * 1024 * 1024
+HTTP_CACHE_TTL = float(os.environ.get("PANION_HTTP_CACHE_TTL", 24 * 3600))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest),
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_access ON entries (last_access);
+"""
+
+def normalize_url(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Canonical form of a request URL and its query parameters.
+
+    Scheme and host are lowercased, default ports and fragments dropped,
+    and query parameters (including ``params``) sorted, so the same request
+    written differently maps to one cache entry.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(sorted(query)), ""))
+
+@dataclass
+class CachedResponse:
+    """A stored response body and its validators."""
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    fresh: bool
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the server answer 304 if the body is unchanged."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        elif not self.etag:
+            headers['If-Modified-Since'] = formatdate(self.stored_at, usegmt=True)
+        return headers
+
+class ResponseCache(SQLiteStore):
+    """Caches GET response bodies on disk, shared by all scrapers.
+
+    Entries are keyed by a hash of the normalized URL and parameters and
+    point at bodies stored once per content hash, zlib-compressed, so
+    pages that come back identical under different URLs (or different
+    paginations of an empty result) share storage. An entry is served
+    without a request for ``ttl_seconds``; after that it is revalidated
+    with If-None-Match / If-Modified-Since and a 304 refreshes it in
+    place. Freshness is the scraper's choice rather than the server's
+    Cache-Control, since directory sites mark search pages uncacheable
+    for browsers though their listings change slowly.
+
+    When the stored bodies exceed ``max_bytes`` the least recently used
+    entries are evicted. The index lives in SQLite next to the bodies.
+    """
+
+    def __init__(self,
+                 cache_dir: str = HTTP_CACHE_DIR,
+                 max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 ttl_seconds: float = HTTP_CACHE_TTL,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the index and compressed bodies
+            max_bytes: Compressed bytes kept before evicting
+            ttl_seconds: Seconds an entry is served without revalidation
+            clock: Wall clock in epoch seconds
+        """
+        super().__init__(os.path.join(cache_dir, "index.db"), _SCHEMA, clock=clock)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.stale = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest + ".z")
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Cache key for a request; hashed so API keys in URLs are not stored."""
+        return hashlib.sha256(f"{method.upper()} {normalize_url(url, params)}".encode()).hexdigest()
+
+    def lookup(self, url: str, params: Optional[Mapping[str, Any]] = None,
+               method: str = "GET") -> Optional[CachedResponse]:
+        """Get the stored response for a request, fresh or stale.
+
+        A fresh entry counts as a hit and a missing one as a miss; a stale
+        one counts as a hit only once ``revalidated`` is called for it.
+        """
+        if method.upper() != "GET":
+            return None
+        key = self.key(method, url, params)
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT url, digest, etag, last_modified, stored_at, expires_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body = self._read_blob(row[1])
+            if body is None:
+                # The body file is gone; forget the entry
+                self._delete_entries(conn, [key])
+                self.misses += 1
+                return None
+            fresh = row[5] > now
+            if fresh:
+                self.hits += 1
+                with conn:
+                    conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            else:
+                self.stale += 1
+        return CachedResponse(url=row[0], body=body, etag=row[2], last_modified=row[3],
+                              stored_at=row[4], fresh=fresh)
+
+    def _read_blob(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                return zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error):
+            return None
+
+    def store(self, url: str, body: str, headers: Optional[Mapping[str, str]] = None,
+              params: Optional[Mapping[str, Any]] = None, method: str = "GET",
+              ttl_seconds: Optional[float] = None) -> None:
+        """Store a successful response body and its validators."""
+        if method.upper() != "GET":
+            return
+        headers = headers or {}
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        key = self.key(method, url, params)
+        now = self._clock()
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            conn = self._connection()
+            known = conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if not known:
+                compressed = zlib.compress(data, 6)
+                path = self._blob_path(digest)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(temp_path, path)
+            previous = conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            with conn:
+                if not known:
+                    conn.execute("INSERT INTO blobs (digest, size, refs) VALUES (?, ?, 0)", (digest, len(compressed)))
+                if previous is None or previous[0] != digest:
+                    conn.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, url, digest, etag, last_modified, stored_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, normalize_url(url), digest, headers.get('ETag'),
+                     headers.get('Last-Modified'), now, expires_at, now)
+                )
+            if previous is not None and previous[0] != digest:
+                self._release_blobs(conn, [previous[0]])
+            self.stores += 1
+            self._evict(conn)
+
+    def revalidated(self, url: str, headers: Optional[Mapping[str, str]] = None,
+                    params: Optional[Mapping[str, Any]] = None, method: str = "GET",
+                    ttl_seconds: Optional[float] = None) -> None:
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        headers = headers or {}
+        now = self._clock()
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "UPDATE entries SET expires_at = ?, last_access = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                    (expires_at, now, headers.get('ETag'), headers.get('Last-Modified'),
+                     self.key(method, url, params))
+                )
+            self.revalidations += 1
+
+    def invalidate(self, url: str, params: Optional[Mapping[str, Any]] = None, method: str = "GET") -> None:
+        """Drop the entry for a request, e.g. when its body turned out to be an error."""
+        with self._lock:
+            self._delete_entries(self._connection(), [self.key(method, url, params)])
+
+    def _delete_entries(self, conn: sqlite3.Connection, keys: List[str]) -> int:
+        """Delete entries, returning the bytes of bodies freed."""
+        digests = []
+        for key in keys:
+            row = conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                digests.append(row[0])
+        with conn:
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+        return self._release_blobs(conn, digests)
+
+    def _release_blobs(self, conn: sqlite3.Connection, digests: List[str]) -> int:
+        """Drop references to bodies, deleting bodies nothing refers to.
+
+        Returns:
+            int: Bytes of bodies deleted
+        """
+        with conn:
+            conn.executemany("UPDATE blobs SET refs = refs - 1 WHERE digest = ?", [(d,) for d in digests])
+            orphans = conn.execute("SELECT digest, size FROM blobs WHERE refs <= 0").fetchall()
+            conn.executemany("DELETE FROM blobs WHERE digest = ?", [(d,) for d, _ in orphans])
+        for digest, _ in orphans:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+        return sum(size for _, size in orphans)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently used entries until the bodies fit in ``max_bytes``."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for (key,) in conn.execute("SELECT key FROM entries ORDER BY last_access").fetchall():
+            total -= self._delete_entries(conn, [key])
+            self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+    def fetch(self, client: Any, url: str, params: Optional[Mapping[str, Any]] = None,
+              headers: Optional[Mapping[str, str]] = None, **kwargs) -> str:
+        """GET a page through a ``requests`` session (or the module), using the cache.
+
+        Fresh entries are returned without a request; stale ones are
+        revalidated. HTTP errors are raised as by ``raise_for_status``.
+
+        Args:
+            client: Object with a requests-style ``get`` method
+            url: Page to fetch
+            params: Query parameters
+            headers: Request headers
+            **kwargs: Passed through to ``client.get`` (timeout, verify, ...)
+
+        Returns:
+            str: The response body
+        """
+        cached = self.lookup(url, params)
+        if cached is not None and cached.fresh:
+            return cached.body
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(cached.conditional_headers())
+        response = client.get(url, params=params, headers=request_headers, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.revalidated(url, response.headers, params)
+            return cached.body
+        response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+        self.store(url, response.text, response.headers, params)
+        return response.text
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/revalidation counts and stored sizes.
+
+        The hit rate counts revalidated entries as hits, since they cost a
+        request but no download.
+        """
+        with self._lock:
+            conn = self._connection()
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            blobs, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            lookups = self.hits + self.stale + self.misses
+            return {
+                "entries": entries,
+                "bodies": blobs,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale": self.stale,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.revalidations) / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions
+            }
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Get the response cache shared by all scrapers in this process."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 import random
 
+from scrapers.response_cache import ResponseCache, get_response_cache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,16 +33,17 @@ USER_AGENTS = [
 class SmokeshopScraper:
     """Scraper for smoke shop information from various online sources."""
     
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
         self.shops = []
         self.session = requests.Session()
+        self.response_cache = response_cache or get_response_cache()
         
     def _get_random_user_agent(self) -> str:
         """Get a random user agent string to avoid detection."""
         return random.choice(USER_AGENTS)
     
     def _make_request(self, url: str) -> Optional[str]:
-        """Make an HTTP request with error handling and retries."""
+        """Make an HTTP request through the response cache, with error handling and retries."""
         headers = {
             'User-Agent': self._get_random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml',
@@ -50,9 +53,7 @@ class SmokeshopScraper:
         retries = 3
         while retries > 0:
             try:
-                response = self.session.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                return response.text
+                return self.response_cache.fetch(self.session, url, headers=headers, timeout=10)
             except requests.exceptions.RequestException as e:
                 logger.error(f"Error fetching {url}: {str(e)}")
                 retries -= 1
@@ -11,6 +11,8 @@ import asyncio
 from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
+from core.progress_stream import progress_stream
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,12 +23,14 @@ class StrategyController:
     
     This class serves as a bridge between the Panion API system and 
     the Strategic Orchestrator, providing a simplified interface for
-    initiating and monitoring strategic operations.
+    initiating and monitoring strategic operations. Operation changes
+    are published to the progress stream on topic ``operation:<id>``.
     """
     
-    def __init__(self):
+    def __init__(self, stream=None):
         """Initialize the strategy controller."""
         self.orchestrator = None
+        self.stream = stream or progress_stream
         self.results_dir = os.path.join('data', 'results')
         os.makedirs(self.results_dir, exist_ok=True)
         
@@ -34,6 +38,11 @@ class StrategyController:
         self.active_operations = {}
         self.operation_results = {}
         
+    def _set_operation(self, operation_id: str, **fields: Any) -> None:
+        """Update an operation record and publish the changed fields."""
+        self.active_operations[operation_id].update(fields)
+        self.stream.publish(f"operation:{operation_id}", {"operation_id": operation_id, **fields})
+    
     def _init_orchestrator(self) -> None:
         """Initialize the strategic orchestrator if not already initialized."""
         if self.orchestrator is None:
@@ -68,11 +77,12 @@ class StrategyController:
         # Record the operation
         self.active_operations[operation_id] = {
             "goal": goal,
-            "parameters": parameters or {},
-            "status": "initializing",
-            "start_time": datetime.now().isoformat(),
-            "progress": 0
+            "parameters": parameters or {}
         }
+        self._set_operation(operation_id,
+                            status="initializing",
+                            start_time=datetime.now().isoformat(),
+                            progress=0)
         
         # Start the operation in the background
         asyncio.create_task(self._execute_operation(operation_id, goal, parameters or {}))
@@ -91,8 +101,7 @@ class StrategyController:
         """Execute a strategic operation in the background."""
         try:
             # Update status to running
-            self.active_operations[operation_id]["status"] = "running"
-            self.active_operations[operation_id]["progress"] = 10
+            self._set_operation(operation_id, status="running", progress=10)
             
             # Execute the goal via the orchestrator
             context = {"parameters": parameters}
@@ -112,10 +121,11 @@ class StrategyController:
             self.operation_results[operation_id] = result
             
             # Update operation status
-            self.active_operations[operation_id]["status"] = "completed"
-            self.active_operations[operation_id]["end_time"] = datetime.now().isoformat()
-            self.active_operations[operation_id]["progress"] = 100
-            self.active_operations[operation_id]["success"] = result.get("success", False)
+            self._set_operation(operation_id,
+                                status="completed",
+                                end_time=datetime.now().isoformat(),
+                                progress=100,
+                                success=result.get("success", False))
             
             # Save the results to a file
             self._save_operation_results(operation_id, result)
@@ -126,11 +136,12 @@ class StrategyController:
             logger.error(f"Error executing strategic operation {operation_id}: {str(e)}")
             
             # Update operation status
-            self.active_operations[operation_id]["status"] = "failed"
-            self.active_operations[operation_id]["end_time"] = datetime.now().isoformat()
-            self.active_operations[operation_id]["error"] = str(e)
-            self.active_operations[operation_id]["progress"] = 100
-            self.active_operations[operation_id]["success"] = False
+            self._set_operation(operation_id,
+                                status="failed",
+                                end_time=datetime.now().isoformat(),
+                                error=str(e),
+                                progress=100,
+                                success=False)
     
     async def _update_progress(self, operation_id: str) -> None:
         """Update the progress of an operation periodically."""
@@ -140,7 +151,7 @@ class StrategyController:
                 # Increment progress up to 90% (last 10% reserved for completion)
                 if progress < 90:
                     progress += 5
-                    self.active_operations[operation_id]["progress"] = progress
+                    self._set_operation(operation_id, progress=progress)
                 
                 # Wait a bit before updating again
                 await asyncio.sleep(3)
@@ -351,10 +362,11 @@ class StrategyController:
             }
             
         # Update operation status
-        operation["status"] = "cancelled"
-        operation["end_time"] = datetime.now().isoformat()
-        operation["progress"] = 100
-        operation["success"] = False
+        self._set_operation(operation_id,
+                            status="cancelled",
+                            end_time=datetime.now().isoformat(),
+                            progress=100,
+                            success=False)
         
         logger.info(f"Operation {operation_id} cancelled")
         
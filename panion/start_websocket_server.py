@@ -14,6 +14,11 @@ import time
 import signal
 from typing import Set, Dict, Any, Optional
 
+import aiohttp
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from core.pubsub_hub import PubSubHub
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +30,18 @@ logger = logging.getLogger(__name__)
 active_connections: Set[Any] = set()
 connection_metadata: Dict[Any, Dict[str, Any]] = {}
 
+# Topic routing for pushed messages. Topics used by Panion:
+#   task:<id>       background task progress (from the API's /events stream)
+#   operation:<id>  strategic operation progress (same source)
+#   agent:<id>      collaboration messages addressed to an agent
+#   goal:<id>       goal status changes
+# These are published by the server side only; clients may publish to any
+# other topic, e.g. client:<name>.
+RESERVED_TOPIC_PREFIXES = ("task:", "operation:", "agent:", "goal:")
+hub: Optional[PubSubHub] = None
+SEND_QUEUE_SIZE = int(os.environ.get("PANION_WS_SEND_QUEUE", 256))  # Pending messages per client before it is dropped
+API_EVENTS_URL = os.environ.get("PANION_API_EVENTS_URL", "http://localhost:8000/events")
+
 # Server stats
 server_stats = {
     "start_time": time.time(),
@@ -35,11 +52,46 @@ server_stats = {
     "last_error": None
 }
 
+def get_hub() -> PubSubHub:
+    """Get the hub, creating it on first use inside the event loop"""
+    global hub
+    if hub is None:
+        hub = PubSubHub(max_queue_size=SEND_QUEUE_SIZE)
+    return hub
+
+def _topics(data):
+    topics = data.get("topics", data.get("topic", []))
+    return [topics] if isinstance(topics, str) else list(topics)
+
+def handle_subscribe(connection, data):
+    """Subscribe to topics; ``prefix*`` patterns are allowed"""
+    return {"topics": get_hub().subscribe(connection, _topics(data))}
+
+def handle_unsubscribe(connection, data):
+    """Remove topic subscriptions"""
+    return {"topics": get_hub().unsubscribe(connection, _topics(data))}
+
+def handle_publish(connection, data):
+    """Publish a message to a topic's subscribers; server-side topics are refused"""
+    topic = data.get("topic")
+    if not topic or not isinstance(topic, str):
+        raise ValueError("publish requires a topic")
+    if topic.startswith(RESERVED_TOPIC_PREFIXES):
+        raise ValueError(f"topic {topic} is reserved for server events")
+    return {"delivered": get_hub().publish(topic, data.get("data"))}
+
+# Message type -> handler(connection, data) returning the response data
+MESSAGE_HANDLERS = {
+    "subscribe": handle_subscribe,
+    "unsubscribe": handle_unsubscribe,
+    "publish": handle_publish,
+}
+
 # Handle connections (v15.0.1 compatible - no path parameter)
 async def handler(websocket):
     """Handle websocket connection"""
     # Initialize variables outside of try block to ensure they exist in all code paths
-    client_id = f"client_{int(time.time() * 1000)}"
+    client_id = f"client_{time.time_ns()}"
     client_info = {
         "id": client_id,
         "connected_at": time.time(),
@@ -48,6 +100,16 @@ async def handler(websocket):
         "messages_sent": 1  # Including welcome message
     }
     
+    # Every outgoing message goes through the connection's queue, in order
+    connection = get_hub().register(client_id, websocket.send, websocket.close)
+    
+    def reply(payload):
+        if connection.enqueue(json.dumps(payload)):
+            client_info["messages_sent"] += 1
+            server_stats["messages_sent"] += 1
+    
+    client_info["connection"] = connection
+    
     try:
         logger.info(f"New connection established: {client_id}")
         active_connections.add(websocket)
@@ -55,7 +117,7 @@ async def handler(websocket):
         server_stats["total_connections"] += 1
         
         # Send welcome message
-        await websocket.send(json.dumps({
+        connection.enqueue(json.dumps({
             "type": "welcome",
             "client_id": client_id,
             "message": "Connected to Panion WebSocket Server",
@@ -65,6 +127,7 @@ async def handler(websocket):
         
         # Process incoming messages
         async for message in websocket:
+            data = None
             try:
                 # Update activity timestamp
                 client_info["last_activity"] = time.time()
@@ -75,9 +138,8 @@ async def handler(websocket):
                 message_type = data.get("type", "unknown")
                 message_id = data.get("id", f"auto_{time.time()}")
                 
-                logger.info(f"Received message from {client_id}: {message_type} (ID: {message_id})")
+                logger.debug(f"Received message from {client_id}: {message_type} (ID: {message_id})")
                 
-                # Simple echo response
                 response = {
                     "id": message_id,
                     "type": f"{message_type}_response",
@@ -87,40 +149,39 @@ async def handler(websocket):
                         "timestamp": time.time()
                     }
                 }
+                message_handler = MESSAGE_HANDLERS.get(message_type)
+                if message_handler:
+                    response["data"].update(message_handler(connection, data))
                 
-                await websocket.send(json.dumps(response))
-                client_info["messages_sent"] += 1
-                server_stats["messages_sent"] += 1
+                reply(response)
                 
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON received from {client_id}")
-                await websocket.send(json.dumps({
+                reply({
                     "type": "error",
                     "error": "Invalid JSON message",
                     "timestamp": time.time()
-                }))
+                })
                 server_stats["errors"] += 1
                 server_stats["last_error"] = "Invalid JSON message"
-                client_info["messages_sent"] += 1
-                server_stats["messages_sent"] += 1
                 
             except Exception as e:
                 logger.error(f"Error processing message from {client_id}: {e}")
-                await websocket.send(json.dumps({
+                reply({
+                    "id": data.get("id") if isinstance(data, dict) else None,
                     "type": "error",
                     "error": str(e),
                     "timestamp": time.time()
-                }))
+                })
                 server_stats["errors"] += 1
                 server_stats["last_error"] = str(e)
-                client_info["messages_sent"] += 1
-                server_stats["messages_sent"] += 1
                 
     except Exception as e:
         logger.error(f"Connection error with {client_id}: {e}")
         server_stats["errors"] += 1
         server_stats["last_error"] = str(e)
     finally:
+        get_hub().unregister(connection)
         if websocket in active_connections:
             active_connections.remove(websocket)
             
@@ -139,54 +200,88 @@ async def heartbeat():
         try:
             if active_connections:
                 logger.info(f"Sending heartbeat to {len(active_connections)} clients")
-                disconnected = []
+                stale = []
+                payload = json.dumps({
+                    "type": "heartbeat",
+                    "timestamp": time.time(),
+                    "connections": len(active_connections),
+                    "server_stats": {
+                        "uptime": time.time() - server_stats["start_time"],
+                        "total_connections": server_stats["total_connections"],
+                        "active_connections": len(active_connections),
+                        "hub": get_hub().get_stats()
+                    }
+                })
                 
-                for websocket in active_connections:
-                    try:
-                        # Check if connection is stale (no activity for 2 minutes)
-                        client_info = connection_metadata.get(websocket, {})
-                        last_activity = client_info.get("last_activity", 0)
-                        
-                        if time.time() - last_activity > 120:  # 2 minutes
-                            logger.info(f"Client {client_info.get('id', 'unknown')} inactive for too long, closing")
-                            await websocket.close(1000, "Inactive connection")
-                            disconnected.append(websocket)
-                            continue
-                        
-                        # Send heartbeat
-                        await websocket.send(json.dumps({
-                            "type": "heartbeat",
-                            "timestamp": time.time(),
-                            "connections": len(active_connections),
-                            "server_stats": {
-                                "uptime": time.time() - server_stats["start_time"],
-                                "total_connections": server_stats["total_connections"],
-                                "active_connections": len(active_connections)
-                            }
-                        }))
+                for websocket in list(active_connections):
+                    # Check if connection is stale (no activity for 2 minutes)
+                    client_info = connection_metadata.get(websocket, {})
+                    last_activity = client_info.get("last_activity", 0)
+                    
+                    if time.time() - last_activity > 120:  # 2 minutes
+                        logger.info(f"Client {client_info.get('id', 'unknown')} inactive for too long, closing")
+                        stale.append(websocket)
+                        continue
+                    
+                    # Queued, not awaited: a slow client cannot stall the others
+                    connection = client_info.get("connection")
+                    if connection is not None and connection.enqueue(payload):
                         client_info["messages_sent"] = client_info.get("messages_sent", 0) + 1
                         server_stats["messages_sent"] += 1
-                        
-                    except websockets.exceptions.ConnectionClosed:
-                        disconnected.append(websocket)
-                    except Exception as e:
-                        logger.error(f"Error sending heartbeat: {e}")
-                        disconnected.append(websocket)
                 
-                # Clean up disconnected clients
-                for websocket in disconnected:
-                    if websocket in active_connections:
-                        active_connections.remove(websocket)
-                    if websocket in connection_metadata:
-                        client_id = connection_metadata[websocket]["id"]
-                        del connection_metadata[websocket]
-                        logger.info(f"Removed stale connection: {client_id}")
+                # Close stale clients concurrently; their handlers clean up
+                if stale:
+                    await asyncio.gather(
+                        *(websocket.close(1000, "Inactive connection") for websocket in stale),
+                        return_exceptions=True
+                    )
                 
             await asyncio.sleep(30)  # 30 second interval
         except Exception as e:
             logger.error(f"Error in heartbeat: {e}")
             await asyncio.sleep(5)  # Wait a bit before retry if there's an error
 
+# Bridge from the API's progress events
+async def follow_api_events(url=API_EVENTS_URL, retry_delay=1.0, max_retry_delay=30.0):
+    """Republish the API's Server-Sent Events on the hub.
+    
+    Task and strategic operation progress is produced in the API process;
+    this follows its ``/events`` stream and publishes each event on its
+    topic. Reconnects resume from the last event id, and a ``reset`` from
+    the API is broadcast so clients refetch state.
+    """
+    last_event_id = None
+    delay = retry_delay
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        while True:
+            headers = {"Last-Event-ID": last_event_id} if last_event_id else {}
+            try:
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    delay = retry_delay
+                    event = {}
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").rstrip("\r\n")
+                        if line:
+                            field, _, value = line.partition(":")
+                            event[field] = value[1:] if value.startswith(" ") else value
+                            continue
+                        if "data" in event:
+                            data = json.loads(event["data"])
+                            if event.get("event") == "reset":
+                                get_hub().broadcast({"type": "reset", "data": data, "timestamp": time.time()})
+                            else:
+                                get_hub().publish(data.pop("topic"), data)
+                        last_event_id = event.get("id", last_event_id)
+                        event = {}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Progress event stream unavailable ({e}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_retry_delay)
+
 # Status reporter
 async def status_reporter():
     """Periodically log server status"""
@@ -201,7 +296,8 @@ async def status_reporter():
                 f"Total={server_stats['total_connections']}, "
                 f"Msgs Rcvd={server_stats['messages_received']}, "
                 f"Msgs Sent={server_stats['messages_sent']}, "
-                f"Errors={server_stats['errors']}"
+                f"Errors={server_stats['errors']}, "
+                f"Dropped={get_hub().stats['dropped_connections']}"
             )
             
             await asyncio.sleep(120)  # Report every 2 minutes
@@ -262,6 +358,7 @@ async def start_server():
         # Start background tasks
         heartbeat_task = asyncio.create_task(heartbeat())
         status_task = asyncio.create_task(status_reporter())
+        events_task = asyncio.create_task(follow_api_events())
         
         # Keep the server running
         await asyncio.Future()
@@ -0,0 +1,129 @@
+"""
+Load test: concurrent keep-alive clients against the simple chat API,
+reporting p50/p99 latency per endpoint.
+
+Starts an in-process server on a free port unless ``--url`` points at a
+running one. Run with ``python -m tests.performance.benchmark_chat_api``.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+# (method, path, body) requests cycled through by every client
+DEFAULT_MIX = [
+    ("GET", "/health", None),
+    ("GET", "/agents", None),
+    ("GET", "/system/stats", None),
+    ("POST", "/chat", {"content": "hello there", "session_id": "load-test"}),
+]
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_client(host: str, port: int, requests: int, keep_alive: bool,
+               mix: List[Tuple[str, str, dict]],
+               latencies: Dict[str, List[float]], errors: Dict[str, int],
+               lock: threading.Lock) -> None:
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local: Dict[str, List[float]] = defaultdict(list)
+    local_errors: Dict[str, int] = defaultdict(int)
+    for i in range(requests):
+        method, path, body = mix[i % len(mix)]
+        key = f"{method} {path}"
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if not keep_alive:
+            headers["Connection"] = "close"
+        began = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                local_errors[key] += 1
+            if not keep_alive or response.will_close:
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            local_errors[key] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local[key].append(time.perf_counter() - began)
+    conn.close()
+    with lock:
+        for key, values in local.items():
+            latencies[key].extend(values)
+        for key, count in local_errors.items():
+            errors[key] += count
+
+def load_test(host: str, port: int, clients: int, requests: int,
+              keep_alive: bool = True, mix=DEFAULT_MIX) -> float:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(host, port, requests, keep_alive, mix, latencies, errors, lock))
+        for _ in range(clients)
+    ]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    total = sum(len(values) for values in latencies.values())
+    mode = "keep-alive" if keep_alive else "connection per request"
+    print(f"{clients} clients x {requests} requests ({mode}): "
+          f"{total:,} ok in {elapsed:.2f}s ({total / elapsed:,.0f} req/s)")
+    print(f"{'endpoint':<22} {'count':>7} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for key in sorted(set(latencies) | set(errors)):
+        values = latencies.get(key, [])
+        print(f"{key:<22} {len(values):>7} {errors.get(key, 0):>7} "
+              f"{percentile(values, 0.5) * 1000:>8.2f} {percentile(values, 0.99) * 1000:>8.2f} "
+              f"{max(values, default=0) * 1000:>8.2f}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', help='Base URL of a running server (default: start one)')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per client')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--max-queue', type=int, default=64)
+    parser.add_argument('--no-keep-alive', action='store_true')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        import simple_chat_api
+        server = simple_chat_api.create_server("127.0.0.1", 0, workers=args.workers,
+                                               max_queue=args.max_queue)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        load_test(host, port, args.clients, args.requests, keep_alive=not args.no_keep_alive)
+        if server is not None and server.rejected:
+            print(f"rejected connections (queue full): {server.rejected}")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    main()
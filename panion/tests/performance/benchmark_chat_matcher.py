@@ -0,0 +1,188 @@
+"""
+Benchmark: chat intent/entity matching and route dispatch.
+
+Times the precompiled matcher (one keyword pass plus prefiltered entity
+regexes) against the per-message regex and ``any(word in message)``
+scans it replaced, checks both make the same decisions on the corpus,
+and times route-table dispatch against the old ``if/elif`` chain.
+
+Run with ``python -m tests.performance.benchmark_chat_matcher``.
+"""
+
+import argparse
+import random
+import re
+import time
+
+from core.chat_intents import chat_matcher
+
+TEMPLATES = [
+    "hello there, can you {verb} {business}s in {city}?",
+    "{verb} {business}s in {city} with {n} results",
+    "I need {business} contact info and phone numbers",
+    "please {verb} 25 restaurants in {city} using playwright without proxy",
+    "show me the system status and performance",
+    "create a goal to launch the {business} project",
+    "can my team collaborate with another agent group?",
+    "analyze this csv data and make a bar chart",
+    "search online for the latest news about {business}s",
+    "smoke shop in {city}",
+    "what can you help me with",
+    "tell me something interesting about {city} history and culture " * 3,
+    "compare the best approach to collect {business} data using selenium",
+]
+BUSINESSES = ["coffee shop", "restaurant", "hardware store", "gym", "bookstore", "hotel", "salon"]
+CITIES = ["Austin", "New York", "San Francisco", "Portland", "Chicago"]
+VERBS = ["find", "search for", "get", "locate", "look up", "scrape", "collect"]
+
+def build_corpus(size, seed=7):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(business=rng.choice(BUSINESSES), city=rng.choice(CITIES),
+                                     verb=rng.choice(VERBS), n=rng.randint(5, 150))
+        for _ in range(size)
+    ]
+
+def legacy_detect_intent(message):
+    message = message.lower()
+    if any(word in message for word in ["hello", "hi", "hey", "greetings"]):
+        return "greeting"
+    elif any(word in message for word in ["help", "support", "assist"]):
+        return "help_request"
+    elif any(word in message for word in ["goal", "task", "objective", "project"]):
+        return "goal_creation"
+    elif any(word in message for word in ["agent", "team", "group", "collaborate"]):
+        return "agent_management"
+    elif any(word in message for word in ["status", "stat", "performance", "health", "system"]):
+        return "system_status"
+    return "general_query"
+
+def legacy_decide(content):
+    """Decisions of the previous /chat handler (no capabilities)."""
+    patterns = [
+        r"(?:find|search for|show me|get|locate|look up)\s+([a-zA-Z\s]+)\s+in\s+([a-zA-Z\s]+)",
+        r"([a-zA-Z\s]+(?:shop|store|restaurant|cafe|business|company|hotel|bar)s?)\s+in\s+([a-zA-Z\s]+)"
+    ]
+    business_type = location = None
+    for pattern in patterns:
+        match = re.search(pattern, content.lower())
+        if match:
+            business_type, location = match.group(1).strip(), match.group(2).strip()
+            break
+    smoke = "smoke shop" in content.lower() or "smokeshop" in content.lower()
+    web = any(p in content.lower() for p in [
+        "search online", "find online", "search the web", "look online",
+        "find on the internet", "current information", "latest news"])
+    intent = legacy_detect_intent(content)
+
+    if smoke or business_type:
+        if smoke and not location:
+            match = re.search(r"in\s+([A-Za-z\s]+)(?:,|\.|$|\s)", content)
+            location = match.group(1) if match else None
+            business_type = "smoke shop"
+        return ("business_search", business_type, location, web, intent)
+    if "hello" in content.lower() or "hi" in content.lower():
+        return ("greeting", None, None, web, intent)
+    if "help" in content.lower():
+        return ("help", None, None, web, intent)
+    if "goal" in content.lower() or "task" in content.lower():
+        return ("goal", None, None, web, intent)
+    if "agent" in content.lower() or "team" in content.lower():
+        return ("agent", None, None, web, intent)
+    if "stat" in content.lower() or "system" in content.lower():
+        return ("system", None, None, web, intent)
+    if re.search(r"(scrape|find|get|collect|search).*(business|store|restaurant|shop|company)", content.lower()) or \
+       re.search(r"(business|store|restaurant|shop|company).*(info|data|details|phone|contact)", content.lower()):
+        match = re.search(r"(restaurant|cafe|coffee\s*shop|bar|grocery\s*store|clothing\s*store|electronic\s*store|hardware\s*store|bookstore|pharmacy|gym|salon|spa|hotel|bank|gas\s*station|theater|cinema)", content.lower())
+        location_match = re.search(r"in\s+([A-Za-z\s]+)(?:,|\.|$|\s)", content)
+        limit_match = re.search(r"(\d+)\s+(results|stores?|businesses|restaurants)", content)
+        use_proxy = True
+        if re.search(r"(using|with|via)\s+(proxy|proxies)", content.lower()):
+            use_proxy = True
+        elif re.search(r"(without|no)\s+(proxy|proxies)", content.lower()):
+            use_proxy = False
+        params = (
+            match.group(1) if match else "business",
+            location_match.group(1) if location_match else "New York",
+            min(int(limit_match.group(1)) if limit_match else 10, 100),
+            use_proxy,
+            bool(re.search(r"(using|with|via)\s+(playwright|browser|headless|chrome|firefox)", content.lower())),
+            bool(re.search(r"(using|with|via)\s+(selenium|browser automation)", content.lower())),
+            bool(re.search(r"(strategic|strategy|multiple approaches|compare|best approach|optimal|combine|multi-source)", content.lower())),
+        )
+        return ("scrape", params, None, web, intent)
+    if re.search(r"(analyze|chart|graph|visualization|trend|plot|dashboard).*(data|csv|json|file|result)", content.lower()):
+        match = re.search(r"(bar\s*chart|pie\s*chart|line\s*graph|histogram|scatter\s*plot|correlation|summary|statistics)", content.lower())
+        return ("analysis", match.group(1) if match else "summary", None, web, intent)
+    return ("general", None, None, web, intent)
+
+def matcher_decide(content):
+    """The same decisions made through the precompiled matcher."""
+    analysis = chat_matcher.analyze(content)
+    web = analysis.has("web_research")
+    business_type, location = analysis.business_type, analysis.location
+    if analysis.has("smoke_shop") or business_type:
+        if analysis.has("smoke_shop") and not location:
+            location = chat_matcher.find_location(content)
+            business_type = "smoke shop"
+        return ("business_search", business_type, location, web, analysis.intent)
+    topic = analysis.topic
+    if topic:
+        return (topic, None, None, web, analysis.intent)
+    if chat_matcher.is_scrape_request(analysis):
+        r = chat_matcher.scrape_request(analysis)
+        params = (r.business_type, r.location, r.limit, r.use_proxy,
+                  r.use_playwright, r.use_selenium, r.use_strategic)
+        return ("scrape", params, None, web, analysis.intent)
+    if chat_matcher.is_analysis_request(analysis):
+        return ("analysis", chat_matcher.analysis_type(analysis), None, web, analysis.intent)
+    return ("general", None, None, web, analysis.intent)
+
+POST_PATHS = ["/chat", "/goals", "/scrape", "/scrape/enhanced", "/analyze", "/document", "/video",
+              "/schedule", "/panion/chat", "/panion/goal", "/panion/goals", "/strategic/status",
+              "/strategic/results", "/panion/expand-dream", "/agents/register", "/teams/create"]
+
+def chain_dispatch(path):
+    for candidate in POST_PATHS:
+        if path == candidate:
+            return candidate
+    if path.startswith("/collaboration/"):
+        return "/collaboration/"
+    return None
+
+def table_dispatch(path, routes={p: p for p in POST_PATHS}, prefixes=(("/collaboration/", "/collaboration/"),)):
+    name = routes.get(path)
+    if name is None:
+        for prefix, handler in prefixes:
+            if path.startswith(prefix):
+                return handler
+    return name
+
+def timed(label, func, items):
+    began = time.perf_counter()
+    results = [func(item) for item in items]
+    elapsed = time.perf_counter() - began
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  ({len(items) / elapsed:,.0f} ops/s)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=50_000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+    print(f"{len(corpus):,} chat messages")
+    legacy = timed("legacy decisions", legacy_decide, corpus)
+    matched = timed("precompiled matcher", matcher_decide, corpus)
+    mismatches = sum(1 for a, b in zip(legacy, matched) if a != b)
+    print(f"decision mismatches: {mismatches}")
+    timed("legacy detect_intent", legacy_detect_intent, corpus)
+    timed("matcher detect_intent", chat_matcher.detect_intent, corpus)
+
+    rng = random.Random(3)
+    paths = [rng.choice(POST_PATHS + ["/collaboration/send", "/missing"]) for _ in range(args.messages * 10)]
+    timed("if/elif dispatch", chain_dispatch, paths)
+    timed("route table dispatch", table_dispatch, paths)
+
+if __name__ == '__main__':
+    main()
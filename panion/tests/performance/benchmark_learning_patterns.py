@@ -0,0 +1,73 @@
+"""
+Benchmark: feature-indexed pattern lookup at 100k learned patterns, against
+the linear scans it replaced.
+
+Run with ``python -m tests.performance.benchmark_learning_patterns``.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from core.learning_system import LearningSystem, Pattern
+
+TASKS = ["search", "scrape", "summarize", "plan", "test", "deploy", "analyze", "translate"]
+TOOLS = ["browser", "http", "llm", "sandbox", "sql", "shell"]
+
+def synthesize(count: int, seed: int = 5):
+    """Patterns with a few shared, low-cardinality features and one distinguishing feature each."""
+    rng = random.Random(seed)
+    return [Pattern("plugin_selection",
+                    {"task": rng.choice(TASKS), "tool": rng.choice(TOOLS), "size": rng.choice(["s", "m", "l"]),
+                     "plugin": f"plugin_{n}"},
+                    rng.random(), datetime.now(), rng.randint(1, 20))
+            for n in range(count)]
+
+def linear_best(patterns, features):
+    best, best_score = None, 0.0
+    for pattern in patterns:
+        score = LearningSystem._compare_features(pattern.features, features)
+        if score > best_score:
+            best, best_score = pattern, score
+    return best
+
+def timed(label, func, count):
+    began = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<36} {elapsed / count * 1e6:9.1f} us/call")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--patterns', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    patterns = synthesize(args.patterns)
+    with tempfile.TemporaryDirectory() as tmp:
+        system = LearningSystem(data_file=Path(tmp) / "learning.json")
+        system.patterns["plugin_selection"] = patterns
+        timed("build index (once)", lambda: system._index_for("plugin_selection"), 1)
+
+        specific = [dict(rng.choice(patterns).features) for _ in range(args.queries)]
+        broad = [{"task": rng.choice(TASKS), "tool": rng.choice(TOOLS)} for _ in range(args.queries)]
+        for label, queries in (("specific", specific), ("broad", broad)):
+            found = timed(f"indexed best match ({label})",
+                          lambda: [system.get_best_pattern("plugin_selection", q) for q in queries], len(queries))
+            sample = queries[:20]
+            expected = timed(f"linear best match ({label})",
+                             lambda: [linear_best(patterns, q) for q in sample], len(sample))
+            assert found[:len(sample)] == expected
+
+        learned = [{"plugin": f"new_{n}", "task": "unseen"} for n in range(args.queries)]
+        timed("learn_pattern (throttled save)",
+              lambda: [system.learn_pattern("plugin_selection", f, True) for f in learned], len(learned))
+        timed("flush (full file)", system.flush, 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: MinHash/LSH candidate generation with process-pool verification
+for memory compression, against comparing every pair with SequenceMatcher
+(the previous implementation) on a sample.
+
+Run with ``python -m tests.performance.benchmark_memory_near_duplicates``.
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from core.memory.near_duplicates import NearDuplicateIndex, compute_signatures, memory_similarity, verify_pairs
+
+SUBJECTS = ["User asked about", "Planner scheduled", "Scraper collected", "Agent reflected on",
+            "Plugin reported", "Goal tracker updated"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "vo", "zu", "ne", "pi", "sa", "do", "fe", "gu", "hi", "ju", "wa"]
+
+def synthesize(count: int, seed: int = 11):
+    """Memories of varied wording, some of them re-recorded with word-level edits."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(2000)]
+    records = []
+    while len(records) < count:
+        subject = rng.choice(SUBJECTS)
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 20))]
+        metadata = {"source": rng.choice(["llm", "planner", "scraper"])}
+        tags = [rng.choice(["task", "fact", "event"])]
+        for copy in range(rng.choice([1, 1, 1, 2, 3])):
+            edited = list(words)
+            for _ in range(rng.randint(1, len(words) // 2) if copy else 0):
+                position = rng.randrange(len(edited))
+                choice = rng.random()
+                if choice < 0.4:
+                    edited[position] = rng.choice(vocabulary)
+                elif choice < 0.7:
+                    edited.insert(position, rng.choice(vocabulary))
+                elif len(edited) > 2:
+                    del edited[position]
+            records.append((f"{subject} {' '.join(edited)}", metadata, tags))
+    return records[:count]
+
+def timed(label, func, count):
+    began = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms  ({count / elapsed:,.0f} memories/s)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--memories', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--pairwise-sample', type=int, default=1500,
+                        help='Memories used to time the all-pairs comparison')
+    args = parser.parse_args()
+
+    records = synthesize(args.memories)
+    texts = [content for content, _, _ in records]
+    count = len(records)
+    index = NearDuplicateIndex.for_threshold(args.threshold)
+    print(f"threshold {args.threshold}: {index.num_perm} permutations in {index.bands} bands "
+          f"of {index.num_perm // index.bands}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        def sign():
+            batches = [texts[start:start + 500] for start in range(0, count, 500)]
+            futures = [pool.submit(compute_signatures, batch, index.num_perm, index.seed, index.shingle_size)
+                       for batch in batches]
+            return [signature for future in futures for signature in future.result()]
+
+        signatures = timed("signatures (process pool)", sign, count)
+        timed("build LSH index", lambda: [index.add(str(n), text, signature)
+                                          for n, (text, signature) in enumerate(zip(texts, signatures))], count)
+        pairs = sorted(timed("candidate pairs", index.candidate_pairs, count))
+        keyed = {str(n): record for n, record in enumerate(records)}
+
+        def verify():
+            futures = [pool.submit(verify_pairs, pairs[start:start + 2000], keyed, args.threshold)
+                       for start in range(0, len(pairs), 2000)]
+            return [match for future in futures for match in future.result()]
+
+        matches = timed("verify candidates (process pool)", verify, count)
+    print(f"{len(pairs):,} candidate pairs of {count * (count - 1) // 2:,}, {len(matches):,} similar")
+
+    sample = records[:args.pairwise_sample]
+    sample_pairs = len(sample) * (len(sample) - 1) // 2
+    scores = timed(f"all pairs ({len(sample):,} sample, {sample_pairs:,} pairs)",
+                   lambda: [memory_similarity(a, b) for a, b in combinations(sample, 2)], len(sample))
+    print(f"all pairs at {count:,} memories would compare {count * (count - 1) // 2 / sample_pairs:,.0f}x as many")
+
+    # Recall against the exhaustive scan on the sample
+    candidates = set(pairs)
+    exhaustive = [tuple(sorted((str(a), str(b))))
+                  for (a, b), score in zip(combinations(range(len(sample)), 2), scores) if score >= args.threshold]
+    found = sum(pair in candidates for pair in exhaustive)
+    print(f"recall on sample: {found:,} of {len(exhaustive):,} pairs the exhaustive scan compresses "
+          f"({found / max(len(exhaustive), 1):.1%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: columnar memory scoring (decay, re-scoring, forgetting
+selection and top-k) at 1M memories, against the per-memory Python loop
+it replaced.
+
+Run with ``python -m tests.performance.benchmark_memory_scoring``.
+"""
+
+import argparse
+import math
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from core.memory.scoring import MemoryScoringSystem
+
+@dataclass
+class LoopScore:
+    """Per-memory score record as kept by the previous implementation."""
+    base_score: float
+    current_score: float
+    updated_at: datetime
+
+def populate(scoring: MemoryScoringSystem, count: int, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    now = datetime.now().timestamp()
+    updated = now - rng.uniform(0, 30 * 86400, count)
+    base = rng.uniform(0.05, 1.0, count)
+    scoring.store.add_many(
+        [f"mem_{i:08d}" for i in range(count)],
+        {
+            "memory_accessed": updated,
+            "access_count": rng.integers(0, 20, count).astype(np.float64),
+            "tag_score": rng.choice([0.0, 0.25, 0.5], count),
+            "relevance": rng.uniform(0, 1, count),
+            "importance": rng.uniform(0, 1, count),
+            "connected_goals": rng.integers(0, 8, count).astype(np.float64),
+            "base_score": base,
+            "current_score": base,
+            "updated_at": updated,
+        }
+    )
+
+def timed(label, func, count):
+    began = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  ({count / elapsed:,.0f} memories/s)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--memories', type=int, default=1_000_000)
+    parser.add_argument('--loop-sample', type=int, default=100_000,
+                        help='Memories used to time the per-memory loop')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scoring = MemoryScoringSystem(config_path=f"{tmp}/missing.json")
+        scoring.min_score = -1.0  # Time selection, not archiving I/O
+        populate(scoring, args.memories)
+        count = args.memories
+
+        print(f"columnar store, {count:,} memories")
+        timed("decay", scoring.apply_decay, count)
+        timed("re-score", scoring.rescore_all, count)
+        timed("forgetting selection", lambda: scoring.get_forgetting_candidates(0.1), count)
+        timed("top-10 (argpartition)", lambda: scoring.get_important_memories(10), count)
+        timed("stats", scoring.get_memory_stats, count)
+
+        # Previous implementation: dataclass per memory, Python loops
+        sample = min(args.loop_sample, count)
+        now = datetime.now()
+        current = scoring.store.column("current_score")
+        updated = scoring.store.column("updated_at")
+        loop_scores = {
+            scoring.store.ids[i]: LoopScore(
+                float(current[i]), float(current[i]),
+                datetime.fromtimestamp(updated[i] - 86400 * 2)
+            )
+            for i in range(sample)
+        }
+
+        def loop_decay():
+            for score in loop_scores.values():
+                days = (now - score.updated_at).days
+                if days > 0:
+                    score.current_score = score.base_score * math.exp(-0.1 * days)
+                    score.updated_at = now
+
+        def loop_top_k():
+            return sorted(loop_scores.items(), key=lambda x: x[1].current_score, reverse=True)[:10]
+
+        print(f"per-memory loop, {sample:,} memories")
+        timed("decay", loop_decay, sample)
+        timed("top-10 (full sort)", loop_top_k, sample)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: sparse, incremental reflection clustering at 100k reflections,
+against dense cosine DBSCAN (the previous implementation) on a sample.
+
+Run with ``python -m tests.performance.benchmark_reflection_clustering``.
+"""
+
+import argparse
+import importlib.util
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sklearn.cluster import DBSCAN
+
+# core/reflection.py shadows the core/reflection/ directory, so load the module by path
+_spec = importlib.util.spec_from_file_location(
+    "reflection_analyzer", Path(__file__).parent.parent.parent / "core" / "reflection" / "analyzer.py")
+analyzer_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(analyzer_module)
+
+SUBJECTS = ["LLM request", "plugin loader", "goal scheduler", "memory archive", "websocket hub",
+            "task store", "proxy pool", "scraper strategy", "sandbox runner", "resource monitor"]
+EVENTS = ["timed out after {n} retries", "failed to import module {w}", "exceeded its {w} budget",
+          "recovered after restarting {w}", "returned an empty result for {w}", "was throttled by {w}",
+          "detected a dependency cycle in {w}", "completed {n} steps ahead of schedule"]
+WORDS = ["alpha", "beta", "gamma", "delta", "cache", "index", "queue", "worker", "session", "graph",
+         "profile", "token", "stream", "window", "shard", "ledger"]
+
+def synthesize(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    reflections = []
+    for n in range(count):
+        event = rng.choice(EVENTS).format(n=rng.randint(1, 9), w=rng.choice(WORDS))
+        noise = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 2)))
+        reflections.append({
+            "thought": f"{rng.choice(SUBJECTS)} {event} {noise}".strip(),
+            "timestamp": f"2026-01-{1 + n % 28:02d}T{n % 24:02d}:{n % 60:02d}:00",
+            "metadata": {"source": rng.choice(["llm_service", "planner", "scraper"])},
+        })
+    return reflections
+
+def timed(label, func, count):
+    began = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms  ({count / elapsed:,.0f} reflections/s)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reflections', type=int, default=100_000)
+    parser.add_argument('--batch', type=int, default=1000, help='Reflections per incremental update')
+    parser.add_argument('--dense-sample', type=int, default=5000,
+                        help='Reflections used to time dense DBSCAN')
+    args = parser.parse_args()
+
+    reflections = synthesize(args.reflections)
+    texts = [r["thought"] for r in reflections]
+    count = len(reflections)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = analyzer_module.ReflectionAnalyzer(tmp)
+        timed("fit vocabulary (once, saved)", lambda: analyzer._vectorize(texts[:5000]), 5000)
+        vectors = timed("transform (saved vocabulary)", lambda: analyzer._vectorize(texts), count)
+        print(f"{count:,} x {vectors.shape[1]} sparse matrix, {vectors.nnz:,} non-zeros "
+              f"(dense would be {count * vectors.shape[1] * 8 / 2**20:,.0f} MiB)")
+
+        clusters = timed("sparse clustering (one pass)", lambda: analyzer._cluster_reflections(vectors), count)
+        print(f"{len(clusters):,} clusters of 2+ reflections")
+
+        incremental = analyzer_module.ReflectionAnalyzer(f"{tmp}/incremental")
+        incremental._vectorize(texts[:5000])
+        began = time.perf_counter()
+        updated = 0
+        for start in range(0, count, args.batch):
+            updated += incremental.add_reflections(reflections[start:start + args.batch])["pattern_count"]
+        elapsed = time.perf_counter() - began
+        print(f"{'incremental (batches of %d)' % args.batch:<36} {elapsed * 1000:9.1f} ms  "
+              f"({count / elapsed:,.0f} reflections/s, {elapsed / (count / args.batch) * 1000:.1f} ms/update, "
+              f"{updated:,} pattern updates)")
+
+        sample = vectors[:args.dense_sample]
+        timed(f"dense DBSCAN ({sample.shape[0]:,} sample)",
+              lambda: DBSCAN(eps=0.3, min_samples=2, metric='cosine').fit(sample.toarray()), sample.shape[0])
+
+if __name__ == '__main__':
+    main()
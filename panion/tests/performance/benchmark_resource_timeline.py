@@ -0,0 +1,97 @@
+"""
+Benchmark: goal time-slot search with the resource timeline index versus
+the fixed-interval stepping search it replaced in GoalScheduler.
+
+Run with ``python -m tests.performance.benchmark_resource_timeline``.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+from core.resource_timeline import ResourceTimeline
+
+LIMITS = {'cpu': 1.0, 'memory': 512.0}
+
+def required_resources(task: Dict[str, Any]) -> Dict[str, float]:
+    """Resource model shared by both implementations."""
+    complexity = task.get('complexity', 0)
+    return {
+        'cpu': 0.1 * (1 + complexity * 0.5),
+        'memory': 100 * (1 + complexity * 0.3),
+    }
+
+def make_goals(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            'task_id': f'goal_{i}',
+            'complexity': rng.randint(0, 4),
+            'duration': rng.randint(5, 240),  # minutes
+        }
+        for i in range(count)
+    ]
+
+def schedule_stepping(goals, start, budget):
+    """Legacy search: 15-minute steps, re-parsing the timeline at each step."""
+    timeline = []
+    began = time.perf_counter()
+    for goal in goals:
+        required = required_resources(goal)
+        current = start
+        while True:
+            usage: Dict[str, float] = {}
+            for entry in timeline:
+                entry_start = datetime.fromisoformat(entry['start_time'])
+                entry_end = datetime.fromisoformat(entry['end_time'])
+                if entry_start <= current <= entry_end:
+                    for resource_type, amount in required_resources(entry).items():
+                        usage[resource_type] = usage.get(resource_type, 0) + amount
+            if all(usage.get(r, 0) + a <= LIMITS[r] for r, a in required.items()):
+                break
+            current += timedelta(minutes=15)
+        end = current + timedelta(minutes=goal['duration'])
+        timeline.append({**goal, 'start_time': current.isoformat(), 'end_time': end.isoformat()})
+        if time.perf_counter() - began > budget:
+            break
+    return timeline
+
+def schedule_indexed(goals, start):
+    """Indexed search: jump straight to the next capacity release."""
+    index = ResourceTimeline(LIMITS)
+    timeline = []
+    for goal in goals:
+        required = required_resources(goal)
+        current = index.next_available(required, start)
+        end = current + timedelta(minutes=goal['duration'])
+        index.add(current, end, required)
+        timeline.append({**goal, 'start_time': current.isoformat(), 'end_time': end.isoformat()})
+    return timeline
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--goals', type=int, default=10_000)
+    parser.add_argument('--stepping-budget', type=float, default=30.0,
+                        help='Seconds to let the stepping search run before stopping')
+    args = parser.parse_args()
+
+    goals = make_goals(args.goals)
+    start = datetime(2025, 1, 1)
+
+    began = time.perf_counter()
+    indexed = schedule_indexed(goals, start)
+    indexed_time = time.perf_counter() - began
+    print(f"indexed:  {len(indexed)} goals in {indexed_time:.3f}s "
+          f"({len(indexed) / indexed_time:,.0f} goals/s)")
+
+    began = time.perf_counter()
+    stepped = schedule_stepping(goals, start, args.stepping_budget)
+    stepping_time = time.perf_counter() - began
+    suffix = "" if len(stepped) == len(goals) else f" (stopped after {args.stepping_budget:.0f}s budget)"
+    print(f"stepping: {len(stepped)} goals in {stepping_time:.3f}s "
+          f"({len(stepped) / stepping_time:,.0f} goals/s){suffix}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Load test: fan-out latency of the websocket server to many local clients.
+
+Starts the websocket handler on a free port, connects ``--clients``
+subscribers to one topic, plus ``--slow`` clients that stop reading
+after subscribing, publishes ``--messages`` events and reports how long
+each took to reach every subscriber. ``--sequential`` measures the
+previous approach, awaiting each client's send in turn, for comparison.
+Run with ``python -m tests.performance.benchmark_websocket_hub``.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import time
+from typing import List
+
+import websockets
+
+import start_websocket_server
+
+TOPIC = "bench"
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def raise_fd_limit() -> None:
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError):
+        pass
+
+async def connect_all(url: str, count: int, batch: int = 250, **kwargs):
+    sockets = []
+    for start in range(0, count, batch):
+        sockets.extend(await asyncio.gather(*(
+            websockets.connect(url, open_timeout=60, ping_interval=None, **kwargs)
+            for _ in range(min(batch, count - start))
+        )))
+    return sockets
+
+async def connect_stalled(url: str, count: int):
+    """Open raw websocket connections that never read after the handshake."""
+    host, port = url[len("ws://"):].split(":")
+    writers = []
+    for _ in range(count):
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (host, int(port)))
+        reader, writer = await asyncio.open_connection(sock=sock, limit=1024)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((f"GET / HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      f"Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        await reader.readuntil(b"\r\n\r\n")
+        # Subscribe with a masked text frame, then stop reading for good
+        payload = json.dumps({"type": "subscribe", "topics": [TOPIC]}).encode()
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        writer.write(bytes([0x81, 0x80 | len(payload)]) + mask + masked)
+        writer.transport.pause_reading()
+        writers.append(writer)
+    return writers
+
+async def receive(websocket, messages: int, latencies: List[float]) -> None:
+    received = 0
+    async for raw in websocket:
+        message = json.loads(raw)
+        if message.get("type") == "event":
+            latencies.append(time.perf_counter() - message["data"]["sent_at"])
+            received += 1
+            if received == messages:
+                return
+
+async def run(args) -> None:
+    sequential_clients = []
+
+    async def sequential_handler(websocket):
+        sequential_clients.append(websocket)
+        await websocket.wait_closed()
+
+    handler = sequential_handler if args.sequential else start_websocket_server.handler
+    async with websockets.serve(handler, "127.0.0.1", 0, ping_interval=None,
+                                max_queue=None) as server:
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        began = time.perf_counter()
+        clients = await connect_all(url, args.clients)
+        if not args.sequential:
+            # Skip the welcome, subscribe, and wait for the acknowledgement
+            await asyncio.gather(*(ws.recv() for ws in clients))
+            await asyncio.gather(*(ws.send(json.dumps({"type": "subscribe", "topics": [TOPIC]}))
+                                   for ws in clients))
+            await asyncio.gather(*(ws.recv() for ws in clients))
+        slow = await connect_stalled(url, args.slow)
+        await asyncio.sleep(0.1)
+        print(f"connected {len(clients)} clients (+{len(slow)} stalled) in {time.perf_counter() - began:.1f}s")
+
+        latencies: List[float] = []
+        receivers = [asyncio.create_task(receive(ws, args.messages, latencies)) for ws in clients]
+        padding = "x" * args.payload
+        began = time.perf_counter()
+
+        async def publish_all():
+            for _ in range(args.messages):
+                data = {"sent_at": time.perf_counter(), "padding": padding}
+                if args.sequential:
+                    message = json.dumps({"type": "event", "topic": TOPIC, "data": data})
+                    for websocket in list(sequential_clients):
+                        await websocket.send(message)
+                else:
+                    start_websocket_server.get_hub().publish(TOPIC, data)
+                await asyncio.sleep(args.interval)
+            await asyncio.gather(*receivers)
+
+        stalled = False
+        try:
+            await asyncio.wait_for(publish_all(), timeout=args.timeout)
+        except asyncio.TimeoutError:
+            stalled = True
+        elapsed = time.perf_counter() - began
+
+        mode = "sequential sends" if args.sequential else "hub fan-out"
+        print(f"{mode}: {args.messages} messages x {len(clients)} clients = "
+              f"{len(latencies):,} deliveries in {elapsed:.2f}s"
+              + (f" (STALLED: gave up after {args.timeout:.0f}s)" if stalled else ""))
+        print(f"latency ms: p50 {percentile(latencies, 0.5) * 1000:.1f}  "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f}  "
+              f"max {max(latencies, default=0) * 1000:.1f}")
+        if not args.sequential:
+            print(f"hub stats: {start_websocket_server.get_hub().get_stats()}")
+
+        for writer in slow:
+            writer.close()
+        for websocket in clients:
+            await websocket.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--slow', type=int, default=0, help='Clients that stop reading')
+    parser.add_argument('--messages', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=0.05, help='Seconds between publishes')
+    parser.add_argument('--payload', type=int, default=200, help='Padding bytes per message')
+    parser.add_argument('--sequential', action='store_true')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds before the run counts as stalled')
+    args = parser.parse_args()
+    raise_fd_limit()
+    asyncio.run(run(args))
+
+if __name__ == '__main__':
+    main()
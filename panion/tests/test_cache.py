@@ -0,0 +1,159 @@
+"""
+Tests for the result cache.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from core.utils.cache import TTLCache, CacheRegistry, cache_result, make_key
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_make_key_is_stable_and_order_insensitive():
+    """Test that equal arguments give equal keys."""
+    assert make_key({"a": 1, "b": 2}) == make_key({"b": 2, "a": 1})
+    assert make_key(1, x=2) == make_key(1, x=2)
+    assert make_key(1, x=2) != make_key(1, x=3)
+    assert len(make_key("x" * 100000)) == 64
+
+def test_make_key_accepts_dicts_json_cannot_key():
+    """Test that tuple-keyed and mixed-key dict arguments still produce keys."""
+    tuple_keyed = {("a", 1): "x"}
+    mixed = {1: "one", "two": 2}
+    assert make_key(tuple_keyed) == make_key({("a", 1): "x"})
+    assert make_key(tuple_keyed) != make_key({("a", 2): "x"})
+    assert make_key(mixed, option=mixed) == make_key(mixed, option=mixed)
+    assert len(make_key(mixed)) == 64
+
+    calls = []
+
+    @cache_result(ttl_seconds=60)
+    def lookup(mapping):
+        calls.append(mapping)
+        return len(mapping)
+
+    assert lookup(mixed) == 2 and lookup(mixed) == 2
+    assert len(calls) == 1
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    """Test that entries expire after their TTL."""
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=100)
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+    clock.now = 101
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+
+def test_single_flight_threads():
+    """Test that concurrent sync misses share one computation."""
+    cache = TTLCache()
+    calls = []
+    started = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(cache.get_or_compute("k", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_single_flight_async_shares_result_and_errors():
+    """Test that concurrent async misses share one await, including failures."""
+    cache = TTLCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_compute_async("k", compute) for _ in range(10)))
+    assert results == [42] * 10
+    assert len(calls) == 1
+    assert cache.stats()["joins"] == 9
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    outcomes = await asyncio.gather(*(cache.get_or_compute_async("bad", fail) for _ in range(3)),
+                                    return_exceptions=True)
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert "bad" not in cache
+
+@pytest.mark.asyncio
+async def test_cache_result_decorator_namespaces():
+    """Test that decorated functions cache per namespace."""
+    calls = []
+
+    @cache_result(ttl_seconds=60, namespace="test.double")
+    async def double(x):
+        calls.append(x)
+        return x * 2
+
+    @cache_result(ttl_seconds=60, namespace="test.triple")
+    def triple(x):
+        calls.append(x)
+        return x * 3
+
+    assert await double(2) == 4
+    assert await double(2) == 4
+    assert triple(2) == 6
+    assert triple(2) == 6
+    assert calls == [2, 2]
+    assert double.cache.stats()["hits"] == 1
+    assert triple.cache.name == "test.triple"
+
+def test_registry_reuses_namespaces():
+    """Test that a namespace is created once and can be cleared."""
+    registry = CacheRegistry()
+    cache = registry.namespace("a", max_size=10)
+    assert registry.namespace("a") is cache
+    cache.set("k", 1)
+    registry.clear("a")
+    assert len(cache) == 0
+    assert set(registry.stats()) == {"a"}
@@ -0,0 +1,71 @@
+"""
+Tests for chat intent matching.
+"""
+
+import pytest
+
+from core.chat_intents import KeywordScanner, chat_matcher
+
+def test_scanner_reports_overlapping_and_prefix_keywords():
+    """Test that one pass finds every keyword, including overlaps and prefixes."""
+    scanner = KeywordScanner({
+        "short": ["stat"],
+        "long": ["status"],
+        "tail": ["tus"],
+        "other": ["hello"],
+    })
+    assert scanner.scan("status report") == {"short", "long", "tail"}
+    assert scanner.scan("say hello") == {"other"}
+    assert scanner.scan("nothing here") == set()
+
+@pytest.mark.parametrize("message,intent", [
+    ("Hello, how are you?", "greeting"),
+    ("I need some support", "help_request"),
+    ("Create a new project", "goal_creation"),
+    ("Build a team", "agent_management"),
+    ("Show system performance", "system_status"),
+    ("What is the weather", "general_query"),
+])
+def test_detect_intent(message, intent):
+    """Test intent detection in keyword priority order."""
+    assert chat_matcher.detect_intent(message) == intent
+    assert chat_matcher.analyze(message).intent == intent
+
+def test_business_search_entities():
+    """Test business type and location extraction."""
+    analysis = chat_matcher.analyze("Please find coffee shops in San Francisco")
+    assert analysis.business_type == "coffee shops"
+    assert analysis.location == "san francisco"
+
+    analysis = chat_matcher.analyze("hardware stores in Austin")
+    assert analysis.business_type == "hardware stores"
+    assert analysis.location == "austin"
+
+    assert chat_matcher.analyze("tell me a joke").business_type is None
+
+def test_topics_and_phrases():
+    """Test chat topics and phrase flags."""
+    assert chat_matcher.analyze("hello!").topic == "greeting"
+    assert chat_matcher.analyze("what goals do I have").topic == "goal"
+    assert chat_matcher.analyze("random words").topic is None
+    assert chat_matcher.analyze("Search online for the latest news").has("web_research")
+    assert chat_matcher.analyze("best smokeshop nearby").has("smoke_shop")
+
+def test_scrape_request_parameters():
+    """Test extraction of scraping parameters."""
+    analysis = chat_matcher.analyze("Collect 250 restaurants in Portland, without proxies, via playwright")
+    assert chat_matcher.is_scrape_request(analysis)
+    request = chat_matcher.scrape_request(analysis)
+    assert request.business_type == "restaurant"
+    assert request.location == "Portland"
+    assert request.limit == 100
+    assert request.use_proxy is False
+    assert request.use_playwright is True
+    assert request.use_selenium is False
+
+def test_analysis_request():
+    """Test data analysis detection."""
+    analysis = chat_matcher.analyze("Analyze this CSV data as a pie chart")
+    assert chat_matcher.is_analysis_request(analysis)
+    assert chat_matcher.analysis_type(analysis) == "pie chart"
+    assert chat_matcher.analysis_type(chat_matcher.analyze("plot the data")) == "summary"
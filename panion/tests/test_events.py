@@ -0,0 +1,158 @@
+"""
+Tests for the event bus.
+"""
+
+import asyncio
+import pytest
+
+from core.events import EventBus, Event, EventType, OverflowPolicy
+
+def make_event(n, source=""):
+    """Create a plugin-loaded event."""
+    return Event(type=EventType.PLUGIN_LOADED, data={"n": n}, source=source)
+
+def test_sync_subscribers_still_called_inline():
+    """Test that plain subscribers are called by publish."""
+    bus = EventBus()
+    received = []
+    bus.subscribe(EventType.PLUGIN_LOADED, received.append)
+    bus.publish(make_event(1))
+    assert [e.data["n"] for e in received] == [1]
+
+    bus.unsubscribe(EventType.PLUGIN_LOADED, received.append)
+    bus.publish(make_event(2))
+    assert len(received) == 1
+
+def test_history_is_bounded_and_indexed_by_type():
+    """Test that history keeps only the most recent events per type."""
+    bus = EventBus(history_size=5)
+    for n in range(10):
+        bus.publish(make_event(n))
+    bus.publish(Event(type=EventType.PLUGIN_UNLOADED, data={"n": 99}))
+
+    assert len(bus.get_event_history()) == 5
+    loaded = bus.get_event_history(EventType.PLUGIN_LOADED)
+    assert [e.data["n"] for e in loaded] == [5, 6, 7, 8, 9]
+    assert [e.data["n"] for e in bus.get_event_history(EventType.PLUGIN_LOADED, limit=2)] == [8, 9]
+    assert bus.get_event_history(EventType.PLUGIN_TEST_STARTED) == []
+
+def test_event_timestamps_are_per_instance():
+    """Test that each event gets its own timestamp."""
+    first = make_event(1)
+    second = make_event(2)
+    assert second.timestamp >= first.timestamp
+    assert first.timestamp is not second.timestamp
+
+@pytest.mark.asyncio
+async def test_slow_async_subscriber_does_not_block_publish():
+    """Test that publish returns before a slow async handler runs."""
+    bus = EventBus()
+    release = asyncio.Event()
+    received = []
+
+    async def slow(event):
+        await release.wait()
+        received.append(event.data["n"])
+
+    await bus.subscribe_async(EventType.PLUGIN_LOADED, slow)
+    for n in range(3):
+        bus.publish(make_event(n))
+    assert received == []
+
+    release.set()
+    await bus.drain()
+    assert received == [0, 1, 2]
+    await bus.close()
+
+@pytest.mark.asyncio
+async def test_drop_policies():
+    """Test that full queues drop the newest or oldest event."""
+    bus = EventBus()
+    release = asyncio.Event()
+    newest, oldest = [], []
+
+    def handler(target):
+        async def handle(event):
+            await release.wait()
+            target.append(event.data["n"])
+        return handle
+
+    drop_newest = await bus.subscribe_async(EventType.PLUGIN_LOADED, handler(newest),
+                                            max_queue_size=2, overflow=OverflowPolicy.DROP_NEWEST)
+    drop_oldest = await bus.subscribe_async(EventType.PLUGIN_LOADED, handler(oldest),
+                                            max_queue_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+    # Let both workers pick up the first event and park on the release
+    bus.publish(make_event(0))
+    await asyncio.sleep(0)
+    for n in range(1, 5):
+        bus.publish(make_event(n))
+
+    release.set()
+    await bus.drain()
+    assert newest == [0, 1, 2]
+    assert oldest == [0, 3, 4]
+    assert drop_newest.dropped == 2
+    assert drop_oldest.dropped == 2
+    await bus.close()
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_latest_per_key():
+    """Test that coalescing replaces queued events with the same key."""
+    bus = EventBus()
+    release = asyncio.Event()
+    received = []
+
+    async def handle(event):
+        await release.wait()
+        received.append((event.source, event.data["n"]))
+
+    subscription = await bus.subscribe_async(EventType.PLUGIN_LOADED, handle,
+                                             overflow=OverflowPolicy.COALESCE)
+    bus.publish(make_event(0, source="warmup"))
+    await asyncio.sleep(0)
+    for n in range(5):
+        bus.publish(make_event(n, source="a"))
+        bus.publish(make_event(n, source="b"))
+
+    release.set()
+    await bus.drain()
+    assert received == [("warmup", 0), ("a", 4), ("b", 4)]
+    assert subscription.coalesced == 8
+    await bus.close()
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    """Test that publish_async waits for space on a BLOCK subscriber."""
+    bus = EventBus()
+    received = []
+
+    async def handle(event):
+        await asyncio.sleep(0.001)
+        received.append(event.data["n"])
+
+    subscription = await bus.subscribe_async(EventType.PLUGIN_LOADED, handle,
+                                             max_queue_size=2, overflow=OverflowPolicy.BLOCK)
+    for n in range(10):
+        await bus.publish_async(make_event(n))
+        assert len(subscription) <= 2
+
+    await bus.drain()
+    assert received == list(range(10))
+    assert subscription.dropped == 0
+    await bus.close()
+
+@pytest.mark.asyncio
+async def test_handler_errors_are_counted():
+    """Test that a failing async handler keeps receiving events."""
+    bus = EventBus()
+
+    def fail(event):
+        raise RuntimeError("boom")
+
+    subscription = await bus.subscribe_async(EventType.PLUGIN_LOADED, fail)
+    bus.publish(make_event(1))
+    bus.publish(make_event(2))
+    await bus.drain()
+    assert subscription.errors == 2
+    assert bus.get_subscription_stats()[0]["errors"] == 2
+    await bus.close()
@@ -0,0 +1,162 @@
+"""
+Tests for the pooled fetch engine and the paginated scraping strategies,
+run against a local HTTP fixture server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from scrapers.enhanced_scraper import EnhancedScraper, merge_listings
+from scrapers.fetch_engine import FetchEngine
+
+def yelp_page(start):
+    items = "".join(
+        f'<div class="container__09f24__mpR8_"><h3><a href="/biz/shop-{n}">Shop {n}</a></h3>'
+        f'<address><p>{100 + n} Main St</p></address></div>'
+        for n in range(start, start + 10)
+    )
+    return f"<html><body>{items}</body></html>"
+
+def yellowpages_page():
+    return ('<html><body>'
+            '<div class="result"><a class="business-name" href="/shop-3">Shop 3</a>'
+            '<div class="street-address">103 Main St</div><div class="phones">555-0103</div></div>'
+            '<div class="result"><a class="business-name" href="/corner">Corner Smoke</a>'
+            '<div class="street-address">7 Oak St</div><div class="phones">555-0007</div></div>'
+            '</body></html>')
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        with server.lock:
+            server.requests.append((time.monotonic(), self.client_address[1], self.path, dict(self.headers)))
+            attempt = server.attempts[url.path] = server.attempts.get(url.path, 0) + 1
+        status, body = 200, "ok"
+        if url.path == "/flaky" and attempt <= 2:
+            status, body = 503, "busy"
+        elif url.path == "/missing":
+            status, body = 404, "missing"
+        elif url.path == "/yelp/search":
+            time.sleep(server.page_delay)
+            body = yelp_page(int(query.get("start", ["0"])[0]))
+        elif url.path == "/yp/search":
+            time.sleep(server.page_delay)
+            body = yellowpages_page()
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.attempts = {}
+    httpd.page_delay = 0.0
+    httpd.base_url = "http://127.0.0.1:%d" % httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def engine():
+    engine = FetchEngine(min_interval=0.0, jitter=0.0, backoff=0.01)
+    yield engine
+    engine.close()
+
+@pytest.fixture
+def scraper(server, engine, tmp_path):
+    scraper = EnhancedScraper(fetch_engine=engine)
+    scraper.data_dir = str(tmp_path)
+    scraper.strategies["direct_yelp"].search_url = server.base_url + "/yelp/search"
+    scraper.strategies["yellowpages"].search_url = server.base_url + "/yp/search"
+    scraper.enhance_business_data_with_linkedin = lambda businesses: businesses
+    return scraper
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_and_requests_paced(server):
+    """Test that requests to one host share a connection and are spaced out."""
+    engine = FetchEngine(min_interval=0.1, jitter=0.0)
+    try:
+        bodies = await engine.fetch_all([f"{server.base_url}/page/{n}" for n in range(4)], use_proxy=False)
+        assert bodies == ["ok"] * 4
+        starts = [started for started, _, _, _ in server.requests]
+        assert all(later - earlier >= 0.08 for earlier, later in zip(starts, starts[1:]))
+        assert len({port for _, port, _, _ in server.requests}) == 1
+        assert engine.stats["requests"] == 4
+    finally:
+        await engine.aclose()
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(server):
+    """Test that 5xx responses are retried and 4xx responses are not."""
+    engine = FetchEngine(min_interval=0.0, jitter=0.0, retries=3, backoff=0.01)
+    try:
+        assert await engine.fetch(f"{server.base_url}/flaky") == "ok"
+        assert server.attempts["/flaky"] == 3
+        assert await engine.fetch(f"{server.base_url}/missing") is None
+        assert server.attempts["/missing"] == 1
+        assert engine.stats["retries"] == 2
+        assert engine.stats["failures"] == 1
+    finally:
+        await engine.aclose()
+
+def test_make_request_runs_on_the_engine_loop(server, scraper):
+    """Test the synchronous request path and its browser-like headers."""
+    assert scraper._make_request(f"{server.base_url}/page", headers={"User-Agent": "test-agent"},
+                                 use_proxy=False) == "ok"
+    assert scraper._make_request(f"{server.base_url}/page", use_proxy=False) == "ok"
+    headers = server.requests[0][3]
+    assert headers["User-Agent"] == "test-agent"
+    assert headers["Cookie"].startswith("visitor=v")
+    assert len({port for _, port, _, _ in server.requests}) == 1
+
+def test_result_pages_are_fetched_concurrently(server, scraper):
+    """Test that pagination fans out and listings are merged in order."""
+    server.page_delay = 0.3
+    strategy = scraper.strategies["direct_yelp"]
+    started = time.monotonic()
+    businesses = strategy.execute(scraper, "smoke shop", "Austin TX", 25)
+    elapsed = time.monotonic() - started
+
+    assert [b["name"] for b in businesses] == [f"Shop {n}" for n in range(25)]
+    assert businesses[0]["url"] == "https://www.yelp.com/biz/shop-0"
+    assert sorted(path.split("&start=")[-1] for _, _, path, _ in server.requests if "start" in path) == ["10", "20"]
+    assert elapsed < 3 * server.page_delay
+    assert strategy.consecutive_failures == 0
+
+def test_fan_out_merges_strategies(server, scraper):
+    """Test that fan-out runs strategies together and drops duplicates."""
+    for name in ("cached_data", "google_maps_api"):
+        del scraper.strategies[name]
+    scraper.strategies["direct_yelp"].max_pages = 1
+    businesses = scraper.scrape_business_directory("smoke shop", "Austin TX", limit=12, fan_out=True)
+
+    names = [b["name"] for b in businesses]
+    assert names == [f"Shop {n}" for n in range(10)] + ["Corner Smoke"]
+    assert scraper.last_successful_strategy == "direct_yelp"
+
+def test_merge_listings_matches_name_and_street_number():
+    """Test duplicate detection across sources."""
+    merged = merge_listings([
+        [{"name": "Cloud 9 Smoke", "address": "12 Main St"}],
+        [{"name": "cloud 9 smoke!", "address": "12 Main Street, Austin"},
+         {"name": "Cloud 9 Smoke", "address": "40 Elm St"}]
+    ])
+    assert [b["address"] for b in merged] == ["12 Main St", "40 Elm St"]
@@ -0,0 +1,49 @@
+"""
+Tests for the ID allocator.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from core.utils.ids import IdAllocator
+
+def test_ids_unique_across_threads():
+    """Test that concurrent allocation never repeats an ID."""
+    allocator = IdAllocator(node="0001")
+    ids = []
+
+    def allocate():
+        ids.extend(allocator.new_id("mem") for _ in range(1000))
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == 4000
+
+def test_ids_monotonic_when_clock_steps_back():
+    """Test that IDs keep increasing if the clock goes backwards."""
+    allocator = IdAllocator(node="0001")
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    times = iter([now, now - timedelta(seconds=5), now])
+
+    with patch("core.utils.ids.datetime") as mock_datetime:
+        mock_datetime.now.side_effect = lambda: next(times)
+        ids = [allocator.new_id("mem") for _ in range(3)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 3
+
+def test_timestamp_round_trip():
+    """Test reading the creation time back from new and legacy IDs."""
+    allocator = IdAllocator()
+    before = datetime.now()
+    memory_id = allocator.new_id("mem")
+
+    assert IdAllocator.timestamp_of(memory_id, "mem") >= before.replace(microsecond=0)
+    assert IdAllocator.timestamp_of("mem_20250101_120000", "mem") == datetime(2025, 1, 1, 12)
+    assert IdAllocator.timestamp_of("agent_x_20250101_120000_000001_0000abcd", "agent_x") == \
+        datetime(2025, 1, 1, 12, 0, 0, 1)
@@ -0,0 +1,79 @@
+"""
+Tests for indexed pattern matching and throttled saving in the learning system.
+"""
+
+import gc
+import json
+import random
+import weakref
+from datetime import datetime
+
+from core import learning_system as learning_module
+from core.learning_system import LearningSystem, Pattern
+
+def linear_best(patterns, features):
+    """The scan get_best_pattern replaced."""
+    best, best_score = None, 0.0
+    for pattern in patterns:
+        score = LearningSystem._compare_features(pattern.features, features)
+        if score > best_score:
+            best, best_score = pattern, score
+    return best
+
+def random_features(rng):
+    values = [1, 1.0, True, "a", "b", [1, 2], {"x": 1}, rng.randint(0, 20)]
+    return {f"k{key}": rng.choice(values) for key in rng.sample(range(12), rng.randint(0, 4))}
+
+def test_best_pattern_matches_a_linear_scan(tmp_path):
+    """Test indexed best-match against the scan, including ties and unhashable values."""
+    rng = random.Random(4)
+    system = LearningSystem(data_file=tmp_path / "learning.json")
+    system.patterns["plan"] = [
+        Pattern("plan", random_features(rng), 0.5, datetime.now()) for _ in range(400)
+    ]
+    for _ in range(500):
+        features = random_features(rng)
+        assert system.get_best_pattern("plan", features) is linear_best(system.patterns["plan"], features)
+    assert system.get_best_pattern("plan", {}) is None
+    assert system.get_best_pattern("other", {"k1": 1}) is None
+
+def test_learning_merges_into_the_earliest_sharing_pattern(tmp_path):
+    """Test that learning updates the first pattern sharing a feature value and keeps the index current."""
+    system = LearningSystem(data_file=tmp_path / "learning.json")
+    system.learn_pattern("plan", {"tool": "search", "size": "small"}, success=True)
+    system.learn_pattern("plan", {"tool": "browse"}, success=True)
+    system.learn_pattern("plan", {"tool": "browse", "size": "small"}, success=False)
+
+    first, second = system.patterns["plan"]
+    assert first.usage_count == 2 and first.success_rate == 0.5
+    assert second.usage_count == 1
+    assert system.get_best_pattern("plan", {"tool": "browse"}) is second
+
+    system.patterns["plan"].append(Pattern("plan", {"tool": "crawl"}, 1.0, datetime.now()))
+    assert system.get_best_pattern("plan", {"tool": "crawl"}).features == {"tool": "crawl"}
+
+def test_saves_are_throttled_and_flushed(tmp_path):
+    """Test that learning does not rewrite the file every call and flush persists pending patterns."""
+    data_file = tmp_path / "learning.json"
+    system = LearningSystem(data_file=data_file, save_interval=3600)
+    for n in range(50):
+        system.learn_pattern("plan", {"step": n}, success=n % 2 == 0)
+    assert not data_file.exists()
+
+    system.flush()
+    assert len(json.loads(data_file.read_text())["plan"]) == 50
+    restored = LearningSystem(data_file=data_file)
+    assert restored.get_best_pattern("plan", {"step": 7}).success_rate == 0.0
+
+def test_exit_hook_flushes_without_keeping_systems_alive(tmp_path):
+    """Test that one exit hook saves pending patterns and does not pin instances."""
+    data_file = tmp_path / "learning.json"
+    system = LearningSystem(data_file=data_file, save_interval=3600)
+    system.learn_pattern("plan", {"step": 1}, success=True)
+    learning_module._flush_open_systems()
+    assert len(json.loads(data_file.read_text())["plan"]) == 1
+
+    system_ref = weakref.ref(system)
+    del system
+    gc.collect()
+    assert system_ref() is None
@@ -0,0 +1,88 @@
+"""
+Tests for concurrent, cached LinkedIn enrichment of scraped businesses.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.progress_stream import ProgressStream
+from core.utils.cache import cache_registry
+from scrapers.enhanced_scraper import EnhancedScraper
+from scrapers.fetch_engine import FetchEngine
+from scrapers.profile_cache import ProfileCache
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Build scrapers sharing a profile database, counting real lookups."""
+    lookups = []
+    lock = threading.Lock()
+
+    def build(delay=0.0, clock=time.time):
+        cache_registry.clear("scraper.linkedin_profiles")
+        scraper = EnhancedScraper(fetch_engine=FetchEngine(),
+                                  profile_cache=ProfileCache(str(tmp_path / "profiles.db"), clock=clock),
+                                  stream=ProgressStream())
+        find = scraper.find_linkedin_profiles
+
+        def counted(business_name, location=None):
+            with lock:
+                lookups.append(business_name)
+            time.sleep(delay)
+            return find(business_name, location)
+
+        scraper.find_linkedin_profiles = counted
+        return scraper
+
+    build.lookups = lookups
+    yield build
+    cache_registry.clear("scraper.linkedin_profiles")
+
+def businesses(count):
+    return [{"name": f"Shop {n} Smoke", "city": "Austin"} for n in range(count)]
+
+def test_lookups_run_concurrently(make_scraper):
+    """Test that slow lookups overlap instead of running one after another."""
+    scraper = make_scraper(delay=0.1)
+    started = time.monotonic()
+    enhanced = scraper.enhance_business_data_with_linkedin(businesses(8))
+    assert time.monotonic() - started < 0.4
+    assert all(b["owner_info"]["company_linkedin"].startswith("https://www.linkedin.com/company/")
+               for b in enhanced)
+
+def test_lookups_are_cached_across_restarts(make_scraper):
+    """Test that each (name, city) pair is looked up once until it expires."""
+    now = [1000.0]
+    scraper = make_scraper(clock=lambda: now[0])
+    records = businesses(3) + [{"name": "shop 0 smoke!", "city": "AUSTIN"}]
+    scraper.enhance_business_data_with_linkedin(records)
+    assert sorted(make_scraper.lookups) == ["Shop 0 Smoke", "Shop 1 Smoke", "Shop 2 Smoke"]
+
+    restarted = make_scraper(clock=lambda: now[0])
+    restarted.enhance_business_data_with_linkedin(businesses(3))
+    assert len(make_scraper.lookups) == 3
+
+    now[0] += 8 * 24 * 3600
+    expired = make_scraper(clock=lambda: now[0])
+    expired.enhance_business_data_with_linkedin(businesses(1))
+    assert len(make_scraper.lookups) == 4
+
+def test_background_enrichment_streams_records(make_scraper):
+    """Test that deferred enrichment returns at once and publishes each record."""
+    scraper = make_scraper(delay=0.05)
+    records = businesses(4)
+    topic = scraper.enhance_business_data_in_background(records)
+    assert all("owner_info" not in b for b in records)
+
+    seen = {}
+    since = 0
+    deadline = time.monotonic() + 5
+    while seen.get(topic, {}).get("status") != "completed" and time.monotonic() < deadline:
+        events, since, _ = scraper.stream.read(since, topic, timeout=1)
+        for event in events:
+            seen.setdefault(event.topic, {}).update(event.data)
+
+    assert seen[topic] == {"status": "completed", "completed": 4, "total": 4}
+    assert sorted(seen[f"{topic}:{n}"]["index"] for n in range(4)) == [0, 1, 2, 3]
+    assert seen[f"{topic}:2"]["owner_info"]["company_linkedin"].endswith("shop-2-smoke")
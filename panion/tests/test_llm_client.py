@@ -0,0 +1,144 @@
+"""
+Tests for the LLM client and response cache against a local stub server.
+"""
+
+import asyncio
+import itertools
+import pytest
+from aiohttp import web
+
+from core.services.llm_client import ChatCompletionClient, LLMResponseCache
+
+_namespaces = itertools.count()
+
+class StubServer:
+    """Local chat-completions endpoint that counts requests."""
+
+    def __init__(self, delay=0.0, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.requests = []
+        self.runner = None
+        self.base_url = None
+
+    async def handle(self, request):
+        payload = await request.json()
+        self.requests.append(payload)
+        if self.failures:
+            self.failures -= 1
+            return web.json_response({"error": {"message": "overloaded"}}, status=503)
+        await asyncio.sleep(self.delay)
+        prompt = payload["messages"][0]["content"]
+        return web.json_response({"choices": [{"message": {"content": f"echo: {prompt}"}}]})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+def request_for(prompt, model="stub-model"):
+    """Build a chat-completion payload."""
+    return {"model": model, "messages": [{"role": "user", "content": prompt}], "temperature": 0}
+
+def make_cache(tmp_path, **kwargs):
+    """Create a cache with its own in-memory namespace."""
+    return LLMResponseCache(cache_dir=tmp_path / "llm_cache",
+                            namespace=f"test.llm.{next(_namespaces)}", **kwargs)
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_prompts_share_one_request(tmp_path):
+    """Test that concurrent identical prompts reach the server once."""
+    server = StubServer(delay=0.05)
+    await server.start()
+    client = ChatCompletionClient(api_key="test", api_base=server.base_url)
+    cache = make_cache(tmp_path)
+    try:
+        request = request_for("decompose goal")
+        results = await asyncio.gather(*(
+            cache.get_or_generate(request, lambda: client.complete(request)) for _ in range(10)
+        ))
+        assert results == ["echo: decompose goal"] * 10
+        assert len(server.requests) == 1
+
+        other = request_for("decompose goal", model="other-model")
+        assert await cache.get_or_generate(other, lambda: client.complete(other))
+        assert len(server.requests) == 2
+    finally:
+        await client.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    """Test that a new cache instance answers from disk."""
+    server = StubServer()
+    await server.start()
+    client = ChatCompletionClient(api_key="test", api_base=server.base_url)
+    try:
+        request = request_for("plan")
+        first = make_cache(tmp_path)
+        await first.get_or_generate(request, lambda: client.complete(request))
+
+        second = make_cache(tmp_path)
+        assert await second.get_or_generate(request, lambda: client.complete(request)) == "echo: plan"
+        assert len(server.requests) == 1
+        assert second.stats()["disk_hits"] == 1
+    finally:
+        await client.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_expired_disk_entries_are_regenerated(tmp_path):
+    """Test that entries older than the TTL are not served."""
+    server = StubServer()
+    await server.start()
+    client = ChatCompletionClient(api_key="test", api_base=server.base_url)
+    try:
+        request = request_for("stale")
+        await make_cache(tmp_path, ttl_seconds=0).get_or_generate(
+            request, lambda: client.complete(request))
+        await make_cache(tmp_path, ttl_seconds=0).get_or_generate(
+            request, lambda: client.complete(request))
+        assert len(server.requests) == 2
+    finally:
+        await client.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_client_retries_server_errors_and_reuses_session(tmp_path):
+    """Test that 5xx responses are retried on the shared session."""
+    server = StubServer(failures=2)
+    await server.start()
+    client = ChatCompletionClient(api_key="test", api_base=server.base_url, retry_delay=0.001)
+    try:
+        assert await client.complete(request_for("retry")) == "echo: retry"
+        session = client.session
+        assert await client.complete(request_for("again")) == "echo: again"
+        assert client.session is session
+        assert len(server.requests) == 4
+    finally:
+        await client.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached(tmp_path):
+    """Test that a failed generation is retried by the next caller."""
+    server = StubServer(failures=1)
+    await server.start()
+    client = ChatCompletionClient(api_key="test", api_base=server.base_url, retry_attempts=1)
+    cache = make_cache(tmp_path)
+    try:
+        request = request_for("flaky")
+        with pytest.raises(Exception):
+            await cache.get_or_generate(request, lambda: client.complete(request))
+        assert await cache.get_or_generate(request, lambda: client.complete(request)) == "echo: flaky"
+    finally:
+        await client.close()
+        await server.stop()
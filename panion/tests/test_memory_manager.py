@@ -0,0 +1,164 @@
+"""
+Tests for the memory manager.
+"""
+
+import gc
+import weakref
+
+import pytest
+from datetime import datetime, timedelta
+
+from core.memory import manager as manager_module
+from core.memory.manager import MemoryManager
+from core.memory.scoring import memory_scoring_system
+from core.memory.storage import SegmentLogStorage
+from core.memory.text_index import InvertedIndex
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Create a memory manager with an empty store."""
+    monkeypatch.setattr(memory_scoring_system, "archive_dir", tmp_path)
+    manager = MemoryManager(data_dir=str(tmp_path / "memories"))
+    yield manager
+    manager.close()
+
+def test_inverted_index_bm25_prefers_rarer_terms():
+    """Test that documents matching rarer terms rank higher."""
+    index = InvertedIndex()
+    index.add("a", ["python scraper for coffee shops"])
+    index.add("b", ["python planner"])
+    index.add("c", ["python tester"])
+
+    scores = index.search("python coffee", match_all=False)
+    assert max(scores, key=scores.get) == "a"
+    assert index.search("python coffee") == {"a": scores["a"]}
+
+def test_inverted_index_remove():
+    """Test that removed documents no longer match."""
+    index = InvertedIndex()
+    index.add("a", ["alpha beta"])
+    index.add("b", ["beta"])
+    index.remove("a")
+
+    assert index.search("alpha") == {}
+    assert set(index.search("beta")) == {"b"}
+    assert "alpha" not in index.postings
+
+def test_search_uses_index_and_tags(manager):
+    """Test token search with and without tag filters."""
+    first = manager.add_memory({"text": "Scraped coffee shops in Seattle"}, tags=["scraping"])
+    second = manager.add_memory({"text": "Planned coffee tasting"}, tags=["planning"])
+
+    ids = {m["id"] for m in manager.search_memories("coffee")}
+    assert {first, second} <= ids
+
+    results = manager.search_memories("coffee", tags=["planning"])
+    assert [m["id"] for m in results] == [second]
+
+    assert manager.search_memories("seattle coffee")[0]["id"] == first
+    assert manager.search_memories("tokyo") == []
+
+def test_search_limit(manager):
+    """Test that only the top results are returned."""
+    for i in range(5):
+        manager.add_memory({"text": f"note {i}"})
+
+    assert len(manager.search_memories("note", limit=3)) == 3
+
+def test_forgotten_memory_is_unindexed(manager):
+    """Test that forgetting removes a memory from search."""
+    memory_id = manager.add_memory({"text": "ephemeral detail"}, tags=["temp"])
+    memory_scoring_system._forget_memory(memory_id)
+
+    assert manager.search_memories("ephemeral") == []
+    assert memory_id not in manager.memory_index.get("temp", set())
+
+def test_same_second_memories_do_not_collide(manager):
+    """Test that rapid inserts keep distinct, ordered IDs."""
+    ids = [manager.add_memory({"text": f"burst {i}"}) for i in range(200)]
+
+    assert len(set(ids)) == 200
+    assert ids == sorted(ids)
+    assert len(manager.memories) == 200
+
+def test_get_memories_in_range(manager):
+    """Test time range scans over memory IDs."""
+    before = datetime.now()
+    first = manager.add_memory({"text": "inside"})
+    second = manager.add_memory({"text": "inside too"})
+    after = datetime.now() + timedelta(microseconds=1)
+
+    in_range = [m["id"] for m in manager.get_memories_in_range(before, after)]
+    assert in_range == [first, second]
+    assert manager.get_memories_in_range(after + timedelta(seconds=1)) == []
+
+def test_memories_survive_restart(tmp_path, manager):
+    """Test that buffered writes and access counts are reloaded."""
+    memory_id = manager.add_memory({"text": "persisted"}, tags=["disk"])
+    manager.get_memory(memory_id)
+    manager.get_memory(memory_id)
+    manager.close()
+
+    reloaded = MemoryManager(data_dir=str(tmp_path / "memories"))
+    assert reloaded.memories[memory_id]["access_count"] == 2
+    assert reloaded.search_memories("persisted")[0]["id"] == memory_id
+    reloaded.close()
+
+def test_exit_hook_closes_open_managers_without_keeping_them(tmp_path, monkeypatch):
+    """Test that one exit hook closes unclosed managers and closed ones can be collected."""
+    monkeypatch.setattr(memory_scoring_system, "archive_dir", tmp_path)
+    pending = MemoryManager(data_dir=str(tmp_path / "pending"))
+    memory_id = pending.add_memory({"text": "buffered"})
+    closed = MemoryManager(data_dir=str(tmp_path / "closed"))
+    closed.close()
+    closed_ref = weakref.ref(closed)
+    del closed
+    gc.collect()
+    assert closed_ref() is None
+
+    manager_module._close_open_managers()
+    assert pending not in manager_module._open_managers
+    assert memory_id in SegmentLogStorage(tmp_path / "pending" / "log").load_all()
+
+def test_legacy_json_files_are_migrated(tmp_path):
+    """Test that one-file-per-memory stores are imported into the log."""
+    data_dir = tmp_path / "memories"
+    data_dir.mkdir()
+    (data_dir / "mem_legacy.json").write_text(
+        '{"id": "mem_legacy", "content": {"text": "old"}, "tags": [], "access_count": 0}'
+    )
+
+    manager = MemoryManager(data_dir=str(data_dir))
+    assert "mem_legacy" in manager.memories
+    assert SegmentLogStorage(data_dir / "log").load_all()["mem_legacy"]["content"] == {"text": "old"}
+    manager.close()
+
+def test_segment_log_batches_and_coalesces(tmp_path):
+    """Test that touches are coalesced and flushed in one batch."""
+    storage = SegmentLogStorage(tmp_path, batch_size=1000, flush_interval=3600)
+    storage.put("a", {"id": "a", "access_count": 0})
+    storage.flush()
+    for count in range(1, 51):
+        storage.touch("a", {"access_count": count})
+
+    assert storage.stats()["pending"] == 1
+    storage.flush()
+    lines = (tmp_path / "segment_000001.log").read_text().splitlines()
+    assert len(lines) == 2
+    assert SegmentLogStorage(tmp_path).load_all()["a"]["access_count"] == 50
+
+def test_segment_log_compaction(tmp_path):
+    """Test that superseded records are dropped by compaction."""
+    storage = SegmentLogStorage(tmp_path, batch_size=1, min_compact_bytes=0, compact_ratio=0.5)
+    for version in range(10):
+        storage.put("a", {"id": "a", "version": version})
+    storage.put("b", {"id": "b"})
+    storage.delete("b")
+    storage.touch("a", {"access_count": 3})
+    storage.compact()
+
+    assert storage.stats()["segments"] == 1
+    assert storage.get("a") == {"id": "a", "version": 9, "access_count": 3}
+    assert SegmentLogStorage(tmp_path).load_all() == {
+        "a": {"id": "a", "version": 9, "access_count": 3}
+    }
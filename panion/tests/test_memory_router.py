@@ -0,0 +1,123 @@
+"""
+Tests for memoized, concurrently assembled agent contexts.
+"""
+
+import asyncio
+
+import pytest
+
+from core.events import event_bus, Event, EventType
+from core.memory.manager import MemoryManager
+from core.memory.plugin_test_logs import PluginTestLogCache
+from core.memory.scoring import memory_scoring_system
+from core.memory_router import MemoryRouter
+from core.reflection import ReflectionCategory, ReflectionLogger
+
+class FakeSource:
+    """Reflection and memory provider that counts calls and takes a while to answer."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def get_reflections(self, goal_id, start_time):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [{"id": f"r{self.calls}", "thought": goal_id}]
+
+    async def get_entries(self, goal_id, start_time):
+        await asyncio.sleep(self.delay)
+        return [{"id": "m1", "content": goal_id}]
+
+@pytest.fixture
+def make_router(tmp_path):
+    routers = []
+
+    def build(**kwargs):
+        source = FakeSource()
+        router = MemoryRouter(reflection_source=source, memory_source=source, **kwargs)
+        router.test_log_cache = PluginTestLogCache(tmp_path / "test_logs")
+        routers.append(router)
+        return router, source
+
+    yield build
+    for router in routers:
+        router.close()
+
+@pytest.mark.asyncio
+async def test_contexts_are_memoized_and_built_concurrently(make_router):
+    """Test that sources are fetched together once and repeated calls hit the memo until the TTL."""
+    now = [0.0]
+    router, source = make_router(context_ttl=60)
+    router._clock = lambda: now[0]
+
+    loop = asyncio.get_running_loop()
+    began = loop.time()
+    context = await router.get_agent_context("goal_1")
+    # Reflections and memories each take 0.05 s; fetched one after another this would take 0.1 s
+    assert loop.time() - began < 0.09
+    assert context["metadata"]["reflection_count"] == 1 and context["memory_entries"][0]["content"] == "goal_1"
+
+    assert await router.get_agent_context("goal_1") is context
+    assert source.calls == 1 and router.context_hits == 1
+
+    now[0] = 61
+    assert await router.get_agent_context("goal_1") is not context
+    assert source.calls == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_build(make_router):
+    """Test that simultaneous requests for a goal wait on the same build."""
+    router, source = make_router()
+    first, second, other = await asyncio.gather(
+        router.get_agent_context("goal_1"),
+        router.get_agent_context("goal_1"),
+        router.get_agent_context("goal_2"),
+    )
+    assert first is second and first is not other
+    assert source.calls == 2 and router.context_misses == 2
+
+@pytest.mark.asyncio
+async def test_goal_writes_invalidate_only_their_goal(make_router, tmp_path, monkeypatch):
+    """Test that reflections and memories tagged with a goal, and test runs, drop memoized contexts."""
+    router, source = make_router()
+    await router.get_agent_context("goal_1")
+    await router.get_agent_context("goal_2")
+    assert source.calls == 2
+
+    logger = ReflectionLogger(tmp_path / "reflections")
+    try:
+        logger.log(ReflectionCategory.GOAL, "step done", metadata={"goal_id": "goal_1"})
+        logger.log(ReflectionCategory.SYSTEM, "unrelated")
+    finally:
+        logger.close()
+    await router.get_agent_context("goal_1")
+    await router.get_agent_context("goal_2")
+    assert source.calls == 3
+
+    monkeypatch.setattr(memory_scoring_system, "archive_dir", tmp_path)
+    manager = MemoryManager(data_dir=str(tmp_path / "memories"))
+    try:
+        manager.add_memory({"goal_id": "goal_2", "text": "found three candidates"})
+        manager.add_memory({"text": "no goal"})
+    finally:
+        manager.close()
+    await router.get_agent_context("goal_1")
+    await router.get_agent_context("goal_2")
+    assert source.calls == 4
+
+    event_bus.publish(Event(EventType.PLUGIN_TEST_COMPLETED, {"plugin_id": "p"}))
+    await router.get_agent_context("goal_1")
+    await router.get_agent_context("goal_2")
+    assert source.calls == 6
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_build_is_not_memoized(make_router):
+    """Test that a context built while its goal was invalidated is not served afterwards."""
+    router, source = make_router()
+    building = asyncio.create_task(router.get_agent_context("goal_1"))
+    await asyncio.sleep(0.01)
+    router.invalidate_context("goal_1")
+    await building
+    await router.get_agent_context("goal_1")
+    assert source.calls == 2
@@ -0,0 +1,77 @@
+"""
+Tests for the memory scoring system.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from core.memory.scoring import MemoryScoringSystem
+
+@pytest.fixture
+def scoring(tmp_path, monkeypatch):
+    """Create a scoring system archiving into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return MemoryScoringSystem(config_path=str(tmp_path / "missing.json"))
+
+def make_memory(days_ago=0, access_count=0, importance=0.5, tags=None):
+    """Create a memory dict."""
+    return {
+        "tags": tags or [],
+        "last_accessed": (datetime.now() - timedelta(days=days_ago)).isoformat(),
+        "access_count": access_count,
+        "metadata": {"importance": importance, "relevance": 0.5}
+    }
+
+def test_batch_scores_match_single_scores(scoring):
+    """Test that batch scoring agrees with per-memory scoring."""
+    memories = {
+        f"m{i}": make_memory(days_ago=i, access_count=i % 12, importance=i / 20,
+                             tags=["critical"] if i % 3 == 0 else [])
+        for i in range(20)
+    }
+    for memory_id, memory in memories.items():
+        scoring.update_score(memory_id, memory)
+
+    batch = scoring.calculate_scores()
+    single = [scoring.calculate_score(memories[memory_id]) for memory_id in scoring.store.ids]
+    assert np.allclose(batch, single)
+
+def test_decay_forgets_low_scores(scoring):
+    """Test that decay lowers stale scores and forgets those below threshold."""
+    forgotten = []
+    scoring.add_forget_listener(forgotten.append)
+    scoring.update_score("fresh", make_memory(importance=1.0, tags=["key"]))
+    scoring.update_score("stale", make_memory(days_ago=60))
+
+    row = scoring.store.row("stale")
+    scoring.store.columns["updated_at"][row] -= 60 * 86400
+
+    scoring.apply_decay()
+
+    assert forgotten == ["stale"]
+    assert "stale" not in scoring.scores
+    assert "fresh" in scoring.scores
+    assert (scoring.archive_dir / "stale.json").exists()
+
+def test_important_memories_top_k(scoring):
+    """Test that top-k returns the highest scores in descending order."""
+    for i in range(50):
+        scoring.update_score(f"m{i}", make_memory(access_count=i % 11, importance=(i % 7) / 7))
+
+    top = scoring.get_important_memories(limit=5)
+    all_scores = sorted(scoring.store.column("current_score"), reverse=True)
+
+    assert [m["score"] for m in top] == pytest.approx(all_scores[:5])
+
+def test_remove_keeps_rows_consistent(scoring):
+    """Test that removing a row keeps the ID-to-row mapping intact."""
+    for i in range(5):
+        scoring.update_score(f"m{i}", make_memory(importance=i / 5))
+    expected = scoring.get_scores(["m4"])
+
+    scoring.store.remove("m1")
+
+    assert len(scoring.scores) == 4
+    assert scoring.get_scores(["m4"]) == expected
+    assert scoring.scores["m4"].current_score == expected["m4"]
@@ -0,0 +1,131 @@
+"""
+Tests for the MinHash/LSH near-duplicate memory index.
+"""
+
+import random
+from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from core.memory.near_duplicates import (
+    LSHIndex, MinHasher, NearDuplicateIndex, compute_signatures, lsh_parameters, memory_similarity,
+    min_content_ratio, shingle_hashes, verify_pairs
+)
+
+WORDS = ["planner", "scraper", "timeout", "plugin", "goal", "memory", "retry", "socket", "budget", "cache",
+         "worker", "session", "token", "stream", "ledger", "queue", "index", "shard", "graph", "agent"]
+
+def sentences(count, seed=3):
+    rng = random.Random(seed)
+    texts = []
+    for n in range(count):
+        base = " ".join(rng.choice(WORDS) for _ in range(12))
+        texts.append(base)
+        if n % 4 == 0:
+            texts.append(base + " again")
+    return texts
+
+def test_signatures_estimate_shingle_jaccard():
+    """Test that signature agreement tracks the exact shingle Jaccard similarity."""
+    hasher = MinHasher(num_perm=256)
+    texts = sentences(20)
+    for first, second in list(combinations(texts, 2))[:60]:
+        a, b = set(shingle_hashes(first).tolist()), set(shingle_hashes(second).tolist())
+        exact = len(a & b) / len(a | b)
+        estimate = float(np.mean(hasher.signature(first) == hasher.signature(second)))
+        assert abs(estimate - exact) < 0.15
+    assert np.array_equal(hasher.signature("Same  TEXT"), hasher.signature("same text"))
+    assert compute_signatures(["short"])[0].shape == (128,)
+
+def test_lsh_finds_near_duplicates_without_all_pairs():
+    """Test that banding surfaces near duplicates while pruning most unrelated pairs."""
+    texts = sentences(200)
+    index = NearDuplicateIndex()
+    for n, text in enumerate(texts):
+        index.add(f"m{n}", text)
+    pairs = index.candidate_pairs()
+    duplicates = {(f"m{i}", f"m{i + 1}") for i, text in enumerate(texts[:-1]) if texts[i + 1] == text + " again"}
+    assert duplicates and all(tuple(sorted(pair)) in pairs for pair in duplicates)
+    assert len(pairs) < len(texts) * (len(texts) - 1) // 2 / 10
+
+def edited_pairs(count, seed=8):
+    """Texts and word-level edits of them, spanning content ratios down to the compression floor."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 7)))
+                  for _ in range(400)]
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(6, 24))]
+        edited = list(words)
+        for _ in range(rng.randint(1, max(1, len(words) // 2))):
+            position = rng.randrange(len(edited))
+            choice = rng.random()
+            if choice < 0.4:
+                edited[position] = rng.choice(vocabulary)
+            elif choice < 0.7:
+                edited.insert(position, rng.choice(vocabulary))
+            elif len(edited) > 2:
+                del edited[position]
+        texts.extend([" ".join(words), " ".join(edited)])
+    return texts
+
+def test_banding_derived_from_the_threshold_keeps_recall():
+    """Test that candidates cover what an exhaustive scan at the threshold would compress."""
+    assert min_content_ratio(0.8) == pytest.approx(2 / 3)
+    num_perm, bands = lsh_parameters(0.2)
+    assert num_perm % bands == 0 and 1 - (1 - 0.2 ** (num_perm // bands)) ** bands >= 0.99
+
+    texts = edited_pairs(80)
+    # Agreeing metadata and tags: the content ratio alone decides, down to about 0.67
+    records = {f"m{n}": (text, {"source": "planner"}, ["task"]) for n, text in enumerate(texts)}
+    expected = {(a, b) for a, b in combinations(sorted(records), 2)
+                if memory_similarity(records[a], records[b], 0.8) >= 0.8}
+    ratios = [SequenceMatcher(None, records[a][0], records[b][0]).ratio() for a, b in expected]
+    assert len(expected) > 60 and min(ratios) < 0.7
+
+    index = NearDuplicateIndex.for_threshold(0.8)
+    for key, (text, _, _) in records.items():
+        index.add(key, text)
+    candidates = index.candidate_pairs()
+    assert len(expected & candidates) / len(expected) >= 0.98
+    assert len(candidates) < len(records) * (len(records) - 1) // 2 / 2
+
+def test_index_updates_incrementally_and_by_group():
+    """Test that keys can be replaced, removed and are only paired within their group."""
+    index = NearDuplicateIndex()
+    index.add("a", "the planner timed out waiting for the scraper", group="task")
+    index.add("b", "the planner timed out waiting for the scraper!", group="task")
+    index.add("c", "the planner timed out waiting for the scraper", group="fact")
+    assert index.candidate_pairs("task") == {("a", "b")}
+    assert index.candidate_pairs("fact") == set()
+    assert index.is_current("a", "the planner timed out waiting for the scraper", "task")
+    assert not index.is_current("a", "something new", "task")
+
+    index.add("c", "the planner timed out waiting for the scraper", group="task")
+    assert index.candidate_pairs("task") == {("a", "b"), ("a", "c"), ("b", "c")}
+    index.remove("b")
+    index.add("a", "a completely different memory about goals", group="task")
+    assert index.candidate_pairs("task") == set() and len(index) == 2
+
+    lsh = LSHIndex(num_perm=8, bands=4)
+    lsh.add("x", np.arange(8, dtype=np.uint32))
+    assert lsh.query(np.array([0, 1, 9, 9, 9, 9, 9, 9], dtype=np.uint32)) == {"x"}
+
+def test_verification_matches_exact_scores_in_worker_processes():
+    """Test that bounded verification in a process pool keeps exactly the pairs scoring above threshold."""
+    rng = random.Random(5)
+    texts = sentences(40)
+    records = {f"m{n}": (text, {"source": rng.choice(["a", "b"])}, ["x", rng.choice(["y", "z"])])
+               for n, text in enumerate(texts)}
+    pairs = list(combinations(sorted(records), 2))
+    expected = {(a, b) for a, b in pairs if memory_similarity(records[a], records[b]) >= 0.8}
+    assert expected
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        halves = [pool.submit(verify_pairs, pairs[start::2], records, 0.8) for start in range(2)]
+        found = [match for half in halves for match in half.result()]
+    assert {(a, b) for a, b, _ in found} == expected
+    assert all(score == memory_similarity(records[a], records[b]) for a, b, score in found)
@@ -0,0 +1,54 @@
+"""
+Tests for the mtime-aware plugin test log cache.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from core.memory.plugin_test_logs import PluginTestLogCache
+
+def write_logs(path, logs, bump=0):
+    path.write_text(json.dumps(logs))
+    if bump:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump))
+
+def test_goal_logs_match_a_full_scan_and_respect_the_window(tmp_path):
+    """Test goal lookups filter by test ID substring and timestamp like the scan they replace."""
+    now = datetime.now()
+    write_logs(tmp_path / "a.json", [
+        {"test_id": "goal_1_unit", "timestamp": now.isoformat(), "status": "pass"},
+        {"test_id": "goal_2_unit", "timestamp": now.isoformat(), "status": "fail"},
+        {"test_id": "goal_1_old", "timestamp": (now - timedelta(days=30)).isoformat()},
+        {"test_id": "goal_1_bad", "timestamp": "not a time"},
+    ])
+    write_logs(tmp_path / "b.json", [{"test_id": "goal_1_integration", "timestamp": now.isoformat()}])
+    (tmp_path / "health.json").write_text(json.dumps({"plugin_id": "p", "results": []}))
+    (tmp_path / "broken.json").write_text("{")
+
+    cache = PluginTestLogCache(tmp_path)
+    logs = cache.logs_for_goal("goal_1", since=now - timedelta(days=7))
+    assert [log["test_id"] for log in logs] == ["goal_1_unit", "goal_1_integration"]
+    assert [log["test_id"] for log in cache.logs_for_goal("goal_1")] == ["goal_1_unit", "goal_1_old",
+                                                                         "goal_1_integration"]
+    assert cache.logs_for_goal("goal_3") == []
+
+def test_files_are_reparsed_only_when_changed(tmp_path):
+    """Test that unchanged files are served from the cache and edits or deletions are picked up."""
+    now = datetime.now().isoformat()
+    write_logs(tmp_path / "a.json", [{"test_id": "goal_1", "timestamp": now}])
+    write_logs(tmp_path / "b.json", [{"test_id": "goal_2", "timestamp": now}])
+    cache = PluginTestLogCache(tmp_path)
+
+    for _ in range(5):
+        assert len(cache.logs_for_goal("goal_1")) == 1
+    assert cache.parses == 2
+
+    write_logs(tmp_path / "a.json", [{"test_id": "goal_1", "timestamp": now}] * 2, bump=10**9)
+    assert len(cache.logs_for_goal("goal_1")) == 2
+    assert cache.parses == 3
+
+    (tmp_path / "a.json").unlink()
+    assert cache.logs_for_goal("goal_1") == []
+    assert len(cache.logs_for_goal("goal_2")) == 1 and cache.parses == 3
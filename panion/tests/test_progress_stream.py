@@ -0,0 +1,104 @@
+"""
+Tests for the progress stream.
+"""
+
+import threading
+
+from core.progress_stream import ProgressStream
+from core.task_store import TaskStore
+from simple_chat_api import TaskManager
+
+def test_read_resumes_from_sequence_number():
+    """Test that readers get exactly the events after their cursor."""
+    stream = ProgressStream()
+    stream.publish("task:a", {"progress": 10})
+    second = stream.publish("task:b", {"progress": 20})
+
+    events, cursor, missed = stream.read(0, timeout=0)
+    assert [event.topic for event in events] == ["task:a", "task:b"]
+    assert cursor == second and not missed
+
+    stream.publish("task:a", {"progress": 30})
+    events, cursor, _ = stream.read(second, timeout=0)
+    assert [(event.seq, event.data) for event in events] == [(3, {"progress": 30})]
+    assert stream.read(cursor, timeout=0) == ([], cursor, False)
+
+def test_rapid_updates_are_coalesced_per_topic():
+    """Test that a burst becomes one merged event per topic."""
+    stream = ProgressStream()
+    stream.publish("task:a", {"status": "running", "messages": ["start"]})
+    stream.publish("task:b", {"progress": 5})
+    stream.publish("task:a", {"progress": 50, "messages": ["half"]})
+
+    events, _, _ = stream.read(0, timeout=0)
+    assert [event.topic for event in events] == ["task:b", "task:a"]
+    assert events[1].seq == 3
+    assert events[1].data == {"status": "running", "progress": 50, "messages": ["start", "half"]}
+
+def test_topic_filter_and_missed_events():
+    """Test topic filtering and detection of evicted history."""
+    stream = ProgressStream(history_size=2)
+    for n in range(4):
+        stream.publish(f"task:{n % 2}", {"n": n})
+
+    events, cursor, missed = stream.read(0, topic_prefix="task:1", timeout=0)
+    assert missed
+    assert [event.data for event in events] == [{"n": 3}]
+    assert cursor == 4
+    assert stream.read(2, timeout=0)[2] is False
+
+def test_cursor_from_before_a_restart_replays_history():
+    """Test that a sequence number ahead of the stream is reported as a gap."""
+    stream = ProgressStream()
+    for n in range(5):
+        stream.publish(f"task:{n}", {"n": n})
+
+    events, cursor, missed = stream.read(500, timeout=0.1)
+    assert missed and cursor == 5
+    assert [event.data["n"] for event in events] == [0, 1, 2, 3, 4]
+
+def test_read_waits_for_new_events():
+    """Test that a blocked reader wakes on publish."""
+    stream = ProgressStream()
+    timer = threading.Timer(0.05, stream.publish, args=("operation:x", {"progress": 15}))
+    timer.start()
+    events, cursor, _ = stream.read(0, timeout=5)
+    timer.join()
+    assert cursor == 1 and events[0].topic == "operation:x"
+
+def test_task_manager_publishes_deltas():
+    """Test that task updates reach the stream as deltas."""
+    stream = ProgressStream()
+    manager = TaskManager(max_workers=1, store=TaskStore(":memory:"), stream=stream)
+    done = threading.Event()
+
+    def work(task_id, details):
+        manager._update_task(task_id, progress=50, message="halfway")
+        manager._update_task(task_id, status="completed", progress=100)
+        done.set()
+
+    manager.task_handlers["work"] = work
+    manager.create_task("t1", {"type": "work"})
+    assert done.wait(5)
+    manager.shutdown()
+
+    events, _, _ = stream.read(0, timeout=0)
+    assert len(events) == 1
+    data = events[0].data
+    assert data["status"] == "completed"
+    assert data["progress"] == 100
+    assert [message["content"] for message in data["messages"]] == ["Initializing task execution", "halfway"]
+
+def test_strategy_controller_publishes_operation_changes():
+    """Test that strategic operation changes reach the stream."""
+    from scrapers.strategy_controller import StrategyController
+    stream = ProgressStream()
+    controller = StrategyController(stream=stream)
+    controller.active_operations["op_1"] = {"goal": "g"}
+    controller._set_operation("op_1", status="running", progress=10, start_time="t")
+    controller.cancel_operation("op_1")
+
+    events, _, _ = stream.read(0, topic_prefix="operation:", timeout=0)
+    assert events[0].topic == "operation:op_1"
+    assert events[0].data["status"] == "cancelled"
+    assert controller.get_operation_status("op_1")["progress"] == 100
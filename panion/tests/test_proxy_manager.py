@@ -0,0 +1,135 @@
+"""
+Tests for the health-scored proxy pool.
+"""
+
+import gc
+import json
+import random
+import weakref
+from collections import Counter
+
+import pytest
+
+from scrapers import proxy_manager as proxy_module
+from scrapers.proxy_manager import ProxyManager, WeightedSampler
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+@pytest.fixture
+def make_manager(tmp_path, clock, monkeypatch):
+    """Build managers on a fake clock that never fetch proxies from the network."""
+    monkeypatch.setattr(ProxyManager, "_needs_refresh", lambda self: False)
+
+    def build(proxies=(), **kwargs):
+        manager = ProxyManager(str(tmp_path / "proxies.json"), clock=lambda: clock[0],
+                               rng=random.Random(7), **kwargs)
+        for proxy in proxies:
+            manager.add_proxy(proxy)
+        return manager
+
+    return build
+
+def test_sampler_draws_in_proportion_to_weight():
+    """Test that slots are drawn by weight and zero-weight slots never are."""
+    sampler = WeightedSampler()
+    for weight in (1.0, 0.0, 3.0, 6.0):
+        sampler.append(weight)
+    rng = random.Random(1)
+    counts = Counter(sampler.sample(rng) for _ in range(10000))
+    assert counts[1] == 0
+    assert 0.08 < counts[0] / 10000 < 0.12
+    assert 0.55 < counts[3] / 10000 < 0.65
+
+    sampler.update(3, 0.0)
+    sampler.update(0, 0.0)
+    assert {sampler.sample(rng) for _ in range(100)} == {2}
+    sampler.update(2, 0.0)
+    assert sampler.sample(rng) is None
+
+def test_fast_reliable_proxies_are_preferred(make_manager):
+    """Test that EWMA latency and success rate steer selection."""
+    manager = make_manager(["1.1.1.1:80", "2.2.2.2:80", "3.3.3.3:80"])
+    for _ in range(5):
+        manager.mark_proxy_success("http://1.1.1.1:80", latency=0.1)
+        manager.mark_proxy_success("2.2.2.2:80", latency=2.0)
+    manager.mark_proxy_failed("3.3.3.3:80")
+    manager.mark_proxy_failed("3.3.3.3:80")
+
+    counts = Counter(manager.get_proxy() for _ in range(2000))
+    assert counts["1.1.1.1:80"] > 5 * counts["2.2.2.2:80"]
+    assert counts["1.1.1.1:80"] > 10 * counts["3.3.3.3:80"]
+
+def test_quarantine_backs_off_and_drops_repeat_offenders(make_manager, clock):
+    """Test that failing proxies sit out for growing periods and are eventually removed."""
+    manager = make_manager(["1.1.1.1:80", "2.2.2.2:80"], max_fail_count=2, max_strikes=2,
+                           quarantine_base=60, max_quarantine=600)
+    manager.mark_proxy_failed("1.1.1.1:80")
+    manager.mark_proxy_failed("1.1.1.1:80")
+    assert manager.get_stats()["quarantined"] == 1
+    assert {manager.get_proxy() for _ in range(50)} == {"2.2.2.2:80"}
+
+    clock[0] += 61
+    assert "1.1.1.1:80" in {manager.get_proxy() for _ in range(200)}
+    # On probation: a single failure sends it back, for twice as long
+    manager.mark_proxy_failed("1.1.1.1:80")
+    assert manager.stats["1.1.1.1:80"].blocked_until == clock[0] + 120
+
+    clock[0] += 121
+    manager.get_proxy()
+    manager.mark_proxy_failed("1.1.1.1:80")
+    assert manager.proxies == ["2.2.2.2:80"]
+
+def test_host_bans_only_affect_that_host(make_manager):
+    """Test that a 403 from one site keeps the proxy away from that site only."""
+    manager = make_manager(["1.1.1.1:80", "2.2.2.2:80"])
+    manager.mark_proxy_failed("1.1.1.1:80", host="www.yelp.com", banned=True)
+
+    assert {manager.get_proxy("www.yelp.com") for _ in range(100)} == {"2.2.2.2:80"}
+    assert "1.1.1.1:80" in {manager.get_proxy("www.yellowpages.com") for _ in range(100)}
+    assert manager.get_stats()["host_bans"] == 1
+
+def test_state_is_saved_in_batches(make_manager, clock, tmp_path):
+    """Test that marks are batched into periodic writes and survive a restart."""
+    path = tmp_path / "proxies.json"
+    manager = make_manager(["1.1.1.1:80"], save_interval=30)
+    manager.flush()
+    written = path.stat().st_mtime_ns
+
+    for _ in range(20):
+        manager.mark_proxy_success("1.1.1.1:80", latency=0.2)
+    assert path.stat().st_mtime_ns == written
+
+    clock[0] += 31
+    manager.mark_proxy_failed("1.1.1.1:80", host="www.yelp.com", banned=True)
+    saved = json.loads(path.read_text())
+    assert saved["proxies"] == ["1.1.1.1:80"]
+    assert saved["host_stats"]["1.1.1.1:80|www.yelp.com"]["strikes"] == 1
+
+    restarted = make_manager()
+    assert restarted.stats["1.1.1.1:80"].latency < 0.5
+    assert restarted.get_proxy("www.yelp.com") is None
+
+def test_exit_hook_flushes_without_keeping_managers_alive(make_manager, tmp_path):
+    """Test that one exit hook saves pending marks and does not pin instances."""
+    manager = make_manager(["1.1.1.1:80"], save_interval=3600)
+    manager.mark_proxy_success("1.1.1.1:80", latency=0.2)
+    proxy_module._flush_open_managers()
+    assert json.loads((tmp_path / "proxies.json").read_text())["proxies"] == ["1.1.1.1:80"]
+
+    manager_ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert manager_ref() is None
+
+def test_legacy_proxy_file_is_loaded(make_manager, tmp_path):
+    """Test that the previous file format still loads."""
+    (tmp_path / "proxies.json").write_text(json.dumps({
+        "proxies": ["http://1.1.1.1:80", "2.2.2.2:80"],
+        "failed_proxies": {"2.2.2.2:80": 1},
+        "last_updated": "2024-01-01T00:00:00"
+    }))
+    manager = make_manager()
+    assert sorted(manager.proxies) == ["1.1.1.1:80", "2.2.2.2:80"]
+    assert manager.get_proxy_dict()["https"].startswith("http://")
@@ -0,0 +1,153 @@
+"""
+Tests for the pub/sub hub and the websocket server routing.
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+import websockets
+
+import simple_chat_api
+import start_websocket_server
+from core.progress_stream import ProgressStream
+from core.pubsub_hub import PubSubHub, SLOW_CONSUMER_CLOSE_CODE
+
+class FakeClient:
+    """Records what the hub sends; can be made to stall."""
+
+    def __init__(self):
+        self.received = []
+        self.closed = None
+        self.stalled = asyncio.Event()
+        self.stalled.set()
+
+    async def send(self, message):
+        await self.stalled.wait()
+        self.received.append(json.loads(message))
+
+    async def close(self, code, reason):
+        self.closed = (code, reason)
+
+def register(hub, name):
+    client = FakeClient()
+    return client, hub.register(name, client.send, client.close)
+
+@pytest.mark.asyncio
+async def test_publish_routes_by_exact_and_prefix_topics():
+    """Test that messages reach exact and wildcard subscribers only."""
+    hub = PubSubHub()
+    exact, exact_conn = register(hub, "exact")
+    prefix, prefix_conn = register(hub, "prefix")
+    other, other_conn = register(hub, "other")
+    hub.subscribe(exact_conn, ["task:1"])
+    hub.subscribe(prefix_conn, ["task:*"])
+    hub.subscribe(other_conn, ["goal:*"])
+
+    assert hub.publish("task:1", {"progress": 10}) == 2
+    assert hub.publish("task:2", {"progress": 20}) == 1
+    await asyncio.sleep(0.01)
+
+    assert [m["data"]["progress"] for m in exact.received] == [10]
+    assert [m["topic"] for m in prefix.received] == ["task:1", "task:2"]
+    assert other.received == []
+
+    hub.unsubscribe(prefix_conn, ["task:*"])
+    assert hub.publish("task:2", {}) == 0
+    hub.unregister(exact_conn)
+    assert hub.subscribers("task:1") == set()
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_without_stalling_others():
+    """Test that a full queue drops only the slow connection."""
+    hub = PubSubHub(max_queue_size=2)
+    slow, slow_conn = register(hub, "slow")
+    fast, fast_conn = register(hub, "fast")
+    slow.stalled.clear()
+    hub.subscribe(slow_conn, ["*"])
+    hub.subscribe(fast_conn, ["*"])
+
+    for n in range(5):
+        hub.publish("task:1", {"n": n})
+        await asyncio.sleep(0.01)
+
+    assert [m["data"]["n"] for m in fast.received] == [0, 1, 2, 3, 4]
+    assert slow_conn.closed
+    assert slow.closed[0] == SLOW_CONSUMER_CLOSE_CODE
+    assert hub.get_stats()["dropped_connections"] == 1
+    assert hub.get_stats()["connections"] == 1
+
+@pytest.mark.asyncio
+async def test_send_timeout_drops_connection():
+    """Test that a send stuck on the socket drops the connection."""
+    hub = PubSubHub(send_timeout=0.05)
+    stuck, stuck_conn = register(hub, "stuck")
+    stuck.stalled.clear()
+    hub.subscribe(stuck_conn, ["goal:1"])
+    hub.publish("goal:1", {})
+    await asyncio.sleep(0.1)
+    assert stuck_conn.closed
+    assert hub.publish("goal:1", {}) == 0
+
+@pytest.mark.asyncio
+async def test_websocket_subscribe_and_publish(monkeypatch):
+    """Test topic routing through the websocket server."""
+    monkeypatch.setattr(start_websocket_server, "hub", None)
+    async with websockets.serve(start_websocket_server.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        async with websockets.connect(f"ws://127.0.0.1:{port}") as listener, \
+                websockets.connect(f"ws://127.0.0.1:{port}") as publisher:
+            assert json.loads(await listener.recv())["type"] == "welcome"
+            assert json.loads(await publisher.recv())["type"] == "welcome"
+
+            await listener.send(json.dumps({"type": "subscribe", "id": "s1", "topics": ["client:*", "agent:*"]}))
+            response = json.loads(await listener.recv())
+            assert response["id"] == "s1"
+            assert response["data"]["topics"] == ["agent:*", "client:*"]
+
+            await publisher.send(json.dumps({"type": "publish", "topic": "client:a1", "data": {"text": "hi"}}))
+            assert json.loads(await publisher.recv())["data"]["delivered"] == 1
+            event = json.loads(await listener.recv())
+            assert event["type"] == "event"
+            assert event["topic"] == "client:a1"
+            assert event["data"] == {"text": "hi"}
+
+            # Server-side topics cannot be spoofed by clients
+            for topic in ("agent:a1", "task:t1", "goal:g1", "operation:o1"):
+                await publisher.send(json.dumps({"type": "publish", "id": "r", "topic": topic, "data": {}}))
+                error = json.loads(await publisher.recv())
+                assert error["type"] == "error" and "reserved" in error["error"]
+
+            await publisher.send(json.dumps({"type": "publish", "id": "p2"}))
+            error = json.loads(await publisher.recv())
+            assert error["type"] == "error" and error["id"] == "p2"
+
+            await publisher.send(json.dumps({"type": "status", "id": "x"}))
+            assert json.loads(await publisher.recv())["type"] == "status_response"
+
+@pytest.mark.asyncio
+async def test_api_progress_events_are_republished(monkeypatch):
+    """Test that the bridge follows the API's event stream into the hub."""
+    stream = ProgressStream()
+    monkeypatch.setattr(simple_chat_api, "progress_stream", stream)
+    stream.publish("task:t1", {"progress": 10})
+    httpd = simple_chat_api.create_server("127.0.0.1", 0, workers=2, max_queue=2)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    hub = PubSubHub()
+    monkeypatch.setattr(start_websocket_server, "hub", hub)
+    client, connection = register(hub, "client")
+    hub.subscribe(connection, ["task:*"])
+    url = "http://%s:%d/events?since=0" % httpd.server_address
+    bridge = asyncio.create_task(start_websocket_server.follow_api_events(url))
+    try:
+        for _ in range(100):
+            if client.received:
+                break
+            await asyncio.sleep(0.02)
+        assert client.received[0]["topic"] == "task:t1"
+        assert client.received[0]["data"] == {"progress": 10}
+    finally:
+        bridge.cancel()
+        httpd.shutdown()
+        httpd.server_close()
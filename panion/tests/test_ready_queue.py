@@ -0,0 +1,91 @@
+"""
+Tests for the goal scheduler's ready queue.
+"""
+
+from datetime import datetime, timedelta
+
+from core.ready_queue import ReadyQueue, deadline_key
+
+class Goal:
+    """Minimal goal with the fields the queue reads."""
+
+    def __init__(self, goal_id, priority=5, dependencies=None, hours=1, status='pending'):
+        self.goal_id = goal_id
+        self.priority = priority
+        self.deadline = datetime.now() + timedelta(hours=hours)
+        self.dependencies = dependencies or []
+        self.status = status
+
+def make_queue(*goals):
+    """Create a queue over the given goals and index them in order."""
+    mapping = {}
+    queue = ReadyQueue(mapping)
+    for goal in goals:
+        mapping[goal.goal_id] = goal
+        queue.index(goal)
+    return queue
+
+def start(started):
+    """Return a starter that marks goals running and records them."""
+    def try_start(goal):
+        goal.status = 'running'
+        started.append(goal.goal_id)
+        return True
+    return try_start
+
+def test_ready_queue_orders_by_priority_and_deadline():
+    """Test that ready goals are dispatched by priority, then deadline."""
+    queue = make_queue(Goal('low', priority=1), Goal('late', priority=9, hours=5),
+                       Goal('early', priority=9, hours=1))
+    started = []
+    assert queue.dispatch(start(started), lambda: False) == ['early', 'late', 'low']
+    assert started == ['early', 'late', 'low'] and len(queue) == 0
+
+def test_blocked_goal_not_ready_until_dependency_completes():
+    """Test that dependents are only queued once their dependencies complete."""
+    parent, child = Goal('parent'), Goal('child', dependencies=['parent'])
+    queue = make_queue(parent, child)
+
+    assert 'parent' in queue and 'child' not in queue
+    assert queue.dependents['parent'] == {'child'}
+
+    assert queue.dispatch(start([]), lambda: False) == ['parent']
+    parent.status = 'completed'
+    assert queue.complete('parent') == ['child']
+    assert 'child' in queue
+
+def test_deferred_goals_stay_ready_and_capacity_stops_dispatch():
+    """Test that declined goals remain queued, also when the starter raises."""
+    queue = make_queue(Goal('big'), Goal('small', priority=1))
+    assert queue.dispatch(lambda goal: False, lambda: False) == []
+    assert len(queue.heap) == 2 and len(queue) == 2
+
+    def failing(goal):
+        raise RuntimeError("agent pool unavailable")
+    try:
+        queue.dispatch(failing, lambda: False)
+    except RuntimeError:
+        pass
+    assert len(queue.heap) == 2
+
+    started = []
+    assert queue.dispatch(start(started), lambda: len(started) >= 1) == ['big']
+    assert 'small' in queue
+
+def test_rebuild_skips_stale_and_finished_goals():
+    """Test rebuilding from the shared mapping and dropping entries of started goals."""
+    done = Goal('done', status='completed')
+    waiting = Goal('waiting', dependencies=['done'])
+    queue = make_queue(done, Goal('other'))
+    queue.goals['waiting'] = waiting
+    queue.rebuild()
+    assert queue.ready == {'other', 'waiting'} and queue.unmet_dependencies['waiting'] == 0
+
+    queue.goals['other'].status = 'running'
+    assert queue.dispatch(start([]), lambda: False) == ['waiting']
+    assert len(queue) == 0
+
+def test_deadline_key_orders_missing_deadlines_last():
+    """Test that unparsable or missing deadlines sort after real ones."""
+    assert deadline_key("2026-01-01T00:00:00") < deadline_key("not a date") == float('inf')
+    assert deadline_key(None) == float('inf')
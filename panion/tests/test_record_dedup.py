@@ -0,0 +1,59 @@
+"""
+Tests for blocking, scoring and clustering of duplicate business records.
+"""
+
+import numpy as np
+
+from core.utils.dedup import (RecordDeduplicator, UnionFind, deduplicate_records,
+                              geohash, normalize_name, normalize_phone)
+
+def test_normalization():
+    """Test the keys records are blocked and compared on."""
+    assert normalize_phone("+1 (512) 555-0100") == "5125550100"
+    assert normalize_phone("ext. 12") == ""
+    assert normalize_name("Joe's Smoke & Vape, LLC") == "joes smoke vape"
+    assert geohash(30.2672, -97.7431, 5) == "9v6kp"
+
+def test_near_duplicates_across_sources_are_merged():
+    """Test that spelling, formatting and missing fields do not hide duplicates."""
+    records = [
+        {"name": "Cloud 9 Smoke Shop", "phone": "512-555-0100", "address": "12 Main Street, Austin TX 78701", "source": "yelp"},
+        {"name": "Cloud Nine Smoke Shop", "phone": "(512) 555 0100", "address": "12 Main St, Austin TX 78701", "source": "google"},
+        {"name": "Cloud 9 Smoke Shop LLC", "address": "12 Main St., Austin, TX 78701", "website": "https://cloud9.example.com"},
+        {"name": "Cloud 9 Smoke Shop", "phone": "512-555-0199", "address": "400 Elm St, Austin TX 78702"},
+        {"name": "Vapor Lounge", "phone": "512-555-0100", "address": "900 Oak Ave, Dallas TX 75201"},
+    ]
+    deduplicator = RecordDeduplicator()
+    assert deduplicator.cluster(records) == [[0, 1, 2], [3], [4]]
+
+    merged = deduplicator.deduplicate(records)
+    assert merged[0]["name"] == "Cloud 9 Smoke Shop"
+    assert merged[0]["website"] == "https://cloud9.example.com"
+    assert [b["address"] for b in merged[1:]] == ["400 Elm St, Austin TX 78702", "900 Oak Ave, Dallas TX 75201"]
+
+def test_names_alone_are_not_enough():
+    """Test that records sharing only a name stay apart."""
+    records = [{"name": "Smoke Shop", "city": "Austin"}, {"name": "Smoke Shop", "city": "Austin"},
+               {"name": "Smoke Shop", "phone": "512-555-0100", "lat": 30.2672, "lng": -97.7431},
+               {"name": "Smoke Shop", "phone": "512-555-0100", "lat": 30.2673, "lng": -97.7432}]
+    assert deduplicate_records(records) == [records[0], records[1], records[2]]
+
+def test_union_find_chains_matches():
+    """Test that pairwise matches join transitively, rooted at the earliest record."""
+    clusters = UnionFind(6)
+    clusters.union(4, 2)
+    clusters.union(2, 5)
+    clusters.union(1, 3)
+    assert clusters.groups() == [[0], [1, 3], [2, 4, 5]]
+
+def test_oversized_blocks_are_skipped():
+    """Test that a block too large to compare pairwise yields no candidates."""
+    records = [{"name": "Smoke Shop", "address": f"{n} Main St"} for n in range(50)]
+    deduplicator = RecordDeduplicator(max_block_size=20)
+    left, right = deduplicator.candidate_pairs(deduplicator.features(records))
+    assert len(left) == 0 and deduplicator.last_stats["oversized_blocks"] == 1
+
+    small = RecordDeduplicator()
+    left, right = small.candidate_pairs(small.features(records))
+    assert len(left) == 50 * 49 // 2 and np.all(left < right)
+    assert len(small.deduplicate(records)) == 50
@@ -0,0 +1,99 @@
+"""
+Tests for sparse and incremental reflection clustering.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# core/reflection.py shadows the core/reflection/ directory, so load the module by path
+_spec = importlib.util.spec_from_file_location(
+    "reflection_analyzer", Path(__file__).parent.parent / "core" / "reflection" / "analyzer.py")
+analyzer_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(analyzer_module)
+IncrementalClusterer = analyzer_module.IncrementalClusterer
+ReflectionAnalyzer = analyzer_module.ReflectionAnalyzer
+
+TOPICS = [
+    "LLM request to the model timed out after retries",
+    "plugin loader failed to import the sandboxed module",
+    "goal decomposition produced a dependency cycle between subtasks",
+]
+
+def reflections(count, start=0):
+    return [{"thought": f"{TOPICS[n % len(TOPICS)]} attempt {n}",
+             "timestamp": f"2026-01-01T{n // 60 % 24:02d}:{n % 60:02d}:00",
+             "metadata": {"source": f"topic{n % len(TOPICS)}"}}
+            for n in range(start, start + count)]
+
+def test_clusterer_groups_by_cosine_similarity():
+    """Test that rows join the nearest centroid and unmatched rows form new clusters."""
+    rows = csr_matrix(np.array([[1, 0, 0], [0.99, 0.14, 0], [0, 1, 0], [0, 0, 1], [0, 0.1, 0.99]], dtype=np.float32))
+    clusterer = IncrementalClusterer(3, eps=0.3, batch_size=2)
+    labels = clusterer.partial_fit(rows)
+    assert labels[0] == labels[1] and labels[3] == labels[4]
+    assert len(set(labels.tolist())) == 3
+    assert clusterer.partial_fit(csr_matrix(np.array([[0.98, 0.2, 0]], dtype=np.float32)))[0] == labels[0]
+    assert clusterer.counts[clusterer.slot_of(labels[0])] == 3
+
+def test_single_member_clusters_are_pruned():
+    """Test that cluster count stays bounded by dropping noise."""
+    clusterer = IncrementalClusterer(20, eps=0.1, batch_size=4, max_clusters=8)
+    labels = clusterer.partial_fit(csr_matrix(np.vstack([np.eye(20, dtype=np.float32)[:12], np.eye(20)[[0, 0]]])))
+    assert clusterer.size <= 8
+    assert labels[12] == labels[13] != -1
+    assert (labels[:12] == -1).sum() >= 4
+
+def test_batch_analysis_keeps_vectors_sparse_and_vocabulary(tmp_path):
+    """Test that analysis clusters topics and reuses the saved vocabulary after a restart."""
+    analyzer = ReflectionAnalyzer(str(tmp_path), min_fit_documents=20)
+    result = analyzer.analyze_reflections(reflections(30))
+    assert result["cluster_count"] == 3
+    assert sorted(p["metadata"]["cluster_size"] for p in result["patterns"]) == [10, 10, 10]
+    vocabulary = json.loads((tmp_path / "vectorizer.json").read_text())["vocabulary"]
+
+    restarted = ReflectionAnalyzer(str(tmp_path))
+    restarted.analyze_reflections(reflections(3, start=100) + [{"thought": "something else entirely"}])
+    assert restarted.vectorizer.vocabulary_ == vocabulary
+
+def test_small_first_analysis_does_not_fix_the_vocabulary(tmp_path):
+    """Test that analyses below min_fit_documents fit per call and are not saved."""
+    analyzer = ReflectionAnalyzer(str(tmp_path), min_fit_documents=20)
+    analyzer.analyze_reflections(reflections(2))
+    assert not (tmp_path / "vectorizer.json").exists()
+
+    timeouts = [{"thought": f"database timeout while saving the session, retry {n}"} for n in range(20)]
+    assert analyzer.analyze_reflections(timeouts)["pattern_count"] == 1
+    assert "database" in json.loads((tmp_path / "vectorizer.json").read_text())["vocabulary"]
+
+def test_vocabulary_is_refitted_when_most_terms_are_new(tmp_path):
+    """Test that a batch mostly outside the vocabulary refits it and resets incremental clusters."""
+    analyzer = ReflectionAnalyzer(str(tmp_path), min_fit_documents=6)
+    assert analyzer.add_reflections(reflections(9))["pattern_count"] == 3
+
+    drifted = [{"thought": f"warehouse inventory forklift shipment pallet {n}"} for n in range(4)]
+    assert analyzer.add_reflections(drifted)["buffered"] == 4
+    assert "warehouse" not in analyzer.vectorizer.vocabulary_
+
+    result = analyzer.add_reflections(drifted[:2])
+    assert "warehouse" in analyzer.vectorizer.vocabulary_
+    assert result["pattern_count"] == 1 and result["cluster_count"] == 1
+
+def test_incremental_updates_only_touched_clusters(tmp_path):
+    """Test that new reflections update their clusters in place."""
+    analyzer = ReflectionAnalyzer(str(tmp_path), min_fit_documents=6, max_occurrences=4)
+    assert analyzer.add_reflections(reflections(3))["buffered"] == 3
+    first = analyzer.add_reflections(reflections(6, start=3))
+    assert first["pattern_count"] == 3 and first["cluster_count"] == 3
+
+    update = analyzer.add_reflections([r for r in reflections(9, start=9) if "plugin" in r["thought"]])
+    assert update["pattern_count"] == 1
+    pattern = update["patterns"][0]
+    assert pattern["pattern_id"] in {p["pattern_id"] for p in first["patterns"]}
+    assert pattern["metadata"]["cluster_size"] == 6
+    assert len(pattern["occurrences"]) == 4
+    assert pattern["created_at"] == analyzer.patterns[pattern["pattern_id"]].created_at
+    assert "plugin" in " ".join(pattern["metadata"]["themes"])
@@ -0,0 +1,113 @@
+"""
+Tests for the append-only reflection journal.
+"""
+
+import gc
+import json
+import weakref
+from datetime import timedelta
+
+import pytest
+
+from core import reflection as reflection_module
+from core.reflection import ReflectionCategory, ReflectionLogger
+
+@pytest.fixture
+def make_logger(tmp_path):
+    loggers = []
+
+    def build(**kwargs):
+        logger = ReflectionLogger(tmp_path / "reflections", **kwargs)
+        loggers.append(logger)
+        return logger
+
+    yield build
+    for logger in loggers:
+        logger.close()
+
+def test_reflections_are_journaled_in_batches(make_logger, tmp_path):
+    """Test that logging appends to the journal in the background and survives a restart."""
+    journal = tmp_path / "reflections" / "reflections.jsonl"
+    logger = make_logger(flush_interval=10)
+    for n in range(50):
+        logger.log_thought("llm_service", f"thought {n}", tags=["llm", f"n{n % 2}"])
+    logger.log(ReflectionCategory.ERROR, "boom", severity="error", tags=["llm"])
+    assert not journal.exists() or journal.read_text() == ""
+
+    logger.flush()
+    assert len(journal.read_text().splitlines()) == 51
+    summary = json.loads((tmp_path / "reflections" / "reflections_summary.json").read_text())
+    assert summary["total_reflections"] == 51
+    assert summary["categories"]["thought"] == 50 and summary["categories"]["error"] == 1
+    assert summary["severities"]["error"] == 1 and summary["severities"]["warning"] == 0
+    assert summary["tags"] == {"llm": 51, "n0": 25, "n1": 25}
+
+    logger.close()
+    restarted = make_logger()
+    assert restarted.get_summary() == logger.get_summary()
+    assert restarted.get_reflections()[-1].message == "boom"
+
+def test_indexed_queries_match_a_full_scan(make_logger):
+    """Test category and time-range lookups against filtering every reflection."""
+    logger = make_logger()
+    categories = list(ReflectionCategory)
+    for n in range(200):
+        logger.log(categories[n % len(categories)], f"r{n}", severity="warning" if n % 3 else "info",
+                   tags=["even"] if n % 2 == 0 else [])
+
+    base = logger.reflections[0].timestamp
+    start, end = logger.reflections[40].timestamp, logger.reflections[120].timestamp
+    for category in (None, ReflectionCategory.GOAL, ReflectionCategory.THOUGHT):
+        for kwargs in ({}, {"start_time": start}, {"end_time": end}, {"start_time": start, "end_time": end},
+                       {"start_time": start, "severity": "warning", "tags": ["even"]}):
+            expected = [r for r in logger.reflections
+                        if (category is None or r.category == category)
+                        and r.timestamp >= kwargs.get("start_time", base)
+                        and r.timestamp <= kwargs.get("end_time", base + timedelta(days=1))
+                        and r.severity == kwargs.get("severity", r.severity)
+                        and all(tag in r.tags for tag in kwargs.get("tags", []))]
+            assert logger.get_reflections(category=category, **kwargs) == expected
+
+def test_legacy_file_is_migrated_and_torn_lines_skipped(make_logger, tmp_path):
+    """Test loading the old whole-file format and a journal cut short by a crash."""
+    directory = tmp_path / "reflections"
+    directory.mkdir()
+    legacy = [{"category": "goal", "message": "old", "timestamp": "2025-01-01T00:00:00",
+               "metadata": {}, "severity": "info", "tags": ["legacy"]}]
+    (directory / "reflections.json").write_text(json.dumps(legacy))
+
+    logger = make_logger()
+    assert [r.message for r in logger.get_reflections(ReflectionCategory.GOAL)] == ["old"]
+    assert (directory / "reflections.json.migrated").exists()
+    logger.log(ReflectionCategory.SYSTEM, "new")
+    logger.close()
+
+    with open(directory / "reflections.jsonl", "a") as f:
+        f.write('{"category": "system", "mess')
+    restarted = make_logger()
+    assert [r.message for r in restarted.get_reflections()] == ["old", "new"]
+
+def test_clear_truncates_the_journal(make_logger, tmp_path):
+    """Test that clearing drops earlier reflections but keeps later ones."""
+    logger = make_logger()
+    logger.log(ReflectionCategory.SYSTEM, "before")
+    logger.clear()
+    logger.log(ReflectionCategory.SYSTEM, "after")
+    logger.flush()
+    assert logger.get_summary()["total_reflections"] == 1
+
+    lines = (tmp_path / "reflections" / "reflections.jsonl").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["after"]
+
+def test_exit_hook_closes_open_loggers_without_keeping_them(tmp_path):
+    """Test that one exit hook writes pending reflections and closed loggers can be collected."""
+    logger = ReflectionLogger(tmp_path / "open", flush_interval=60)
+    logger.log(ReflectionCategory.SYSTEM, "pending at exit")
+    reflection_module._close_open_loggers()
+    assert logger not in reflection_module._open_loggers
+    assert "pending at exit" in (tmp_path / "open" / "reflections.jsonl").read_text()
+
+    logger_ref = weakref.ref(logger)
+    del logger
+    gc.collect()
+    assert logger_ref() is None
@@ -0,0 +1,61 @@
+"""
+Tests for the resource timeline index.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from core.resource_timeline import ResourceTimeline, UsageProfile
+
+@pytest.fixture
+def base_time():
+    """Fixed reference time."""
+    return datetime(2025, 1, 1, 12, 0, 0)
+
+def test_usage_profile_accumulates_overlaps():
+    """Test that overlapping usage is summed over the overlap only."""
+    profile = UsageProfile()
+    profile.add(0, 10, 1.0)
+    profile.add(5, 15, 2.0)
+
+    assert profile.usage_at(-1) == 0.0
+    assert profile.usage_at(0) == 1.0
+    assert profile.usage_at(7) == 3.0
+    assert profile.usage_at(10) == 2.0
+    assert profile.usage_at(15) == 0.0
+
+def test_next_fit_jumps_to_release(base_time):
+    """Test that availability jumps to the time capacity frees up."""
+    timeline = ResourceTimeline({'cpu': 1.0})
+    end = base_time + timedelta(minutes=37)
+    timeline.add(base_time, end, {'cpu': 1.0})
+
+    assert timeline.next_available({'cpu': 0.5}, base_time) == end
+    assert timeline.next_available({'cpu': 0.5}, end + timedelta(minutes=1)) == end + timedelta(minutes=1)
+
+def test_next_fit_respects_duration(base_time):
+    """Test that a window must fit for its whole duration."""
+    timeline = ResourceTimeline({'memory': 100.0})
+    busy_start = base_time + timedelta(minutes=10)
+    busy_end = base_time + timedelta(minutes=20)
+    timeline.add(busy_start, busy_end, {'memory': 100.0})
+
+    assert timeline.next_available({'memory': 10.0}, base_time, duration=5 * 60) == base_time
+    assert timeline.next_available({'memory': 10.0}, base_time, duration=15 * 60) == busy_end
+
+def test_next_available_across_resources(base_time):
+    """Test that all resources must fit at the same time."""
+    timeline = ResourceTimeline({'cpu': 1.0, 'memory': 100.0})
+    timeline.add(base_time, base_time + timedelta(minutes=5), {'cpu': 1.0})
+    timeline.add(base_time + timedelta(minutes=5), base_time + timedelta(minutes=9), {'memory': 100.0})
+
+    result = timeline.next_available({'cpu': 0.5, 'memory': 50.0}, base_time)
+    assert result == base_time + timedelta(minutes=9)
+
+def test_requirement_over_limit_terminates(base_time):
+    """Test that an impossible requirement does not loop forever."""
+    timeline = ResourceTimeline({'cpu': 1.0})
+    end = base_time + timedelta(minutes=3)
+    timeline.add(base_time, end, {'cpu': 0.5})
+
+    assert timeline.next_available({'cpu': 2.0}, base_time) == end
@@ -0,0 +1,122 @@
+"""
+Tests for the shared scraper HTTP response cache.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scrapers.fetch_engine import FetchEngine
+from scrapers.response_cache import ResponseCache, normalize_url
+from scrapers.smokeshop_scraper import SmokeshopScraper
+
+class ValidatingHandler(BaseHTTPRequestHandler):
+    """Serves a page with an ETag and answers matching revalidations with 304."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        etag = f'"v{server.version}"'
+        server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        payload = f"<html>page {server.version}</html>".encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ValidatingHandler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.version = 1
+    httpd.base_url = "http://127.0.0.1:%d" % httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "http"), ttl_seconds=60, clock=lambda: clock[0])
+    yield cache
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_fresh_hits_and_conditional_revalidation(server, cache, clock):
+    """Test that fresh entries skip the network and stale ones are revalidated."""
+    engine = FetchEngine(min_interval=0.0, jitter=0.0, cache=cache)
+    try:
+        url = f"{server.base_url}/search?b=2&a=1"
+        assert await engine.fetch(url, use_proxy=False) == "<html>page 1</html>"
+        assert await engine.fetch(f"{server.base_url}/search?a=1&b=2#top", use_proxy=False) == "<html>page 1</html>"
+        assert len(server.requests) == 1
+
+        clock[0] += 120
+        assert await engine.fetch(url, use_proxy=False) == "<html>page 1</html>"
+        assert server.requests[-1] == ("/search?b=2&a=1", '"v1"')
+
+        clock[0] += 120
+        server.version = 2
+        assert await engine.fetch(url, use_proxy=False) == "<html>page 2</html>"
+        assert len(server.requests) == 3
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["stale"], stats["revalidations"], stats["misses"]) == (1, 2, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1 and stats["bodies"] == 1
+    finally:
+        await engine.aclose()
+
+def test_requests_clients_share_the_cache(server, cache):
+    """Test the requests-based path used by the smokeshop scraper."""
+    scraper = SmokeshopScraper(response_cache=cache)
+    for _ in range(3):
+        assert scraper._make_request(f"{server.base_url}/shops") == "<html>page 1</html>"
+    assert len(server.requests) == 1
+
+def test_identical_bodies_are_stored_once(cache):
+    """Test content addressing and URL normalization."""
+    assert normalize_url("HTTPS://Example.com:443/a?z=1&y=2", {"x": 3}) == "https://example.com/a?x=3&y=2&z=1"
+    cache.store("https://example.com/a", "same body")
+    cache.store("https://example.com/b", "same body")
+    cache.store("https://example.com/a", "new body")
+    assert cache.lookup("https://example.com/b").body == "same body"
+    assert cache.stats()["bodies"] == 2
+
+    cache.invalidate("https://example.com/b")
+    assert cache.lookup("https://example.com/b") is None
+    assert cache.stats()["bodies"] == 1
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    """Test that stored bodies stay under the size bound."""
+    cache.max_bytes = 5000
+    for n in range(4):
+        clock[0] += 1
+        cache.store(f"https://example.com/{n}", os.urandom(1000).hex())
+    clock[0] += 1
+    assert cache.lookup("https://example.com/0") is not None
+    clock[0] += 1
+    cache.store("https://example.com/4", os.urandom(1000).hex())
+
+    assert cache.stats()["bytes"] <= 5000
+    assert cache.lookup("https://example.com/1") is None
+    assert cache.lookup("https://example.com/0") is not None
+    assert cache.lookup("https://example.com/4") is not None
+    assert cache.evictions >= 1
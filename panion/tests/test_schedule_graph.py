@@ -0,0 +1,80 @@
+"""
+Tests for the schedule dependency graph.
+"""
+
+import pytest
+import random
+
+from core.schedule_graph import ScheduleDAG
+
+def assert_topological(graph):
+    """Check that every edge respects the maintained order."""
+    position = {node: i for i, node in enumerate(graph.topological_order())}
+    for node, successors in graph.successors.items():
+        for successor in successors:
+            assert position[node] < position[successor]
+
+def test_order_repaired_on_edge_insertion():
+    """Test that inserting a back edge reorders only as needed."""
+    graph = ScheduleDAG()
+    for node in ['a', 'b', 'c', 'd']:
+        graph.add_node(node)
+    graph.add_edge('c', 'd')
+    graph.add_edge('d', 'a')
+    graph.add_edge('b', 'c')
+
+    assert graph.topological_order() == ['b', 'c', 'd', 'a']
+    assert_topological(graph)
+
+def test_cycle_rejected_and_graph_unchanged():
+    """Test that an edge closing a cycle raises without mutating the graph."""
+    graph = ScheduleDAG()
+    graph.add_edge('a', 'b')
+    graph.add_edge('b', 'c')
+
+    with pytest.raises(ValueError, match="Circular dependency"):
+        graph.add_edge('c', 'a')
+    with pytest.raises(ValueError, match="Circular dependency"):
+        graph.add_edge('a', 'a')
+
+    assert 'a' not in graph.successors['c']
+    assert graph.topological_order() == ['a', 'b', 'c']
+
+def test_set_dependencies_rolls_back_on_cycle():
+    """Test that replacing dependencies is all-or-nothing."""
+    graph = ScheduleDAG()
+    graph.add_edge('a', 'b')
+    graph.add_edge('b', 'c')
+    graph.add_node('x')
+
+    with pytest.raises(ValueError):
+        graph.set_dependencies('a', ['x', 'c'])
+
+    assert graph.predecessors['a'] == set()
+    assert graph.successors['x'] == set()
+
+def test_descendants_cone():
+    """Test that the downstream cone includes only reachable nodes."""
+    graph = ScheduleDAG.from_items([
+        {'id': 'a', 'dependencies': []},
+        {'id': 'b', 'dependencies': ['a']},
+        {'id': 'c', 'dependencies': ['b']},
+        {'id': 'd', 'dependencies': ['a']},
+        {'id': 'e', 'dependencies': []},
+    ], key='id')
+
+    assert graph.descendants(['b']) == {'b', 'c'}
+    assert graph.descendants(['a']) == {'a', 'b', 'c', 'd'}
+
+def test_random_insertions_keep_valid_order():
+    """Test the maintained order against random acyclic insertions."""
+    rng = random.Random(7)
+    graph = ScheduleDAG()
+    nodes = list(range(50))
+    rng.shuffle(nodes)
+    for node in nodes:
+        graph.add_node(node)
+    for _ in range(300):
+        u, v = sorted(rng.sample(range(50), 2))
+        graph.add_edge(u, v)
+    assert_topological(graph)
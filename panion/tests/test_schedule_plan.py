@@ -0,0 +1,74 @@
+"""
+Tests for incremental re-planning of goal schedules.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from core.resource_timeline import ResourceTimeline
+from core.schedule_graph import ScheduleDAG
+from core.schedule_plan import SchedulePlan
+
+ANCHOR = datetime(2026, 1, 1, 9, 0)
+
+def place(task, plan):
+    """Start a task when its dependencies end, one cpu unit each."""
+    start_time = max([plan.anchor] + [plan.end_times[dep] for dep in task['dependencies']
+                                      if dep in plan.end_times])
+    end_time = start_time + timedelta(minutes=task['estimated_duration'])
+    plan.record(task['subtask_id'], start_time, end_time, {'cpu': 1.0})
+    return {'task_id': task['subtask_id'], 'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(), 'duration': task['estimated_duration']}
+
+@pytest.fixture
+def planned():
+    """A chain a -> b -> c and an independent task d, placed in order."""
+    tasks = {
+        task_id: {'subtask_id': task_id, 'dependencies': deps, 'estimated_duration': 10}
+        for task_id, deps in [('a', []), ('b', ['a']), ('c', ['b']), ('d', [])]
+    }
+    plan = SchedulePlan(
+        graph=ScheduleDAG.from_items(tasks.values(), key='subtask_id'),
+        resource_index=ResourceTimeline({'cpu': 100.0}),
+        anchor=ANCHOR
+    )
+    timeline = [place(tasks[task_id], plan) for task_id in plan.graph.topological_order()]
+    return tasks, timeline, plan
+
+def test_replan_moves_only_the_downstream_cone(planned):
+    """Test that a duration change only moves its dependents."""
+    tasks, timeline, plan = planned
+    entries = {e['task_id']: dict(e) for e in timeline}
+
+    assert plan.replan(tasks, timeline, {'b': {'estimated_duration': 60}}, place) == ['b', 'c']
+
+    updated = {e['task_id']: e for e in timeline}
+    assert updated['a'] == entries['a'] and updated['d'] == entries['d']
+    assert updated['b']['start_time'] == entries['b']['start_time']
+    assert updated['c']['start_time'] > entries['c']['start_time']
+    assert plan.resource_index.usage_at(ANCHOR + timedelta(minutes=30))['cpu'] == 1.0
+
+def test_replan_rejects_cycle(planned):
+    """Test that a dependency change creating a cycle is rejected."""
+    tasks, timeline, plan = planned
+    with pytest.raises(ValueError, match="Circular dependency"):
+        plan.replan(tasks, timeline, {'a': {'dependencies': ['c']}}, place)
+
+@pytest.mark.parametrize("task_updates", [
+    {'d': {'dependencies': ['c'], 'estimated_duration': 5}, 'a': {'dependencies': ['c']}},
+    {'b': {'estimated_duration': 60}, 'missing': {'estimated_duration': 1}},
+])
+def test_rejected_update_changes_nothing(planned, task_updates):
+    """Test that an update rejected part way leaves tasks, graph and timeline as they were."""
+    tasks, timeline, plan = planned
+    before = ({k: dict(v) for k, v in tasks.items()}, [dict(e) for e in timeline],
+              {k: set(v) for k, v in plan.graph.predecessors.items()}, dict(plan.usage))
+
+    with pytest.raises(ValueError):
+        plan.replan(tasks, timeline, task_updates, place)
+
+    assert tasks == before[0] and timeline == before[1]
+    assert plan.graph.predecessors == before[2] and plan.usage == before[3]
+    order = plan.graph.topological_order()
+    assert order.index('a') < order.index('b') < order.index('c')
+    assert plan.replan(tasks, timeline, {'d': {'dependencies': ['c']}}, place) == ['d']
@@ -0,0 +1,239 @@
+"""
+Tests for the simple chat API serving mode.
+"""
+
+import http.client
+import json
+import socket
+import threading
+import time
+import pytest
+
+import simple_chat_api
+from simple_chat_api import PanionAPIHandler, PooledHTTPServer, buffered_response
+
+release = threading.Event()
+
+class SlowHandler(PanionAPIHandler):
+    """Handler with an endpoint that blocks until released."""
+
+    max_body_size = 1024
+
+    @buffered_response
+    def do_GET(self):
+        if self.path == "/slow":
+            release.wait(10)
+            self._set_headers()
+            self.wfile.write(b'{"slow": true}')
+        else:
+            PanionAPIHandler.do_GET.__wrapped__(self)
+
+@pytest.fixture
+def server():
+    """Start a pooled server on a free port."""
+    release.clear()
+    httpd = PooledHTTPServer(("127.0.0.1", 0), SlowHandler, workers=2, max_queue=1)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+def connect(httpd):
+    """Open a client connection to the server."""
+    return http.client.HTTPConnection(*httpd.server_address, timeout=5)
+
+def test_keep_alive_reuses_connection(server):
+    """Test that several requests share one HTTP/1.1 connection."""
+    conn = connect(server)
+    for _ in range(3):
+        conn.request("GET", "/health")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.version == 11
+        assert json.loads(response.read())["status"] == "ok"
+        assert not response.will_close
+    conn.request("POST", "/goals", body=json.dumps({}), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    assert response.getheader("Content-Length") is not None
+    conn.close()
+
+def test_health_is_served_while_a_request_is_slow(server):
+    """Test that a slow request does not block other clients."""
+    slow = connect(server)
+    slow.request("GET", "/slow")
+
+    probe = connect(server)
+    probe.request("GET", "/health")
+    assert probe.getresponse().status == 200
+    probe.close()
+
+    release.set()
+    assert slow.getresponse().status == 200
+    slow.close()
+
+def test_oversized_body_is_rejected(server):
+    """Test that bodies over the limit get 413 without being read."""
+    conn = connect(server)
+    conn.request("POST", "/chat", body=b"x" * 2048, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    assert response.status == 413
+    assert response.will_close
+    conn.close()
+
+def test_connections_beyond_the_queue_get_503(server):
+    """Test that the server sheds load once workers and queue are full."""
+    held = []
+    # Two workers busy on /slow, one connection waiting in the queue
+    for _ in range(3):
+        conn = connect(server)
+        conn.request("GET", "/slow")
+        held.append(conn)
+
+    sock = socket.create_connection(server.server_address, timeout=5)
+    sock.sendall(b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n")
+    assert sock.recv(1024).startswith(b"HTTP/1.1 503")
+    sock.close()
+    assert server.rejected == 1
+
+    release.set()
+    for conn in held:
+        assert conn.getresponse().status == 200
+        conn.close()
+
+def test_create_server_uses_pool_settings():
+    """Test that the factory builds a pooled server."""
+    httpd = simple_chat_api.create_server("127.0.0.1", 0, workers=3, max_queue=4)
+    try:
+        assert httpd.workers == 3
+        assert httpd.max_queue == 4
+    finally:
+        httpd.server_close()
+
+def test_route_table_dispatch(server):
+    """Test that routes resolve through the tables and unknown paths 404."""
+    conn = connect(server)
+    conn.request("POST", "/chat", body=json.dumps({"content": "hello"}),
+                 headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    assert response.status == 200
+    assert body["additional_info"]["intent_detected"] == "greeting"
+    assert body["response"].startswith("Hello!")
+
+    conn.request("POST", "/nope", body=b"{}", headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 404
+
+    conn.request("GET", "/system/stats")
+    response = conn.getresponse()
+    assert json.loads(response.read())["agent_count"] == len(simple_chat_api.AGENTS)
+    conn.close()
+
+def test_task_endpoints(server, monkeypatch):
+    """Test task status, listing and cancellation over HTTP."""
+    from core.task_store import TaskStore
+    manager = simple_chat_api.TaskManager(max_workers=1, store=TaskStore(":memory:"))
+    monkeypatch.setattr(simple_chat_api, "task_manager", manager)
+    manager.create_task("t1", {"type": "unknown"})
+
+    conn = connect(server)
+    conn.request("GET", "/tasks?limit=1")
+    listing = json.loads(conn.getresponse().read())
+    assert listing["limit"] == 1
+
+    conn.request("GET", "/tasks/missing")
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 404
+
+    conn.request("POST", "/tasks/missing/cancel", body=b"{}", headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 409
+
+    conn.request("GET", "/tasks?limit=x")
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 400
+    conn.close()
+    manager.shutdown()
+
+def read_sse(response, count):
+    """Read a number of events from a Server-Sent Events response."""
+    events, fields = [], {}
+    while len(events) < count:
+        line = response.fp.readline().decode().rstrip("\n")
+        if line:
+            name, _, value = line.partition(": ")
+            fields[name] = value
+        elif fields:
+            events.append(fields)
+            fields = {}
+    return events
+
+def test_event_stream_resumes_after_reconnect(server, monkeypatch):
+    """Test that progress streams over SSE and resumes from Last-Event-ID."""
+    from core.progress_stream import ProgressStream
+    stream = ProgressStream()
+    monkeypatch.setattr(simple_chat_api, "progress_stream", stream)
+    monkeypatch.setattr(SlowHandler, "stream_max_seconds", 0.3)
+    monkeypatch.setattr(SlowHandler, "stream_coalesce_seconds", 0.01)
+    # The first stream keeps its slot until it notices the client left
+    monkeypatch.setattr(server, "stream_slots", threading.BoundedSemaphore(2))
+    stream.publish("task:t1", {"progress": 10})
+    stream.publish("operation:op", {"progress": 5})
+
+    conn = connect(server)
+    conn.request("GET", "/events?since=0&topic=task:")
+    response = conn.getresponse()
+    assert response.getheader("Content-Type") == "text/event-stream"
+    first = read_sse(response, 2)
+    assert first[0] == {"retry": "1000"}
+    assert first[1]["id"] == "1"
+    assert json.loads(first[1]["data"]) == {"topic": "task:t1", "progress": 10}
+    conn.close()
+
+    stream.publish("task:t1", {"progress": 60})
+    conn = connect(server)
+    conn.request("GET", "/events?topic=task:", headers={"Last-Event-ID": "1"})
+    response = conn.getresponse()
+    assert response.status == 200
+    resumed = read_sse(response, 2)[1]
+    assert resumed["id"] == "3"
+    assert json.loads(resumed["data"])["progress"] == 60
+    conn.close()
+
+def test_event_streams_are_capped(server):
+    """Test that streams beyond the slot limit get 503."""
+    server.stream_slots.acquire()
+    try:
+        conn = connect(server)
+        conn.request("GET", "/events")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 503
+        conn.close()
+    finally:
+        server.stream_slots.release()
+
+def test_request_counts_are_keyed_by_route(server):
+    """Test that distinct task IDs and unknown paths do not add new count keys."""
+    conn = connect(server)
+    for path in ["/tasks/a", "/tasks/b", "/tasks/c", "/nope/1", "/nope/2", "/health"]:
+        conn.request("GET", path)
+        conn.getresponse().read()
+    conn.close()
+    # Counted after the response is sent
+    for _ in range(100):
+        if sum(server.request_counts.values()) == 6:
+            break
+        time.sleep(0.01)
+    assert server.request_counts == {
+        "GET /tasks/* 404": 3,
+        "GET <unmatched> 404": 2,
+        "GET /health 200": 1,
+    }
@@ -0,0 +1,52 @@
+"""
+Tests for the shared SQLite store base class.
+"""
+
+from core.utils.sqlite import SQLiteStore
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, expires_at REAL NOT NULL);"
+
+class ExpiringRows(SQLiteStore):
+    """Rows that expire, purged on write."""
+
+    def put(self, key, ttl):
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO rows VALUES (?, ?)", (key, now + ttl))
+            self._purge_if_due(conn, now)
+
+    def count(self):
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def _delete_expired(self, conn, now):
+        with conn:
+            return conn.execute("DELETE FROM rows WHERE expires_at <= ?", (now,)).rowcount
+
+def test_purge_on_write_is_throttled(tmp_path):
+    """Test that writes purge at most once per interval and purge_expired always does."""
+    now = [1000.0]
+    store = ExpiringRows(str(tmp_path / "nested" / "rows.db"), _SCHEMA, purge_interval=60, clock=lambda: now[0])
+    store.put("a", ttl=10)
+    now[0] += 20
+    store.put("b", ttl=10)
+    assert store.count() == 2
+
+    now[0] += 60
+    store.put("c", ttl=10)
+    assert store.count() == 1
+    now[0] += 20
+    assert store.purge_expired() == 1
+    store.close()
+
+def test_connection_reopens_after_close(tmp_path):
+    """Test that closing releases the connection and later calls reopen the same file."""
+    store = ExpiringRows(str(tmp_path / "rows.db"), _SCHEMA)
+    store.put("a", ttl=3600)
+    store.close()
+    store.close()
+    assert store._conn is None
+    assert store.count() == 1 and store.purge_expired() == 0
+    store.close()
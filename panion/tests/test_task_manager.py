@@ -0,0 +1,135 @@
+"""
+Tests for the background task manager and task store.
+"""
+
+import threading
+import time
+import pytest
+
+from core.task_store import TaskStore
+from simple_chat_api import TaskManager
+
+def wait_for(condition, timeout=5):
+    """Poll until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def finished(manager, task_id):
+    return manager.get_task_status(task_id)["status"] == "completed"
+
+@pytest.fixture
+def gate():
+    gate = threading.Event()
+    yield gate
+    gate.set()
+
+@pytest.fixture
+def manager(gate):
+    """A one-worker manager with blocking and recording task types."""
+    manager = TaskManager(max_workers=1, max_pending=3, store=TaskStore(":memory:"))
+    manager.order = []
+
+    def block(task_id, details):
+        while not gate.wait(0.01):
+            manager._update_task(task_id, progress=50)
+        manager._update_task(task_id, status="completed", progress=100)
+
+    def record(task_id, details):
+        manager.order.append(task_id)
+        manager._update_task(task_id, status="completed", result={"n": details["n"]})
+
+    manager.task_handlers.update({"block": block, "record": record})
+    yield manager
+    manager.shutdown(wait=False)
+
+def test_priorities_and_admission(manager, gate):
+    """Test that queued tasks run by priority and the queue is bounded."""
+    manager.create_task("blocker", {"type": "block"})
+    assert wait_for(lambda: manager.active_tasks["blocker"]["status"] == "running")
+
+    manager.create_task("low", {"type": "record", "n": 1}, priority="low")
+    manager.create_task("normal", {"type": "record", "n": 2})
+    manager.create_task("high", {"type": "record", "n": 3}, priority="high")
+    refused = manager.create_task("extra", {"type": "record", "n": 4})
+    assert refused["status"] == "error"
+    assert manager.pending_count() == 3
+
+    gate.set()
+    assert wait_for(lambda: finished(manager, "low"))
+    assert manager.order == ["high", "normal", "low"]
+    assert manager.active_tasks == {}
+    assert manager.create_task("high", {"type": "record", "n": 5})["status"] == "error"
+
+def test_cancel_queued_and_running(manager, gate):
+    """Test cancelling a waiting task and a running one."""
+    manager.create_task("blocker", {"type": "block"})
+    manager.create_task("waiting", {"type": "record", "n": 1})
+    assert wait_for(lambda: manager.active_tasks["blocker"]["status"] == "running")
+
+    assert manager.cancel_task("waiting")["status"] == "cancelled"
+    assert manager.cancel_task("blocker")["status"] == "cancelling"
+    assert wait_for(lambda: finished(manager, "blocker"))
+
+    assert manager.get_task_status("blocker")["task_data"]["status"] == "cancelled"
+    assert manager.get_task_status("waiting")["task_data"]["status"] == "cancelled"
+    assert manager.cancel_task("waiting")["status"] == "error"
+    assert manager.order == []
+
+def test_finished_tasks_are_listed_from_the_store(manager, gate):
+    """Test paginated listing of finished tasks."""
+    gate.set()
+    for n in range(3):
+        manager.create_task(f"t{n}", {"type": "record", "n": n})
+        assert wait_for(lambda: finished(manager, f"t{n}"))
+    manager.create_task("bad", {"type": "unknown"})
+    assert wait_for(lambda: finished(manager, "bad"))
+
+    listing = manager.list_tasks(limit=2)
+    assert listing["total_completed"] == 4
+    assert listing["total_active"] == 0
+    assert [task["id"] for task in listing["completed_tasks"]] == ["bad", "t2"]
+    assert [task["id"] for task in manager.list_tasks(limit=2, offset=2)["completed_tasks"]] == ["t1", "t0"]
+
+    errors = manager.list_tasks(status="error")
+    assert [task["id"] for task in errors["completed_tasks"]] == ["bad"]
+    assert manager.get_task_status("t1")["task_data"]["result"] == {"n": 1}
+    assert manager.get_task_status("missing")["status"] == "error"
+
+def test_store_retention():
+    """Test that finished tasks expire and unfinished ones are kept."""
+    now = [1000.0]
+    store = TaskStore(":memory:", retention_seconds=60, purge_interval=3600, clock=lambda: now[0])
+    store.save({"id": "old", "status": "completed", "created_at": "a"})
+    store.save({"id": "pending", "status": "queued", "created_at": "b"})
+    now[0] += 30
+    store.save({"id": "new", "status": "error", "created_at": "c"})
+
+    now[0] += 45
+    assert store.purge_expired() == 1
+    assert store.get("old") is None
+    assert store.get("new")["status"] == "error"
+    assert [task["id"] for task in store.unfinished()] == ["pending"]
+
+def test_recover_after_restart(tmp_path):
+    """Test that queued tasks are requeued and running ones are interrupted."""
+    path = str(tmp_path / "tasks.db")
+    store = TaskStore(path)
+    store.save({"id": "queued", "status": "queued", "priority": "normal", "created_at": "a",
+                "details": {"type": "record", "n": 1}, "messages": []})
+    store.save({"id": "running", "status": "running", "priority": "normal", "created_at": "b",
+                "details": {"type": "record", "n": 2}, "messages": []})
+    store.close()
+
+    manager = TaskManager(max_workers=1, store=TaskStore(path))
+    manager.task_handlers["record"] = lambda task_id, details: manager._update_task(task_id, status="completed")
+    try:
+        assert manager.recover() == 1
+        assert wait_for(lambda: finished(manager, "queued"))
+        assert manager.get_task_status("queued")["task_data"]["status"] == "completed"
+        assert manager.get_task_status("running")["task_data"]["status"] == "interrupted"
+    finally:
+        manager.shutdown()